@@ -4,12 +4,15 @@ The Powersoft Mezzo integration.
 This integration provides control and monitoring of Powersoft Mezzo amplifiers
 via the PBus protocol over UDP.
 """
+import asyncio
 import logging
+import time
 from datetime import timedelta
+from typing import Any, Awaitable, Callable
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
@@ -20,16 +23,33 @@ from .const import (
     CLIENT,
     SCENE_MANAGER,
     ACTIVE_SCENE_ID,
+    METER_STREAMER,
     CONF_HOST,
     CONF_PORT,
     CONF_TIMEOUT,
     CONF_SCAN_INTERVAL,
+    CONF_PROTOCOL,
+    CONF_METER_RATE,
+    CONF_EXPORT_METRICS,
+    CONF_PACKET_TRACE,
+    CONF_CHANGE_DETECTION,
+    CONF_SCENE_DIFF,
+    CONF_SCENE_TRANSITION,
+    METRICS_EXPORTER,
+    PROTOCOL_MEZZO,
+    PROTOCOL_QUATTRO,
     DEFAULT_PORT,
+    DEFAULT_QUATTRO_PORT,
     DEFAULT_TIMEOUT,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_METER_RATE,
+    METER_PUBLISH_INTERVAL,
 )
 from .mezzo_client import MezzoClient
+from .quattro_client import QuattroClient
+from .quattro_meters import QuattroMeterStreamer
 from .scene_manager import SceneManager
+from .transport_metrics import PHASE_FANOUT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,14 +57,22 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Powersoft Mezzo from a config entry."""
     host = entry.data[CONF_HOST]
-    port = entry.data.get(CONF_PORT, DEFAULT_PORT)
+    protocol = entry.data.get(CONF_PROTOCOL, PROTOCOL_MEZZO)
     timeout = entry.options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
 
-    _LOGGER.info("Setting up Powersoft Mezzo integration for %s:%d", host, port)
+    # Create client (both return the same state shape to the coordinator)
+    if protocol == PROTOCOL_QUATTRO:
+        port = entry.data.get(CONF_PORT, DEFAULT_QUATTRO_PORT)
+        client = QuattroClient(host, port, timeout)
+    else:
+        port = entry.data.get(CONF_PORT, DEFAULT_PORT)
+        client = MezzoClient(host, port, timeout)
+        client.enable_change_detection(entry.options.get(CONF_CHANGE_DETECTION, False))
+        client.scene_diff = entry.options.get(CONF_SCENE_DIFF, False)
+        client.scene_transition = entry.options.get(CONF_SCENE_TRANSITION, 0.0)
 
-    # Create client
-    client = MezzoClient(host, port, timeout)
+    _LOGGER.info("Setting up Powersoft %s integration for %s:%d", protocol, host, port)
 
     # Try to connect
     try:
@@ -53,6 +81,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.error("Failed to connect to amplifier at %s:%d: %s", host, port, err)
         raise ConfigEntryNotReady(f"Unable to connect to amplifier: {err}") from err
 
+    # Opt-in ring buffer of raw frames for the diagnostics download
+    trace_frames = entry.options.get(CONF_PACKET_TRACE, 0)
+    if trace_frames:
+        client.start_trace(trace_frames)
+
     # Create coordinator
     coordinator = MezzoDataUpdateCoordinator(
         hass,
@@ -64,8 +97,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await coordinator.async_config_entry_first_refresh()
 
     # Create and load scene manager
-    scene_manager = SceneManager(hass, entry.entry_id)
+    scene_manager = SceneManager(
+        hass, entry.entry_id, protocol=protocol, precompile=protocol == PROTOCOL_MEZZO
+    )
     await scene_manager.async_load()
+    if scene_manager.frames is not None:
+        # Recompile scene frames when the poll sees the scene context change
+        @callback
+        def _update_scene_context() -> None:
+            scene_manager.update_scene_context((coordinator.data or {}).get("scene_context"))
+
+        _update_scene_context()
+        entry.async_on_unload(coordinator.async_add_listener(_update_scene_context))
     _LOGGER.info(
         "Scene manager initialized: %d default + %d custom scenes",
         len(scene_manager.get_all_scenes()) - scene_manager.get_custom_scene_count(),
@@ -79,8 +122,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         CLIENT: client,
         SCENE_MANAGER: scene_manager,
         ACTIVE_SCENE_ID: None,  # Track currently active scene
+        METER_STREAMER: None,
     }
 
+    # Stream QUATTROCANALI meters independently of the state poll
+    if protocol == PROTOCOL_QUATTRO:
+        streamer = QuattroMeterStreamer(
+            client,
+            rate=entry.options.get(CONF_METER_RATE, DEFAULT_METER_RATE),
+            publish_interval=METER_PUBLISH_INTERVAL,
+        )
+        streamer.start()
+        hass.data[DOMAIN][entry.entry_id][METER_STREAMER] = streamer
+
+    # Publish state and transport metrics on the OpenMetrics endpoint
+    if entry.options.get(CONF_EXPORT_METRICS, False):
+        from .openmetrics import async_get_exporter
+
+        async_get_exporter(hass).add_amplifier(entry.entry_id, entry.title, coordinator, client)
+
     # Register services (only once for the domain)
     if not hass.services.has_service(DOMAIN, "save_scene"):
         await async_register_services(hass)
@@ -105,6 +165,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         # Disconnect client
         data = hass.data[DOMAIN].pop(entry.entry_id)
+        if METRICS_EXPORTER in hass.data:
+            hass.data[METRICS_EXPORTER].remove_amplifier(entry.entry_id)
+        if data.get(METER_STREAMER):
+            await data[METER_STREAMER].stop()
+        # Scene changes are saved with a delay; the reloaded entry reads the store
+        await data[SCENE_MANAGER].async_flush()
         client: MezzoClient = data[CLIENT]
         await client.disconnect()
         _LOGGER.info("Successfully unloaded Powersoft Mezzo integration")
@@ -139,6 +205,9 @@ async def async_register_services(hass: HomeAssistant) -> None:
         try:
             # Capture current amplifier state
             config = await client.capture_current_state()
+            if call.data.get("preset") is not None:
+                # QUATTROCANALI: recall this stored preset instead of writing gains
+                config["preset"] = call.data["preset"]
 
             # Save as new scene
             scene_id = await scene_manager.async_create_scene(name, config)
@@ -226,6 +295,88 @@ async def async_register_services(hass: HomeAssistant) -> None:
             _LOGGER.error("Failed to rename scene %d: %s", scene_id, err)
             raise
 
+    async def handle_export_scenes(call):
+        """Handle export_scenes service call."""
+        from .scene_index import SCENE_LIBRARY_EXTENSION, save_library
+
+        host = call.data.get("host")
+        written = []
+
+        for entry_id, data in hass.data[DOMAIN].items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if host and entry.data[CONF_HOST] != host:
+                continue
+            scene_manager: SceneManager = data[SCENE_MANAGER]
+            library = scene_manager.export_scenes()
+            path = hass.config.path(
+                f"{DOMAIN}_scenes_{entry.data[CONF_HOST]}_{time.strftime('%Y%m%d-%H%M%S')}"
+                f"{SCENE_LIBRARY_EXTENSION}"
+            )
+            await hass.async_add_executor_job(save_library, path, library)
+            written.append((path, len(library["scenes"])))
+            _LOGGER.info("Exported %d scene(s) of %s to %s",
+                         len(library["scenes"]), entry.data[CONF_HOST], path)
+
+        if written:
+            message = "Scene libraries written:\n" + "\n".join(
+                f"- `{path}` ({count} scenes)" for path, count in written
+            )
+        else:
+            message = f"No amplifier configured with host {host}."
+        await hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {
+                "title": "Scene Export",
+                "message": message,
+                "notification_id": f"{DOMAIN}_scene_export",
+            },
+        )
+
+    async def handle_import_scenes(call):
+        """Handle import_scenes service call."""
+        import os
+
+        from .scene_index import load_library
+
+        host = call.data.get("host")
+        path = call.data["path"]
+        overwrite = call.data.get("overwrite", False)
+        if not os.path.isabs(path):
+            path = hass.config.path(path)
+        if not hass.config.is_allowed_path(path):
+            raise ValueError(f"Access to {path} is not allowed")
+        scenes = await hass.async_add_executor_job(load_library, path)
+
+        imported = []
+        for entry_id, data in list(hass.data[DOMAIN].items()):
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if host and entry.data[CONF_HOST] != host:
+                continue
+            scene_manager: SceneManager = data[SCENE_MANAGER]
+            created, updated = await scene_manager.async_import_scenes(scenes, overwrite)
+            imported.append((entry, created, updated))
+
+        if not imported:
+            raise ValueError(f"No amplifier configured with host {host}")
+
+        for entry, _, _ in imported:
+            # Reload integration to refresh button entities
+            await hass.config_entries.async_reload(entry.entry_id)
+
+        await hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {
+                "title": "Scene Import",
+                "message": "\n".join(
+                    f"**{entry.title}**: {created} scenes created, {updated} updated."
+                    for entry, created, updated in imported
+                ),
+                "notification_id": f"{DOMAIN}_scene_import",
+            },
+        )
+
     async def handle_capture_eq(call):
         """Handle capture_eq service call (debugging helper)."""
         _LOGGER.warning("Service call: capture_eq - Reading EQ from amplifier...")
@@ -421,20 +572,20 @@ async def async_register_services(hass: HomeAssistant) -> None:
             output_lines.append("\n2. SOURCE EQ (0x0000f100-0x0000f1c0):")
             output_lines.append("   Status: Source EQ per output channel - 2 bands each")
 
-            import struct
+            from .register_schema import unpack_biquad
             for ch in range(1, 5):
                 output_lines.append(f"\n   Output Channel {ch}:")
                 for band in range(1, 3):  # Only 2 bands per channel
                     offset = ((ch - 1) * 2 + (band - 1)) * 24
                     if offset + 24 <= len(eq_data['source_eq']):
                         biquad_data = eq_data['source_eq'][offset:offset + 24]
-                        enabled, filt_type, q, slope, frequency, gain = struct.unpack('<IIffIf', biquad_data)
+                        biquad = unpack_biquad(biquad_data)
                         type_name = {0: "Peaking", 11: "Low Shelving", 12: "High Shelving",
                                     13: "Low Pass", 14: "High Pass", 15: "Band Pass",
-                                    16: "Band Stop", 17: "All Pass"}.get(filt_type, f"Type {filt_type}")
+                                    16: "Band Stop", 17: "All Pass"}.get(biquad["type"], f"Type {biquad['type']}")
                         output_lines.append(
-                            f"     Band {band}: enabled={enabled}, type={type_name}, "
-                            f"freq={frequency}Hz, gain={gain:.2f}, q={q:.2f}"
+                            f"     Band {band}: enabled={biquad['enabled']}, type={type_name}, "
+                            f"freq={biquad['frequency']}Hz, gain={biquad['gain']:.2f}, q={biquad['q']:.2f}"
                         )
 
             # Zone EQ - output channels 1-4, 4 bands each (384 bytes, offset at 192)
@@ -448,13 +599,13 @@ async def async_register_services(hass: HomeAssistant) -> None:
                     offset = zone_eq_offset + ((ch - 1) * 4 + (band - 1)) * 24
                     if offset + 24 <= len(eq_data['source_eq']):
                         biquad_data = eq_data['source_eq'][offset:offset + 24]
-                        enabled, filt_type, q, slope, frequency, gain = struct.unpack('<IIffIf', biquad_data)
+                        biquad = unpack_biquad(biquad_data)
                         type_name = {0: "Peaking", 11: "Low Shelving", 12: "High Shelving",
                                     13: "Low Pass", 14: "High Pass", 15: "Band Pass",
-                                    16: "Band Stop", 17: "All Pass"}.get(filt_type, f"Type {filt_type}")
+                                    16: "Band Stop", 17: "All Pass"}.get(biquad["type"], f"Type {biquad['type']}")
                         output_lines.append(
-                            f"     Band {band}: enabled={enabled}, type={type_name}, "
-                            f"freq={frequency}Hz, gain={gain:.2f}, q={q:.2f}"
+                            f"     Band {band}: enabled={biquad['enabled']}, type={type_name}, "
+                            f"freq={biquad['frequency']}Hz, gain={biquad['gain']:.2f}, q={biquad['q']:.2f}"
                         )
 
             # Source Config area
@@ -774,11 +925,8 @@ async def async_register_services(hass: HomeAssistant) -> None:
         )
 
         try:
-            from .pbus_protocol import ReadCommand
-            from .mezzo_memory_map import ADDR_STANDBY_STATE
-
-            # Simple read command to test connectivity
-            test_cmd = ReadCommand(ADDR_STANDBY_STATE, 4)
+            from .mezzo_client import DISCOVERY_COMMANDS, expand_sweep_targets
+            from .udp_manager import UDPSweeper
 
             # Build formatted output
             output_lines = ["Port Scan Results:"]
@@ -789,34 +937,23 @@ async def async_register_services(hass: HomeAssistant) -> None:
             output_lines.append("")
 
             responsive_ports = []
+            replies = 0
+
+            # Probe all ports in parallel from one socket instead of one client per port
+            sweeper = UDPSweeper(timeout=timeout, attempts=1)
+            targets = expand_sweep_targets([host], range(start_port, end_port + 1))
+            async for reply_host, port, responses in sweeper.iter_sweep(DISCOVERY_COMMANDS, targets):
+                replies += 1
+                if responses and not responses[0].is_nak():
+                    output_lines.append(f"{reply_host} port {port}: ✓ RESPONSE (got valid data)")
+                    responsive_ports.append(port)
+                    _LOGGER.info("%s port %d responded with valid data!", reply_host, port)
+                else:
+                    output_lines.append(f"{reply_host} port {port}: ⚠ NAK (device responded but rejected command)")
+                    _LOGGER.debug("%s port %d sent NAK", reply_host, port)
 
-            for port in range(start_port, end_port + 1):
-                _LOGGER.debug("Testing port %d...", port)
-
-                # Create temporary client for this port
-                temp_client = MezzoClient(host, port, timeout)
-
-                try:
-                    await temp_client.connect()
-                    responses = await temp_client._udp.send_request([test_cmd], timeout=timeout)
-
-                    # Check if we got a valid response
-                    if responses and not responses[0].is_nak():
-                        output_lines.append(f"Port {port}: ✓ RESPONSE (got valid data)")
-                        responsive_ports.append(port)
-                        _LOGGER.info("Port %d responded with valid data!", port)
-                    else:
-                        output_lines.append(f"Port {port}: ⚠ NAK (device responded but rejected command)")
-                        _LOGGER.debug("Port %d sent NAK", port)
-
-                except TimeoutError:
-                    output_lines.append(f"Port {port}: ✗ No response (timeout)")
-                    _LOGGER.debug("Port %d timed out", port)
-                except Exception as e:
-                    output_lines.append(f"Port {port}: ✗ Error - {e}")
-                    _LOGGER.debug("Port %d error: %s", port, e)
-                finally:
-                    await temp_client.disconnect()
+            if not replies:
+                output_lines.append("No port responded within the timeout.")
 
             output_lines.append("")
             output_lines.append("=" * 60)
@@ -1130,6 +1267,280 @@ async def async_register_services(hass: HomeAssistant) -> None:
             if should_cleanup:
                 await client.disconnect()
 
+    async def handle_export_packet_trace(call):
+        """Handle export_packet_trace service call."""
+        host = call.data.get("host")
+        written = []
+
+        for entry_id, data in hass.data[DOMAIN].items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if host and entry.data[CONF_HOST] != host:
+                continue
+            pcap = data[CLIENT].export_pcap()
+            if pcap is None:
+                continue
+            path = hass.config.path(
+                f"{DOMAIN}_{entry.data[CONF_HOST]}_{time.strftime('%Y%m%d-%H%M%S')}.pcap"
+            )
+
+            def write(path=path, pcap=pcap):
+                with open(path, "wb") as file:
+                    file.write(pcap)
+
+            await hass.async_add_executor_job(write)
+            written.append(path)
+            _LOGGER.info("Wrote packet trace for %s to %s", entry.data[CONF_HOST], path)
+
+        if written:
+            message = "Packet traces written:\n" + "\n".join(f"- `{path}`" for path in written)
+        else:
+            message = "No packet trace to export. Enable Packet Trace in the amplifier options first."
+        await hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {
+                "title": "Amplifier Packet Trace",
+                "message": message,
+                "notification_id": f"{DOMAIN}_packet_trace",
+            },
+        )
+
+    async def handle_profile_poll(call):
+        """Handle profile_poll service call."""
+        import io
+        import pstats
+
+        host = call.data.get("host")
+        reports = []
+
+        # One amplifier at a time: the profiler sees the whole event loop
+        for entry_id, data in hass.data[DOMAIN].items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if host and entry.data[CONF_HOST] != host:
+                continue
+            coordinator: MezzoDataUpdateCoordinator = data[COORDINATOR]
+            profiler = await coordinator.async_profile_refresh()
+            path = hass.config.path(
+                f"{DOMAIN}_{entry.data[CONF_HOST]}_{time.strftime('%Y%m%d-%H%M%S')}.prof"
+            )
+            await hass.async_add_executor_job(profiler.dump_stats, path)
+
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(call.data["top"])
+            _LOGGER.warning("Poll profile for %s (%s):\n%s", entry.data[CONF_HOST], path, output.getvalue())
+            reports.append(f"**{entry.title}**: `{path}`")
+
+        await hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {
+                "title": "Amplifier Poll Profile",
+                "message": "\n".join(reports) + "\n\nTop functions are in the log." if reports
+                else "No matching amplifier.",
+                "notification_id": f"{DOMAIN}_profile",
+            },
+        )
+
+    async def handle_backup_configuration(call):
+        """Handle backup_configuration service call."""
+        from .snapshot import SNAPSHOT_EXTENSION, SnapshotEngine
+
+        host = call.data.get("host")
+        written = []
+
+        for entry_id, data in hass.data[DOMAIN].items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if host and entry.data[CONF_HOST] != host:
+                continue
+            if entry.data.get(CONF_PROTOCOL, PROTOCOL_MEZZO) != PROTOCOL_MEZZO:
+                continue
+            snapshot = await SnapshotEngine(data[CLIENT]).capture()
+            path = hass.config.path(
+                f"{DOMAIN}_{entry.data[CONF_HOST]}_{time.strftime('%Y%m%d-%H%M%S')}{SNAPSHOT_EXTENSION}"
+            )
+            await hass.async_add_executor_job(snapshot.save, path)
+            written.append(path)
+            _LOGGER.info("Wrote configuration snapshot for %s to %s", entry.data[CONF_HOST], path)
+
+        if written:
+            message = "Configuration snapshots written:\n" + "\n".join(f"- `{path}`" for path in written)
+        else:
+            message = "No matching Mezzo amplifier to back up."
+        await hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {
+                "title": "Amplifier Configuration Backup",
+                "message": message,
+                "notification_id": f"{DOMAIN}_backup",
+            },
+        )
+
+    async def handle_restore_configuration(call):
+        """Handle restore_configuration service call."""
+        import os
+
+        from .snapshot import ConfigSnapshot, SnapshotEngine
+
+        host = call.data["host"]
+        path = call.data["path"]
+        if not os.path.isabs(path):
+            path = hass.config.path(path)
+        if not hass.config.is_allowed_path(path):
+            raise ValueError(f"Access to {path} is not allowed")
+
+        for entry_id, data in hass.data[DOMAIN].items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if entry.data[CONF_HOST] != host:
+                continue
+            if entry.data.get(CONF_PROTOCOL, PROTOCOL_MEZZO) != PROTOCOL_MEZZO:
+                raise ValueError(f"Amplifier {host} does not support configuration snapshots")
+            snapshot = await hass.async_add_executor_job(ConfigSnapshot.load, path)
+            client: MezzoClient = data[CLIENT]
+            result = await SnapshotEngine(client).restore(snapshot)
+            if client.area_cache is not None:
+                client.area_cache.invalidate()
+            await data[COORDINATOR].async_request_refresh()
+
+            await hass.services.async_call(
+                "persistent_notification",
+                "create",
+                {
+                    "title": "Amplifier Configuration Restore",
+                    "message": (
+                        f"**{entry.title}**: {len(result.written)} of {result.checked} areas "
+                        f"differed and were written ({', '.join(result.written) or 'none'})."
+                    ),
+                    "notification_id": f"{DOMAIN}_restore",
+                },
+            )
+            return
+
+        raise ValueError(f"No amplifier configured with host {host}")
+
+    async def handle_load_eq_preset(call):
+        """Handle load_eq_preset service call."""
+        from .mezzo_memory_map import NUM_CHANNELS, NUM_EQ_BANDS
+
+        host = call.data.get("host")
+        channel = call.data.get("channel")
+        bands = call.data.get("bands")
+        banks = call.data.get("banks")
+        if (bands is None) == (banks is None):
+            raise ValueError("Give either bands (one channel's bank) or banks (all channels)")
+        if banks is not None and channel is not None:
+            raise ValueError("banks sets every channel; use bands with channel")
+        if bands is not None and len(bands) != NUM_EQ_BANDS:
+            raise ValueError(f"bands must have {NUM_EQ_BANDS} entries")
+        if banks is not None and (
+            len(banks) != NUM_CHANNELS or any(len(bank) != NUM_EQ_BANDS for bank in banks)
+        ):
+            raise ValueError(f"banks must have {NUM_CHANNELS} lists of {NUM_EQ_BANDS} bands")
+
+        loaded = 0
+        for entry_id, data in hass.data[DOMAIN].items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if host and entry.data[CONF_HOST] != host:
+                continue
+            if entry.data.get(CONF_PROTOCOL, PROTOCOL_MEZZO) != PROTOCOL_MEZZO:
+                continue
+            coordinator: MezzoDataUpdateCoordinator = data[COORDINATOR]
+            if channel is not None:
+                await coordinator.async_write_eq_bank(channel, bands)
+            else:
+                await coordinator.async_write_all_eq(banks or [bands] * NUM_CHANNELS)
+            loaded += 1
+
+        if not loaded:
+            raise ValueError(f"No Mezzo amplifier configured with host {host}" if host
+                             else "No Mezzo amplifier configured")
+
+    async def handle_ramp(call):
+        """Handle ramp_volume and ramp_eq_gain service calls."""
+        from .mezzo_memory_map import NUM_CHANNELS
+
+        host = call.data.get("host")
+        channel = call.data.get("channel")
+        channels = [channel] if channel is not None else list(range(1, NUM_CHANNELS + 1))
+        duration = call.data["duration"]
+
+        ramps = []
+        for entry_id, data in hass.data[DOMAIN].items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if host and entry.data[CONF_HOST] != host:
+                continue
+            if entry.data.get(CONF_PROTOCOL, PROTOCOL_MEZZO) != PROTOCOL_MEZZO:
+                continue
+            client: MezzoClient = data[CLIENT]
+            for ch in channels:
+                if call.service == "ramp_volume":
+                    ramps.append((data, client.ramp_volume(ch, call.data["volume"], duration)))
+                else:
+                    ramps.append((data, client.ramp_eq_gain(ch, call.data["band"], call.data["gain"], duration)))
+
+        if not ramps:
+            raise ValueError(f"No Mezzo amplifier configured with host {host}" if host
+                             else "No Mezzo amplifier configured")
+
+        # One tick task per amplifier drives all of its ramps
+        await asyncio.gather(*(ramp for _, ramp in ramps))
+        for data in {id(data): data for data, _ in ramps}.values():
+            await data[COORDINATOR].async_request_refresh()
+
+    async def handle_apply_scene_group(call):
+        """Handle apply_scene_group service call."""
+        from .scene_group import apply_scene_group
+
+        name = call.data["scene"]
+        hosts = call.data.get("hosts")
+        delay = call.data.get("delay", 0.0)
+
+        targets = []
+        members = []
+        for entry_id, data in hass.data[DOMAIN].items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if hosts and entry.data[CONF_HOST] not in hosts:
+                continue
+            if entry.data.get(CONF_PROTOCOL, PROTOCOL_MEZZO) != PROTOCOL_MEZZO:
+                continue
+            scene_manager: SceneManager = data[SCENE_MANAGER]
+            scene = scene_manager.get_scene_by_name(name)
+            if scene is None:
+                raise ValueError(f"Scene '{name}' not found on {entry.title}")
+            client: MezzoClient = data[CLIENT]
+            frame = await scene_manager.async_get_frame(client, scene)
+            if frame is None:
+                raise ValueError(f"Scene '{name}' cannot be precompiled for {entry.title}")
+            targets.append((client, frame))
+            members.append((data, scene["id"]))
+
+        if not targets:
+            raise ValueError("No Mezzo amplifier configured" if not hosts
+                             else f"No Mezzo amplifier configured with host {', '.join(hosts)}")
+
+        # Frames are ready; the delay only schedules the send instant
+        at = asyncio.get_running_loop().time() + delay if delay else None
+        report = await apply_scene_group(targets, at=at)
+
+        for data, scene_id in members:
+            data[ACTIVE_SCENE_ID] = scene_id
+            await data[COORDINATOR].async_request_refresh()
+
+        failures = "".join(f"\n- {host}: {error}" for host, error in report.failures.items())
+        await hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {
+                "title": "Scene Group Apply",
+                "message": (
+                    f"Scene '{name}' acknowledged by {report.acked} of {report.amplifiers} "
+                    f"amplifiers. Send skew {report.send_skew_ms:.2f} ms, "
+                    f"ACK spread {report.ack_spread_ms:.2f} ms.{failures}"
+                ),
+                "notification_id": f"{DOMAIN}_scene_group",
+            },
+        )
+
     # Register services
     hass.services.async_register(
         DOMAIN,
@@ -1137,6 +1548,7 @@ async def async_register_services(hass: HomeAssistant) -> None:
         handle_save_scene,
         schema=vol.Schema({
             vol.Required("name"): cv.string,
+            vol.Optional("preset"): vol.All(vol.Coerce(int), vol.Range(min=0, max=200)),
         }),
     )
 
@@ -1242,6 +1654,121 @@ async def async_register_services(hass: HomeAssistant) -> None:
         }),
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        "export_packet_trace",
+        handle_export_packet_trace,
+        schema=vol.Schema({
+            vol.Optional("host"): cv.string,
+        }),
+    )
+
+    eq_band_schema = vol.Schema({
+        vol.Optional("enabled", default=1): vol.All(vol.Coerce(int), vol.In([0, 1])),
+        vol.Optional("type", default=0): vol.All(vol.Coerce(int), vol.In([0, *range(11, 18)])),
+        vol.Optional("q", default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=20.0)),
+        vol.Optional("slope", default=1.0): vol.Coerce(float),
+        vol.Optional("frequency", default=1000): vol.All(vol.Coerce(int), vol.Range(min=10, max=24000)),
+        vol.Optional("gain", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=-15.0, max=15.0)),
+    })
+
+    hass.services.async_register(
+        DOMAIN,
+        "load_eq_preset",
+        handle_load_eq_preset,
+        schema=vol.Schema({
+            vol.Optional("host"): cv.string,
+            vol.Optional("channel"): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+            vol.Optional("bands"): [eq_band_schema],
+            vol.Optional("banks"): [[eq_band_schema]],
+        }),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "ramp_volume",
+        handle_ramp,
+        schema=vol.Schema({
+            vol.Optional("host"): cv.string,
+            vol.Optional("channel"): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+            vol.Required("volume"): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
+            vol.Required("duration"): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=600.0)),
+        }),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "ramp_eq_gain",
+        handle_ramp,
+        schema=vol.Schema({
+            vol.Optional("host"): cv.string,
+            vol.Optional("channel"): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+            vol.Required("band"): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+            vol.Required("gain"): vol.All(vol.Coerce(float), vol.Range(min=-15.0, max=15.0)),
+            vol.Required("duration"): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=600.0)),
+        }),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "apply_scene_group",
+        handle_apply_scene_group,
+        schema=vol.Schema({
+            vol.Required("scene"): cv.string,
+            vol.Optional("hosts"): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional("delay", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=10.0)),
+        }),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "export_scenes",
+        handle_export_scenes,
+        schema=vol.Schema({
+            vol.Optional("host"): cv.string,
+        }),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "import_scenes",
+        handle_import_scenes,
+        schema=vol.Schema({
+            vol.Optional("host"): cv.string,
+            vol.Required("path"): cv.string,
+            vol.Optional("overwrite", default=False): cv.boolean,
+        }),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "backup_configuration",
+        handle_backup_configuration,
+        schema=vol.Schema({
+            vol.Optional("host"): cv.string,
+        }),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "restore_configuration",
+        handle_restore_configuration,
+        schema=vol.Schema({
+            vol.Required("host"): cv.string,
+            vol.Required("path"): cv.string,
+        }),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile_poll",
+        handle_profile_poll,
+        schema=vol.Schema({
+            vol.Optional("host"): cv.string,
+            vol.Optional("top", default=30): vol.All(vol.Coerce(int), vol.Range(min=5, max=200)),
+        }),
+    )
+
     hass.services.async_register(
         DOMAIN,
         "test_quattro_direct",
@@ -1259,7 +1786,7 @@ class MezzoDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(
         self,
         hass: HomeAssistant,
-        client: MezzoClient,
+        client: MezzoClient | QuattroClient,
         update_interval: timedelta,
     ):
         """Initialize the coordinator."""
@@ -1273,6 +1800,7 @@ class MezzoDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         """Fetch data from amplifier."""
+        start = time.monotonic()
         try:
             # Get complete state in single batch request
             state = await self.client.get_all_state()
@@ -1285,3 +1813,178 @@ class MezzoDataUpdateCoordinator(DataUpdateCoordinator):
             raise UpdateFailed(f"Connection error: {err}") from err
         except Exception as err:
             raise UpdateFailed(f"Unexpected error updating data: {err}") from err
+        finally:
+            self.client.metrics.poll.record(time.monotonic() - start)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners, timing the entity update fan-out."""
+        start = time.perf_counter_ns()
+        super().async_update_listeners()
+        self.client.metrics.phases[PHASE_FANOUT].record_ns(time.perf_counter_ns() - start)
+
+    async def async_profile_refresh(self):
+        """
+        Run one poll cycle under cProfile.
+
+        The profiler sees everything the event loop runs meanwhile, so
+        other integrations' work can show up in the output.
+
+        Returns:
+            cProfile.Profile holding the stats of the cycle
+        """
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.async_refresh()
+        finally:
+            profiler.disable()
+        return profiler
+
+    async def async_write_optimistic(
+        self,
+        path: tuple,
+        value: Any,
+        write: Callable[[], Awaitable[None]],
+    ) -> None:
+        """
+        Apply a value to the cached state immediately, then write it.
+
+        Client setters read the written registers back in the same
+        multicommand, so a successful write confirms the new value without
+        a full refresh. If the write fails (NAK, read-back mismatch or
+        timeout) the previous value is restored, unless a poll replaced the
+        cached state meanwhile, and a refresh is requested to resynchronise
+        with the device.
+
+        Args:
+            path: Keys into the coordinator data, e.g. ("volumes", 1)
+            value: New value to store at path
+            write: Coroutine function performing the amplifier write
+        """
+        if not self.data:
+            await write()
+            await self.async_request_refresh()
+            return
+
+        *parents, key = path
+        container = self.data
+        for part in parents:
+            container = container.setdefault(part, {})
+
+        had_value = key in container
+        previous = container.get(key)
+        container[key] = value
+        self.async_update_listeners()
+
+        try:
+            await write()
+        except Exception:
+            # A poll during the write may have replaced self.data; look the
+            # path up again and only roll back our own value, as fresh
+            # polled state is newer than the previous value
+            current = self.data
+            for part in parents:
+                current = current.get(part) if isinstance(current, dict) else None
+            if current is container and container.get(key) is value:
+                if had_value:
+                    container[key] = previous
+                else:
+                    container.pop(key, None)
+                self.async_update_listeners()
+            await self.async_request_refresh()
+            raise
+
+    async def async_write_eq_band(self, channel: int, band: int, **changes: Any) -> None:
+        """
+        Change fields of a User EQ band using the cached band as the base.
+
+        Args:
+            channel: Channel number (1-4)
+            band: Band number (1-4)
+            **changes: Band fields to change (enabled, type, q, slope, frequency, gain)
+        """
+        current = (self.data or {}).get("eq", {}).get(channel, {}).get(band)
+        if current is None:
+            current = await self.client.get_eq_band(channel, band)
+        new_band = {**current, **changes}
+
+        await self.async_write_optimistic(
+            ("eq", channel, band),
+            new_band,
+            lambda: self.client.set_eq_band(
+                channel,
+                band,
+                enabled=new_band["enabled"],
+                filt_type=new_band["type"],
+                q=new_band["q"],
+                slope=new_band["slope"],
+                frequency=new_band["frequency"],
+                gain=new_band["gain"],
+            ),
+        )
+
+    async def async_write_eq_bank(self, channel: int, bands: list) -> None:
+        """
+        Replace every User EQ band of a channel in one write.
+
+        Args:
+            channel: Channel number (1-4)
+            bands: One BiQuad dict per band; missing keys take flat values
+        """
+        from .register_schema import FLAT_BIQUAD
+
+        bank = {band: {**FLAT_BIQUAD, **values} for band, values in enumerate(bands, start=1)}
+        await self.async_write_optimistic(
+            ("eq", channel),
+            bank,
+            lambda: self.client.set_eq_bank(channel, list(bank.values())),
+        )
+
+    async def async_write_all_eq(self, banks: list) -> None:
+        """
+        Replace the User EQ of every channel in one write.
+
+        Args:
+            banks: One list of BiQuad dicts per channel
+        """
+        from .register_schema import FLAT_BIQUAD
+
+        eq = {
+            channel: {band: {**FLAT_BIQUAD, **values} for band, values in enumerate(bands, start=1)}
+            for channel, bands in enumerate(banks, start=1)
+        }
+        await self.async_write_optimistic(
+            ("eq",),
+            eq,
+            lambda: self.client.set_all_eq([list(bank.values()) for bank in eq.values()]),
+        )
+
+    async def async_write_source_eq_band(self, band: int, **changes: Any) -> None:
+        """
+        Change fields of a Source EQ band using the cached band as the base.
+
+        Args:
+            band: Band number (1-2)
+            **changes: Band fields to change (enabled, type, q, slope, frequency, gain)
+        """
+        current = (self.data or {}).get("source_eq", {}).get(band)
+        if current is None:
+            current = await self.client.get_source_eq_band(band)
+        new_band = {**current, **changes}
+
+        await self.async_write_optimistic(
+            ("source_eq", band),
+            new_band,
+            lambda: self.client.set_source_eq_band(
+                band,
+                enabled=new_band["enabled"],
+                filt_type=new_band["type"],
+                q=new_band["q"],
+                slope=new_band["slope"],
+                frequency=new_band["frequency"],
+                gain=new_band["gain"],
+            ),
+        )
@@ -0,0 +1,179 @@
+"""
+CRC-Gated Area Cache for Powersoft Mezzo Amplifiers.
+
+Configuration areas such as the User EQ only change when someone edits
+them, from Home Assistant or from another controller. Instead of reading
+them on every poll, the client asks for the device-side CRC16 of each
+cached area (the PBus C opcode, 2 bytes per area on the wire), compares
+it with the CRC of the local image, and reads an area again only when
+the two differ. Registers of an area whose CRC or re-read the device
+refuses are read directly, as without the cache.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from .mezzo_memory_map import (
+    ADDR_MATRIX_END,
+    ADDR_MATRIX_START,
+    ADDR_SOURCE_EQ_END,
+    ADDR_SOURCE_EQ_START,
+    ADDR_USER_EQ_END,
+    ADDR_USER_EQ_START,
+    ADDR_USER_SETTINGS_END,
+    ADDR_USER_SETTINGS_START,
+    ADDR_ZONE_SETTINGS_END,
+    ADDR_ZONE_SETTINGS_START,
+)
+from .pbus_protocol import CrcCommand, PBusResponse, ReadCommand, calculate_crc16
+
+_LOGGER = logging.getLogger(__name__)
+
+# (name, start, end) of the areas polled by CRC; the zone settings and
+# the Source EQ are separate because the gap between them is unallocated
+CACHED_AREAS = (
+    ("user_settings", ADDR_USER_SETTINGS_START, ADDR_USER_SETTINGS_END),
+    ("user_eq", ADDR_USER_EQ_START, ADDR_USER_EQ_END),
+    ("zone_settings", ADDR_ZONE_SETTINGS_START, ADDR_ZONE_SETTINGS_END),
+    ("source_eq", ADDR_SOURCE_EQ_START, ADDR_SOURCE_EQ_END),
+    ("matrix", ADDR_MATRIX_START, ADDR_MATRIX_END),
+)
+
+# Keep area re-reads to about one Ethernet frame of data per request
+MAX_READ_PER_REQUEST = 1024
+
+
+class CachedArea:
+    """Local image of one configuration area and its CRC16."""
+
+    __slots__ = ('name', 'start', 'end', 'image', 'crc')
+
+    def __init__(self, name: str, start: int, end: int):
+        """Initialize an area with no image yet."""
+        self.name = name
+        self.start = start
+        self.end = end
+        self.image: Optional[bytes] = None
+        self.crc: Optional[int] = None
+
+    @property
+    def size(self) -> int:
+        """Area size in bytes."""
+        return self.end - self.start
+
+    def covers(self, address: int, size: int) -> bool:
+        """Check if [address, address + size) lies inside the area."""
+        return self.start <= address and address + size <= self.end
+
+    def store(self, image: Optional[bytes]) -> None:
+        """Replace the image (None if the read failed) and its CRC."""
+        self.image = image
+        self.crc = calculate_crc16(image) if image is not None else None
+
+
+class AreaCache:
+    """Set of CRC-gated areas for one amplifier."""
+
+    def __init__(self, areas=CACHED_AREAS):
+        """
+        Initialize the cache.
+
+        Args:
+            areas: Iterable of (name, start, end) tuples
+        """
+        self.areas: List[CachedArea] = [CachedArea(*area) for area in areas]
+        self.crc_checks = 0
+        self.reads = 0
+        self.bytes_read = 0
+
+    def area_for(self, address: int, size: int) -> Optional[CachedArea]:
+        """Return the cached area holding a range, if any."""
+        for area in self.areas:
+            if area.covers(address, size):
+                return area
+        return None
+
+    def crc_commands(self) -> List[CrcCommand]:
+        """CRC commands for every area, in area order."""
+        return [CrcCommand(area.start, area.size) for area in self.areas]
+
+    def stale(self, responses: List[PBusResponse]) -> List[CachedArea]:
+        """
+        Compare device CRCs with the local images.
+
+        Args:
+            responses: Replies to crc_commands(), in the same order
+
+        Areas whose CRC the device refused are not read whole (that read
+        would most likely be refused too); their image is dropped so
+        lookups miss and the caller reads the registers directly.
+
+        Returns:
+            Areas that must be read: no image yet or a different CRC
+        """
+        self.crc_checks += len(responses)
+        stale = []
+        for area, response in zip(self.areas, responses):
+            if response.crc is None:
+                _LOGGER.debug("CRC of area %s was refused", area.name)
+                area.store(None)
+            elif area.image is None or response.crc != area.crc:
+                stale.append(area)
+        return stale
+
+    def read_batches(self, areas: List[CachedArea]) -> List[List[ReadCommand]]:
+        """Group whole-area reads into requests of bounded size."""
+        batches: List[List[ReadCommand]] = []
+        batch: List[ReadCommand] = []
+        total = 0
+        for area in areas:
+            if batch and total + area.size > MAX_READ_PER_REQUEST:
+                batches.append(batch)
+                batch, total = [], 0
+            batch.append(ReadCommand(area.start, area.size))
+            total += area.size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def store(self, responses: List[PBusResponse]) -> None:
+        """Store the replies to read_batches() commands."""
+        for response in responses:
+            area = self.area_for(response.address, response.size or 1)
+            if area is None:
+                continue
+            if response.is_nak():
+                _LOGGER.debug("Read of area %s was NAKed", area.name)
+                area.store(None)
+                continue
+            area.store(response.data)
+            self.reads += 1
+            self.bytes_read += len(response.data)
+
+    def lookup(self, address: int, size: int) -> Optional[bytes]:
+        """Return cached bytes for a range, or None if not cached."""
+        area = self.area_for(address, size)
+        if area is None or area.image is None:
+            return None
+        offset = address - area.start
+        return area.image[offset:offset + size]
+
+    def invalidate(self) -> None:
+        """Drop every image so the next poll reads all areas."""
+        for area in self.areas:
+            area.store(None)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable snapshot for diagnostics."""
+        return {
+            'crc_checks': self.crc_checks,
+            'reads': self.reads,
+            'bytes_read': self.bytes_read,
+            'areas': {
+                area.name: {
+                    'start': f"0x{area.start:08x}",
+                    'size': area.size,
+                    'crc': f"0x{area.crc:04x}" if area.crc is not None else None,
+                }
+                for area in self.areas
+            },
+        }
@@ -54,6 +54,7 @@ async def async_setup_entry(
             MezzoSceneButton(
                 coordinator,
                 client,
+                scene_manager,
                 entry,
                 scene,
             )
@@ -103,12 +104,14 @@ class MezzoSceneButton(CoordinatorEntity, ButtonEntity):
         self,
         coordinator,
         client: MezzoClient,
+        scene_manager: SceneManager,
         entry: ConfigEntry,
         scene_config: dict,
     ):
         """Initialize the scene button."""
         super().__init__(coordinator)
         self._client = client
+        self._scene_manager = scene_manager
         self._scene_config = scene_config
         self._entry = entry
         self._attr_device_info = {
@@ -152,7 +155,7 @@ class MezzoSceneButton(CoordinatorEntity, ButtonEntity):
         """Handle the button press - apply the scene."""
         try:
             _LOGGER.info("Applying scene: %s", self._scene_config["name"])
-            await self._client.apply_scene(self._scene_config)
+            await self._scene_manager.async_apply_scene(self._client, self._scene_config)
 
             # Update active scene tracking
             self.hass.data[DOMAIN][self._entry.entry_id][ACTIVE_SCENE_ID] = self._scene_config["id"]
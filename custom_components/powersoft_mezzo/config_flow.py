@@ -12,18 +12,47 @@ from homeassistant.helpers import config_validation as cv
 from .const import (
     DOMAIN,
     CONF_PORT,
+    CONF_NETWORKS,
+    CONF_PORTS,
     CONF_TIMEOUT,
     CONF_SCAN_INTERVAL,
+    CONF_PROTOCOL,
+    CONF_METER_RATE,
+    CONF_EXPORT_METRICS,
+    CONF_PACKET_TRACE,
+    CONF_CHANGE_DETECTION,
+    CONF_SCENE_DIFF,
+    CONF_SCENE_TRANSITION,
+    PROTOCOL_MEZZO,
+    PROTOCOL_QUATTRO,
     DEFAULT_PORT,
+    DEFAULT_QUATTRO_PORT,
     DEFAULT_TIMEOUT,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_NAME,
+    DEFAULT_SWEEP_RATE,
+    DEFAULT_SWEEP_TIMEOUT,
+    DEFAULT_METER_RATE,
 )
-from .mezzo_client import discover_amplifiers, MezzoClient
+from .mezzo_client import discover_amplifiers, sweep_amplifiers, MezzoClient
+from .quattro_client import QuattroClient
+from .packet_trace import MAX_TRACE_FRAMES
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _create_client(protocol: str, host: str, port: int):
+    """Create the client matching an amplifier's protocol."""
+    if protocol == PROTOCOL_QUATTRO:
+        return QuattroClient(host, port, DEFAULT_TIMEOUT)
+    return MezzoClient(host, port, DEFAULT_TIMEOUT)
+
+
+def _title_prefix(protocol: str) -> str:
+    """Return the default entry title prefix for a protocol."""
+    return "QUATTROCANALI" if protocol == PROTOCOL_QUATTRO else "Mezzo"
+
+
 class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Powersoft Mezzo."""
 
@@ -32,6 +61,7 @@ class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Initialize the config flow."""
         self.discovered_devices = {}
+        self.swept_devices = {}
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -39,7 +69,7 @@ class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle the initial step - choose between discovery and manual."""
         return self.async_show_menu(
             step_id="user",
-            menu_options=["discovery", "manual"],
+            menu_options=["discovery", "sweep", "manual"],
         )
 
     async def async_step_discovery(
@@ -49,6 +79,9 @@ class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             # User selected a discovered device
             host = user_input[CONF_HOST]
+            info = self.discovered_devices.get(host, {})
+            protocol = info.get('protocol', PROTOCOL_MEZZO)
+            port = info.get('port', DEFAULT_PORT)
 
             # Check if already configured
             await self.async_set_unique_id(host)
@@ -56,7 +89,7 @@ class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             # Verify we can connect
             try:
-                client = MezzoClient(host, DEFAULT_PORT, DEFAULT_TIMEOUT)
+                client = _create_client(protocol, host, port)
                 await client.connect()
                 await client.disconnect()
             except Exception as err:
@@ -64,16 +97,18 @@ class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_abort(reason="cannot_connect")
 
             return self.async_create_entry(
-                title=user_input.get(CONF_NAME, f"Mezzo {host}"),
+                title=user_input.get(CONF_NAME, f"{_title_prefix(protocol)} {host}"),
                 data={
                     CONF_HOST: host,
-                    CONF_PORT: DEFAULT_PORT,
+                    CONF_PORT: port,
+                    CONF_PROTOCOL: protocol,
                 },
             )
 
         # Discover devices
         _LOGGER.info("Starting device discovery...")
-        self.discovered_devices = await discover_amplifiers(timeout=5.0)
+        # Returns early once replies go quiet, instead of always waiting the full timeout
+        self.discovered_devices = await discover_amplifiers(timeout=5.0, idle_timeout=1.0)
 
         if not self.discovered_devices:
             _LOGGER.warning("No devices discovered")
@@ -110,6 +145,93 @@ class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
+    async def async_step_sweep(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle unicast sweep of routed networks (e.g. other VLANs)."""
+        errors = {}
+
+        if user_input is not None:
+            networks = [n.strip() for n in user_input[CONF_NETWORKS].split(",") if n.strip()]
+            try:
+                ports = [int(p) for p in str(user_input.get(CONF_PORTS, DEFAULT_PORT)).split(",") if p.strip()]
+                if not networks or not ports or not all(1 <= p <= 65535 for p in ports):
+                    raise ValueError("No networks or invalid ports")
+
+                _LOGGER.info("Sweeping %s on port(s) %s...", networks, ports)
+                self.swept_devices = await sweep_amplifiers(
+                    networks,
+                    ports,
+                    rate=DEFAULT_SWEEP_RATE,
+                    timeout=DEFAULT_SWEEP_TIMEOUT,
+                )
+            except ValueError as err:
+                _LOGGER.error("Invalid sweep range %s: %s", user_input[CONF_NETWORKS], err)
+                errors["base"] = "invalid_network"
+            else:
+                if self.swept_devices:
+                    return await self.async_step_sweep_select()
+                errors["base"] = "no_devices_found"
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_NETWORKS): cv.string,
+                vol.Optional(CONF_PORTS, default=str(DEFAULT_PORT)): cv.string,
+            }
+        )
+
+        return self.async_show_form(
+            step_id="sweep",
+            data_schema=schema,
+            errors=errors,
+        )
+
+    async def async_step_sweep_select(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle selection of an amplifier found by the sweep."""
+        if user_input is not None:
+            info = self.swept_devices[user_input[CONF_HOST]]
+            host = info['host']
+            port = info['port']
+
+            # Check if already configured
+            await self.async_set_unique_id(host)
+            self._abort_if_unique_id_configured()
+
+            return self.async_create_entry(
+                title=user_input.get(CONF_NAME, f"Mezzo {host}"),
+                data={
+                    CONF_HOST: host,
+                    CONF_PORT: port,
+                },
+            )
+
+        # Display format: "Model - Serial Number (IP Address:Port)"
+        devices = {}
+        for key, info in self.swept_devices.items():
+            model = info.get('model', 'Unknown')
+            serial = info.get('serial', 'Unknown')
+            if serial and serial != 'Unknown':
+                devices[key] = f"{model} - S/N: {serial} (IP: {key})"
+            else:
+                devices[key] = f"{model} (IP: {key})"
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_HOST): vol.In(devices),
+                vol.Optional(CONF_NAME): cv.string,
+            }
+        )
+
+        return self.async_show_form(
+            step_id="sweep_select",
+            data_schema=schema,
+            description_placeholders={
+                "count": str(len(self.swept_devices))
+            },
+        )
+
     async def async_step_manual(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -118,7 +240,11 @@ class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             host = user_input[CONF_HOST]
+            protocol = user_input.get(CONF_PROTOCOL, PROTOCOL_MEZZO)
             port = user_input.get(CONF_PORT, DEFAULT_PORT)
+            if protocol == PROTOCOL_QUATTRO and port == DEFAULT_PORT:
+                # The form defaults to the Mezzo port
+                port = DEFAULT_QUATTRO_PORT
 
             # Check if already configured
             await self.async_set_unique_id(host)
@@ -126,15 +252,16 @@ class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             # Try to connect
             try:
-                client = MezzoClient(host, port, DEFAULT_TIMEOUT)
+                client = _create_client(protocol, host, port)
                 await client.connect()
                 await client.disconnect()
 
                 return self.async_create_entry(
-                    title=user_input.get(CONF_NAME, f"Mezzo {host}"),
+                    title=user_input.get(CONF_NAME, f"{_title_prefix(protocol)} {host}"),
                     data={
                         CONF_HOST: host,
                         CONF_PORT: port,
+                        CONF_PROTOCOL: protocol,
                     },
                 )
             except TimeoutError:
@@ -150,6 +277,9 @@ class MezzoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         schema = vol.Schema(
             {
                 vol.Required(CONF_HOST): cv.string,
+                vol.Optional(CONF_PROTOCOL, default=PROTOCOL_MEZZO): vol.In(
+                    {PROTOCOL_MEZZO: "Mezzo", PROTOCOL_QUATTRO: "QUATTROCANALI"}
+                ),
                 vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
                 vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
             }
@@ -183,21 +313,54 @@ class MezzoOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        schema = vol.Schema(
-            {
-                vol.Optional(
-                    CONF_TIMEOUT,
-                    default=self.config_entry.options.get(
-                        CONF_TIMEOUT, DEFAULT_TIMEOUT
-                    ),
-                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=10.0)),
-                vol.Optional(
-                    CONF_SCAN_INTERVAL,
-                    default=self.config_entry.options.get(
-                        CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-                    ),
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
-            }
-        )
+        fields = {
+            vol.Optional(
+                CONF_TIMEOUT,
+                default=self.config_entry.options.get(
+                    CONF_TIMEOUT, DEFAULT_TIMEOUT
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=10.0)),
+            vol.Optional(
+                CONF_SCAN_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            vol.Optional(
+                CONF_EXPORT_METRICS,
+                default=self.config_entry.options.get(CONF_EXPORT_METRICS, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_PACKET_TRACE,
+                default=self.config_entry.options.get(CONF_PACKET_TRACE, 0),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_TRACE_FRAMES)),
+        }
+
+        # Meter streaming is a QUATTROCANALI feature
+        if self.config_entry.data.get(CONF_PROTOCOL) == PROTOCOL_QUATTRO:
+            fields[vol.Optional(
+                CONF_METER_RATE,
+                default=self.config_entry.options.get(
+                    CONF_METER_RATE, DEFAULT_METER_RATE
+                ),
+            )] = vol.All(vol.Coerce(int), vol.Range(min=0, max=20))
+        else:
+            # Configuration areas are polled by CRC16 (PBus C opcode)
+            fields[vol.Optional(
+                CONF_CHANGE_DETECTION,
+                default=self.config_entry.options.get(CONF_CHANGE_DETECTION, False),
+            )] = cv.boolean
+            # Scenes write only registers that differ from the last poll
+            fields[vol.Optional(
+                CONF_SCENE_DIFF,
+                default=self.config_entry.options.get(CONF_SCENE_DIFF, False),
+            )] = cv.boolean
+            # Scene volumes fade over this many seconds
+            fields[vol.Optional(
+                CONF_SCENE_TRANSITION,
+                default=self.config_entry.options.get(CONF_SCENE_TRANSITION, 0.0),
+            )] = vol.All(vol.Coerce(float), vol.Range(min=0.0, max=10.0))
+
+        schema = vol.Schema(fields)
 
         return self.async_show_form(step_id="init", data_schema=schema)
@@ -11,12 +11,30 @@ CONF_TIMEOUT: Final = "timeout"
 CONF_SCAN_INTERVAL: Final = "scan_interval"
 CONF_CHANNEL_NAMES: Final = "channel_names"
 CONF_SCENES: Final = "scenes"
+CONF_NETWORKS: Final = "networks"
+CONF_PORTS: Final = "ports"
+CONF_PROTOCOL: Final = "protocol"
+CONF_METER_RATE: Final = "meter_rate"
+CONF_EXPORT_METRICS: Final = "export_metrics"
+CONF_PACKET_TRACE: Final = "packet_trace"
+CONF_CHANGE_DETECTION: Final = "change_detection"
+CONF_SCENE_DIFF: Final = "scene_diff"
+CONF_SCENE_TRANSITION: Final = "scene_transition"
+
+# Amplifier protocol families
+PROTOCOL_MEZZO: Final = "mezzo"
+PROTOCOL_QUATTRO: Final = "quattrocanali"
 
 # Default values
 DEFAULT_PORT: Final = 8002
+DEFAULT_QUATTRO_PORT: Final = 1234
 DEFAULT_TIMEOUT: Final = 2.0
 DEFAULT_SCAN_INTERVAL: Final = 5  # seconds
 DEFAULT_NAME: Final = "Mezzo Amplifier"
+DEFAULT_SWEEP_RATE: Final = 2000  # probes per second
+DEFAULT_SWEEP_TIMEOUT: Final = 1.0  # seconds per probe
+DEFAULT_METER_RATE: Final = 10  # QUATTROCANALI meter polls per second (0 = off)
+METER_PUBLISH_INTERVAL: Final = 1.0  # seconds between meter sensor updates
 
 # Default EQ band (flat/bypass configuration)
 DEFAULT_EQ_BAND_FLAT: Final = {
@@ -55,6 +73,10 @@ CLIENT: Final = "client"
 SCENE_MANAGER: Final = "scene_manager"
 ENTRY_ID: Final = "entry_id"
 ACTIVE_SCENE_ID: Final = "active_scene_id"
+METER_STREAMER: Final = "meter_streamer"
+
+# Domain-wide OpenMetrics exporter (hass.data key)
+METRICS_EXPORTER: Final = "powersoft_mezzo_metrics"
 
 # Attributes
 ATTR_CHANNEL: Final = "channel"
@@ -74,6 +96,11 @@ UID_FAULT_CODE: Final = "fault_code"
 UID_MUTE_CODES: Final = "mute_codes_ch"
 UID_STANDBY_STATE: Final = "standby_state"
 UID_EQ: Final = "eq_ch"
+UID_ALARMS: Final = "alarms"
+UID_LOAD: Final = "load_ch"
+UID_OUTPUT_LEVEL: Final = "output_level_ch"
+UID_INPUT_SIGNAL: Final = "input_signal_ch"
+UID_TRANSPORT: Final = "transport"
 
 # Channel configuration
 NUM_CHANNELS: Final = 4
@@ -0,0 +1,77 @@
+"""Diagnostics support for Powersoft Mezzo integration."""
+import base64
+from typing import Any, Dict, Optional
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, COORDINATOR, CLIENT, CONF_HOST, METER_STREAMER
+
+TO_REDACT = {CONF_HOST, "serial_number", "mac_address"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data[COORDINATOR]
+    client = data[CLIENT]
+    streamer = data.get(METER_STREAMER)
+
+    diagnostics = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "last_update_success": coordinator.last_update_success,
+        "state": async_redact_data(coordinator.data or {}, TO_REDACT),
+        "transport": client.metrics.as_dict(),
+    }
+    if streamer is not None:
+        diagnostics["meter_stream"] = {
+            "running": streamer.running,
+            "rate": streamer.rate,
+            "frames": streamer.frames,
+            "missed": streamer.missed,
+            "overruns": streamer.overruns,
+        }
+    eq_response = _eq_response(coordinator.data or {})
+    if eq_response is not None:
+        diagnostics["eq_response"] = eq_response
+    scene_report = getattr(client, "last_scene_report", None)
+    if scene_report is not None:
+        diagnostics["last_scene_apply"] = scene_report.as_dict()
+    area_cache = getattr(client, "area_cache", None)
+    if area_cache is not None:
+        diagnostics["area_cache"] = area_cache.as_dict()
+    trace = client.trace
+    if trace is not None:
+        pcap = client.export_pcap()
+        diagnostics["packet_trace"] = {
+            "capacity": trace.capacity,
+            "recorded": trace.recorded,
+            "dropped": trace.dropped,
+            "frames": trace.summary(),
+            "pcap_base64": base64.b64encode(pcap).decode("ascii"),
+        }
+    return diagnostics
+
+
+def _eq_response(state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the User EQ and Source EQ response curves, if NumPy is available."""
+    if "eq" not in state:
+        return None
+    try:
+        from .eq_response import get_engine
+    except ImportError:
+        return None
+    engine = get_engine()
+    curves = dict(engine.curves(state["eq"]))
+    if state.get("source_eq"):
+        curves["source"] = engine.curves({"source": state["source_eq"]})["source"]
+    return {
+        str(name): {**engine.summary(curve), "curve": engine.export(curve)}
+        for name, curve in curves.items()
+    }
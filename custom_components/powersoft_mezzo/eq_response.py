@@ -0,0 +1,287 @@
+"""
+EQ Frequency Response for Powersoft Mezzo Amplifiers.
+
+Turns BiQuad EQ bands (the 24-byte '<IIffIf' structure, see
+register_schema.BIQUAD) into filter coefficients using the RBJ audio EQ
+cookbook formulas and evaluates their magnitude response on a shared
+log-spaced frequency grid.
+
+All bands missing from the cache are evaluated together: their
+coefficients are stacked into arrays and the (bands x grid) magnitudes
+come out of two matrix products. Per-band responses (in dB) are cached by
+their parameter tuple, so after an edit only the changed band is
+evaluated again; channel curves are the sum of their enabled bands.
+
+NumPy is imported with the module; callers import this module lazily and
+treat ImportError as "no curves".
+
+Shelving filters use the Q field; the slope field does not change the
+magnitude computed here.
+"""
+import math
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .mezzo_memory_map import (
+    EQ_TYPE_ALL_PASS,
+    EQ_TYPE_BAND_PASS,
+    EQ_TYPE_BAND_STOP,
+    EQ_TYPE_HIGH_PASS,
+    EQ_TYPE_HIGH_SHELVING,
+    EQ_TYPE_LOW_PASS,
+    EQ_TYPE_LOW_SHELVING,
+    EQ_TYPE_PEAKING,
+)
+
+DEFAULT_SAMPLE_RATE = 48000
+GRID_POINTS = 128
+GRID_MIN_HZ = 20.0
+GRID_MAX_HZ = 20000.0
+DEFAULT_CACHE_SIZE = 512
+
+# Parameter tuple identifying a band's response: (type, frequency, gain, q)
+BandKey = Tuple[int, float, float, float]
+
+
+def band_key(band: Dict[str, Any]) -> Optional[BandKey]:
+    """
+    Return the cache key of a band, or None if it does not shape the response.
+
+    Disabled bands and all-pass filters have a flat magnitude.
+    """
+    if not band.get("enabled", 0) or band.get("type", EQ_TYPE_PEAKING) == EQ_TYPE_ALL_PASS:
+        return None
+    return (
+        int(band.get("type", EQ_TYPE_PEAKING)),
+        float(band.get("frequency", 1000)),
+        float(band.get("gain", 0.0)),
+        float(band.get("q", 1.0)),
+    )
+
+
+def _peaking(gain_a, cos_w0, alpha):
+    return (1 + alpha * gain_a, -2 * cos_w0, 1 - alpha * gain_a,
+            1 + alpha / gain_a, -2 * cos_w0, 1 - alpha / gain_a)
+
+
+def _low_shelving(gain_a, cos_w0, alpha):
+    sqrt_a = 2 * math.sqrt(gain_a) * alpha
+    return (gain_a * ((gain_a + 1) - (gain_a - 1) * cos_w0 + sqrt_a),
+            2 * gain_a * ((gain_a - 1) - (gain_a + 1) * cos_w0),
+            gain_a * ((gain_a + 1) - (gain_a - 1) * cos_w0 - sqrt_a),
+            (gain_a + 1) + (gain_a - 1) * cos_w0 + sqrt_a,
+            -2 * ((gain_a - 1) + (gain_a + 1) * cos_w0),
+            (gain_a + 1) + (gain_a - 1) * cos_w0 - sqrt_a)
+
+
+def _high_shelving(gain_a, cos_w0, alpha):
+    sqrt_a = 2 * math.sqrt(gain_a) * alpha
+    return (gain_a * ((gain_a + 1) + (gain_a - 1) * cos_w0 + sqrt_a),
+            -2 * gain_a * ((gain_a - 1) + (gain_a + 1) * cos_w0),
+            gain_a * ((gain_a + 1) + (gain_a - 1) * cos_w0 - sqrt_a),
+            (gain_a + 1) - (gain_a - 1) * cos_w0 + sqrt_a,
+            2 * ((gain_a - 1) - (gain_a + 1) * cos_w0),
+            (gain_a + 1) - (gain_a - 1) * cos_w0 - sqrt_a)
+
+
+def _low_pass(gain_a, cos_w0, alpha):
+    return ((1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2,
+            1 + alpha, -2 * cos_w0, 1 - alpha)
+
+
+def _high_pass(gain_a, cos_w0, alpha):
+    return ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2,
+            1 + alpha, -2 * cos_w0, 1 - alpha)
+
+
+def _band_pass(gain_a, cos_w0, alpha):
+    return (alpha, 0.0, -alpha,
+            1 + alpha, -2 * cos_w0, 1 - alpha)
+
+
+def _band_stop(gain_a, cos_w0, alpha):
+    return (1.0, -2 * cos_w0, 1.0,
+            1 + alpha, -2 * cos_w0, 1 - alpha)
+
+
+# RBJ cookbook (b0, b1, b2, a0, a1, a2) per filter type, from
+# A = 10^(gain/40), cos(w0) and alpha = sin(w0) / 2Q
+_FORMS = {
+    EQ_TYPE_PEAKING: _peaking,
+    EQ_TYPE_LOW_SHELVING: _low_shelving,
+    EQ_TYPE_HIGH_SHELVING: _high_shelving,
+    EQ_TYPE_LOW_PASS: _low_pass,
+    EQ_TYPE_HIGH_PASS: _high_pass,
+    EQ_TYPE_BAND_PASS: _band_pass,
+    EQ_TYPE_BAND_STOP: _band_stop,
+}
+
+
+def _power_terms(coeffs: np.ndarray) -> np.ndarray:
+    """Map (c0, c1, c2) rows to the weights of (1, cos w, cos 2w) in |C(e^jw)|^2."""
+    c0, c1, c2 = coeffs[:, 0], coeffs[:, 1], coeffs[:, 2]
+    return np.stack((c0 * c0 + c1 * c1 + c2 * c2, 2 * (c0 * c1 + c1 * c2), 2 * c0 * c2), axis=1)
+
+
+class EQResponseEngine:
+    """Evaluate and cache EQ magnitude responses on a fixed grid."""
+
+    def __init__(
+        self,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        points: int = GRID_POINTS,
+        f_min: float = GRID_MIN_HZ,
+        f_max: float = GRID_MAX_HZ,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            sample_rate: DSP sample rate in Hz
+            points: Number of grid frequencies
+            f_min: Lowest grid frequency in Hz
+            f_max: Highest grid frequency in Hz (below sample_rate / 2)
+            cache_size: Number of band responses kept
+
+        Raises:
+            ValueError: If the grid is invalid
+        """
+        if not 0 < f_min < f_max < sample_rate / 2:
+            raise ValueError(f"Grid must satisfy 0 < f_min < f_max < {sample_rate / 2} Hz")
+        if points < 2:
+            raise ValueError("Grid needs at least 2 points")
+        self.sample_rate = sample_rate
+        self.frequencies = np.geomspace(f_min, f_max, points)
+        omega = 2 * np.pi * self.frequencies / sample_rate
+        self._cosines = np.stack((np.ones_like(omega), np.cos(omega), np.cos(2 * omega)))
+        self._cache: "OrderedDict[BandKey, np.ndarray]" = OrderedDict()
+        self._cache_size = cache_size
+        self._flat = np.zeros(points)
+        self._flat.setflags(write=False)
+        self._last: Optional[Tuple[tuple, Dict[Any, np.ndarray]]] = None
+        self.evaluated = 0
+
+    def coefficients(self, keys: List[BandKey]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute normalised BiQuad coefficients for several bands.
+
+        Unknown filter types get a pass-through filter.
+
+        Args:
+            keys: Band keys from band_key()
+
+        Returns:
+            (b, a) arrays of shape (len(keys), 3) with a[:, 0] == 1
+        """
+        nyquist = self.sample_rate / 2
+        rows = []
+        for filt_type, frequency, gain, q in keys:
+            form = _FORMS.get(filt_type)
+            if form is None:
+                rows.append((1.0, 0.0, 0.0, 1.0, 0.0, 0.0))
+                continue
+            w0 = 2 * math.pi * min(max(frequency, 1.0), 0.999 * nyquist) / self.sample_rate
+            rows.append(form(10.0 ** (gain / 40.0), math.cos(w0), math.sin(w0) / (2 * max(q, 0.01))))
+        coeffs = np.array(rows, dtype=float).reshape(-1, 6)
+        coeffs /= coeffs[:, 3:4]
+        return coeffs[:, :3], coeffs[:, 3:]
+
+    def band_responses(self, keys: Iterable[BandKey]) -> List[np.ndarray]:
+        """
+        Magnitude response in dB of each band on the grid.
+
+        Bands missing from the cache are evaluated together in one pass.
+
+        Args:
+            keys: Band keys from band_key()
+
+        Returns:
+            One read-only array per key
+        """
+        keys = list(keys)
+        cache = self._cache
+        missing = list(dict.fromkeys(key for key in keys if key not in cache))
+        if missing:
+            b, a = self.coefficients(missing)
+            # |c0 + c1 z^-1 + c2 z^-2|^2 is linear in (1, cos w, cos 2w),
+            # so numerator and denominator are one matrix product each
+            power = (_power_terms(b) @ self._cosines) / (_power_terms(a) @ self._cosines)
+            responses = 10.0 * np.log10(np.maximum(power, 1e-20))
+            responses.setflags(write=False)
+            for key, response in zip(missing, responses):
+                cache[key] = response
+            self.evaluated += len(missing)
+        result = []
+        for key in keys:
+            cache.move_to_end(key)
+            result.append(cache[key])
+        while len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return result
+
+    def curves(self, bands_by_curve: Dict[Any, Dict[int, Dict[str, Any]]]) -> Dict[Any, np.ndarray]:
+        """
+        Combined response of several band sets, e.g. one per channel.
+
+        The result for the last set of parameters is kept, so entities
+        sharing one coordinator update compute the curves only once.
+
+        Args:
+            bands_by_curve: {curve id: {band number: BiQuad dict}}
+
+        Returns:
+            {curve id: response in dB on the grid}
+        """
+        plan = tuple(
+            (curve, tuple(band_key(band) for band in bands.values()))
+            for curve, bands in bands_by_curve.items()
+        )
+        if self._last is not None and self._last[0] == plan:
+            return self._last[1]
+
+        keys = [key for _, band_keys in plan for key in band_keys if key is not None]
+        responses = dict(zip(keys, self.band_responses(keys)))
+        curves = {}
+        for curve, band_keys in plan:
+            active = [responses[key] for key in band_keys if key is not None]
+            curves[curve] = np.sum(active, axis=0) if active else self._flat
+        self._last = (plan, curves)
+        return curves
+
+    def summary(self, curve: np.ndarray) -> Dict[str, float]:
+        """
+        Peak and dip of a response curve.
+
+        Returns:
+            peak_db/peak_hz (largest boost) and dip_db/dip_hz (deepest cut)
+        """
+        peak = int(np.argmax(curve))
+        dip = int(np.argmin(curve))
+        return {
+            "peak_db": round(float(curve[peak]), 2),
+            "peak_hz": round(float(self.frequencies[peak])),
+            "dip_db": round(float(curve[dip]), 2),
+            "dip_hz": round(float(self.frequencies[dip])),
+        }
+
+    def export(self, curve: np.ndarray) -> List[List[float]]:
+        """Return a curve as [[frequency Hz, dB], ...] for attributes or downloads."""
+        return [
+            [round(float(frequency), 1), round(float(level), 2)]
+            for frequency, level in zip(self.frequencies, curve)
+        ]
+
+
+_ENGINE: Optional[EQResponseEngine] = None
+
+
+def get_engine() -> EQResponseEngine:
+    """Return the shared engine (the grid and cache are the same for every amplifier)."""
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = EQResponseEngine()
+    return _ENGINE
+
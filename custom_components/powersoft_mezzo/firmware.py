@@ -0,0 +1,277 @@
+"""
+Firmware Transfer Engine for Powersoft Mezzo Amplifiers.
+
+Streams a firmware image into the firmware area (ADDR_FIRMWARE_START to
+ADDR_FIRMWARE_END) region by region:
+
+1. Erase the region with the E opcode.
+2. Write it in MTU-sized WriteCommand chunks, keeping up to `window`
+   requests in flight; chunks that time out or are NAKed are retried.
+3. Ask the device for the CRC16 of the region with the C opcode and
+   compare it with the CRC of the local data. On a mismatch, the CRC of
+   every chunk is requested (2 bytes each) and only the chunks that
+   differ are written again.
+
+Only one region of the image is held in memory at a time. Starting the
+upgrade itself (ADDR_UPGRADE_FW_INFO / ADDR_UPGRADE_FW_FLASH_ERASE) is
+left to the caller.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .mezzo_memory_map import ADDR_FIRMWARE_END, ADDR_FIRMWARE_START
+from .pbus_protocol import (
+    CrcCommand,
+    EraseCommand,
+    PBusCommand,
+    WriteCommand,
+    calculate_crc16,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# A chunk must fit one Ethernet frame even if every byte needs escaping:
+# STX + escaped(TAG + command header + data + CRC) + ETX <= 1472 bytes
+UDP_MTU_PAYLOAD = 1472
+FIRMWARE_CHUNK_SIZE = (UDP_MTU_PAYLOAD - 2) // 2 - (4 + 9 + 2)  # 720 bytes
+FIRMWARE_REGION_SIZE = 0x10000  # 64 KiB erase/verify unit
+DEFAULT_WINDOW = 8
+DEFAULT_RETRIES = 3
+
+# Chunk CRC queries per request (11 bytes per reply, well below the MTU)
+_CRC_BATCH = 64
+
+
+@dataclass
+class FirmwareUploadResult:
+    """Outcome of a firmware transfer."""
+    size: int
+    regions: int
+    chunks: int
+    retransmitted: int
+    crc_mismatches: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        """Sustained transfer rate in bytes per second."""
+        return self.size / self.elapsed if self.elapsed else 0.0
+
+
+class FirmwareUploader:
+    """Write a firmware image to one amplifier."""
+
+    def __init__(
+        self,
+        client,
+        chunk_size: int = FIRMWARE_CHUNK_SIZE,
+        region_size: int = FIRMWARE_REGION_SIZE,
+        window: int = DEFAULT_WINDOW,
+        retries: int = DEFAULT_RETRIES,
+        timeout: Optional[float] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        """
+        Initialize the uploader.
+
+        Args:
+            client: Connected MezzoClient
+            chunk_size: Data bytes per WriteCommand
+            region_size: Bytes erased and CRC-verified at a time
+            window: Maximum write requests in flight
+            retries: Extra attempts for a failed chunk or region
+            timeout: Per-request timeout (client default if None)
+            progress: Called with (bytes verified, total bytes) after each region
+
+        Raises:
+            ValueError: If the sizes or window are invalid
+        """
+        if not 0 < chunk_size <= FIRMWARE_CHUNK_SIZE:
+            raise ValueError(f"Chunk size must be 1-{FIRMWARE_CHUNK_SIZE}, got {chunk_size}")
+        if region_size < chunk_size:
+            raise ValueError("Region size must be at least one chunk")
+        if window < 1:
+            raise ValueError("Window must be at least 1")
+        self._client = client
+        self.chunk_size = chunk_size
+        self.region_size = region_size
+        self.window = window
+        self.retries = retries
+        self.timeout = timeout
+        self._progress = progress
+        self._retransmitted = 0
+        self._mismatches = 0
+
+    async def upload(self, path: str, base: int = ADDR_FIRMWARE_START) -> FirmwareUploadResult:
+        """
+        Transfer a firmware image from disk.
+
+        Args:
+            path: Image file
+            base: Address the image is written to
+
+        Returns:
+            Transfer statistics
+
+        Raises:
+            ValueError: If the image does not fit, or a region still fails
+                        verification after all retries
+            ConnectionError: If not connected
+            TimeoutError: If an erase or CRC request times out
+        """
+        loop = asyncio.get_running_loop()
+        size = await loop.run_in_executor(None, os.path.getsize, path)
+        if base < ADDR_FIRMWARE_START or base + size > ADDR_FIRMWARE_END:
+            raise ValueError(
+                f"Image of {size} bytes at 0x{base:08x} does not fit the firmware area"
+            )
+
+        self._retransmitted = 0
+        self._mismatches = 0
+        chunks = 0
+        regions = 0
+        start = time.perf_counter()
+        # Open, read and close in the executor so no file I/O blocks the loop
+        file = await loop.run_in_executor(None, open, path, "rb")
+        try:
+            offset = 0
+            while offset < size:
+                data = await loop.run_in_executor(None, file.read, self.region_size)
+                if not data:
+                    break
+                chunks += await self._transfer_region(base + offset, data)
+                regions += 1
+                offset += len(data)
+                if self._progress is not None:
+                    self._progress(offset, size)
+        finally:
+            await loop.run_in_executor(None, file.close)
+
+        result = FirmwareUploadResult(
+            size=size,
+            regions=regions,
+            chunks=chunks,
+            retransmitted=self._retransmitted,
+            crc_mismatches=self._mismatches,
+            elapsed=time.perf_counter() - start,
+        )
+        _LOGGER.info(
+            "Firmware transfer to %s: %d bytes in %.1fs (%.1f KiB/s, %d chunks resent)",
+            self._client.host, size, result.elapsed, result.rate / 1024, result.retransmitted,
+        )
+        return result
+
+    async def _transfer_region(self, address: int, data: bytes) -> int:
+        """
+        Erase, write and verify one region.
+
+        Returns:
+            Number of chunks in the region
+        """
+        await self._command(EraseCommand(address, len(data)), "Erase")
+
+        offsets = list(range(0, len(data), self.chunk_size))
+        pending = offsets
+        for attempt in range(self.retries + 1):
+            failed = await self._write_chunks(address, data, pending)
+            if not failed:
+                if await self._region_crc(address, len(data)) == calculate_crc16(data):
+                    return len(offsets)
+                self._mismatches += 1
+                failed = await self._mismatched_chunks(address, data, offsets)
+                _LOGGER.debug(
+                    "CRC mismatch in region 0x%08x, %d chunks differ", address, len(failed)
+                )
+            if attempt < self.retries:
+                self._retransmitted += len(failed)
+            pending = failed
+
+        raise ValueError(f"Firmware region 0x{address:08x} failed verification")
+
+    async def _write_chunks(self, address: int, data: bytes, offsets: List[int]) -> List[int]:
+        """
+        Write chunks with up to `window` requests in flight.
+
+        Returns:
+            Offsets of the chunks that were NAKed or timed out
+        """
+        failed: List[int] = []
+        slots = asyncio.Semaphore(self.window)
+        view = memoryview(data)
+
+        async def write(offset: int) -> None:
+            try:
+                chunk = bytes(view[offset:offset + self.chunk_size])
+                responses = await self._client.send_commands(
+                    [WriteCommand(address + offset, chunk)], self.timeout, exclusive=False
+                )
+                if responses[0].is_nak():
+                    failed.append(offset)
+            except TimeoutError:
+                failed.append(offset)
+            finally:
+                slots.release()
+
+        tasks = []
+        for offset in offsets:
+            await slots.acquire()
+            tasks.append(asyncio.ensure_future(write(offset)))
+        await asyncio.gather(*tasks)
+        return sorted(failed)
+
+    async def _region_crc(self, address: int, size: int) -> int:
+        """Return the device-side CRC16 of a range."""
+        response = await self._command(CrcCommand(address, size), "CRC")
+        return response.crc
+
+    async def _mismatched_chunks(self, address: int, data: bytes, offsets: List[int]) -> List[int]:
+        """
+        Compare per-chunk CRCs with the local data.
+
+        Returns:
+            Offsets of the chunks whose device CRC differs
+        """
+        view = memoryview(data)
+        mismatched = []
+        for batch_start in range(0, len(offsets), _CRC_BATCH):
+            batch = offsets[batch_start:batch_start + _CRC_BATCH]
+            commands = [
+                CrcCommand(address + offset, len(view[offset:offset + self.chunk_size]))
+                for offset in batch
+            ]
+            try:
+                responses = await self._client.send_commands(commands, self.timeout)
+            except TimeoutError:
+                # Treat the whole batch as suspect; rewriting is idempotent
+                mismatched.extend(batch)
+                continue
+            for offset, response in zip(batch, responses):
+                local = calculate_crc16(view[offset:offset + self.chunk_size])
+                if response.crc != local:
+                    mismatched.append(offset)
+        return mismatched
+
+    async def _command(self, command: PBusCommand, what: str):
+        """
+        Send one erase or CRC command, retrying on timeout (both are idempotent).
+
+        Raises:
+            ValueError: If the device NAKs it
+            TimeoutError: If every attempt times out
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                response = (await self._client.send_commands([command], self.timeout))[0]
+                break
+            except TimeoutError:
+                if attempt == self.retries:
+                    raise
+        if response.is_nak():
+            raise ValueError(
+                f"{what} of 0x{command.address:08x}+{command.size} was refused (NAK)"
+            )
+        return response
@@ -4,13 +4,33 @@ Powersoft Mezzo Amplifier Client.
 High-level API for controlling and monitoring Powersoft Mezzo amplifiers.
 Provides convenient methods for all control functions.
 """
+import asyncio
+import ipaddress
 import logging
-import struct
-from typing import Optional, Dict, Any, List
+import time
+from typing import Optional, Dict, Any, List, AsyncIterator, Iterable, Iterator, Tuple
 import math
 
-from .udp_manager import UDPManager, UDPBroadcaster
+from .area_cache import AreaCache
+from .packet_trace import DEFAULT_TRACE_FRAMES, PacketTrace
+from .ramp import RampEngine
+from .register_image import ApplyReport, RegisterImage, command_bytes
+from .register_schema import (
+    FLAT_BIQUAD,
+    REGISTERS,
+    ReadPlan,
+    pack_biquad,
+    pack_biquads,
+    unpack_biquad,
+    write_command,
+)
+from .transport_metrics import PHASE_BUILD, PHASE_DECODE, TransportMetrics
+from .udp_manager import UDPManager, UDPBroadcaster, UDPSweeper, BROADCAST_ADDRESS
+from .quattro_client import identify_quattro
 from .pbus_protocol import (
+    CrcCommand,
+    PBusCommand,
+    PBusResponse,
     ReadCommand,
     WriteCommand,
     float_to_bytes,
@@ -22,6 +42,7 @@ from .pbus_protocol import (
     int32_to_bytes,
     bytes_to_int32,
     bytes_to_string,
+    calculate_crc16,
 )
 from .mezzo_memory_map import (
     # Device Info
@@ -61,14 +82,51 @@ from .mezzo_memory_map import (
     MUTE_CODES,
     # EQ
     get_user_eq_biquad_address,
+    get_user_eq_channel_start,
     NUM_EQ_BANDS,
+    NUM_SOURCE_EQ_BANDS,
     EQ_BIQUAD_SIZE,
+    # Zones
+    ADDR_ZONE_ENABLE_CH1,
     # Misc
     NUM_CHANNELS,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Registers polled by get_all_state; Source EQ is only read from output
+# channel 1 since all enabled zone channels get written with same values
+ALL_STATE_PLAN = ReadPlan([
+    "standby_state",
+    "user_gain",
+    "user_mute",
+    "manual_source",
+    "zone_enable",
+    "temp_transformer",
+    "temp_heatsink",
+    "fault_code",
+    "user_eq",
+    REGISTERS["source_eq"].select(0, NUM_SOURCE_EQ_BANDS),
+])
+USER_EQ_PLAN = ReadPlan(["user_eq"])
+SCENE_CONTEXT_PLAN = ReadPlan(["manual_source", "zone_enable"])
+
+# Device state a compiled scene depends on: bits 16-31 of the manual source
+# selection register (kept when the sources are written) and the zone
+# enable bytes (which output channels get the Source EQ)
+SceneContext = Tuple[int, Tuple[int, ...]]
+
+# Source IDs accepted by the manual source selection register
+VALID_SOURCE_IDS = {1, 3, 5, 7, 9, 11, 13, 15}
+
+# Volume ramps run in dB; levels at or below this are written as silence
+RAMP_FLOOR_DB = -80.0
+
+
+def _encode_ramp_db(db: float) -> bytes:
+    """Encode a volume ramp level in dB as a user gain register value."""
+    return float_to_bytes(0.0 if db <= RAMP_FLOOR_DB else min(1.0, 10 ** (db / 20)))
+
 
 class MezzoClient:
     """
@@ -91,6 +149,12 @@ class MezzoClient:
         self.port = port
         self.timeout = timeout
         self._udp = UDPManager(host, port, timeout)
+        self._area_cache: Optional[AreaCache] = None
+        self.register_image = RegisterImage()
+        self.scene_diff = False  # apply scenes by writing only what changed
+        self.scene_transition = 0.0  # seconds to fade volumes when applying scenes
+        self._ramps: Optional[RampEngine] = None
+        self.last_scene_report: Optional[ApplyReport] = None
 
     async def connect(self) -> None:
         """Connect to the amplifier."""
@@ -98,6 +162,8 @@ class MezzoClient:
 
     async def disconnect(self) -> None:
         """Disconnect from the amplifier."""
+        if self._ramps is not None:
+            await self._ramps.stop()
         await self._udp.disconnect()
 
     @property
@@ -105,6 +171,120 @@ class MezzoClient:
         """Check if connected to amplifier."""
         return self._udp.is_connected
 
+    @property
+    def metrics(self) -> TransportMetrics:
+        """Transport counters and latency histograms for this amplifier."""
+        return self._udp.metrics
+
+    @property
+    def trace(self) -> Optional[PacketTrace]:
+        """Packet trace of recent frames, or None when tracing is off."""
+        return self._udp.trace
+
+    def start_trace(self, capacity: int = DEFAULT_TRACE_FRAMES) -> PacketTrace:
+        """
+        Start recording raw frames into a ring buffer.
+
+        Args:
+            capacity: Number of most recent frames to keep
+
+        Returns:
+            The new PacketTrace
+        """
+        self._udp.trace = PacketTrace(capacity)
+        return self._udp.trace
+
+    def stop_trace(self) -> None:
+        """Stop recording frames and discard the trace."""
+        self._udp.trace = None
+
+    def export_pcap(self) -> Optional[bytes]:
+        """Return the recorded frames as a pcap file, or None when tracing is off."""
+        if self._udp.trace is None:
+            return None
+        return self._udp.trace.to_pcap(self._udp.local_address, (self.host, self.port))
+
+    async def send_commands(
+        self,
+        commands: List[PBusCommand],
+        timeout: Optional[float] = None,
+        exclusive: bool = True,
+    ) -> List[PBusResponse]:
+        """
+        Send raw PBus commands in one request.
+
+        Args:
+            commands: Commands to send as one multicommand
+            timeout: Timeout in seconds (uses the client default if None)
+            exclusive: False lets the request overlap other non-exclusive
+                       ones (used by bulk transfers)
+
+        Returns:
+            One response per command; NAKs are not raised
+
+        Raises:
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        return await self._request(commands, timeout, exclusive)
+
+    async def _request(
+        self,
+        commands: List[PBusCommand],
+        timeout: Optional[float] = None,
+        exclusive: bool = True,
+    ) -> List[PBusResponse]:
+        """Send one request and keep the register image in step with it."""
+        try:
+            responses = await self._udp.send_request(commands, timeout, exclusive)
+        except Exception:
+            # Writes may or may not have been applied
+            self.register_image.track(commands, [])
+            raise
+        self.register_image.track(commands, responses)
+        return responses
+
+    async def _send_writes(
+        self,
+        commands: List[WriteCommand],
+        error_message: str,
+        verify: bool = True,
+    ) -> None:
+        """
+        Send write commands, reading the same registers back in the same packet.
+
+        PBus executes a multicommand left to right, so appending a read of
+        each written register after the writes returns what the device
+        actually stored without a second round trip.
+
+        Args:
+            commands: Write commands to send
+            error_message: Message for the ValueError raised on failure
+            verify: Append read-back commands and compare them with the
+                    written data (disable for write-only registers)
+
+        Raises:
+            ValueError: If a write is NAKed or the read-back differs
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        request: List[Any] = list(commands)
+        if verify:
+            request.extend(ReadCommand(cmd.address, cmd.size) for cmd in commands)
+
+        responses = await self._request(request)
+
+        for cmd, resp in zip(commands, responses):
+            if resp.is_nak():
+                raise ValueError(f"{error_message} (NAK at 0x{cmd.address:08x})")
+
+        if verify:
+            for cmd, resp in zip(commands, responses[len(commands):]):
+                if resp.is_nak() or resp.data != cmd.data:
+                    raise ValueError(
+                        f"{error_message} (read-back mismatch at 0x{cmd.address:08x})"
+                    )
+
     # ========================================================================
     # Power Control
     # ========================================================================
@@ -124,10 +304,8 @@ class MezzoClient:
         cmd = WriteCommand(ADDR_STANDBY_TRIGGER, uint32_to_bytes(value))
 
         _LOGGER.info("Setting standby to %s", standby)
-        responses = await self._udp.send_request([cmd])
-
-        if responses[0].is_nak():
-            raise ValueError("Failed to set standby state")
+        # The standby trigger is write-only, so there is nothing to read back
+        await self._send_writes([cmd], "Failed to set standby state", verify=False)
 
     async def get_standby_state(self) -> bool:
         """
@@ -141,7 +319,7 @@ class MezzoClient:
             TimeoutError: If request times out
         """
         cmd = ReadCommand(ADDR_STANDBY_STATE, 4)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError("Failed to read standby state")
@@ -183,10 +361,7 @@ class MezzoClient:
 
         _LOGGER.warning("Setting channel %d volume to %.2f (writing to user gain 0x%08x)",
                        channel, volume, addr)
-        responses = await self._udp.send_request([cmd])
-
-        if responses[0].is_nak():
-            raise ValueError(f"Failed to set volume for channel {channel}")
+        await self._send_writes([cmd], f"Failed to set volume for channel {channel}")
 
     async def get_volume(self, channel: int, use_user_gain: bool = False) -> float:
         """
@@ -211,7 +386,7 @@ class MezzoClient:
         # Read from user gain (0x00004000+)
         addr = get_user_gain_address(channel)
         cmd = ReadCommand(addr, 4)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError(f"Failed to read volume for channel {channel}")
@@ -274,10 +449,7 @@ class MezzoClient:
         cmd = WriteCommand(addr, uint8_to_bytes(value))
 
         _LOGGER.debug("Setting channel %d mute to %s", channel, muted)
-        responses = await self._udp.send_request([cmd])
-
-        if responses[0].is_nak():
-            raise ValueError(f"Failed to set mute for channel {channel}")
+        await self._send_writes([cmd], f"Failed to set mute for channel {channel}")
 
     async def get_mute(self, channel: int, use_user_mute: bool = True) -> bool:
         """
@@ -300,7 +472,7 @@ class MezzoClient:
 
         addr = get_user_mute_address(channel) if use_user_mute else get_zone_mute_address(channel)
         cmd = ReadCommand(addr, 1)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError(f"Failed to read mute for channel {channel}")
@@ -316,7 +488,8 @@ class MezzoClient:
         Set input source for channel.
 
         The Mezzo uses a packed format where each output channel's source
-        is stored in a separate byte of the Manual Source Selection register.
+        is stored in a separate byte of the Manual Source Selection register;
+        only that byte is written, with its 1-byte read-back in the same packet.
 
         Args:
             channel: Output channel number (1-2 for Mezzo 602 AD)
@@ -338,35 +511,13 @@ class MezzoClient:
         if source_id not in valid_source_ids:
             raise ValueError(f"Source ID must be one of {valid_source_ids}")
 
-        # Read current packed value
-        read_cmd = ReadCommand(ADDR_MANUAL_SOURCE_SELECTION, 4)
-        responses = await self._udp.send_request([read_cmd])
-
-        if responses[0].is_nak():
-            raise ValueError("Failed to read current source selection")
-
-        current_value = bytes_to_int32(responses[0].data)
-
-        # Modify the appropriate byte for this channel
-        # Channel 1 = byte 0 (bits 0-7), Channel 2 = byte 1 (bits 8-15)
-        if channel == 1:
-            # Clear byte 0 and set new value
-            new_value = (current_value & 0xFFFFFF00) | source_id
-        else:  # channel == 2
-            # Clear byte 1 and set new value
-            new_value = (current_value & 0xFFFF00FF) | (source_id << 8)
-
-        _LOGGER.warning(
-            "Setting channel %d to source ID %d: 0x%08x → 0x%08x",
-            channel, source_id, current_value, new_value
-        )
+        # Channel 1 = byte 0, Channel 2 = byte 1: write only this channel's
+        # byte, so the other channel needs no read first
+        addr = ADDR_MANUAL_SOURCE_SELECTION + channel - 1
+        _LOGGER.warning("Setting channel %d to source ID %d (0x%08x)", channel, source_id, addr)
 
-        # Write the modified packed value
-        write_cmd = WriteCommand(ADDR_MANUAL_SOURCE_SELECTION, int32_to_bytes(new_value))
-        responses = await self._udp.send_request([write_cmd])
-
-        if responses[0].is_nak():
-            raise ValueError("Failed to set source")
+        write_cmd = WriteCommand(addr, bytes([source_id]))
+        await self._send_writes([write_cmd], "Failed to set source")
 
         _LOGGER.warning("Source set complete for channel %d", channel)
 
@@ -385,7 +536,7 @@ class MezzoClient:
 
         _LOGGER.warning("Disabling manual source selection mode (writing 0 to 0x%08x)",
                        ADDR_MANUAL_SOURCE_SELECTION)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError("Failed to disable manual source mode")
@@ -414,7 +565,7 @@ class MezzoClient:
 
         _LOGGER.warning("Enabling manual source selection mode with source %d (writing to 0x%08x)",
                        source_id, ADDR_MANUAL_SOURCE_SELECTION)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError("Failed to enable manual source mode")
@@ -449,7 +600,7 @@ class MezzoClient:
         commands.append(ReadCommand(ADDR_MANUAL_SOURCE_SELECTION, 4))
 
         # Send all read commands
-        responses = await self._udp.send_request(commands)
+        responses = await self._request(commands)
 
         # Parse results
         result = {
@@ -503,17 +654,17 @@ class MezzoClient:
 
         # Read Source EQ area (576 bytes = 0x240)
         source_eq_cmd = ReadCommand(ADDR_SOURCE_EQ_START, 576)
-        source_eq_response = await self._udp.send_request([source_eq_cmd])
+        source_eq_response = await self._request([source_eq_cmd])
         source_eq_data = source_eq_response[0].data if not source_eq_response[0].is_nak() else b''
 
         # Read Source Config area (84 bytes = 0x54)
         source_config_cmd = ReadCommand(ADDR_SOURCE_CONFIG_START, 84)
-        source_config_response = await self._udp.send_request([source_config_cmd])
+        source_config_response = await self._request([source_config_cmd])
         source_config_data = source_config_response[0].data if not source_config_response[0].is_nak() else b''
 
         # Read Ways area (2384 bytes = 0x950) - this is large, might want to sample
         ways_cmd = ReadCommand(ADDR_WAYS_START, 2384)
-        ways_response = await self._udp.send_request([ways_cmd])
+        ways_response = await self._request([ways_cmd])
         ways_data = ways_response[0].data if not ways_response[0].is_nak() else b''
 
         return {
@@ -543,7 +694,7 @@ class MezzoClient:
 
         addr = get_source_id_address(channel)
         cmd = ReadCommand(addr, 4)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError(f"Failed to read source for channel {channel}")
@@ -588,26 +739,16 @@ class MezzoClient:
         if not 1 <= band <= NUM_EQ_BANDS:
             raise ValueError(f"Band must be 1-{NUM_EQ_BANDS}")
 
-        # Pack BiQuad structure (24 bytes)
-        biquad_data = struct.pack(
-            '<IIffIf',  # Little-endian
-            enabled,
-            filt_type,
-            q,
-            slope,
-            frequency,
-            gain,
+        cmd = write_command(
+            "user_eq",
+            {"enabled": enabled, "type": filt_type, "q": q, "slope": slope,
+             "frequency": frequency, "gain": gain},
+            (channel - 1) * NUM_EQ_BANDS + band - 1,
         )
 
-        addr = get_user_eq_biquad_address(channel, band)
-        cmd = WriteCommand(addr, biquad_data)
-
         _LOGGER.debug("Setting EQ CH%d Band%d: enabled=%d, type=%d, freq=%dHz, gain=%.2f",
                      channel, band, enabled, filt_type, frequency, gain)
-        responses = await self._udp.send_request([cmd])
-
-        if responses[0].is_nak():
-            raise ValueError(f"Failed to write EQ band {band} for channel {channel}")
+        await self._send_writes([cmd], f"Failed to write EQ band {band} for channel {channel}")
 
     async def get_eq_band(self, channel: int, band: int) -> Dict[str, Any]:
         """
@@ -638,23 +779,57 @@ class MezzoClient:
 
         addr = get_user_eq_biquad_address(channel, band)
         cmd = ReadCommand(addr, EQ_BIQUAD_SIZE)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError(f"Failed to read EQ band {band} for channel {channel}")
 
-        # Parse BiQuad structure
-        data = responses[0].data
-        enabled, filt_type, q, slope, frequency, gain = struct.unpack('<IIffIf', data)
+        return unpack_biquad(responses[0].data)
 
-        return {
-            "enabled": enabled,
-            "type": filt_type,
-            "q": q,
-            "slope": slope,
-            "frequency": frequency,
-            "gain": gain,
-        }
+    async def set_eq_bank(self, channel: int, bands: List[Dict[str, Any]]) -> None:
+        """
+        Write every User EQ band of a channel in one contiguous write.
+
+        The channel's BiQuads are packed with one precompiled struct into
+        a single 96-byte WriteCommand, so the bands switch together.
+
+        Args:
+            channel: Channel number (1-4)
+            bands: One BiQuad dict per band (enabled, type, q, slope,
+                   frequency, gain); missing keys take flat values
+
+        Raises:
+            ValueError: If channel or band count is invalid, or the write
+                        is NAKed or reads back differently
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        if len(bands) != NUM_EQ_BANDS:
+            raise ValueError(f"EQ bank must have {NUM_EQ_BANDS} bands, got {len(bands)}")
+        cmd = WriteCommand(get_user_eq_channel_start(channel), pack_biquads(bands))
+        _LOGGER.debug("Setting EQ bank CH%d (%d bytes)", channel, cmd.size)
+        await self._send_writes([cmd], f"Failed to write EQ bank for channel {channel}")
+
+    async def set_all_eq(self, banks: List[List[Dict[str, Any]]]) -> None:
+        """
+        Write the User EQ of all channels in one contiguous write.
+
+        Args:
+            banks: One list of band dicts per channel (see set_eq_bank)
+
+        Raises:
+            ValueError: If the channel or band counts are invalid, or the
+                        write is NAKed or reads back differently
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        if len(banks) != NUM_CHANNELS or any(len(bands) != NUM_EQ_BANDS for bands in banks):
+            raise ValueError(f"EQ must have {NUM_CHANNELS} banks of {NUM_EQ_BANDS} bands")
+        cmd = WriteCommand(
+            get_user_eq_channel_start(1), pack_biquads([band for bands in banks for band in bands])
+        )
+        _LOGGER.debug("Setting all EQ banks (%d bytes)", cmd.size)
+        await self._send_writes([cmd], "Failed to write EQ banks")
 
     async def get_all_eq(self) -> List[List[Dict[str, Any]]]:
         """
@@ -667,53 +842,15 @@ class MezzoClient:
             ConnectionError: If not connected
             TimeoutError: If request times out
         """
-        # Build multicommand to read all EQ bands at once
-        commands = []
-        for ch in range(1, NUM_CHANNELS + 1):
-            for band in range(1, NUM_EQ_BANDS + 1):
-                addr = get_user_eq_biquad_address(ch, band)
-                commands.append(ReadCommand(addr, EQ_BIQUAD_SIZE))
-
+        # All User EQ BiQuads are contiguous, so one read covers them
         _LOGGER.debug("Reading all EQ settings (16 bands)...")
-        responses = await self._udp.send_request(commands)
-
-        # Parse responses into nested structure
-        eq_config = []
-        resp_idx = 0
-
-        for ch in range(NUM_CHANNELS):
-            channel_bands = []
-            for band in range(NUM_EQ_BANDS):
-                resp = responses[resp_idx]
-                resp_idx += 1
-
-                if resp.is_nak():
-                    _LOGGER.warning("Failed to read EQ CH%d Band%d", ch+1, band+1)
-                    # Use default flat EQ
-                    channel_bands.append({
-                        "enabled": 0,
-                        "type": 0,
-                        "q": 1.0,
-                        "slope": 1.0,
-                        "frequency": 1000,
-                        "gain": 1.0,
-                    })
-                else:
-                    # Parse BiQuad structure
-                    data = resp.data
-                    enabled, filt_type, q, slope, frequency, gain = struct.unpack('<IIffIf', data)
-                    channel_bands.append({
-                        "enabled": enabled,
-                        "type": filt_type,
-                        "q": q,
-                        "slope": slope,
-                        "frequency": frequency,
-                        "gain": gain,
-                    })
-
-            eq_config.append(channel_bands)
+        responses = await self._request(USER_EQ_PLAN.commands)
+        bands = USER_EQ_PLAN.decode(responses)['user_eq']
+        if bands is None:
+            _LOGGER.warning("Failed to read User EQ, using flat bands")
+            bands = [dict(FLAT_BIQUAD) for _ in range(NUM_CHANNELS * NUM_EQ_BANDS)]
 
-        return eq_config
+        return [bands[ch * NUM_EQ_BANDS:(ch + 1) * NUM_EQ_BANDS] for ch in range(NUM_CHANNELS)]
 
     # ========================================================================
     # Source EQ (Active Input EQ)
@@ -755,23 +892,12 @@ class MezzoClient:
 
         addr = get_source_eq_biquad_address(band, channel)
         cmd = ReadCommand(addr, EQ_BIQUAD_SIZE)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError(f"Failed to read Source EQ band {band} for channel {channel}")
 
-        # Parse BiQuad structure
-        data = responses[0].data
-        enabled, filt_type, q, slope, frequency, gain = struct.unpack('<IIffIf', data)
-
-        return {
-            "enabled": enabled,
-            "type": filt_type,
-            "q": q,
-            "slope": slope,
-            "frequency": frequency,
-            "gain": gain,
-        }
+        return unpack_biquad(responses[0].data)
 
     async def set_source_eq_band(
         self,
@@ -789,6 +915,8 @@ class MezzoClient:
         Source EQ is per OUTPUT CHANNEL. Since output channels are typically
         linked as stereo pairs, this writes to ALL enabled zone channels
         (currently channels 1 & 2) to ensure consistent EQ across linked outputs.
+        The zone enable bytes come from the register image (see
+        get_all_state), so the request is just the writes and their read-back.
 
         Args:
             band: Band number (1-4)
@@ -813,31 +941,23 @@ class MezzoClient:
         if not 1 <= band <= NUM_SOURCE_EQ_BANDS:
             raise ValueError(f"Band must be 1-{NUM_SOURCE_EQ_BANDS}")
 
-        # Pack BiQuad structure (24 bytes)
-        biquad_data = struct.pack(
-            '<IIffIf',  # Little-endian
-            enabled,
-            filt_type,
-            q,
-            slope,
-            frequency,
-            gain,
-        )
+        biquad_data = pack_biquad({
+            "enabled": enabled, "type": filt_type, "q": q, "slope": slope,
+            "frequency": frequency, "gain": gain,
+        })
 
         _LOGGER.debug("Setting Source EQ Band%d: enabled=%d, type=%d, freq=%dHz, gain=%.2f",
                      band, enabled, filt_type, frequency, gain)
 
-        # Read zone enable status to find which output channels are active
-        zone_enable_cmd = ReadCommand(ADDR_ZONE_ENABLE_CH1, 4)
-        zone_responses = await self._udp.send_request([zone_enable_cmd])
-
-        if zone_responses[0].is_nak():
-            _LOGGER.warning("Could not read zone enable status, defaulting to channels 1-2")
+        # Zone enable picks the output channels; take it from the register
+        # image kept by the poll so the band is written without a read first
+        zone_data = self.register_image.lookup(ADDR_ZONE_ENABLE_CH1, NUM_CHANNELS)
+        if zone_data is None:
+            _LOGGER.warning("Zone enable status not known yet, defaulting to channels 1-2")
             enabled_channels = [1, 2]
         else:
             # Find which channels are enabled in the zone
-            zone_data = zone_responses[0].data
-            enabled_channels = [ch + 1 for ch in range(4) if ch < len(zone_data) and zone_data[ch] != 0]
+            enabled_channels = [ch + 1 for ch in range(NUM_CHANNELS) if zone_data[ch] != 0]
             if not enabled_channels:
                 enabled_channels = [1, 2]  # Fallback
             _LOGGER.debug("Zone enabled channels: %s", enabled_channels)
@@ -848,13 +968,10 @@ class MezzoClient:
             addr = get_source_eq_biquad_address(band, channel)
             write_commands.append(WriteCommand(addr, biquad_data))
 
-        responses = await self._udp.send_request(write_commands)
-
-        # Check for failures
-        for i, response in enumerate(responses):
-            if response.is_nak():
-                ch = enabled_channels[i]
-                raise ValueError(f"Failed to set Source EQ band {band} for output channel {ch}")
+        await self._send_writes(
+            write_commands,
+            f"Failed to set Source EQ band {band} for output channels {enabled_channels}",
+        )
 
         _LOGGER.info("Source EQ Band %d updated successfully for output channels %s",
                      band, enabled_channels)
@@ -883,7 +1000,7 @@ class MezzoClient:
             commands.append(ReadCommand(addr, EQ_BIQUAD_SIZE))
 
         _LOGGER.debug("Reading all Source EQ settings (%d bands)...", NUM_SOURCE_EQ_BANDS)
-        responses = await self._udp.send_request(commands)
+        responses = await self._request(commands)
 
         # Parse responses
         eq_config = []
@@ -892,26 +1009,9 @@ class MezzoClient:
             if resp.is_nak():
                 _LOGGER.warning("Failed to read Source EQ Band%d", band)
                 # Use default flat EQ
-                eq_config.append({
-                    "enabled": 0,
-                    "type": 0,
-                    "q": 1.0,
-                    "slope": 1.0,
-                    "frequency": 1000,
-                    "gain": 1.0,
-                })
+                eq_config.append(dict(FLAT_BIQUAD))
             else:
-                # Parse BiQuad structure
-                data = resp.data
-                enabled, filt_type, q, slope, frequency, gain = struct.unpack('<IIffIf', data)
-                eq_config.append({
-                    "enabled": enabled,
-                    "type": filt_type,
-                    "q": q,
-                    "slope": slope,
-                    "frequency": frequency,
-                    "gain": gain,
-                })
+                eq_config.append(unpack_biquad(resp.data))
 
         return eq_config
 
@@ -949,36 +1049,59 @@ class MezzoClient:
                      NUM_CHANNELS, len(source_eq_config))
         return scene_config
 
-    async def apply_scene(self, scene_config: Dict[str, Any]) -> None:
+    @staticmethod
+    def scene_context(values: Dict[str, Any]) -> Optional[SceneContext]:
         """
-        Apply a complete scene configuration via multicommand.
-
-        This is the recommended way to load scenes/presets. It applies all
-        configuration changes (volumes, mutes, sources, Source EQ, power) in a single
-        PBus packet for maximum efficiency and atomicity.
+        Build the scene context from decoded register values.
 
         Args:
-            scene_config: Dictionary with scene configuration:
-                - volumes: List[float] - Volume levels 0.0-1.0 for channels 1-4
-                - mutes: List[bool] - Mute states for channels 1-4
-                - sources: List[int] - Source IDs for channels 1-4
-                - source_eq: List[Dict] - Source EQ settings (2 bands) (optional)
-                - standby: bool - Standby state (optional)
+            values: Decoded values holding 'manual_source' and 'zone_enable'
+
+        Returns:
+            Scene context, or None if either register could not be read
+        """
+        if values.get('manual_source') is None or values.get('zone_enable') is None:
+            return None
+        return (values['manual_source'] & 0xFFFF0000, tuple(values['zone_enable']))
+
+    async def read_scene_context(self) -> SceneContext:
+        """
+        Read the device state compile_scene depends on in one request.
+
+        Registers that cannot be read fall back to 0 for the upper source
+        selection bytes and to no enabled zones (Source EQ on channels 1-2).
+
+        Returns:
+            Scene context for compile_scene
 
         Raises:
-            ValueError: If configuration is invalid
             ConnectionError: If not connected
             TimeoutError: If request times out
+        """
+        responses = await self._request(SCENE_CONTEXT_PLAN.commands)
+        values = SCENE_CONTEXT_PLAN.decode(responses)
+        if values['manual_source'] is None:
+            _LOGGER.warning("Could not read current source selection, using 0x00000000")
+            values['manual_source'] = 0
+        if values['zone_enable'] is None:
+            _LOGGER.warning("Could not read zone enable status, defaulting to channels 1-2")
+            values['zone_enable'] = ()
+        return self.scene_context(values)
 
-        Example:
-            scene = {
-                "volumes": [0.7, 0.7, 0.5, 0.5],
-                "mutes": [False, False, False, False],
-                "sources": [1, 1, 2, 2],
-                "source_eq": [{"enabled": 1, "type": 0, ...}, ...],
-                "standby": False
-            }
-            await client.apply_scene(scene)
+    @staticmethod
+    def compile_scene(scene_config: Dict[str, Any], context: SceneContext) -> List[WriteCommand]:
+        """
+        Build the write commands of a scene without any I/O.
+
+        Args:
+            scene_config: Scene configuration (see apply_scene)
+            context: Device state from read_scene_context or the poll
+
+        Returns:
+            Write commands for volumes, mutes, sources, Source EQ and power
+
+        Raises:
+            ValueError: If configuration is invalid
         """
         commands = []
 
@@ -1005,75 +1128,40 @@ class MezzoClient:
             value = MUTE_ON if muted else MUTE_OFF
             commands.append(WriteCommand(addr, uint8_to_bytes(value)))
 
-        # Source selection - use byte-packed Manual Source Selection register
-        # Channels 1 & 2 are stored in bytes 0 & 1 of a single 32-bit register
-        # Read current value first
-        read_cmd = ReadCommand(ADDR_MANUAL_SOURCE_SELECTION, 4)
-        read_responses = await self._udp.send_request([read_cmd])
-
-        if read_responses[0].is_nak():
-            _LOGGER.warning("Could not read current source selection, using 0x00000000")
-            current_source_value = 0
-        else:
-            current_source_value = bytes_to_int32(read_responses[0].data)
+        source_upper, zone_enable = context
 
-        # Build new packed value with sources for channels 1 & 2
+        # Source selection - use byte-packed Manual Source Selection register
+        # Channels 1 & 2 are stored in bytes 0 & 1 of a single 32-bit register;
         # Mezzo 602 AD only has 2 output channels, ignore channels 3 & 4 from scene
         ch1_source = scene_config['sources'][0]
         ch2_source = scene_config['sources'][1]
-
-        # Valid source IDs: 1,3,5,7,9,11,13,15 (odd numbers)
-        valid_source_ids = {1, 3, 5, 7, 9, 11, 13, 15}
-        if ch1_source not in valid_source_ids:
-            raise ValueError(f"Channel 1 source ID must be one of {valid_source_ids}")
-        if ch2_source not in valid_source_ids:
-            raise ValueError(f"Channel 2 source ID must be one of {valid_source_ids}")
+        if ch1_source not in VALID_SOURCE_IDS:
+            raise ValueError(f"Channel 1 source ID must be one of {VALID_SOURCE_IDS}")
+        if ch2_source not in VALID_SOURCE_IDS:
+            raise ValueError(f"Channel 2 source ID must be one of {VALID_SOURCE_IDS}")
 
         # Pack both channels into one value: ch1 in byte 0, ch2 in byte 1
-        new_source_value = (current_source_value & 0xFFFF0000) | ch1_source | (ch2_source << 8)
-        commands.append(WriteCommand(ADDR_MANUAL_SOURCE_SELECTION, int32_to_bytes(new_source_value)))
+        new_source_value = source_upper | ch1_source | (ch2_source << 8)
+        commands.append(WriteCommand(ADDR_MANUAL_SOURCE_SELECTION, uint32_to_bytes(new_source_value)))
 
         # Source EQ settings (optional) - write to all enabled zone channels
         if 'source_eq' in scene_config:
             from .mezzo_memory_map import (
                 get_source_eq_biquad_address,
                 NUM_SOURCE_EQ_BANDS,
-                ADDR_ZONE_ENABLE_CH1,
             )
 
             source_eq_bands = scene_config['source_eq']
             if len(source_eq_bands) != NUM_SOURCE_EQ_BANDS:
                 raise ValueError(f"Scene Source EQ must contain {NUM_SOURCE_EQ_BANDS} band configurations")
 
-            # Read zone enable status to find which output channels are active
-            zone_enable_cmd = ReadCommand(ADDR_ZONE_ENABLE_CH1, 4)
-            zone_responses = await self._udp.send_request([zone_enable_cmd])
-
-            if zone_responses[0].is_nak():
-                _LOGGER.warning("Could not read zone enable status, defaulting to channels 1-2")
+            enabled_channels = [ch + 1 for ch, enabled in enumerate(zone_enable) if enabled]
+            if not enabled_channels:
                 enabled_channels = [1, 2]
-            else:
-                zone_data = zone_responses[0].data
-                enabled_channels = [ch + 1 for ch in range(4) if ch < len(zone_data) and zone_data[ch] != 0]
-                if not enabled_channels:
-                    enabled_channels = [1, 2]
 
             # Write each Source EQ band to all enabled output channels
             for band in range(1, NUM_SOURCE_EQ_BANDS + 1):
-                band_config = source_eq_bands[band - 1]
-
-                # Build BiQuad structure (24 bytes)
-                biquad_data = struct.pack(
-                    '<IIffIf',
-                    band_config.get('enabled', 0),
-                    band_config.get('type', 0),
-                    band_config.get('q', 1.0),
-                    band_config.get('slope', 1.0),
-                    band_config.get('frequency', 1000),
-                    band_config.get('gain', 1.0),
-                )
-
-                # Write to all enabled zone channels
+                biquad_data = pack_biquad(source_eq_bands[band - 1])
                 for channel in enabled_channels:
                     addr = get_source_eq_biquad_address(band, channel)
                     commands.append(WriteCommand(addr, biquad_data))
@@ -1084,41 +1172,371 @@ class MezzoClient:
             value = STANDBY_ACTIVATE if standby else STANDBY_DEACTIVATE
             commands.append(WriteCommand(ADDR_STANDBY_TRIGGER, uint32_to_bytes(value)))
 
-        # Send commands in batches for better performance
-        # We can batch commands efficiently now that write response parsing is fixed
+        return commands
+
+    async def apply_scene(
+        self,
+        scene_config: Dict[str, Any],
+        diff: Optional[bool] = None,
+        transition: Optional[float] = None,
+    ) -> ApplyReport:
+        """
+        Apply a complete scene configuration via multicommand.
+
+        This is the recommended way to load scenes/presets. It applies all
+        configuration changes (volumes, mutes, sources, Source EQ, power) in a single
+        PBus packet for maximum efficiency and atomicity.
+
+        The scene context is read first; scenes precompiled by
+        SceneFrameCache skip that read and go out with apply_scene_frame.
+
+        In differential mode the compiled writes are compared with the
+        register image and only those that change something are sent, with
+        adjacent ones merged; the scene context comes from the image too
+        when it is known. Already active settings (in particular the
+        standby trigger and the source register) are then not rewritten.
+
+        With a transition the volumes are ramped (see ramp_volume) instead
+        of written: unmutes and the other settings go out first, mutes
+        after the fade.
+
+        Args:
+            scene_config: Dictionary with scene configuration:
+                - volumes: List[float] - Volume levels 0.0-1.0 for channels 1-4
+                - mutes: List[bool] - Mute states for channels 1-4
+                - sources: List[int] - Source IDs for channels 1-4
+                - source_eq: List[Dict] - Source EQ settings (2 bands) (optional)
+                - standby: bool - Standby state (optional)
+            diff: Write only changed registers (defaults to self.scene_diff)
+            transition: Seconds to fade volumes over (defaults to
+                        self.scene_transition, 0 = write at once)
+
+        Returns:
+            Commands and bytes sent compared with a full write (ramped
+            volumes are not counted as sent)
+
+        Raises:
+            ValueError: If configuration is invalid
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+
+        Example:
+            scene = {
+                "volumes": [0.7, 0.7, 0.5, 0.5],
+                "mutes": [False, False, False, False],
+                "sources": [1, 1, 2, 2],
+                "source_eq": [{"enabled": 1, "type": 0, ...}, ...],
+                "standby": False
+            }
+            await client.apply_scene(scene)
+        """
+        if diff is None:
+            diff = self.scene_diff
+        if transition is None:
+            transition = self.scene_transition
+        context = self._image_scene_context() if diff else None
+        if context is None:
+            context = await self.read_scene_context()
+        commands = self.compile_scene(scene_config, context)
+
+        fades: Dict[int, float] = {}
+        immediate = commands
+        deferred: List[WriteCommand] = []
+        if transition > 0:
+            gains = {get_user_gain_address(ch): ch for ch in range(1, NUM_CHANNELS + 1)}
+            mutes = {get_user_mute_address(ch) for ch in range(1, NUM_CHANNELS + 1)}
+            mute_on = uint8_to_bytes(MUTE_ON)
+            fades = {
+                gains[cmd.address]: scene_config['volumes'][gains[cmd.address] - 1]
+                for cmd in commands
+                if cmd.address in gains and (not diff or self.register_image.changed(cmd))
+            }
+            immediate = [cmd for cmd in commands if cmd.address not in gains]
+            # Mute after fading out, unmute before fading in
+            deferred = [cmd for cmd in immediate if cmd.address in mutes and cmd.data == mute_on]
+            immediate = [cmd for cmd in immediate if cmd not in deferred]
+        if diff:
+            immediate = self.register_image.diff(immediate)
+            deferred = self.register_image.diff(deferred)
+        report = ApplyReport(
+            commands=len(commands),
+            bytes=command_bytes(commands),
+            commands_sent=len(immediate) + len(deferred),
+            bytes_sent=command_bytes(immediate) + command_bytes(deferred),
+        )
+        self.last_scene_report = report
+
         scene_name = scene_config.get('name', 'Unknown')
-        _LOGGER.info("Applying scene '%s' with %d commands", scene_name, len(commands))
+        if not immediate and not deferred and not fades:
+            _LOGGER.info("Scene '%s' already active, nothing to write", scene_name)
+            return report
+        _LOGGER.info("Applying scene '%s' with %d commands (%d bytes saved, %d volumes faded over %.1fs)",
+                     scene_name, report.commands_sent, report.bytes_saved, len(fades), transition)
 
         try:
-            # Split into reasonable batch sizes (12 commands per batch = volumes + mutes + sources)
-            # This way we can send basic controls, then EQ, then power
-            batch_size = 12
-            failed_count = 0
-
-            for batch_start in range(0, len(commands), batch_size):
-                batch = commands[batch_start:batch_start + batch_size]
-                try:
-                    responses = await self._udp.send_request(batch, timeout=3.0)
-                    # Check for NAKs
-                    for i, resp in enumerate(responses):
-                        if resp.is_nak():
-                            cmd_idx = batch_start + i
-                            _LOGGER.warning("Command %d/%d NAK (addr=0x%08x)",
-                                          cmd_idx+1, len(commands), commands[cmd_idx].address)
-                            failed_count += 1
-                except Exception as batch_err:
-                    _LOGGER.warning("Batch %d-%d failed: %s",
-                                  batch_start+1, min(batch_start+batch_size, len(commands)), batch_err)
-                    failed_count += len(batch)
+            failed_count = await self._send_scene_commands(immediate)
+            if fades:
+                await asyncio.gather(*(
+                    self.ramp_volume(ch, volume, transition) for ch, volume in fades.items()
+                ))
+            failed_count += await self._send_scene_commands(deferred)
 
             if failed_count > 0:
-                _LOGGER.warning("Scene '%s' applied with %d/%d failures", scene_name, failed_count, len(commands))
+                _LOGGER.warning("Scene '%s' applied with %d/%d failures",
+                                scene_name, failed_count, report.commands_sent)
             else:
                 _LOGGER.info("Scene '%s' applied successfully", scene_name)
 
         except Exception as err:
             _LOGGER.error("Failed to apply scene '%s': %s", scene_name, err)
             raise
+        return report
+
+    async def _send_scene_commands(self, commands: List[WriteCommand]) -> int:
+        """
+        Send scene writes in batches.
+
+        Returns:
+            Number of commands that were NAKed or whose batch failed
+        """
+        # Split into reasonable batch sizes (12 commands per batch = volumes + mutes + sources)
+        # This way we can send basic controls, then EQ, then power
+        batch_size = 12
+        failed_count = 0
+
+        for batch_start in range(0, len(commands), batch_size):
+            batch = commands[batch_start:batch_start + batch_size]
+            try:
+                responses = await self._request(batch, timeout=3.0)
+                # Check for NAKs
+                for i, resp in enumerate(responses):
+                    if resp.is_nak():
+                        cmd_idx = batch_start + i
+                        _LOGGER.warning("Command %d/%d NAK (addr=0x%08x)",
+                                      cmd_idx+1, len(commands), commands[cmd_idx].address)
+                        failed_count += 1
+            except Exception as batch_err:
+                _LOGGER.warning("Batch %d-%d failed: %s",
+                              batch_start+1, min(batch_start+batch_size, len(commands)), batch_err)
+                failed_count += len(batch)
+        return failed_count
+
+    def _image_scene_context(self) -> Optional[SceneContext]:
+        """Scene context from the register image, or None if not known."""
+        source = self.register_image.lookup(ADDR_MANUAL_SOURCE_SELECTION, 4)
+        zone_enable = self.register_image.lookup(ADDR_ZONE_ENABLE_CH1, NUM_CHANNELS)
+        if source is None or zone_enable is None:
+            return None
+        return self.scene_context({
+            'manual_source': bytes_to_int32(source),
+            'zone_enable': zone_enable,
+        })
+
+    async def apply_scene_frame(self, frame) -> ApplyReport:
+        """
+        Apply a precompiled scene: one sendto and one acknowledgement.
+
+        Args:
+            frame: SceneFrame from SceneFrameCache
+
+        Returns:
+            Commands and bytes sent (always the full scene)
+
+        Raises:
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        _LOGGER.info("Applying scene '%s' from precompiled frame (%d commands, %d bytes)",
+                     frame.name, len(frame.commands), len(frame.escaped_body))
+        async with self._udp.exclusive():
+            pending = self.post_scene_frame(frame)
+            return await self.finish_scene_frame(frame, pending, timeout=3.0)
+
+    def exclusive(self):
+        """
+        Lock held while a request is in flight (use with async with).
+
+        Holding it allows post_scene_frame and finish_scene_frame to be
+        split, e.g. to send frames to several amplifiers at one instant.
+        """
+        return self._udp.exclusive()
+
+    def stamp_scene_frame(self, frame) -> Tuple[bytes, bytes]:
+        """
+        Stamp a precompiled scene with a fresh TAG.
+
+        Every send gets its own TAG, so a late reply to an earlier send of
+        the same scene cannot acknowledge this one.
+
+        Args:
+            frame: SceneFrame from SceneFrameCache
+
+        Returns:
+            (tag, packet) for post_scene_frame
+        """
+        tag = self._udp.new_tag()
+        return tag, frame.stamp(tag)
+
+    def post_scene_frame(self, frame, stamped: Optional[Tuple[bytes, bytes]] = None):
+        """
+        Send a precompiled scene without waiting for the acknowledgement.
+
+        The caller must hold exclusive() and pass the result to
+        finish_scene_frame.
+
+        Args:
+            frame: SceneFrame from SceneFrameCache
+            stamped: (tag, packet) from stamp_scene_frame, made while
+                     holding exclusive(); stamped here if None
+
+        Returns:
+            Pending request; its sent_ns is the send time
+
+        Raises:
+            ConnectionError: If not connected
+        """
+        try:
+            tag, packet = stamped or self.stamp_scene_frame(frame)
+            return self._udp.post_packet(tag, packet)
+        except Exception:
+            self.register_image.track(frame.commands, [])
+            raise
+
+    async def finish_scene_frame(self, frame, pending, timeout: float = 3.0) -> ApplyReport:
+        """
+        Wait for the acknowledgement of a posted scene frame.
+
+        Args:
+            frame: SceneFrame passed to post_scene_frame
+            pending: Request returned by post_scene_frame
+            timeout: Seconds to wait
+
+        Returns:
+            Commands and bytes sent (always the full scene)
+
+        Raises:
+            TimeoutError: If the acknowledgement does not arrive in time
+        """
+        commands = frame.commands
+        try:
+            responses = await self._udp.wait_response(pending, timeout)
+        except Exception:
+            self.register_image.track(commands, [])
+            raise
+        self.register_image.track(commands, responses)
+        size = command_bytes(commands)
+        report = ApplyReport(len(commands), size, len(commands), size)
+        self.last_scene_report = report
+
+        failed = [cmd.address for cmd, resp in zip(commands, responses) if resp.is_nak()]
+        failed.extend(cmd.address for cmd in commands[len(responses):])
+        for addr in failed:
+            _LOGGER.warning("Scene command NAK (addr=0x%08x)", addr)
+        if failed:
+            _LOGGER.warning("Scene '%s' applied with %d/%d failures",
+                            frame.name, len(failed), len(commands))
+        else:
+            _LOGGER.info("Scene '%s' applied successfully", frame.name)
+        return report
+
+    # ========================================================================
+    # Ramps
+    # ========================================================================
+
+    @property
+    def ramps(self) -> RampEngine:
+        """Shared tick scheduler of this amplifier's volume and EQ ramps."""
+        if self._ramps is None:
+            self._ramps = RampEngine(self)
+        return self._ramps
+
+    async def _known_or_read(self, address: int, size: int) -> bytes:
+        """Return register bytes from the register image, reading them if unknown."""
+        data = self.register_image.lookup(address, size)
+        if data is not None:
+            return data
+        responses = await self._request([ReadCommand(address, size)])
+        if responses[0].is_nak():
+            raise ValueError(f"Failed to read 0x{address:08x}")
+        return responses[0].data
+
+    async def ramp_volume(self, channel: int, volume: float, duration: float) -> bool:
+        """
+        Fade a channel's volume to a new level.
+
+        The gain is interpolated in dB, so fades sound even; levels below
+        RAMP_FLOOR_DB are written as silence. Starting a ramp on a channel
+        that is already fading retargets it from where it is.
+
+        Args:
+            channel: Channel number (1-4)
+            volume: Target volume 0.0-1.0 (linear gain)
+            duration: Fade time in seconds
+
+        Returns:
+            True once the target is set, False if the fade was replaced
+            or cancelled
+
+        Raises:
+            ValueError: If channel or volume out of range
+            ConnectionError: If not connected
+            TimeoutError: If the start level cannot be read
+        """
+        if not 1 <= channel <= NUM_CHANNELS:
+            raise ValueError(f"Channel must be 1-{NUM_CHANNELS}")
+        if not 0.0 <= volume <= 1.0:
+            raise ValueError("Volume must be between 0.0 and 1.0")
+
+        addr = get_user_gain_address(channel)
+        start = RAMP_FLOOR_DB
+        if self.ramps.current(addr) is None:
+            start = self.volume_to_db(bytes_to_float(await self._known_or_read(addr, 4)))
+        _LOGGER.debug("Ramping channel %d volume to %.2f over %.2fs", channel, volume, duration)
+        return await self.ramps.ramp(
+            addr,
+            max(start, RAMP_FLOOR_DB),
+            max(self.volume_to_db(volume), RAMP_FLOOR_DB),
+            duration,
+            _encode_ramp_db,
+        )
+
+    async def ramp_eq_gain(self, channel: int, band: int, gain: float, duration: float) -> bool:
+        """
+        Move a User EQ band's gain to a new value.
+
+        The gain field is interpolated linearly in its own units; the rest
+        of the BiQuad keeps its current settings.
+
+        Args:
+            channel: Channel number (1-4)
+            band: Band number (1-4)
+            gain: Target gain
+            duration: Ramp time in seconds
+
+        Returns:
+            True once the target is set, False if the ramp was replaced
+            or cancelled
+
+        Raises:
+            ValueError: If channel or band out of range, or the band cannot be read
+            ConnectionError: If not connected
+            TimeoutError: If the current band cannot be read
+        """
+        if not 1 <= channel <= NUM_CHANNELS:
+            raise ValueError(f"Channel must be 1-{NUM_CHANNELS}")
+        if not 1 <= band <= NUM_EQ_BANDS:
+            raise ValueError(f"Band must be 1-{NUM_EQ_BANDS}")
+
+        addr = get_user_eq_biquad_address(channel, band)
+        biquad = unpack_biquad(await self._known_or_read(addr, EQ_BIQUAD_SIZE))
+        _LOGGER.debug("Ramping EQ CH%d Band%d gain to %.2f over %.2fs", channel, band, gain, duration)
+        return await self.ramps.ramp(
+            addr,
+            biquad['gain'],
+            gain,
+            duration,
+            lambda value: pack_biquad({**biquad, 'gain': value}),
+        )
 
     async def load_preset(self, speaker: int, preset_id: int) -> None:
         """
@@ -1145,7 +1563,7 @@ class MezzoClient:
         cmd = WriteCommand(addr, int32_to_bytes(preset_id))
 
         _LOGGER.info("Loading preset %d for speaker %d", preset_id, speaker)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError(f"Failed to load preset for speaker {speaker}")
@@ -1175,7 +1593,7 @@ class MezzoClient:
 
         addr = ADDR_PRESET_TYPE_SPK1 + ((speaker - 1) * 4)
         cmd = ReadCommand(addr, 4)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError(f"Failed to read preset for speaker {speaker}")
@@ -1210,7 +1628,7 @@ class MezzoClient:
             ReadCommand(get_temp_channel_address(4), 4),
         ]
 
-        responses = await self._udp.send_request(commands)
+        responses = await self._request(commands)
 
         temps = {}
         if not responses[0].is_nak():
@@ -1235,7 +1653,7 @@ class MezzoClient:
             TimeoutError: If request times out
         """
         cmd = ReadCommand(ADDR_FAULT_CODE, 1)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError("Failed to read fault code")
@@ -1264,7 +1682,7 @@ class MezzoClient:
 
         addr = get_mute_code_flags_address(channel)
         cmd = ReadCommand(addr, 4)
-        responses = await self._udp.send_request([cmd])
+        responses = await self._request([cmd])
 
         if responses[0].is_nak():
             raise ValueError(f"Failed to read mute codes for channel {channel}")
@@ -1290,72 +1708,138 @@ class MezzoClient:
             ConnectionError: If not connected
             TimeoutError: If request times out
         """
-        # Build multicommand to read all important state
-        commands = [
-            # Power
-            ReadCommand(ADDR_STANDBY_STATE, 4),
-            # Volumes (all channels) - read from user_gain
-            ReadCommand(get_user_gain_address(1), 4),
-            ReadCommand(get_user_gain_address(2), 4),
-            ReadCommand(get_user_gain_address(3), 4),
-            ReadCommand(get_user_gain_address(4), 4),
-            # Mutes (all channels)
-            ReadCommand(get_user_mute_address(1), 1),
-            ReadCommand(get_user_mute_address(2), 1),
-            ReadCommand(get_user_mute_address(3), 1),
-            ReadCommand(get_user_mute_address(4), 1),
-            # Sources (read packed manual source selection register)
-            ReadCommand(ADDR_MANUAL_SOURCE_SELECTION, 4),
-            # Temperatures
-            ReadCommand(ADDR_TEMP_TRANSFORMER, 4),
-            ReadCommand(ADDR_TEMP_HEATSINK, 4),
-            # Fault
-            ReadCommand(ADDR_FAULT_CODE, 1),
+        phases = self._udp.metrics.phases
+        start = time.perf_counter_ns()
+        commands = self.all_state_commands()
+        phases[PHASE_BUILD].record_ns(time.perf_counter_ns() - start)
+
+        if self._area_cache is not None:
+            responses = await self._read_through_cache(commands)
+        else:
+            responses = await self._request(commands)
+
+        start = time.perf_counter_ns()
+        state = self.decode_all_state(responses)
+        phases[PHASE_DECODE].record_ns(time.perf_counter_ns() - start)
+        return state
+
+    @property
+    def area_cache(self) -> Optional[AreaCache]:
+        """CRC-gated area cache, or None when change detection is off."""
+        return self._area_cache
+
+    def enable_change_detection(self, enabled: bool = True) -> None:
+        """
+        Switch CRC-gated change detection for configuration areas.
+
+        When enabled, get_all_state reads the User settings, User EQ,
+        zone settings, Source EQ and matrix only when their device-side
+        CRC16 differs from the cached image, which also picks up edits
+        made by other controllers.
+
+        Args:
+            enabled: True to poll CRCs, False to read every area each poll
+        """
+        self._area_cache = AreaCache() if enabled else None
+
+    async def _read_through_cache(self, commands: List[ReadCommand]) -> List[PBusResponse]:
+        """
+        Answer read commands from the area cache where possible.
+
+        Reads outside the cached areas go out together with one CRC
+        command per area; areas whose CRC changed are then re-read whole.
+        Reads in an area whose CRC or re-read was refused are sent as they
+        are, like without the cache.
+
+        Args:
+            commands: Read commands to answer
+
+        Returns:
+            One response per command, as if they had all been sent
+        """
+        cache = self._area_cache
+        direct = [cmd for cmd in commands if cache.area_for(cmd.address, cmd.size) is None]
+
+        responses = await self._request(direct + cache.crc_commands())
+        stale = cache.stale(responses[len(direct):])
+        for batch in cache.read_batches(stale):
+            cache.store(await self._request(batch))
+        if stale:
+            _LOGGER.debug("Re-read areas: %s", ", ".join(area.name for area in stale))
+
+        # Fall back to direct reads where the cache has no image
+        fallback = [
+            cmd for cmd in commands
+            if cache.area_for(cmd.address, cmd.size) is not None
+            and cache.lookup(cmd.address, cmd.size) is None
         ]
+        fallback_responses = iter(await self._request(fallback) if fallback else [])
+
+        direct_responses = iter(responses[:len(direct)])
+        result = []
+        for cmd in commands:
+            if cache.area_for(cmd.address, cmd.size) is None:
+                result.append(next(direct_responses))
+                continue
+            data = cache.lookup(cmd.address, cmd.size)
+            if data is None:
+                result.append(next(fallback_responses))
+            else:
+                result.append(PBusResponse(cmd.opcode, cmd.address, cmd.size, data))
+        return result
 
-        # Add User EQ band read commands (4 channels × 4 bands)
-        for ch in range(1, NUM_CHANNELS + 1):
-            for band in range(1, NUM_EQ_BANDS + 1):
-                addr = get_user_eq_biquad_address(ch, band)
-                commands.append(ReadCommand(addr, EQ_BIQUAD_SIZE))
-
-        # Add Source EQ band read commands (only from channel 1)
-        # Source EQ values are per output channel, but we only need to read from
-        # channel 1 since all enabled zone channels get written with same values
-        from .mezzo_memory_map import get_source_eq_biquad_address, NUM_SOURCE_EQ_BANDS
-        for band in range(1, NUM_SOURCE_EQ_BANDS + 1):
-            addr = get_source_eq_biquad_address(band, channel=1)
-            commands.append(ReadCommand(addr, EQ_BIQUAD_SIZE))
+    @staticmethod
+    def all_state_commands() -> List[ReadCommand]:
+        """
+        Build the multicommand read by get_all_state.
+
+        Returns:
+            Read commands for power, volumes, mutes, sources, temperatures,
+            fault code and EQ, in the order decode_all_state expects
+        """
+        return ALL_STATE_PLAN.commands
 
-        responses = await self._udp.send_request(commands)
+    @staticmethod
+    def decode_all_state(responses: List[PBusResponse]) -> Dict[str, Any]:
+        """
+        Decode the responses to all_state_commands.
 
+        Kept separate from the request so recorded traces can be replayed
+        through the same code path without an amplifier.
+
+        Args:
+            responses: Responses in all_state_commands order
+
+        Returns:
+            Dictionary containing all amplifier state including EQ
+
+        Raises:
+            ValueError: If there are fewer responses than commands
+        """
+        values = ALL_STATE_PLAN.decode(responses)
+        standby = values['standby_state']
         state = {
-            'standby': bool(bytes_to_uint32(responses[0].data)) if not responses[0].is_nak() else None,
+            'standby': bool(standby) if standby is not None else None,
             'volumes': {},
             'mutes': {},
             'sources': {},
             'temperatures': {},
-            'fault_code': None,
+            'fault_code': values['fault_code'],
             'eq': {},  # Store User EQ by channel/band: eq[channel][band]
             'source_eq': {},  # Store Source EQ by band: source_eq[band]
         }
 
-        # Parse volumes
-        for i in range(NUM_CHANNELS):
-            if not responses[1 + i].is_nak():
-                state['volumes'][i + 1] = bytes_to_float(responses[1 + i].data)
-
-        # Parse mutes
-        for i in range(NUM_CHANNELS):
-            if not responses[5 + i].is_nak():
-                state['mutes'][i + 1] = bool(bytes_to_uint8(responses[5 + i].data))
+        if values['user_gain'] is not None:
+            state['volumes'] = {ch + 1: gain for ch, gain in enumerate(values['user_gain'])}
+        if values['user_mute'] is not None:
+            state['mutes'] = {ch + 1: bool(mute) for ch, mute in enumerate(values['user_mute'])}
 
         # Parse sources (decode packed manual source selection register)
         # Store actual source IDs: 1,3,5,7,9,11,13,15 (odd numbers for all inputs)
         # 1=Input1, 5=Input2, 9=Input3, 13=Input4, 3=Dante1, 7=Dante2, 11=Dante3, 15=Dante4
         valid_sources = {1, 3, 5, 7, 9, 11, 13, 15}
-        if not responses[9].is_nak():
-            packed_value = bytes_to_int32(responses[9].data)
+        packed_value = values['manual_source']
+        if packed_value is not None:
             # Channel 1 source is in byte 0 (bits 0-7)
             ch1_source_id = packed_value & 0xFF
             state['sources'][1] = ch1_source_id if ch1_source_id in valid_sources else 1
@@ -1365,79 +1849,95 @@ class MezzoClient:
             # Channels 3 & 4 don't exist on Mezzo 602 AD (only 2 output channels)
             state['sources'][3] = 1
             state['sources'][4] = 1
+        state['scene_context'] = MezzoClient.scene_context(values)
 
-        # Parse temperatures (adjusted indices after removing per-channel source reads)
-        if not responses[10].is_nak():
-            state['temperatures']['transformer'] = bytes_to_float(responses[10].data)
-        if not responses[11].is_nak():
-            state['temperatures']['heatsink'] = bytes_to_float(responses[11].data)
-
-        # Parse fault
-        if not responses[12].is_nak():
-            state['fault_code'] = bytes_to_uint8(responses[12].data)
+        if values['temp_transformer'] is not None:
+            state['temperatures']['transformer'] = values['temp_transformer']
+        if values['temp_heatsink'] is not None:
+            state['temperatures']['heatsink'] = values['temp_heatsink']
 
-        # Parse EQ bands (starting at response index 13)
-        resp_idx = 13
+        # User EQ bands are stored channel-major; use flat defaults if the read failed
+        user_eq = values['user_eq']
         for ch in range(1, NUM_CHANNELS + 1):
-            if ch not in state['eq']:
-                state['eq'][ch] = {}
-            for band in range(1, NUM_EQ_BANDS + 1):
-                resp = responses[resp_idx]
-                resp_idx += 1
-
-                if not resp.is_nak():
-                    # Parse BiQuad structure
-                    data = resp.data
-                    enabled, filt_type, q, slope, frequency, gain = struct.unpack('<IIffIf', data)
-                    state['eq'][ch][band] = {
-                        "enabled": enabled,
-                        "type": filt_type,
-                        "q": q,
-                        "slope": slope,
-                        "frequency": frequency,
-                        "gain": gain,
-                    }
-                else:
-                    # Use default if read failed
-                    state['eq'][ch][band] = {
-                        "enabled": 0,
-                        "type": 0,
-                        "q": 1.0,
-                        "slope": 1.0,
-                        "frequency": 1000,
-                        "gain": 1.0,
-                    }
-
-        # Parse Source EQ bands (2 bands from output channel 1)
+            state['eq'][ch] = {
+                band: user_eq[(ch - 1) * NUM_EQ_BANDS + band - 1] if user_eq else dict(FLAT_BIQUAD)
+                for band in range(1, NUM_EQ_BANDS + 1)
+            }
+
+        # Source EQ bands (from output channel 1)
+        source_eq = values['source_eq']
         for band in range(1, NUM_SOURCE_EQ_BANDS + 1):
-            resp = responses[resp_idx]
-            resp_idx += 1
-
-            if not resp.is_nak():
-                # Parse BiQuad structure
-                data = resp.data
-                enabled, filt_type, q, slope, frequency, gain = struct.unpack('<IIffIf', data)
-                state['source_eq'][band] = {
-                    "enabled": enabled,
-                    "type": filt_type,
-                    "q": q,
-                    "slope": slope,
-                    "frequency": frequency,
-                    "gain": gain,
-                }
-            else:
-                # Use default if read failed
-                state['source_eq'][band] = {
-                    "enabled": 0,
-                    "type": 0,
-                    "q": 1.0,
-                    "slope": 1.0,
-                    "frequency": 1000,
-                    "gain": 1.0,
-                }
+            state['source_eq'][band] = source_eq[band - 1] if source_eq else dict(FLAT_BIQUAD)
 
         return state
 
+    # ========================================================================
+    # Memory Verification
+    # ========================================================================
+
+    async def get_crcs(self, ranges: List[tuple]) -> List[Optional[int]]:
+        """
+        Get the device-side CRC16 of several address ranges in one request.
+
+        Each reply costs 2 bytes of data regardless of the range size.
+
+        Args:
+            ranges: (address, size) tuples; each range must lie inside one
+                    PBus area
+
+        Returns:
+            CRC16 per range (same algorithm as calculate_crc16), or None
+            where the device NAKed the range
+
+        Raises:
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        responses = await self._request(
+            [CrcCommand(address, size) for address, size in ranges]
+        )
+        return [response.crc for response in responses]
+
+    async def get_crc(self, address: int, size: int) -> int:
+        """
+        Get the device-side CRC16 of an address range.
+
+        Args:
+            address: Start address
+            size: Number of bytes
+
+        Returns:
+            CRC16 of the range
+
+        Raises:
+            ValueError: If the range is NAKed (unallocated, spans areas or
+                        does not allow C)
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        crc = (await self.get_crcs([(address, size)]))[0]
+        if crc is None:
+            raise ValueError(f"CRC of 0x{address:08x}+{size} was refused (NAK)")
+        return crc
+
+    async def verify_range(self, address: int, data: bytes) -> bool:
+        """
+        Check a local copy against device memory without reading it.
+
+        Args:
+            address: Start address of the copy
+            data: Expected contents
+
+        Returns:
+            True if the device CRC16 matches the CRC16 of data
+
+        Raises:
+            ValueError: If the range is NAKed
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        return await self.get_crc(address, len(data)) == calculate_crc16(data)
+
     # ========================================================================
     # Context Manager Support
     # ========================================================================
@@ -1452,149 +1952,275 @@ class MezzoClient:
         await self.disconnect()
 
 
-async def discover_amplifiers(timeout: float = 5.0) -> Dict[str, Dict[str, Any]]:
-    """
-    Discover Powersoft amplifiers on the network.
+# Identification multicommand shared by broadcast discovery
+DISCOVERY_COMMANDS = [
+    ReadCommand(ADDR_STANDBY_STATE, 4),
+    ReadCommand(ADDR_MODEL_NAME, 20),
+    ReadCommand(ADDR_SERIAL_NUMBER, 16),
+    ReadCommand(ADDR_FIRMWARE_VERSION, 20),
+]
 
-    Scans for both Mezzo (port 8002) and QUATTROCANALI (port 1234) amplifiers.
+
+def _parse_mezzo_identification(host: str, responses: list, port: int = 8002) -> Dict[str, Any]:
+    """
+    Build a device info dictionary from an identification reply.
 
     Args:
-        timeout: Time to wait for responses
+        host: IP address of the amplifier
+        responses: Responses to DISCOVERY_COMMANDS (standby, model, serial, firmware)
+        port: UDP port the amplifier answered on
 
     Returns:
-        Dictionary mapping IP addresses to device information including protocol type
+        Device information dictionary
+    """
+    device_info = {
+        'host': host,
+        'protocol': 'mezzo',
+        'port': port,
+    }
+
+    for idx, resp in enumerate(responses):
+        _LOGGER.debug(
+            "Host %s response[%d]: opcode=0x%02x, addr=0x%08x, size=%d, is_nak=%s, data=%s",
+            host, idx, resp.opcode, resp.address, resp.size, resp.is_nak(),
+            resp.data.hex() if resp.data else "None"
+        )
+
+    # Standby state
+    if responses and not responses[0].is_nak() and responses[0].data:
+        device_info['standby'] = bool(bytes_to_uint32(responses[0].data))
+    else:
+        device_info['standby'] = False
+        _LOGGER.debug("Host %s: standby NAK, defaulting to False", host)
+
+    # Model name, serial number and firmware version (optional)
+    for idx, key in ((1, 'model'), (2, 'serial'), (3, 'firmware')):
+        value = 'Unknown'
+        if len(responses) > idx and not responses[idx].is_nak() and responses[idx].data:
+            try:
+                value = bytes_to_string(responses[idx].data)
+            except Exception as e:
+                _LOGGER.warning("Failed to parse %s for %s: %s", key, host, e)
+        else:
+            _LOGGER.debug("Host %s: %s NAK or no response", host, key)
+        device_info[key] = value
+
+    return device_info
+
+
+async def iter_discover_amplifiers(
+    timeout: float = 5.0,
+    idle_timeout: Optional[float] = 1.0,
+    expected: Optional[int] = None,
+    repeats: int = 3,
+    repeat_interval: float = 0.3,
+    broadcast_address: Optional[str] = None,
+    mezzo_port: int = 8002,
+    quattro_port: int = 1234,
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    from .quattro_protocol import build_power_command, DEFAULT_PORT as QUATTRO_PORT
+    Discover Powersoft amplifiers, yielding each one as soon as it answers.
 
-    # Try Mezzo protocol first (port 8002)
-    # Broadcast read requests for device identification
-    mezzo_commands = [
-        ReadCommand(ADDR_STANDBY_STATE, 4),
-        ReadCommand(ADDR_MODEL_NAME, 20),
-        ReadCommand(ADDR_SERIAL_NUMBER, 16),
-        ReadCommand(ADDR_FIRMWARE_VERSION, 20),
-    ]
+    Mezzo (port 8002) and QUATTROCANALI (port 1234) scans run concurrently
+    on separate sockets. Each broadcast is repeated to survive packet loss.
+    Discovery ends after `timeout`, once both scans have been quiet for
+    `idle_timeout`, or as soon as `expected` devices have been found.
 
-    _LOGGER.info("Starting amplifier discovery (scanning both Mezzo and QUATTROCANALI)...")
+    Args:
+        timeout: Maximum discovery time in seconds
+        idle_timeout: Quiet period after which a scan ends early (None = never)
+        expected: Number of devices after which discovery stops
+        repeats: Number of broadcasts per protocol
+        repeat_interval: Delay between repeated broadcasts
+        broadcast_address: Destination address (default 255.255.255.255)
+        mezzo_port: Mezzo PBus port
+        quattro_port: QUATTROCANALI port
+
+    Yields:
+        Device information dictionaries
+    """
+    if broadcast_address is None:
+        broadcast_address = BROADCAST_ADDRESS
 
-    # Scan Mezzo devices on port 8002
-    _LOGGER.info("Scanning for Mezzo amplifiers on port 8002...")
-    mezzo_responses = await UDPBroadcaster.broadcast(mezzo_commands, port=8002, timeout=timeout)
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def scan_mezzo():
+        """Feed Mezzo devices into the queue."""
+        try:
+            async for host, responses in UDPBroadcaster.iter_broadcast(
+                DISCOVERY_COMMANDS, mezzo_port, timeout, idle_timeout,
+                repeats, repeat_interval, broadcast_address,
+            ):
+                if responses:
+                    await queue.put(_parse_mezzo_identification(host, responses, mezzo_port))
+        finally:
+            queue.put_nowait(done)
+
+    async def identify_quattro_into_queue(host: str):
+        """Read INFO and STANDBY from a QUATTROCANALI device and queue it."""
+        await queue.put(await identify_quattro(host, quattro_port))
+
+    async def scan_quattro():
+        """Feed QUATTROCANALI devices into the queue."""
+        # Identification runs per device so one slow unit does not hold up the scan
+        identifications = []
+        try:
+            async for host, _ in UDPBroadcaster.iter_broadcast_quattro(
+                quattro_port, timeout, idle_timeout,
+                repeats, repeat_interval, broadcast_address,
+            ):
+                identifications.append(asyncio.create_task(identify_quattro_into_queue(host)))
+            await asyncio.gather(*identifications)
+        finally:
+            for task in identifications:
+                task.cancel()
+            queue.put_nowait(done)
+
+    _LOGGER.info("Starting amplifier discovery (scanning both Mezzo and QUATTROCANALI)...")
+    tasks = [asyncio.create_task(scan_mezzo()), asyncio.create_task(scan_quattro())]
+    seen = set()
+    running = len(tasks)
+
+    try:
+        while running:
+            item = await queue.get()
+            if item is done:
+                running -= 1
+                continue
+            # A host answering both protocols is reported once (first answer wins)
+            if item['host'] in seen:
+                continue
+            seen.add(item['host'])
+            _LOGGER.info("Discovered %s amplifier at %s: %s (S/N: %s, FW: %s)",
+                         item['protocol'], item['host'], item['model'],
+                         item['serial'], item['firmware'])
+            yield item
+            if expected is not None and len(seen) >= expected:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def discover_amplifiers(
+    timeout: float = 5.0,
+    idle_timeout: Optional[float] = 1.0,
+    expected: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Discover Powersoft amplifiers on the network.
 
-    # Scan QUATTROCANALI devices on port 1234
-    _LOGGER.info("Scanning for QUATTROCANALI amplifiers on port 1234...")
-    quattro_responses = await UDPBroadcaster.broadcast_quattro(timeout=timeout)
+    Scans for both Mezzo (port 8002) and QUATTROCANALI (port 1234) amplifiers.
 
-    _LOGGER.info("Discovery scan complete: Mezzo=%d, QUATTROCANALI=%d",
-                 len(mezzo_responses), len(quattro_responses))
+    Args:
+        timeout: Maximum time to wait for responses
+        idle_timeout: Stop early once no replies arrive for this long
+        expected: Stop as soon as this many devices have answered
 
+    Returns:
+        Dictionary mapping IP addresses to device information including protocol type
+    """
     devices = {}
+    async for device_info in iter_discover_amplifiers(timeout, idle_timeout, expected):
+        devices[device_info['host']] = device_info
 
-    # Process Mezzo responses (port 8002, PBus protocol)
-    for host, responses in mezzo_responses.items():
-        _LOGGER.info("Processing Mezzo responses from host %s: received %d response(s)",
-                    host, len(responses) if responses else 0)
+    _LOGGER.info("Discovery complete: found %d amplifier(s) total (Mezzo: %d, QUATTROCANALI: %d)",
+                 len(devices),
+                 len([d for d in devices.values() if d.get('protocol') == 'mezzo']),
+                 len([d for d in devices.values() if d.get('protocol') == 'quattrocanali']))
+    return devices
 
-        if not responses or len(responses) < 1:
-            _LOGGER.warning("Host %s: No valid Mezzo responses, skipping", host)
-            continue
 
-        # Parse responses - not all may succeed, so handle gracefully
-        device_info = {
-            'host': host,
-            'protocol': 'mezzo',
-            'port': 8002
-        }
+def expand_sweep_targets(networks: Iterable[str], ports: Iterable[int]) -> Iterator[tuple]:
+    """
+    Expand CIDR ranges and single addresses into (host, port) targets.
 
-        # Log all responses for debugging
-        for idx, resp in enumerate(responses):
-            _LOGGER.info(
-                "Host %s response[%d]: opcode=0x%02x, addr=0x%08x, size=%d, is_nak=%s, data=%s",
-                host, idx, resp.opcode, resp.address, resp.size, resp.is_nak(),
-                resp.data.hex() if resp.data else "None"
-            )
+    Args:
+        networks: CIDR ranges or single IPv4 addresses, e.g. "10.0.40.0/22"
+        ports: UDP ports to probe on every host
 
-        # Standby state (required)
-        if not responses[0].is_nak() and responses[0].data:
-            device_info['standby'] = bool(bytes_to_uint32(responses[0].data))
-            _LOGGER.info("Host %s: standby=%s", host, device_info['standby'])
-        else:
-            device_info['standby'] = False
-            _LOGGER.info("Host %s: standby NAK, defaulting to False", host)
+    Yields:
+        (host, port) tuples, lazily
 
-        # Model name (optional)
-        if len(responses) > 1 and not responses[1].is_nak() and responses[1].data:
-            try:
-                device_info['model'] = bytes_to_string(responses[1].data)
-                _LOGGER.info("Host %s: model='%s'", host, device_info['model'])
-            except Exception as e:
-                _LOGGER.warning("Failed to parse model name for %s: %s", host, e)
-                device_info['model'] = 'Unknown'
-        else:
-            device_info['model'] = 'Unknown'
-            _LOGGER.warning("Host %s: model NAK or no response", host)
+    Raises:
+        ValueError: If a network cannot be parsed
+    """
+    ports = list(ports)
+    for network in networks:
+        net = ipaddress.ip_network(network.strip(), strict=False)
+        hosts = net.hosts() if net.num_addresses > 2 else iter(net)
+        for address in hosts:
+            for port in ports:
+                yield str(address), port
+
+
+async def iter_sweep_amplifiers(
+    networks: Iterable[str],
+    ports: Iterable[int] = (8002,),
+    rate: float = 2000.0,
+    concurrency: int = 1024,
+    timeout: float = 1.0,
+    attempts: int = 2,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Find Mezzo amplifiers by unicast sweep, yielding each one as it answers.
 
-        # Serial number (optional)
-        if len(responses) > 2 and not responses[2].is_nak() and responses[2].data:
-            try:
-                device_info['serial'] = bytes_to_string(responses[2].data)
-                _LOGGER.info("Host %s: serial='%s'", host, device_info['serial'])
-            except Exception as e:
-                _LOGGER.warning("Failed to parse serial number for %s: %s", host, e)
-                device_info['serial'] = 'Unknown'
-        else:
-            device_info['serial'] = 'Unknown'
-            _LOGGER.warning("Host %s: serial NAK or no response", host)
+    Unlike broadcast discovery this reaches amplifiers on routed networks
+    and other VLANs. Every host/port pair receives the identification
+    multicommand from one shared, rate-limited socket.
 
-        # Firmware version (optional)
-        if len(responses) > 3 and not responses[3].is_nak() and responses[3].data:
-            try:
-                device_info['firmware'] = bytes_to_string(responses[3].data)
-                _LOGGER.info("Host %s: firmware='%s'", host, device_info['firmware'])
-            except Exception as e:
-                _LOGGER.warning("Failed to parse firmware version for %s: %s", host, e)
-                device_info['firmware'] = 'Unknown'
-        else:
-            device_info['firmware'] = 'Unknown'
-            _LOGGER.info("Host %s: firmware NAK or empty", host)
-
-        devices[host] = device_info
-        _LOGGER.info("Discovered Mezzo amplifier at %s: %s (S/N: %s, FW: %s)",
-                    host, device_info.get('model', 'Unknown'),
-                    device_info.get('serial', 'Unknown'),
-                    device_info.get('firmware', 'Unknown'))
-
-    # Process QUATTROCANALI responses (port 1234, custom Powersoft protocol)
-    from .quattro_protocol import QuattroResponse
-    for host, raw_data in quattro_responses.items():
-        _LOGGER.info("Processing QUATTROCANALI response from host %s: %d bytes",
-                    host, len(raw_data) if raw_data else 0)
-
-        if not raw_data or len(raw_data) < 10:
-            _LOGGER.warning("Host %s: Invalid QUATTROCANALI response, skipping", host)
+    Args:
+        networks: CIDR ranges or single IPv4 addresses to sweep
+        ports: UDP ports to probe on every host
+        rate: Maximum probes sent per second
+        concurrency: Maximum probes awaiting a reply
+        timeout: Time to wait for each probe's reply
+        attempts: Sends per target before giving up
+
+    Yields:
+        Device information dictionaries (same format as discovery)
+    """
+    sweeper = UDPSweeper(rate=rate, concurrency=concurrency, timeout=timeout, attempts=attempts)
+    targets = expand_sweep_targets(networks, ports)
+
+    async for host, port, responses in sweeper.iter_sweep(DISCOVERY_COMMANDS, targets):
+        if not responses:
             continue
+        device_info = _parse_mezzo_identification(host, responses, port)
+        _LOGGER.info("Sweep found Mezzo amplifier at %s:%d: %s (S/N: %s)",
+                     host, port, device_info['model'], device_info['serial'])
+        yield device_info
+
+
+async def sweep_amplifiers(
+    networks: Iterable[str],
+    ports: Iterable[int] = (8002,),
+    rate: float = 2000.0,
+    concurrency: int = 1024,
+    timeout: float = 1.0,
+    attempts: int = 2,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Find Mezzo amplifiers on routed networks by unicast sweep.
 
-        # Try to parse as QUATTROCANALI protocol
-        quattro_resp = QuattroResponse.parse_packet(raw_data)
-        if quattro_resp:
-            # Successfully parsed QUATTROCANALI response
-            device_info = {
-                'host': host,
-                'protocol': 'quattrocanali',
-                'port': 1234,
-                'model': 'QUATTROCANALI',  # We'll refine this later with proper queries
-                'standby': False,  # TODO: Parse from response data
-                'serial': 'Unknown',
-                'firmware': 'Unknown'
-            }
+    Args:
+        networks: CIDR ranges or single IPv4 addresses to sweep
+        ports: UDP ports to probe on every host
+        rate: Maximum probes sent per second
+        concurrency: Maximum probes awaiting a reply
+        timeout: Time to wait for each probe's reply
+        attempts: Sends per target before giving up
 
-            devices[host] = device_info
-            _LOGGER.info("Discovered QUATTROCANALI amplifier at %s", host)
-        else:
-            _LOGGER.warning("Host %s: Failed to parse QUATTROCANALI response", host)
+    Returns:
+        Dictionary mapping "host:port" to device information
+    """
+    devices = {}
+    async for device_info in iter_sweep_amplifiers(
+        networks, ports, rate, concurrency, timeout, attempts
+    ):
+        devices[f"{device_info['host']}:{device_info['port']}"] = device_info
 
-    _LOGGER.info("Discovery complete: found %d amplifier(s) total (Mezzo: %d, QUATTROCANALI: %d)",
-                 len(devices),
-                 len([d for d in devices.values() if d.get('protocol') == 'mezzo']),
-                 len([d for d in devices.values() if d.get('protocol') == 'quattrocanali']))
+    _LOGGER.info("Sweep complete: found %d amplifier(s)", len(devices))
     return devices
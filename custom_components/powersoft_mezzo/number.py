@@ -15,6 +15,8 @@ from .const import (
     CLIENT,
     UID_VOLUME,
     CHANNEL_NUMBERS,
+    CONF_PROTOCOL,
+    PROTOCOL_QUATTRO,
 )
 from .mezzo_client import MezzoClient
 from .mezzo_memory_map import NUM_EQ_BANDS, NUM_SOURCE_EQ_BANDS
@@ -37,6 +39,12 @@ async def async_setup_entry(
     for channel in CHANNEL_NUMBERS:
         entities.append(MezzoVolumeNumber(coordinator, client, entry, channel))
 
+    # QUATTROCANALI amplifiers expose output volumes only
+    if entry.data.get(CONF_PROTOCOL) == PROTOCOL_QUATTRO:
+        async_add_entities(entities)
+        _LOGGER.info("Added %d number entities (volumes)", len(entities))
+        return
+
     # Add User EQ parameter controls for each channel and band
     for channel in CHANNEL_NUMBERS:
         for band in range(1, NUM_EQ_BANDS + 1):
@@ -100,8 +108,11 @@ class MezzoVolumeNumber(CoordinatorEntity, NumberEntity):
         try:
             # Convert percentage (0-100) to linear gain (0.0-1.0)
             linear_gain = value / 100.0
-            await self._client.set_volume(self._channel, linear_gain)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_optimistic(
+                ("volumes", self._channel),
+                linear_gain,
+                lambda: self._client.set_volume(self._channel, linear_gain),
+            )
         except Exception as err:
             _LOGGER.error(
                 "Failed to set volume for channel %d: %s", self._channel, err
@@ -156,21 +167,7 @@ class MezzoEQFrequencyNumber(CoordinatorEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the frequency."""
         try:
-            # Read current settings
-            current = await self._client.get_eq_band(self._channel, self._band)
-
-            # Write back with new frequency
-            await self._client.set_eq_band(
-                self._channel,
-                self._band,
-                enabled=current["enabled"],
-                filt_type=current["type"],
-                q=current["q"],
-                slope=current["slope"],
-                frequency=int(value),
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_eq_band(self._channel, self._band, frequency=int(value))
         except Exception as err:
             _LOGGER.error(
                 "Failed to set EQ frequency for CH%d Band%d: %s",
@@ -229,21 +226,7 @@ class MezzoEQGainNumber(CoordinatorEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the gain in dB."""
         try:
-            # Read current settings
-            current = await self._client.get_eq_band(self._channel, self._band)
-
-            # Write back with new gain (value is already in dB)
-            await self._client.set_eq_band(
-                self._channel,
-                self._band,
-                enabled=current["enabled"],
-                filt_type=current["type"],
-                q=current["q"],
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=value,  # Send dB value directly
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_eq_band(self._channel, self._band, gain=value)
         except Exception as err:
             _LOGGER.error(
                 "Failed to set EQ gain for CH%d Band%d: %s",
@@ -300,21 +283,7 @@ class MezzoEQQNumber(CoordinatorEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the Q factor."""
         try:
-            # Read current settings
-            current = await self._client.get_eq_band(self._channel, self._band)
-
-            # Write back with new Q
-            await self._client.set_eq_band(
-                self._channel,
-                self._band,
-                enabled=current["enabled"],
-                filt_type=current["type"],
-                q=value,
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_eq_band(self._channel, self._band, q=value)
         except Exception as err:
             _LOGGER.error(
                 "Failed to set EQ Q for CH%d Band%d: %s",
@@ -370,20 +339,7 @@ class MezzoSourceEQFrequencyNumber(CoordinatorEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the frequency."""
         try:
-            # Read current settings
-            current = await self._client.get_source_eq_band(self._band)
-
-            # Write back with new frequency
-            await self._client.set_source_eq_band(
-                self._band,
-                enabled=current["enabled"],
-                filt_type=current["type"],
-                q=current["q"],
-                slope=current["slope"],
-                frequency=int(value),
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_source_eq_band(self._band, frequency=int(value))
         except Exception as err:
             _LOGGER.error(
                 "Failed to set Source EQ frequency for Band%d: %s",
@@ -435,20 +391,7 @@ class MezzoSourceEQGainNumber(CoordinatorEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the gain."""
         try:
-            # Read current settings
-            current = await self._client.get_source_eq_band(self._band)
-
-            # Write back with new gain
-            await self._client.set_source_eq_band(
-                self._band,
-                enabled=current["enabled"],
-                filt_type=current["type"],
-                q=current["q"],
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=value,
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_source_eq_band(self._band, gain=value)
         except Exception as err:
             _LOGGER.error(
                 "Failed to set Source EQ gain for Band%d: %s",
@@ -500,20 +443,7 @@ class MezzoSourceEQQNumber(CoordinatorEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the Q factor."""
         try:
-            # Read current settings
-            current = await self._client.get_source_eq_band(self._band)
-
-            # Write back with new Q
-            await self._client.set_source_eq_band(
-                self._band,
-                enabled=current["enabled"],
-                filt_type=current["type"],
-                q=value,
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_source_eq_band(self._band, q=value)
         except Exception as err:
             _LOGGER.error(
                 "Failed to set Source EQ Q for Band%d: %s",
@@ -0,0 +1,230 @@
+"""
+OpenMetrics Exporter for Powersoft Amplifiers.
+
+Renders the last polled state and the transport metrics of every
+amplifier that has metrics export enabled, in the OpenMetrics text format
+Prometheus scrapes.
+
+Scrapes never touch the amplifiers. Each amplifier's samples are
+rendered when its coordinator publishes a poll result and kept per metric
+family; a scrape only concatenates the cached lines, and the joined
+document itself is reused until one of the amplifiers updates again.
+"""
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import METRICS_EXPORTER
+from .transport_metrics import BUCKET_BOUNDS, LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+METRICS_URL = "/api/powersoft_mezzo/metrics"
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# (family, type, help); samples are emitted in this order
+FAMILIES = (
+    ("powersoft_up", "gauge", "Whether the last poll of the amplifier succeeded"),
+    ("powersoft_standby", "gauge", "Whether the amplifier is in standby"),
+    ("powersoft_volume", "gauge", "Channel volume (0.0 to 1.0)"),
+    ("powersoft_gain_db", "gauge", "Channel output gain in dB"),
+    ("powersoft_mute", "gauge", "Whether the channel is muted"),
+    ("powersoft_source", "gauge", "Selected source of the channel"),
+    ("powersoft_temperature_celsius", "gauge", "Amplifier temperatures"),
+    ("powersoft_fault_code", "gauge", "Current fault code (0 = no fault)"),
+    ("powersoft_alarms", "gauge", "Alarm bitfield (QUATTROCANALI)"),
+    ("powersoft_load_impedance_ohms", "gauge", "Measured load impedance (QUATTROCANALI)"),
+    ("powersoft_requests", "counter", "Requests sent, excluding retransmits"),
+    ("powersoft_retransmits", "counter", "Retransmitted requests"),
+    ("powersoft_timeouts", "counter", "Requests that timed out"),
+    ("powersoft_naks", "counter", "NAKed PBus commands"),
+    ("powersoft_unmatched_replies", "counter", "Replies matching no outstanding request"),
+    ("powersoft_parse_errors", "counter", "Replies that failed CRC or parsing"),
+    ("powersoft_sent_bytes", "counter", "Bytes sent, including retransmits"),
+    ("powersoft_received_bytes", "counter", "Bytes received"),
+    ("powersoft_rtt_seconds", "histogram", "Request round-trip time"),
+    ("powersoft_poll_duration_seconds", "histogram", "Coordinator poll duration"),
+)
+
+# Export one histogram bucket per octave of the recorded buckets
+_EXPORT_STEP = 4
+_EXPORT_BOUNDS = [
+    (index, repr(BUCKET_BOUNDS[index]))
+    for index in range(0, len(BUCKET_BOUNDS), _EXPORT_STEP)
+]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _histogram(name: str, labels: str, histogram: LatencyHistogram) -> str:
+    """Render a histogram with cumulative buckets."""
+    lines = []
+    counts = histogram.counts
+    cumulative = 0
+    previous = 0
+    for index, bound in _EXPORT_BOUNDS:
+        cumulative += sum(counts[previous:index + 1])
+        previous = index + 1
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}\n')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}\n')
+    lines.append(f'{name}_count{{{labels}}} {histogram.count}\n')
+    lines.append(f'{name}_sum{{{labels}}} {histogram.total}\n')
+    return "".join(lines)
+
+
+def render_amplifier(labels: str, state: Optional[Dict[str, Any]], up: bool, metrics) -> Dict[str, str]:
+    """
+    Render the samples of one amplifier.
+
+    Args:
+        labels: Pre-rendered label pairs identifying the amplifier
+        state: Last get_all_state result (None before the first poll)
+        up: Whether the last poll succeeded
+        metrics: TransportMetrics of the amplifier's client
+
+    Returns:
+        Sample lines keyed by metric family
+    """
+    out: Dict[str, List[str]] = {}
+
+    def add(family: str, value: Any, extra: str = "") -> None:
+        if value is None:
+            return
+        out.setdefault(family, []).append(
+            f"{family}{{{labels}{extra}}} {float(value)!r}\n"
+        )
+
+    add("powersoft_up", up)
+    state = state or {}
+    add("powersoft_standby", state.get("standby"))
+    for family, key in (
+        ("powersoft_volume", "volumes"),
+        ("powersoft_gain_db", "gains_db"),
+        ("powersoft_mute", "mutes"),
+        ("powersoft_source", "sources"),
+    ):
+        for channel, value in sorted((state.get(key) or {}).items()):
+            add(family, value, f',channel="{channel}"')
+    for sensor, value in sorted((state.get("temperatures") or {}).items()):
+        add("powersoft_temperature_celsius", value, f',sensor="{sensor}"')
+    add("powersoft_fault_code", state.get("fault_code"))
+
+    alarms = state.get("alarms")
+    if alarms:
+        add("powersoft_alarms", alarms.get("global"), ',scope="global"')
+        for channel, value in enumerate(alarms.get("channels") or (), start=1):
+            add("powersoft_alarms", value, f',scope="channel",channel="{channel}"')
+    for channel, load in sorted((state.get("loads") or {}).items()):
+        add("powersoft_load_impedance_ohms", load.get("impedance_ohm"), f',channel="{channel}"')
+
+    for family, value in (
+        ("powersoft_requests", metrics.requests),
+        ("powersoft_retransmits", metrics.retransmits),
+        ("powersoft_timeouts", metrics.timeouts),
+        ("powersoft_naks", metrics.naks),
+        ("powersoft_unmatched_replies", metrics.unknown_tags),
+        ("powersoft_parse_errors", metrics.parse_errors),
+        ("powersoft_sent_bytes", metrics.bytes_out),
+        ("powersoft_received_bytes", metrics.bytes_in),
+    ):
+        out[family] = [f"{family}_total{{{labels}}} {value}\n"]
+
+    rendered = {family: "".join(lines) for family, lines in out.items()}
+    rendered["powersoft_rtt_seconds"] = _histogram("powersoft_rtt_seconds", labels, metrics.rtt)
+    rendered["powersoft_poll_duration_seconds"] = _histogram(
+        "powersoft_poll_duration_seconds", labels, metrics.poll
+    )
+    return rendered
+
+
+class FleetMetricsExporter:
+    """Cached OpenMetrics document for all exported amplifiers."""
+
+    def __init__(self):
+        """Initialize an empty exporter."""
+        self._blocks: Dict[str, Dict[str, str]] = {}
+        self._unsubscribe: Dict[str, Callable[[], None]] = {}
+        self._document: Optional[bytes] = None
+
+    @property
+    def amplifiers(self) -> int:
+        """Number of amplifiers being exported."""
+        return len(self._blocks)
+
+    @callback
+    def add_amplifier(self, entry_id: str, name: str, coordinator, client) -> None:
+        """
+        Start exporting an amplifier.
+
+        Its samples are re-rendered every time the coordinator publishes,
+        whether the poll succeeded or not.
+        """
+        self.remove_amplifier(entry_id)
+        labels = f'entry_id="{_escape(entry_id)}",name="{_escape(name)}"'
+
+        @callback
+        def update() -> None:
+            self._blocks[entry_id] = render_amplifier(
+                labels, coordinator.data, coordinator.last_update_success, client.metrics
+            )
+            self._document = None
+
+        update()
+        self._unsubscribe[entry_id] = coordinator.async_add_listener(update)
+
+    @callback
+    def remove_amplifier(self, entry_id: str) -> None:
+        """Stop exporting an amplifier."""
+        unsubscribe = self._unsubscribe.pop(entry_id, None)
+        if unsubscribe is not None:
+            unsubscribe()
+        if self._blocks.pop(entry_id, None) is not None:
+            self._document = None
+
+    def render(self) -> bytes:
+        """Return the OpenMetrics document, rebuilding it only if stale."""
+        if self._document is None:
+            parts = []
+            blocks = list(self._blocks.values())
+            for family, kind, description in FAMILIES:
+                parts.append(f"# TYPE {family} {kind}\n# HELP {family} {description}\n")
+                parts.extend(block[family] for block in blocks if family in block)
+            parts.append("# EOF\n")
+            self._document = "".join(parts).encode()
+        return self._document
+
+
+class MezzoMetricsView(HomeAssistantView):
+    """Serve the fleet metrics to Prometheus."""
+
+    url = METRICS_URL
+    name = "api:powersoft_mezzo:metrics"
+
+    def __init__(self, exporter: FleetMetricsExporter):
+        """Initialize the view."""
+        self._exporter = exporter
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the cached metrics document."""
+        return web.Response(
+            body=self._exporter.render(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+@callback
+def async_get_exporter(hass: HomeAssistant) -> FleetMetricsExporter:
+    """Return the shared exporter, registering the HTTP view on first use."""
+    exporter = hass.data.get(METRICS_EXPORTER)
+    if exporter is None:
+        exporter = FleetMetricsExporter()
+        hass.data[METRICS_EXPORTER] = exporter
+        hass.http.register_view(MezzoMetricsView(exporter))
+        _LOGGER.info("OpenMetrics endpoint available at %s", METRICS_URL)
+    return exporter
@@ -0,0 +1,244 @@
+"""
+Packet Trace Recorder for Powersoft Amplifiers.
+
+Keeps the most recent raw request and reply frames of one UDP manager in
+a fixed-size ring buffer, and converts them to and from pcap so a trace
+can be opened in Wireshark or replayed through the decoders offline.
+
+Recording is opt-in; when enabled it costs one tuple and one deque append
+per frame, and the oldest frames are dropped once the buffer is full.
+"""
+import socket
+import struct
+import time
+from collections import deque
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple
+
+DIRECTION_OUT = "out"
+DIRECTION_IN = "in"
+
+DEFAULT_TRACE_FRAMES = 256
+MAX_TRACE_FRAMES = 4096
+
+# pcap (microsecond timestamps)
+PCAP_MAGIC = 0xA1B2C3D4
+PCAP_MAGIC_NS = 0xA1B23C4D
+PCAP_SNAPLEN = 65535
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_IPV4 = 228
+
+_PCAP_HEADER = struct.Struct('<IHHiIII')
+_PCAP_RECORD = struct.Struct('<IIII')
+_IPV4_HEADER = struct.Struct('!BBHHHBBH4s4s')
+_UDP_HEADER = struct.Struct('!HHHH')
+_IPPROTO_UDP = 17
+
+
+class TraceRecord(NamedTuple):
+    """
+    One recorded frame.
+
+    Attributes:
+        timestamp: time.monotonic() when the frame was sent or received
+        direction: DIRECTION_OUT (to the amplifier) or DIRECTION_IN
+        tag: PBus TAG (bytes) or QUATTROCANALI cookie (int); None if the
+            frame could not be parsed
+        data: Raw datagram as sent on the wire
+    """
+    timestamp: float
+    direction: str
+    tag: Any
+    data: bytes
+
+
+class PacketTrace:
+    """Ring buffer of the most recent frames exchanged with one amplifier."""
+
+    def __init__(self, capacity: int = DEFAULT_TRACE_FRAMES):
+        """
+        Initialize the trace.
+
+        Args:
+            capacity: Number of frames kept (1 to MAX_TRACE_FRAMES)
+
+        Raises:
+            ValueError: If capacity is out of range
+        """
+        if not 1 <= capacity <= MAX_TRACE_FRAMES:
+            raise ValueError(f"Trace capacity must be 1-{MAX_TRACE_FRAMES}, got {capacity}")
+        self.records: deque = deque(maxlen=capacity)
+        self.recorded = 0
+        # Offset to turn monotonic timestamps into wall-clock pcap times
+        self._wall_offset = time.time() - time.monotonic()
+
+    @property
+    def capacity(self) -> int:
+        """Number of frames kept."""
+        return self.records.maxlen
+
+    @property
+    def dropped(self) -> int:
+        """Frames that fell out of the buffer."""
+        return self.recorded - len(self.records)
+
+    def record(self, direction: str, data: bytes, tag: Any = None) -> None:
+        """Append a frame, evicting the oldest when full."""
+        self.records.append(TraceRecord(time.monotonic(), direction, tag, data))
+        self.recorded += 1
+
+    def clear(self) -> None:
+        """Discard all recorded frames."""
+        self.records.clear()
+        self.recorded = 0
+
+    def summary(self) -> List[dict]:
+        """
+        Describe the recorded frames without their payloads.
+
+        Returns:
+            One dict per frame with time offset, direction, tag and size
+        """
+        if not self.records:
+            return []
+        start = self.records[0].timestamp
+        return [
+            {
+                't_ms': round((record.timestamp - start) * 1000, 3),
+                'direction': record.direction,
+                'tag': record.tag.hex() if isinstance(record.tag, bytes) else record.tag,
+                'size': len(record.data),
+            }
+            for record in self.records
+        ]
+
+    def to_pcap(self, local: Tuple[str, int], remote: Tuple[str, int]) -> bytes:
+        """
+        Export the trace as a pcap file.
+
+        Frames are wrapped in synthetic IPv4/UDP headers between the local
+        socket and the amplifier, so Wireshark shows real addresses and ports.
+
+        Args:
+            local: Local (host, port) of the socket
+            remote: Amplifier (host, port)
+
+        Returns:
+            pcap file contents
+        """
+        return write_pcap(
+            (record.timestamp + self._wall_offset,
+             (local, remote) if record.direction == DIRECTION_OUT else (remote, local),
+             record.data)
+            for record in self.records
+        )
+
+
+# ============================================================================
+# pcap encoding
+# ============================================================================
+
+def _ipv4_checksum(header: bytes) -> int:
+    """Compute the IPv4 header checksum."""
+    total = sum(struct.unpack(f'!{len(header) // 2}H', header))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def _address(host: str) -> bytes:
+    """Pack an IPv4 address, falling back to 0.0.0.0 for names."""
+    try:
+        return socket.inet_aton(host)
+    except OSError:
+        return bytes(4)
+
+
+def write_pcap(frames: Iterable[Tuple[float, Tuple[Tuple[str, int], Tuple[str, int]], bytes]]) -> bytes:
+    """
+    Encode UDP payloads as a pcap file (LINKTYPE_RAW, IPv4).
+
+    Args:
+        frames: (wall-clock time, (source, destination), payload) tuples
+
+    Returns:
+        pcap file contents
+    """
+    parts = [_PCAP_HEADER.pack(PCAP_MAGIC, 2, 4, 0, 0, PCAP_SNAPLEN, LINKTYPE_RAW)]
+    for ident, (timestamp, (source, destination), payload) in enumerate(frames):
+        udp_length = _UDP_HEADER.size + len(payload)
+        total_length = _IPV4_HEADER.size + udp_length
+        header = _IPV4_HEADER.pack(
+            0x45, 0, total_length, ident & 0xFFFF, 0, 64, _IPPROTO_UDP, 0,
+            _address(source[0]), _address(destination[0]),
+        )
+        header = header[:10] + struct.pack('!H', _ipv4_checksum(header)) + header[12:]
+        udp = _UDP_HEADER.pack(source[1], destination[1], udp_length, 0)
+        seconds = int(timestamp)
+        micros = int((timestamp - seconds) * 1_000_000)
+        parts.append(_PCAP_RECORD.pack(seconds, micros, total_length, total_length))
+        parts.append(header)
+        parts.append(udp)
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def read_pcap(data: bytes, device_port: Optional[int] = None) -> List[TraceRecord]:
+    """
+    Decode the UDP payloads of a pcap file.
+
+    Reads files written by PacketTrace.to_pcap as well as Wireshark or
+    tcpdump captures on Ethernet. Frames sent to `device_port` are
+    outgoing requests; everything else is an incoming reply. Without a
+    port, the destination port of the first frame is taken to be the
+    amplifier's.
+
+    Args:
+        data: pcap file contents
+        device_port: UDP port of the amplifier
+
+    Returns:
+        Recorded frames with timestamps in seconds and tag None
+
+    Raises:
+        ValueError: If the file is not a supported pcap file
+    """
+    if len(data) < _PCAP_HEADER.size:
+        raise ValueError("File too short for a pcap header")
+    magic = struct.unpack_from('<I', data)[0]
+    if magic in (PCAP_MAGIC, PCAP_MAGIC_NS):
+        endian = '<'
+    elif struct.unpack_from('>I', data)[0] in (PCAP_MAGIC, PCAP_MAGIC_NS):
+        endian = '>'
+        magic = struct.unpack_from('>I', data)[0]
+    else:
+        raise ValueError("Not a pcap file")
+    scale = 1e-9 if magic == PCAP_MAGIC_NS else 1e-6
+    linktype = struct.unpack_from(f'{endian}I', data, 20)[0]
+    if linktype not in (LINKTYPE_ETHERNET, LINKTYPE_RAW, LINKTYPE_IPV4):
+        raise ValueError(f"Unsupported pcap link type {linktype}")
+
+    record_header = struct.Struct(f'{endian}IIII')
+    records = []
+    offset = _PCAP_HEADER.size
+    while offset + record_header.size <= len(data):
+        seconds, fraction, captured, _ = record_header.unpack_from(data, offset)
+        offset += record_header.size
+        frame = memoryview(data)[offset:offset + captured]
+        offset += captured
+
+        if linktype == LINKTYPE_ETHERNET:
+            if len(frame) < 14 or frame[12:14] != b'\x08\x00':
+                continue
+            frame = frame[14:]
+        if len(frame) < 20 or frame[0] >> 4 != 4 or frame[9] != _IPPROTO_UDP:
+            continue
+        ip_length = (frame[0] & 0x0F) * 4
+        source_port, destination_port, udp_length, _ = _UDP_HEADER.unpack_from(frame, ip_length)
+        payload = bytes(frame[ip_length + _UDP_HEADER.size:ip_length + udp_length])
+
+        if device_port is None:
+            device_port = destination_port
+        direction = DIRECTION_OUT if destination_port == device_port else DIRECTION_IN
+        records.append(TraceRecord(seconds + fraction * scale, direction, None, payload))
+    return records
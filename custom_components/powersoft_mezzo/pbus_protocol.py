@@ -62,7 +62,7 @@ CRC16_TABLE = [
 ]
 
 
-def calculate_crc16(data: bytes) -> int:
+def calculate_crc16(data: bytes, crc: int = 0) -> int:
     """
     Calculate CRC16-CCITT for the given data.
 
@@ -70,11 +70,11 @@ def calculate_crc16(data: bytes) -> int:
 
     Args:
         data: Bytes to calculate CRC for
+        crc: CRC of the bytes before data, to continue a running CRC
 
     Returns:
         CRC16 value as 16-bit integer
     """
-    crc = 0
     for byte in data:
         crc = ((crc << 8) ^ CRC16_TABLE[((crc >> 8) ^ byte) & 0xFF]) & 0xFFFF
     return crc
@@ -181,6 +181,48 @@ class WriteCommand(PBusCommand):
         super().__init__(OPCODE_WRITE, address, len(data), data)
 
 
+class EraseCommand(PBusCommand):
+    """PBus Erase command ('E')."""
+
+    def __init__(self, address: int, size: int):
+        """
+        Create an erase command.
+
+        The reply echoes SIZE32 and carries no data.
+
+        Args:
+            address: 32-bit start address of the range to erase
+            size: Number of bytes to erase
+        """
+        super().__init__(OPCODE_ERASE, address, size, None)
+
+
+class CrcCommand(PBusCommand):
+    """PBus CRC command ('C')."""
+
+    def __init__(self, address: int, size: int):
+        """
+        Create a CRC command.
+
+        The device replies with the CRC16 of the range (2 bytes, little
+        endian), whatever its size, so a large range can be compared with
+        a local copy without reading it.
+
+        Args:
+            address: 32-bit start address of the range
+            size: Number of bytes covered by the CRC
+        """
+        super().__init__(OPCODE_CRC, address, size, None)
+
+
+# Request command classes by opcode (write commands carry their data)
+_COMMAND_TYPES = {
+    OPCODE_READ: ReadCommand,
+    OPCODE_ERASE: EraseCommand,
+    OPCODE_CRC: CrcCommand,
+}
+
+
 @dataclass
 class PBusResponse:
     """Parsed PBus command response."""
@@ -193,6 +235,13 @@ class PBusResponse:
         """Check if this is a NAK response (SIZE32 == 0)."""
         return self.size == 0
 
+    @property
+    def crc(self) -> Optional[int]:
+        """CRC16 carried by a CRC reply, or None for NAKs and other opcodes."""
+        if self.opcode != OPCODE_CRC or not self.data or len(self.data) != 2:
+            return None
+        return struct.unpack('<H', self.data)[0]
+
 
 class PBusPacket:
     """PBus protocol packet builder and parser."""
@@ -206,30 +255,103 @@ class PBusPacket:
             tag: 4-byte TAG for request/response matching
             commands: List of PBus commands to include
 
+        Returns:
+            Complete packet ready to send via UDP
+        """
+        body = b"".join(cmd.to_bytes() for cmd in commands)
+        return PBusPacket.stamp_request(tag, body, escape_data(body))
+
+    @staticmethod
+    def stamp_request(tag: bytes, body: bytes, escaped_body: bytes) -> bytes:
+        """
+        Build a request packet from commands encoded in advance.
+
+        Escaping works byte by byte, so the escaped commands do not depend
+        on the TAG; only the TAG and the CRC are encoded here. This lets a
+        precompiled request go out with a fresh TAG on every send.
+
+        Args:
+            tag: 4-byte TAG for request/response matching
+            body: Concatenated command bytes, unescaped
+            escaped_body: escape_data(body)
+
         Returns:
             Complete packet ready to send via UDP
         """
         if len(tag) != 4:
             raise ValueError("TAG must be 4 bytes")
 
-        # Build payload (TAG + commands)
-        payload = bytearray(tag)
-        for cmd in commands:
-            payload.extend(cmd.to_bytes())
+        # CRC16 over the unescaped TAG and commands
+        crc = calculate_crc16(body, calculate_crc16(tag))
 
-        # Calculate CRC16 on unescaped payload
-        crc = calculate_crc16(bytes(payload))
-        payload.extend(struct.pack('<H', crc))
+        # STX + escaped TAG, commands and CRC + ETX
+        return b"".join((
+            bytes([STX]),
+            escape_data(tag),
+            escaped_body,
+            escape_data(struct.pack('<H', crc)),
+            bytes([ETX]),
+        ))
 
-        # Apply escaping to everything except STX and ETX
-        escaped = escape_data(bytes(payload))
+    @staticmethod
+    def parse_request(packet: bytes) -> Tuple[bytes, List[PBusCommand]]:
+        """
+        Parse a request packet as the amplifier would.
 
-        # Build final packet: STX + escaped_payload + ETX
-        packet = bytearray([STX])
-        packet.extend(escaped)
-        packet.append(ETX)
+        Used by simulated devices and tools. Following the protocol, a
+        request whose commands cannot all be delimited (unknown opcode or
+        truncated DATA) is corrupted as a whole and gets no reply.
 
-        return bytes(packet)
+        Args:
+            packet: Complete request packet received via UDP
+
+        Returns:
+            Tuple of (tag, list of commands)
+
+        Raises:
+            ValueError: If packet is malformed or CRC check fails
+        """
+        if len(packet) < 8:  # Minimum: STX + TAG + CRC + ETX
+            raise ValueError("Packet too short")
+
+        if packet[0] != STX or packet[-1] != ETX:
+            raise ValueError("Invalid STX/ETX framing")
+
+        payload = unescape_data(packet[1:-1])
+        if len(payload) < 6:
+            raise ValueError("Payload too short for TAG and CRC")
+
+        crc_received = struct.unpack('<H', payload[-2:])[0]
+        crc_calculated = calculate_crc16(payload[:-2])
+        if crc_received != crc_calculated:
+            raise ValueError(
+                f"CRC mismatch: received 0x{crc_received:04x}, "
+                f"calculated 0x{crc_calculated:04x}"
+            )
+
+        payload = payload[:-2]
+        tag = payload[0:4]
+
+        commands = []
+        offset = 4
+        while offset < len(payload):
+            if offset + 9 > len(payload):
+                raise ValueError("Incomplete PBus command")
+
+            opcode, address, size = struct.unpack_from('<BII', payload, offset)
+            offset += 9
+
+            if opcode == OPCODE_WRITE:
+                if offset + size > len(payload):
+                    raise ValueError("Write data extends beyond payload")
+                commands.append(WriteCommand(address, payload[offset:offset + size]))
+                offset += size
+            elif opcode in _COMMAND_TYPES:
+                commands.append(_COMMAND_TYPES[opcode](address, size))
+            else:
+                raise ValueError(f"Unknown opcode: 0x{opcode:02x}")
+
+        return tag, commands
 
     @staticmethod
     def parse_response(packet: bytes) -> Tuple[bytes, List[PBusResponse]]:
@@ -308,21 +430,67 @@ class PBusPacket:
             data = None
             if size > 0:
                 # Check if this is a WRITE response
-                if opcode == OPCODE_WRITE:
-                    # For writes, SIZE indicates bytes written but data is not returned
-                    # This is an ACK - don't try to read data
+                if opcode in (OPCODE_WRITE, OPCODE_ERASE):
+                    # For writes and erases, SIZE indicates bytes affected but data
+                    # is not returned. This is an ACK - don't try to read data
                     pass
-                else:
+                elif opcode == OPCODE_CRC:
+                    # CRC replies carry the CRC16 of the SIZE bytes, not the bytes
+                    if offset + 2 > len(payload):
+                        raise ValueError("Response data extends beyond payload")
+                    data = payload[offset:offset+2]
+                    offset += 2
+                elif opcode == OPCODE_READ:
                     # For reads, data should be present
                     if offset + size > len(payload):
                         raise ValueError("Response data extends beyond payload")
                     data = payload[offset:offset+size]
                     offset += size
+                else:
+                    # The length of an unknown reply is unknown, so nothing after it can be trusted
+                    raise ValueError(f"Unknown opcode in response: 0x{opcode:02x}")
 
             responses.append(PBusResponse(opcode, address, size, data))
 
         return tag, responses
 
+    @staticmethod
+    def build_response(tag: bytes, responses: List[PBusResponse]) -> bytes:
+        """
+        Build a response packet as sent by the amplifier.
+
+        Used by simulated devices and tools; the integration itself only
+        parses responses.
+
+        Args:
+            tag: 4-byte TAG copied from the request
+            responses: List of PBus responses to include
+
+        Returns:
+            Complete packet as the amplifier would send it
+        """
+        if len(tag) != 4:
+            raise ValueError("TAG must be 4 bytes")
+
+        # Build payload (Magic + Protocol ID + TAG + responses)
+        payload = bytearray(MAGIC_NUMBER)
+        payload.extend(struct.pack('<H', PROTOCOL_ID))
+        payload.extend(tag)
+        for resp in responses:
+            payload.extend(struct.pack('<BII', resp.opcode, resp.address, resp.size))
+            # Write and erase ACKs carry SIZE but no data
+            if resp.data and resp.opcode not in (OPCODE_WRITE, OPCODE_ERASE):
+                payload.extend(resp.data)
+
+        crc = calculate_crc16(bytes(payload))
+        payload.extend(struct.pack('<H', crc))
+
+        packet = bytearray([STX])
+        packet.extend(escape_data(bytes(payload)))
+        packet.append(ETX)
+
+        return bytes(packet)
+
 
 # Convenience functions for data type conversion
 
@@ -0,0 +1,766 @@
+"""
+Powersoft QUATTROCANALI Amplifier Client.
+
+High-level API for controlling and monitoring Powersoft QUATTROCANALI
+amplifiers. Returns state in the same shape as MezzoClient so the
+integration can drive both families with one coordinator.
+"""
+import asyncio
+import logging
+import math
+from typing import Optional, Dict, Any, List
+
+from .packet_trace import DEFAULT_TRACE_FRAMES, PacketTrace
+from .transport_metrics import TransportMetrics
+from .udp_manager import QuattroUDPManager
+from .quattro_meters import MeterState
+from .quattro_protocol import (
+    DEFAULT_PORT,
+    ANSWER_OK,
+    STANDBY_READ,
+    STANDBY_OFF,
+    STANDBY_ON,
+    GAIN_MIN_CDB,
+    CMD_STANDBY,
+    QuattroCommand,
+    build_ping_command,
+    build_info_command,
+    build_standby_command,
+    build_readgm_command,
+    build_write_out_gain_command,
+    build_write_out_mute_command,
+    build_load_preset2_command,
+    build_read_alarms_command,
+    build_read_all_alarms2_command,
+    build_source_meter_command,
+    build_output_meter_command,
+    parse_info_response,
+    parse_standby_response,
+    parse_readgm_response,
+    parse_alarms_response,
+    parse_all_alarms2_response,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# QUATTROCANALI amplifiers have four output channels
+NUM_CHANNELS = 4
+
+
+class QuattroClient:
+    """
+    High-level client for Powersoft QUATTROCANALI amplifiers.
+
+    Requests are pipelined: independent reads and writes are sent together
+    and matched back by cookie, so a full poll costs one round trip rather
+    than one per command.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        timeout: float = 2.0,
+        retries: int = 3,
+    ):
+        """
+        Initialize the QUATTROCANALI client.
+
+        Args:
+            host: IP address of the amplifier
+            port: UDP port (default 1234)
+            timeout: Default timeout for requests, including retransmits
+            retries: Retransmits per request within the timeout
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._udp = QuattroUDPManager(host, port, timeout, retries)
+
+    async def connect(self) -> None:
+        """Connect to the amplifier."""
+        await self._udp.connect()
+
+    async def disconnect(self) -> None:
+        """Disconnect from the amplifier."""
+        await self._udp.disconnect()
+
+    @property
+    def is_connected(self) -> bool:
+        """Check if connected to amplifier."""
+        return self._udp.is_connected
+
+    @property
+    def metrics(self) -> TransportMetrics:
+        """Transport counters and latency histograms for this amplifier."""
+        return self._udp.metrics
+
+    @property
+    def trace(self) -> Optional[PacketTrace]:
+        """Packet trace of recent frames, or None when tracing is off."""
+        return self._udp.trace
+
+    def start_trace(self, capacity: int = DEFAULT_TRACE_FRAMES) -> PacketTrace:
+        """
+        Start recording raw frames into a ring buffer.
+
+        Args:
+            capacity: Number of most recent frames to keep
+
+        Returns:
+            The new PacketTrace
+        """
+        self._udp.trace = PacketTrace(capacity)
+        return self._udp.trace
+
+    def stop_trace(self) -> None:
+        """Stop recording frames and discard the trace."""
+        self._udp.trace = None
+
+    def export_pcap(self) -> Optional[bytes]:
+        """Return the recorded frames as a pcap file, or None when tracing is off."""
+        if self._udp.trace is None:
+            return None
+        return self._udp.trace.to_pcap(self._udp.local_address, (self.host, self.port))
+
+    async def _request(
+        self,
+        command: QuattroCommand,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+    ) -> bytes:
+        """
+        Send one command and return the answer payload.
+
+        Args:
+            command: Command to send (its cookie is assigned by the transport)
+            timeout: Timeout in seconds (uses default if None)
+            retries: Retransmits within the timeout (uses default if None)
+
+        Returns:
+            Answer data
+
+        Raises:
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        response = await self._udp.send_request(command.cmd, command.data, timeout, retries)
+        return response.data
+
+    async def _write(self, command: QuattroCommand, error_message: str) -> None:
+        """
+        Send a write command and check the device accepted it.
+
+        Write answers are answer_ok followed by an echo of the request
+        fields, so a matching echo confirms the stored value.
+
+        Args:
+            command: Write command to send
+            error_message: Message for the ValueError raised on failure
+
+        Raises:
+            ValueError: If the device rejects the write or echoes other values
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        data = await self._request(command)
+        if not data or data[0] != ANSWER_OK:
+            raise ValueError(f"{error_message} (rejected)")
+        echo = data[1:]
+        if len(echo) == len(command.data) and echo != command.data:
+            raise ValueError(
+                f"{error_message} (device reports {echo.hex()}, sent {command.data.hex()})"
+            )
+
+    @staticmethod
+    def _check_channel(channel: int) -> None:
+        """Validate a 1-based channel number."""
+        if not 1 <= channel <= NUM_CHANNELS:
+            raise ValueError(f"Channel must be 1-{NUM_CHANNELS}")
+
+    # ========================================================================
+    # Gain Conversion
+    # ========================================================================
+
+    @staticmethod
+    def gain_to_volume(gain_cdb: int) -> float:
+        """
+        Convert a gain in cents of dB to linear volume (0.0-1.0).
+
+        Gains above 0 dB are reported as full volume.
+
+        Args:
+            gain_cdb: Gain in cents of dB
+
+        Returns:
+            Linear volume 0.0-1.0
+        """
+        if gain_cdb <= GAIN_MIN_CDB:
+            return 0.0
+        return min(1.0, 10 ** (gain_cdb / 2000.0))
+
+    @staticmethod
+    def volume_to_gain(volume: float) -> int:
+        """
+        Convert linear volume (0.0-1.0) to a gain in cents of dB.
+
+        Args:
+            volume: Linear volume 0.0-1.0
+
+        Returns:
+            Gain in cents of dB, floored at -60 dB
+        """
+        if volume <= 0.0:
+            return GAIN_MIN_CDB
+        return max(GAIN_MIN_CDB, round(2000.0 * math.log10(volume)))
+
+    # ========================================================================
+    # Identification
+    # ========================================================================
+
+    async def ping(self) -> float:
+        """
+        Check that the amplifier answers.
+
+        Returns:
+            Round-trip time in seconds
+
+        Raises:
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await self._request(build_ping_command())
+        return loop.time() - start
+
+    async def get_info(self) -> Dict[str, str]:
+        """
+        Read manufacturer, family, model and serial number.
+
+        Returns:
+            Dictionary with manufacturer, family, model and serial_number
+
+        Raises:
+            ValueError: If the answer is malformed
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        info = parse_info_response(await self._request(build_info_command()))
+        if info is None:
+            raise ValueError("Failed to read device info")
+        return info
+
+    # ========================================================================
+    # Power Control
+    # ========================================================================
+
+    async def set_standby(self, standby: bool) -> None:
+        """
+        Set amplifier standby state.
+
+        Args:
+            standby: True to enter standby, False to power on
+
+        Raises:
+            ValueError: If the device does not report the requested state
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        action = STANDBY_ON if standby else STANDBY_OFF
+        state = parse_standby_response(await self._request(build_standby_command(action)))
+        if state is None:
+            raise ValueError("Failed to set standby state")
+        if state != standby:
+            _LOGGER.debug("Standby transition to %s still in progress", standby)
+
+    async def get_standby_state(self) -> bool:
+        """
+        Get current standby state.
+
+        Returns:
+            True if in standby, False if powered on
+
+        Raises:
+            ValueError: If the answer is malformed
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        state = parse_standby_response(await self._request(build_standby_command(STANDBY_READ)))
+        if state is None:
+            raise ValueError("Failed to read standby state")
+        return state
+
+    # ========================================================================
+    # Gain and Mute Control
+    # ========================================================================
+
+    async def read_gains_mutes(self) -> Dict[str, Any]:
+        """
+        Read all input/output gains and mutes (READGM).
+
+        Returns:
+            Parsed READGM answer (0-based lists, gains in cents of dB)
+
+        Raises:
+            ValueError: If the answer is malformed
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        result = parse_readgm_response(await self._request(build_readgm_command()))
+        if result is None:
+            raise ValueError("Failed to read gains and mutes")
+        return result
+
+    async def set_volume(self, channel: int, volume: float) -> None:
+        """
+        Set output channel volume.
+
+        Args:
+            channel: Channel number (1-4)
+            volume: Volume level 0.0-1.0 (linear gain)
+
+        Raises:
+            ValueError: If channel or volume out of range, or the write fails
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        self._check_channel(channel)
+        if not 0.0 <= volume <= 1.0:
+            raise ValueError("Volume must be between 0.0 and 1.0")
+
+        await self.set_gain_db(channel, self.volume_to_gain(volume) / 100.0)
+
+    async def set_gain_db(self, channel: int, gain_db: float) -> None:
+        """
+        Set output channel gain in dB.
+
+        Args:
+            channel: Channel number (1-4)
+            gain_db: Gain in dB (-60 to +15)
+
+        Raises:
+            ValueError: If channel out of range or the write fails
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        self._check_channel(channel)
+        command = build_write_out_gain_command(channel - 1, round(gain_db * 100))
+        await self._write(command, f"Failed to set gain for channel {channel}")
+
+    async def set_mute(self, channel: int, muted: bool) -> None:
+        """
+        Set output channel mute state.
+
+        Args:
+            channel: Channel number (1-4)
+            muted: True to mute, False to unmute
+
+        Raises:
+            ValueError: If channel out of range or the write fails
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        self._check_channel(channel)
+        command = build_write_out_mute_command(channel - 1, muted)
+        await self._write(command, f"Failed to set mute for channel {channel}")
+
+    async def set_outputs(
+        self,
+        gains_cdb: Optional[List[Optional[int]]] = None,
+        mutes: Optional[List[Optional[bool]]] = None,
+    ) -> None:
+        """
+        Set gains and mutes of several output channels in one round trip.
+
+        One WRITEOUTGAIN/WRITEOUTMUTE per value, all in flight at once.
+
+        Args:
+            gains_cdb: Gain in cents of dB per channel, None to leave unchanged
+            mutes: Mute state per channel, None to leave unchanged
+
+        Raises:
+            ValueError: If nothing is selected or a write fails
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        commands = self._output_commands(gains_cdb or [], mutes or [])
+        if not commands:
+            raise ValueError("No gain or mute to write")
+        await asyncio.gather(*(
+            self._write(command, f"Failed to write output 0x{command.cmd:02X}")
+            for command in commands
+        ))
+
+    @staticmethod
+    def _output_commands(
+        gains_cdb: List[Optional[int]],
+        mutes: List[Optional[bool]],
+    ) -> List[QuattroCommand]:
+        """
+        Build the output gain and mute writes for per-channel values.
+
+        WRITEMULTI is not used: it also sets the input gain and mute of
+        every selected channel, and its layout is not confirmed on hardware.
+
+        Raises:
+            ValueError: If a list has more than NUM_CHANNELS entries
+        """
+        if len(gains_cdb) > NUM_CHANNELS or len(mutes) > NUM_CHANNELS:
+            raise ValueError(f"At most {NUM_CHANNELS} gains and mutes")
+        commands = []
+        for channel, gain in enumerate(gains_cdb):
+            if gain is not None:
+                commands.append(build_write_out_gain_command(channel, gain))
+        for channel, muted in enumerate(mutes):
+            if muted is not None:
+                commands.append(build_write_out_mute_command(channel, bool(muted)))
+        return commands
+
+    async def load_preset(self, preset: int) -> None:
+        """
+        Recall a preset stored on the amplifier (LOADPRESET2).
+
+        Args:
+            preset: Stored preset number (0-200)
+
+        Raises:
+            ValueError: If the preset number is out of range or the device rejects it
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        await self._write(build_load_preset2_command(preset), f"Failed to load preset {preset}")
+
+    # ========================================================================
+    # Alarms and Load Monitoring
+    # ========================================================================
+
+    async def read_alarms(self, channel: int) -> Dict[str, Any]:
+        """
+        Read load monitoring and alarm status of one channel (READALARMS).
+
+        Args:
+            channel: Channel number (1-4)
+
+        Returns:
+            Parsed READALARMS answer
+
+        Raises:
+            ValueError: If channel out of range or the answer is malformed
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        self._check_channel(channel)
+        result = parse_alarms_response(await self._request(build_read_alarms_command(channel - 1)))
+        if result is None:
+            raise ValueError(f"Failed to read alarms for channel {channel}")
+        return result
+
+    async def read_all_alarms(self) -> Dict[str, Any]:
+        """
+        Read global and per-channel alarm bitfields (READALLALARMS2).
+
+        Returns:
+            Parsed READALLALARMS2 answer
+
+        Raises:
+            ValueError: If the answer is malformed
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        result = parse_all_alarms2_response(await self._request(build_read_all_alarms2_command()))
+        if result is None:
+            raise ValueError("Failed to read alarms")
+        return result
+
+    # ========================================================================
+    # Metering
+    # ========================================================================
+
+    async def read_meters_into(self, meters: MeterState, timeout: Optional[float] = None) -> None:
+        """
+        Read SOURCEMETER and OUTPUTMETER together into preallocated arrays.
+
+        Meter reads are not retransmitted: by the time a retry would be
+        answered the next poll is due anyway.
+
+        Args:
+            meters: MeterState updated in place
+            timeout: Timeout in seconds (uses default if None)
+
+        Raises:
+            ValueError: If an answer is malformed
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        source, output = await asyncio.gather(
+            self._request(build_source_meter_command(), timeout, retries=0),
+            self._request(build_output_meter_command(), timeout, retries=0),
+        )
+        if not meters.decode_source_meter(source):
+            raise ValueError(f"Invalid SOURCEMETER answer: {bytes(source).hex()}")
+        if not meters.decode_output_meter(output):
+            raise ValueError(f"Invalid OUTPUTMETER answer: {bytes(output).hex()}")
+
+    async def read_meters(self) -> Dict[str, Any]:
+        """
+        Read input and output meters once.
+
+        Returns:
+            Dictionary with 'outputs' (rms_v, headroom_db, signal) and
+            'inputs' (signal and clip slot bitmasks), keyed by 1-based channel
+
+        Raises:
+            ValueError: If an answer is malformed
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        meters = MeterState(NUM_CHANNELS)
+        await self.read_meters_into(meters)
+        return {
+            'outputs': {
+                i + 1: {
+                    'rms_v': meters.out_rms_v[i],
+                    'headroom_db': meters.out_headroom_db[i],
+                    'signal': bool(meters.out_signal[i]),
+                }
+                for i in range(meters.channels)
+            },
+            'inputs': {
+                x + 1: {'signal': meters.in_presence[x], 'clip': meters.in_clip[x]}
+                for x in range(meters.inputs)
+            },
+        }
+
+    # ========================================================================
+    # Batch Operations
+    # ========================================================================
+
+    async def get_all_state(self) -> Dict[str, Any]:
+        """
+        Get complete amplifier state with all requests in flight at once.
+
+        STANDBY, READGM, READALLALARMS2 and one READALARMS per channel are
+        sent together; the poll takes as long as the slowest answer. Alarm
+        reads are best effort, standby and gains must succeed.
+
+        Returns:
+            Dictionary in the same shape as MezzoClient.get_all_state, plus
+            'gains_db', 'alarms' and 'loads'
+
+        Raises:
+            ValueError: If standby or gains cannot be read
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        channels = range(1, NUM_CHANNELS + 1)
+        results = await asyncio.gather(
+            self.get_standby_state(),
+            self.read_gains_mutes(),
+            self.read_all_alarms(),
+            *(self.read_alarms(ch) for ch in channels),
+            return_exceptions=True,
+        )
+        standby, gm, alarms, *loads = results
+
+        for result in (standby, gm):
+            if isinstance(result, BaseException):
+                raise result
+
+        state = {
+            'standby': standby,
+            'volumes': {},
+            'mutes': {},
+            'gains_db': {},
+            'sources': {},
+            'temperatures': {},
+            'fault_code': None,
+            'eq': {},
+            'source_eq': {},
+            'alarms': None if isinstance(alarms, BaseException) else alarms,
+            'loads': {},
+        }
+
+        for idx in range(gm['num_channels']):
+            ch = idx + 1
+            state['volumes'][ch] = self.gain_to_volume(gm['out_gains'][idx])
+            state['gains_db'][ch] = gm['out_gains'][idx] / 100.0
+            state['mutes'][ch] = gm['out_mutes'][idx]
+
+        for ch, load in zip(channels, loads):
+            if isinstance(load, BaseException):
+                _LOGGER.debug("READALARMS for channel %d failed: %s", ch, load)
+                continue
+            state['loads'][ch] = load
+
+        return state
+
+    async def capture_current_state(self) -> Dict[str, Any]:
+        """
+        Capture current amplifier state for scene creation.
+
+        Returns:
+            Scene configuration with volumes, mutes and standby
+
+        Raises:
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        state = await self.get_all_state()
+        return {
+            "volumes": [state['volumes'].get(i, 0.5) for i in range(1, NUM_CHANNELS + 1)],
+            "mutes": [state['mutes'].get(i, False) for i in range(1, NUM_CHANNELS + 1)],
+            "standby": state.get('standby', False),
+        }
+
+    def compile_scene(self, scene_config: Dict[str, Any]) -> List[QuattroCommand]:
+        """
+        Compile a scene configuration into QUATTROCANALI commands.
+
+        A scene with a 'preset' number compiles to a single LOADPRESET2, as
+        the stored preset already defines gains and mutes. Otherwise each
+        output gain and mute is a WRITEOUTGAIN/WRITEOUTMUTE. A standby change
+        is a separate command, sent alongside either.
+
+        Sources and Source EQ are Mezzo features and are ignored.
+
+        Args:
+            scene_config: Dictionary with scene configuration:
+                - volumes: List[float] - Volume levels 0.0-1.0 for channels 1-4
+                - mutes: List[bool] - Mute states for channels 1-4
+                - preset: int - Stored preset to recall instead (optional)
+                - standby: bool - Standby state (optional)
+
+        Returns:
+            Commands that can all be in flight at once
+
+        Raises:
+            ValueError: If configuration is invalid
+        """
+        commands: List[QuattroCommand] = []
+
+        if scene_config.get('preset') is not None:
+            commands.append(build_load_preset2_command(int(scene_config['preset'])))
+        else:
+            if 'volumes' not in scene_config or len(scene_config['volumes']) != NUM_CHANNELS:
+                raise ValueError(f"Scene must contain 'volumes' list with {NUM_CHANNELS} entries")
+            if 'mutes' not in scene_config or len(scene_config['mutes']) != NUM_CHANNELS:
+                raise ValueError(f"Scene must contain 'mutes' list with {NUM_CHANNELS} entries")
+            gains = []
+            for ch, volume in enumerate(scene_config['volumes'], start=1):
+                if not 0.0 <= volume <= 1.0:
+                    raise ValueError(f"Volume for channel {ch} must be between 0.0 and 1.0")
+                gains.append(self.volume_to_gain(volume))
+            commands.extend(self._output_commands(
+                gains, [bool(m) for m in scene_config['mutes']]
+            ))
+
+        if 'standby' in scene_config:
+            action = STANDBY_ON if scene_config['standby'] else STANDBY_OFF
+            commands.append(build_standby_command(action))
+
+        return commands
+
+    async def _send_scene_command(self, command: QuattroCommand) -> None:
+        """Send one compiled scene command and check its acknowledgement."""
+        if command.cmd == CMD_STANDBY:
+            if parse_standby_response(await self._request(command)) is None:
+                raise ValueError("Failed to set standby state")
+            return
+        await self._write(command, f"Scene command 0x{command.cmd:02X} failed")
+
+    async def apply_scene(self, scene_config: Dict[str, Any]) -> None:
+        """
+        Apply a scene configuration in one round trip.
+
+        The scene is compiled with compile_scene and all commands are sent
+        together; each is matched to its acknowledgement by cookie.
+
+        Args:
+            scene_config: Scene configuration (see compile_scene)
+
+        Raises:
+            ValueError: If configuration is invalid or the device rejects a command
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        commands = self.compile_scene(scene_config)
+        scene_name = scene_config.get('name', 'Unknown')
+        _LOGGER.info("Applying scene '%s' with %d commands", scene_name, len(commands))
+
+        results = await asyncio.gather(
+            *(self._send_scene_command(command) for command in commands),
+            return_exceptions=True,
+        )
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures:
+            _LOGGER.warning("Scene '%s' applied with %d/%d failures (first: %s)",
+                            scene_name, len(failures), len(commands), failures[0])
+            raise failures[0]
+        _LOGGER.info("Scene '%s' applied successfully", scene_name)
+
+    # ========================================================================
+    # Context Manager Support
+    # ========================================================================
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.disconnect()
+
+
+async def identify_quattro(host: str, port: int = DEFAULT_PORT, timeout: float = 1.0) -> Dict[str, Any]:
+    """
+    Build a device info dictionary for a QUATTROCANALI amplifier.
+
+    INFO and STANDBY are requested together; fields that cannot be read
+    fall back to 'Unknown' so discovery still lists the device.
+
+    Args:
+        host: IP address of the amplifier
+        port: UDP port the amplifier answered on
+        timeout: Time to wait for the answers
+
+    Returns:
+        Device information dictionary
+    """
+    device_info = {
+        'host': host,
+        'protocol': 'quattrocanali',
+        'port': port,
+        'model': 'QUATTROCANALI',
+        'standby': False,
+        'serial': 'Unknown',
+        'firmware': 'Unknown',
+    }
+
+    client = QuattroClient(host, port, timeout, retries=1)
+    try:
+        await client.connect()
+        info, standby = await asyncio.gather(
+            client.get_info(), client.get_standby_state(), return_exceptions=True
+        )
+    except OSError as err:
+        _LOGGER.debug("Cannot identify QUATTROCANALI at %s: %s", host, err)
+        return device_info
+    finally:
+        await client.disconnect()
+
+    if isinstance(info, dict):
+        if info.get('model'):
+            device_info['model'] = info['model']
+        if info.get('serial_number'):
+            device_info['serial'] = info['serial_number']
+    else:
+        _LOGGER.debug("INFO from %s failed: %s", host, info)
+
+    if isinstance(standby, bool):
+        device_info['standby'] = standby
+    else:
+        _LOGGER.debug("STANDBY from %s failed: %s", host, standby)
+
+    return device_info
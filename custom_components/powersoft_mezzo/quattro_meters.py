@@ -0,0 +1,335 @@
+"""
+QUATTROCANALI Meter Streaming.
+
+Polls SOURCEMETER and OUTPUTMETER at a fixed rate and decodes the answers
+into preallocated per-channel arrays. Full-rate frames go to subscribers
+as they arrive; a peak-hold summary is published at a lower rate for
+Home Assistant sensors, which should not be written 20 times a second.
+"""
+import asyncio
+import logging
+import math
+import struct
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+from .quattro_protocol import ANSWER_OK
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_METER_CHANNELS = 4
+DEFAULT_METER_INPUTS = 4
+SOURCE_SLOTS = 4
+
+
+def _build_slot_tables() -> tuple:
+    """
+    Map a PRESENCE_CLIP byte to presence and clip slot bitmasks.
+
+    Bit 2k is presence and bit 2k+1 clip for source slot k; the tables
+    compact them into bit k so decoding is one lookup per input.
+    """
+    presence = bytearray(256)
+    clip = bytearray(256)
+    for value in range(256):
+        for slot in range(SOURCE_SLOTS):
+            if value & (1 << (2 * slot)):
+                presence[value] |= 1 << slot
+            if value & (1 << (2 * slot + 1)):
+                clip[value] |= 1 << slot
+    return bytes(presence), bytes(clip)
+
+
+_PRESENCE_SLOTS, _CLIP_SLOTS = _build_slot_tables()
+
+
+class MeterState:
+    """
+    Preallocated meter values for one amplifier.
+
+    The arrays are updated in place on every frame; subscribers that keep
+    values beyond their callback must copy them.
+
+    Attributes:
+        out_rms_v: Output RMS voltage per channel (V)
+        out_headroom_db: Output headroom per channel (dB)
+        out_signal: Output signal presence per channel (0/1)
+        in_presence: Source slots with signal per input (bitmask, bit k = slot k)
+        in_clip: Source slots clipping per input (bitmask)
+        timestamp: Loop time of the last decoded frame
+        sequence: Number of frames decoded
+    """
+
+    __slots__ = (
+        'channels', 'inputs',
+        'out_rms_v', 'out_headroom_db', 'out_signal',
+        'in_presence', 'in_clip',
+        'timestamp', 'sequence',
+        '_output_struct',
+    )
+
+    def __init__(self, channels: int = DEFAULT_METER_CHANNELS, inputs: int = DEFAULT_METER_INPUTS):
+        """
+        Initialize the meter arrays.
+
+        Args:
+            channels: Number of output channels
+            inputs: Number of input channels
+        """
+        self.channels = channels
+        self.inputs = inputs
+        self.out_rms_v = array('f', bytes(4 * channels))
+        self.out_headroom_db = array('f', bytes(4 * channels))
+        self.out_signal = array('B', bytes(channels))
+        self.in_presence = array('B', bytes(inputs))
+        self.in_clip = array('B', bytes(inputs))
+        self.timestamp = 0.0
+        self.sequence = 0
+        # OUT_RMS_V (u16, tenths of V) x N, OUT_HEADROOM (i16, cents of dB) x N
+        self._output_struct = struct.Struct(f'<{channels}H{channels}h')
+
+    def decode_source_meter(self, data) -> bool:
+        """
+        Decode a SOURCEMETER answer in place.
+
+        Layout: answer_ok (u8), then one PRESENCE_CLIP byte per input.
+
+        Args:
+            data: Answer payload
+
+        Returns:
+            True if the answer was valid
+        """
+        if len(data) < 1 + self.inputs or data[0] != ANSWER_OK:
+            return False
+        presence = self.in_presence
+        clip = self.in_clip
+        for x in range(self.inputs):
+            value = data[1 + x]
+            presence[x] = _PRESENCE_SLOTS[value]
+            clip[x] = _CLIP_SLOTS[value]
+        return True
+
+    def decode_output_meter(self, data) -> bool:
+        """
+        Decode an OUTPUTMETER answer in place.
+
+        Layout: answer_ok (u8), OUT_RMS_V (u16 x N, tenths of V),
+        OUT_HEADROOM (i16 x N, cents of dB), OUT_SIGNAL_PRESENCE (u8 bitmask).
+
+        Args:
+            data: Answer payload
+
+        Returns:
+            True if the answer was valid
+        """
+        unpacker = self._output_struct
+        if len(data) < 2 + unpacker.size or data[0] != ANSWER_OK:
+            return False
+        values = unpacker.unpack_from(data, 1)
+        signal = data[1 + unpacker.size]
+        n = self.channels
+        rms = self.out_rms_v
+        headroom = self.out_headroom_db
+        out_signal = self.out_signal
+        for i in range(n):
+            rms[i] = values[i] / 10.0
+            headroom[i] = values[n + i] / 100.0
+            out_signal[i] = (signal >> i) & 1
+        return True
+
+
+class _PeakHold:
+    """Accumulates the worst case of each meter over a publish window."""
+
+    def __init__(self, channels: int, inputs: int):
+        self.rms = array('f', bytes(4 * channels))
+        self.headroom = array('f', [math.inf] * channels)
+        self.signal = array('B', bytes(channels))
+        self.presence = array('B', bytes(inputs))
+        self.clip = array('B', bytes(inputs))
+        self.frames = 0
+
+    def add(self, meters: MeterState) -> None:
+        """Fold one frame into the window."""
+        for i in range(meters.channels):
+            if meters.out_rms_v[i] > self.rms[i]:
+                self.rms[i] = meters.out_rms_v[i]
+            if meters.out_headroom_db[i] < self.headroom[i]:
+                self.headroom[i] = meters.out_headroom_db[i]
+            self.signal[i] |= meters.out_signal[i]
+        for x in range(meters.inputs):
+            self.presence[x] |= meters.in_presence[x]
+            self.clip[x] |= meters.in_clip[x]
+        self.frames += 1
+
+    def publish(self) -> Dict[str, Any]:
+        """Return the window summary and start a new window."""
+        summary = {
+            'frames': self.frames,
+            'outputs': {
+                i + 1: {
+                    'rms_v': round(self.rms[i], 1),
+                    'headroom_db': round(self.headroom[i], 2) if self.frames else None,
+                    'signal': bool(self.signal[i]),
+                }
+                for i in range(len(self.rms))
+            },
+            'inputs': {
+                x + 1: {
+                    'signal': bool(self.presence[x]),
+                    'clip': bool(self.clip[x]),
+                    'signal_slots': [k + 1 for k in range(SOURCE_SLOTS) if self.presence[x] >> k & 1],
+                    'clip_slots': [k + 1 for k in range(SOURCE_SLOTS) if self.clip[x] >> k & 1],
+                }
+                for x in range(len(self.presence))
+            },
+        }
+        for i in range(len(self.rms)):
+            self.rms[i] = 0.0
+            self.headroom[i] = math.inf
+            self.signal[i] = 0
+        for x in range(len(self.presence)):
+            self.presence[x] = 0
+            self.clip[x] = 0
+        self.frames = 0
+        return summary
+
+
+class QuattroMeterStreamer:
+    """
+    Fixed-rate SOURCEMETER/OUTPUTMETER poller for one amplifier.
+
+    Ticks are scheduled on absolute loop times so the rate does not drift.
+    Both meters are requested together without retransmits: a lost frame
+    is simply replaced by the next one. If a poll overruns its slot the
+    missed ticks are skipped rather than bunched up.
+    """
+
+    def __init__(
+        self,
+        client,
+        rate: float = 10.0,
+        publish_interval: float = 1.0,
+        channels: int = DEFAULT_METER_CHANNELS,
+        inputs: int = DEFAULT_METER_INPUTS,
+    ):
+        """
+        Initialize the streamer.
+
+        Args:
+            client: QuattroClient to poll
+            rate: Polls per second
+            publish_interval: Seconds between decimated summaries
+            channels: Number of output channels
+            inputs: Number of input channels
+        """
+        self._client = client
+        self.rate = rate
+        self.publish_interval = publish_interval
+        self.meters = MeterState(channels, inputs)
+        self.decimated: Optional[Dict[str, Any]] = None
+        self.frames = 0
+        self.missed = 0
+        self.overruns = 0
+        self._peak = _PeakHold(channels, inputs)
+        self._subscribers: List[Callable[[MeterState], None]] = []
+        self._decimated_subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Check if the streamer is polling."""
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, callback: Callable[[MeterState], None]) -> Callable[[], None]:
+        """
+        Receive every decoded frame.
+
+        The callback runs in the event loop and gets the shared MeterState;
+        it must be quick and must copy any values it keeps.
+
+        Args:
+            callback: Called with the MeterState after each frame
+
+        Returns:
+            Function that removes the subscription
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def subscribe_decimated(self, callback: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """
+        Receive the peak-hold summary once per publish interval.
+
+        Args:
+            callback: Called with the summary dictionary
+
+        Returns:
+            Function that removes the subscription
+        """
+        self._decimated_subscribers.append(callback)
+        return lambda: self._decimated_subscribers.remove(callback)
+
+    def start(self) -> None:
+        """Start polling in a background task."""
+        if self.running or self.rate <= 0:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        _LOGGER.info("Meter streaming for %s started at %.1f Hz", self._client.host, self.rate)
+
+    async def stop(self) -> None:
+        """Stop polling and wait for the task to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        _LOGGER.info("Meter streaming for %s stopped (%d frames, %d missed, %d overruns)",
+                     self._client.host, self.frames, self.missed, self.overruns)
+
+    @staticmethod
+    def _notify(callbacks: list, value: Any) -> None:
+        """Call subscribers, isolating their failures from the poll loop."""
+        for callback in tuple(callbacks):
+            try:
+                callback(value)
+            except Exception:
+                _LOGGER.exception("Meter subscriber failed")
+
+    async def _run(self) -> None:
+        """Poll loop."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.rate
+        next_tick = loop.time()
+        next_publish = next_tick + self.publish_interval
+
+        while True:
+            try:
+                await self._client.read_meters_into(self.meters, timeout=interval)
+            except (TimeoutError, ValueError, ConnectionError) as err:
+                self.missed += 1
+                _LOGGER.debug("Meter poll of %s failed: %s", self._client.host, err)
+            else:
+                self.frames += 1
+                self.meters.timestamp = loop.time()
+                self.meters.sequence += 1
+                self._peak.add(self.meters)
+                self._notify(self._subscribers, self.meters)
+
+            now = loop.time()
+            if now >= next_publish:
+                self.decimated = self._peak.publish()
+                self._notify(self._decimated_subscribers, self.decimated)
+                next_publish += self.publish_interval * max(1, math.ceil((now - next_publish) / self.publish_interval))
+
+            next_tick += interval
+            if next_tick < now:
+                # Skip the slots we overran instead of polling back to back
+                skipped = math.ceil((now - next_tick) / interval)
+                self.overruns += skipped
+                next_tick += skipped * interval
+            await asyncio.sleep(next_tick - now)
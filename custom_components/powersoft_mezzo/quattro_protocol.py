@@ -10,7 +10,7 @@ https://support.biamp.com/Biamp_Control/Control_configuration/Developing_a_custo
 import struct
 import logging
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Dict, Any, List
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,36 +20,117 @@ ETX = 0x03
 DEFAULT_PORT = 1234
 
 # Command codes (from official Powersoft Quattrocanali.pdf documentation)
-CMD_PING = 0x00   # Ping command - simple connectivity test
-CMD_INFO = 0x0B   # Info command - device identification (128 bytes)
-CMD_POWER = 0x14  # Standby control command
+CMD_PING = 0x00            # Ping command - simple connectivity test
+CMD_READGM = 0x01          # Read all gains and mutes
+CMD_WRITE_IN_MUTE = 0x02   # Set input (speaker) mute
+CMD_WRITE_OUT_MUTE = 0x03  # Set output channel mute
+CMD_WRITE_IN_GAIN = 0x04   # Set input (speaker) gain
+CMD_WRITE_OUT_GAIN = 0x05  # Set output channel gain
+CMD_WRITEMULTI = 0x08      # Set gains and mutes of several channels at once
+CMD_INFO = 0x0B            # Info command - device identification (128 bytes)
+CMD_READALARMS = 0x0D      # Per-channel alarms and load metering
+CMD_STANDBY = 0x0E         # Standby set/read command
+CMD_READALLALARMS2 = 0x19  # Global and per-channel alarm bitfields
+CMD_LOADPRESET2 = 0x1A     # Recall a stored preset (0-200)
+CMD_SOURCEMETER = 0x1B     # Input signal presence/clip per source slot
+CMD_OUTPUTMETER = 0x1C     # Output RMS voltage, headroom and signal presence
+
+# Kept for backwards compatibility (was wrongly 0x14 = READLOADDETECT)
+CMD_POWER = CMD_STANDBY
+
+# Answers carry the request command with the high bit set (128 - 255)
+ANSWER_FLAG = 0x80
+ANSWER_OK = 1
+
+# STANDBY request argument (ON-OFF-READ)
+STANDBY_READ = 0
+STANDBY_OFF = 1  # Make the amplifier operative
+STANDBY_ON = 2   # Put the amplifier in standby
+
+# STANDBY answer value (ON-OFF); the encoding differs from the request
+STANDBY_ANSWER_STANDBY = 1
+STANDBY_ANSWER_OPERATIVE = 2
+
+# Gains are expressed in cents of dB
+GAIN_MIN_CDB = -6000
+GAIN_MAX_CDB = 1500
+
+# LOADPRESET2 preset range
+PRESET_MIN = 0
+PRESET_MAX = 200
+
+# WRITEMULTI CHANNEL-MASK: bit X = channel X (0-based) is configured
+MULTI_CHANNELS = 4
+
+# READALLALARMS2 global alarm bits
+GLOBAL_ALARMS = {
+    0: "Mains phase error",
+    1: "AD converter fault",
+    2: "DA converter fault",
+    3: "AUX voltage fault",
+    4: "Digital board over-temperature",
+    5: "Power supply over-temperature",
+    6: "Fan fault",
+    7: "Moderate over-temperature",
+    8: "High over-temperature",
+}
+
+# READALLALARMS2 per-channel alarm bits
+CHANNEL_ALARMS = {
+    0: "Input clip",
+    1: "Thermal SOA active",
+    3: "Over-temperature",
+    4: "Rail voltage fault",
+    5: "AUX current fault",
+    6: "Other fault",
+    7: "Low load protection",
+}
+
+
+def _build_crc16_arc_table() -> tuple:
+    """Precompute the CRC16/ARC remainder of every byte value."""
+    polynomial = 0xA001  # Reversed polynomial for CRC-16-IBM/ARC
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ polynomial
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
 
 
-def crc16_arc(data: bytes) -> int:
+_CRC16_ARC_TABLE = _build_crc16_arc_table()
+
+# Packet framing: STX | cmd | cookie | answer_port | count  ...  crc16 | ~cmd | ETX
+_HEADER = struct.Struct('<BBHHH')
+_TRAILER = struct.Struct('<HBB')
+HEADER_SIZE = _HEADER.size
+MIN_PACKET_SIZE = _HEADER.size + _TRAILER.size
+_EMPTY_DATA = memoryview(b"")
+
+
+def crc16_arc(data) -> int:
     """
     Calculate CRC16/ARC checksum.
 
     This is the algorithm used by QUATTROCANALI protocol.
-    Also known as CRC-16-IBM or CRC-16-ANSI.
+    Also known as CRC-16-IBM or CRC-16-ANSI. Uses a 256-entry table,
+    one lookup per byte instead of eight shift/xor steps.
 
     Args:
-        data: Bytes to calculate checksum for
+        data: Bytes-like object (bytes, bytearray or memoryview)
 
     Returns:
         16-bit CRC checksum
     """
+    table = _CRC16_ARC_TABLE
     crc = 0x0000
-    polynomial = 0xA001  # Reversed polynomial for CRC-16-IBM/ARC
-
     for byte in data:
-        crc ^= byte
-        for _ in range(8):
-            if crc & 0x0001:
-                crc = (crc >> 1) ^ polynomial
-            else:
-                crc >>= 1
-
-    return crc & 0xFFFF
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
 
 
 @dataclass
@@ -70,28 +151,12 @@ class QuattroCommand:
         Returns:
             Complete packet as bytes
         """
-        # Calculate data length
-        count = len(self.data)
-
-        # Calculate CRC16 of data
-        crc = crc16_arc(self.data)
-
-        # Calculate inverse command (~cmd = 255 - cmd)
-        cmd_inverse = (255 - self.cmd) & 0xFF
-
-        # Build packet (all multi-byte values in little-endian)
-        packet = struct.pack(
-            '<BBHHH',
-            STX,
-            self.cmd,
-            self.cookie,
-            self.answer_port,
-            count
-        )
-        packet += self.data
-        packet += struct.pack('<HBB', crc, cmd_inverse, ETX)
-
-        return packet
+        # All multi-byte values are little-endian; ~cmd = 255 - cmd
+        return b''.join((
+            _HEADER.pack(STX, self.cmd, self.cookie, self.answer_port, len(self.data)),
+            self.data,
+            _TRAILER.pack(crc16_arc(self.data), (255 - self.cmd) & 0xFF, ETX),
+        ))
 
 
 @dataclass
@@ -99,75 +164,98 @@ class QuattroResponse:
     """Represents a QUATTROCANALI protocol response."""
     cmd: int           # Command code this responds to
     cookie: int        # Cookie from request
-    data: bytes        # Response data payload
+    data: bytes        # Response data payload (memoryview into the packet)
 
     @staticmethod
-    def parse_packet(packet: bytes) -> Optional['QuattroResponse']:
+    def parse_packet(packet) -> Optional['QuattroResponse']:
         """
         Parse a QUATTROCANALI response packet.
 
+        The payload is returned as a memoryview into the received packet,
+        so no bytes are copied; use bytes(response.data) to keep a copy
+        independent of the packet buffer.
+
         Args:
-            packet: Raw packet bytes
+            packet: Raw packet (bytes, bytearray or memoryview)
 
         Returns:
             Parsed QuattroResponse or None if invalid
         """
-        try:
-            # Minimum packet size: STX + cmd + cookie + answer_port + count + crc16 + ~cmd + ETX
-            if len(packet) < 10:
-                _LOGGER.debug("Packet too short: %d bytes", len(packet))
-                return None
+        size = len(packet)
 
-            # Check STX
-            if packet[0] != STX:
-                _LOGGER.debug("Invalid STX: 0x%02x", packet[0])
-                return None
+        if size < MIN_PACKET_SIZE:
+            _LOGGER.debug("Packet too short: %d bytes", size)
+            return None
 
-            # Check ETX
-            if packet[-1] != ETX:
-                _LOGGER.debug("Invalid ETX: 0x%02x", packet[-1])
-                return None
+        if packet[0] != STX:
+            _LOGGER.debug("Invalid STX: 0x%02x", packet[0])
+            return None
 
-            # Parse header (little-endian)
-            cmd, cookie, answer_port, count = struct.unpack_from('<BHHH', packet, 1)
+        if packet[-1] != ETX:
+            _LOGGER.debug("Invalid ETX: 0x%02x", packet[-1])
+            return None
 
-            # Extract data
-            data_start = 7
-            data_end = data_start + count
+        _, cmd, cookie, _, count = _HEADER.unpack_from(packet)
+        data_end = HEADER_SIZE + count
 
-            if data_end + 3 > len(packet):
-                _LOGGER.debug("Invalid packet length")
-                return None
+        if data_end + _TRAILER.size > size:
+            _LOGGER.debug("Invalid packet length: count %d, packet %d bytes", count, size)
+            return None
 
-            data = packet[data_start:data_end]
+        crc_received, cmd_inverse, _ = _TRAILER.unpack_from(packet, data_end)
 
-            # Verify CRC
-            crc_received = struct.unpack_from('<H', packet, data_end)[0]
+        if count:
+            data = memoryview(packet)[HEADER_SIZE:data_end]
             crc_calculated = crc16_arc(data)
+        else:
+            # Empty payload (acknowledgements): no view to slice, CRC of nothing
+            data = _EMPTY_DATA
+            crc_calculated = 0
+        if crc_received != crc_calculated:
+            _LOGGER.warning(
+                "CRC mismatch: received 0x%04x, calculated 0x%04x",
+                crc_received, crc_calculated
+            )
+            return None
 
-            if crc_received != crc_calculated:
-                _LOGGER.warning(
-                    "CRC mismatch: received 0x%04x, calculated 0x%04x",
-                    crc_received, crc_calculated
-                )
-                return None
+        expected_inverse = (255 - cmd) & 0xFF
+        if cmd_inverse != expected_inverse:
+            _LOGGER.warning(
+                "Command inverse mismatch: received 0x%02x, expected 0x%02x",
+                cmd_inverse, expected_inverse
+            )
+            return None
 
-            # Verify inverse command
-            cmd_inverse = packet[data_end + 2]
-            expected_inverse = (255 - cmd) & 0xFF
+        return QuattroResponse(cmd=cmd, cookie=cookie, data=data)
 
-            if cmd_inverse != expected_inverse:
-                _LOGGER.warning(
-                    "Command inverse mismatch: received 0x%02x, expected 0x%02x",
-                    cmd_inverse, expected_inverse
-                )
-                return None
 
-            return QuattroResponse(cmd=cmd, cookie=cookie, data=data)
+def is_answer_to(response: QuattroResponse, cmd: int) -> bool:
+    """
+    Check whether a response answers the given request command.
 
-        except Exception as err:
-            _LOGGER.error("Failed to parse QUATTROCANALI packet: %s", err)
-            return None
+    Args:
+        response: Parsed response
+        cmd: Request command code
+
+    Returns:
+        True if the response command matches the request
+    """
+    # Some firmwares echo the request code instead of setting the answer bit
+    return response.cmd in (cmd | ANSWER_FLAG, cmd)
+
+
+def decode_alarm_bits(value: int, names: Dict[int, str]) -> List[str]:
+    """
+    Decode an alarm bitfield into the names of the active alarms.
+
+    Args:
+        value: Alarm bitfield
+        names: Mapping of bit number to alarm name
+
+    Returns:
+        List of active alarm names
+    """
+    return [name for bit, name in names.items() if value & (1 << bit)]
 
 
 # Command builders for common operations
@@ -212,10 +300,166 @@ def build_power_command(power_on: bool) -> QuattroCommand:
     Returns:
         QuattroCommand for power control
     """
-    # Power ON: 01 00 00 00 (little-endian)
-    # Power OFF: 02 00 00 00 (little-endian)
-    data = struct.pack('<I', 1 if power_on else 2)
-    return QuattroCommand(cmd=CMD_POWER, data=data)
+    return build_standby_command(STANDBY_OFF if power_on else STANDBY_ON)
+
+
+def build_standby_command(action: int = STANDBY_READ) -> QuattroCommand:
+    """
+    Build a STANDBY command.
+
+    Args:
+        action: STANDBY_READ to query, STANDBY_OFF to power on,
+                STANDBY_ON to enter standby
+
+    Returns:
+        QuattroCommand for STANDBY
+    """
+    # ON-OFF-READ as 32-bit little-endian (e.g. power on: 01 00 00 00)
+    return QuattroCommand(cmd=CMD_STANDBY, data=struct.pack('<I', action))
+
+
+def build_readgm_command() -> QuattroCommand:
+    """
+    Build a READGM command to read all gains and mutes.
+
+    Returns:
+        QuattroCommand for READGM
+    """
+    return QuattroCommand(cmd=CMD_READGM, data=b'')
+
+
+def build_write_out_gain_command(channel: int, gain_cdb: int) -> QuattroCommand:
+    """
+    Build a WRITEOUTGAIN command.
+
+    Args:
+        channel: Output channel (0-based)
+        gain_cdb: Gain in cents of dB (-6000 to 1500)
+
+    Returns:
+        QuattroCommand for WRITEOUTGAIN
+    """
+    gain_cdb = max(GAIN_MIN_CDB, min(GAIN_MAX_CDB, int(gain_cdb)))
+    return QuattroCommand(cmd=CMD_WRITE_OUT_GAIN, data=struct.pack('<Bi', channel, gain_cdb))
+
+
+def build_write_out_mute_command(channel: int, muted: bool) -> QuattroCommand:
+    """
+    Build a WRITEOUTMUTE command.
+
+    Args:
+        channel: Output channel (0-based)
+        muted: True to mute, False to unmute
+
+    Returns:
+        QuattroCommand for WRITEOUTMUTE
+    """
+    return QuattroCommand(cmd=CMD_WRITE_OUT_MUTE, data=struct.pack('<BB', channel, 1 if muted else 0))
+
+
+def build_write_multi_command(
+    channel_mask: int,
+    in_gain_cdb: int,
+    out_gain_cdb: int,
+    in_mute: bool,
+    out_mute: bool,
+) -> QuattroCommand:
+    """
+    Build a WRITEMULTI command.
+
+    WRITEMULTI sets the same input gain, output gain, input mute and output
+    mute on every channel selected by CHANNEL-MASK. All four values are
+    applied, so the current input settings must be passed to keep them.
+
+    Layout: CHANNEL-MASK (u8), INGAIN (i32), OUTGAIN (i32), INMUTE (u8),
+    OUTMUTE (u8). The field widths follow the single channel writes; the
+    protocol document does not give the mask width, and the layout has not
+    been checked on hardware, so scenes use the single channel writes.
+
+    Args:
+        channel_mask: Bit X set to configure channel X (0-based)
+        in_gain_cdb: Input gain in cents of dB
+        out_gain_cdb: Output gain in cents of dB
+        in_mute: Input mute
+        out_mute: Output mute
+
+    Returns:
+        QuattroCommand for WRITEMULTI
+
+    Raises:
+        ValueError: If the mask selects no channel or an unknown one
+    """
+    if not 0 < channel_mask < 1 << MULTI_CHANNELS:
+        raise ValueError(f"WRITEMULTI channel mask must select channels 0-{MULTI_CHANNELS - 1}")
+    return QuattroCommand(cmd=CMD_WRITEMULTI, data=struct.pack(
+        '<BiiBB',
+        channel_mask,
+        max(GAIN_MIN_CDB, min(GAIN_MAX_CDB, int(in_gain_cdb))),
+        max(GAIN_MIN_CDB, min(GAIN_MAX_CDB, int(out_gain_cdb))),
+        1 if in_mute else 0,
+        1 if out_mute else 0,
+    ))
+
+
+def build_load_preset2_command(preset: int) -> QuattroCommand:
+    """
+    Build a LOADPRESET2 command.
+
+    Args:
+        preset: Stored preset number (0-200)
+
+    Returns:
+        QuattroCommand for LOADPRESET2
+
+    Raises:
+        ValueError: If the preset number is out of range
+    """
+    if not PRESET_MIN <= preset <= PRESET_MAX:
+        raise ValueError(f"Preset must be between {PRESET_MIN} and {PRESET_MAX}")
+    return QuattroCommand(cmd=CMD_LOADPRESET2, data=struct.pack('<B', preset))
+
+
+def build_read_alarms_command(channel: int) -> QuattroCommand:
+    """
+    Build a READALARMS command for one output channel.
+
+    Args:
+        channel: Output channel (0-based)
+
+    Returns:
+        QuattroCommand for READALARMS
+    """
+    return QuattroCommand(cmd=CMD_READALARMS, data=struct.pack('<B', channel))
+
+
+def build_source_meter_command() -> QuattroCommand:
+    """
+    Build a SOURCEMETER command.
+
+    Returns:
+        QuattroCommand for SOURCEMETER
+    """
+    return QuattroCommand(cmd=CMD_SOURCEMETER, data=b'')
+
+
+def build_output_meter_command() -> QuattroCommand:
+    """
+    Build an OUTPUTMETER command.
+
+    Returns:
+        QuattroCommand for OUTPUTMETER
+    """
+    return QuattroCommand(cmd=CMD_OUTPUTMETER, data=b'')
+
+
+def build_read_all_alarms2_command() -> QuattroCommand:
+    """
+    Build a READALLALARMS2 command.
+
+    Returns:
+        QuattroCommand for READALLALARMS2
+    """
+    return QuattroCommand(cmd=CMD_READALLALARMS2, data=b'')
 
 
 def parse_info_response(data: bytes) -> Optional[dict]:
@@ -234,6 +478,7 @@ def parse_info_response(data: bytes) -> Optional[dict]:
 
     try:
         # Each field is 32 bytes, null-terminated strings
+        data = bytes(data)
         manufacturer = data[0:32].split(b'\x00', 1)[0].decode('ascii', errors='ignore').strip()
         family = data[32:64].split(b'\x00', 1)[0].decode('ascii', errors='ignore').strip()
         model = data[64:96].split(b'\x00', 1)[0].decode('ascii', errors='ignore').strip()
@@ -248,3 +493,129 @@ def parse_info_response(data: bytes) -> Optional[dict]:
     except Exception as err:
         _LOGGER.error("Failed to parse INFO response: %s", err)
         return None
+
+
+def parse_standby_response(data: bytes) -> Optional[bool]:
+    """
+    Parse the response from a STANDBY command.
+
+    Layout: answer_ok (u8), ON-OFF (u8, 2 = operative, 1 = standby).
+
+    Args:
+        data: Response data
+
+    Returns:
+        True if the amplifier is in standby, False if operative, None if invalid
+    """
+    if len(data) < 2 or data[0] != ANSWER_OK:
+        _LOGGER.warning("Invalid STANDBY response: %s", data.hex())
+        return None
+    return data[1] == STANDBY_ANSWER_STANDBY
+
+
+def parse_readgm_response(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse the response from a READGM command.
+
+    Layout: answer_ok (u8), num_channels (u8), then for N slots
+    IN_GAIN (i32 x N), OUT_GAIN (i32 x N), IN_MUTE (u8 x N), OUT_MUTE (u8 x N).
+    N is derived from the payload size so 4 and 8 channel models both parse;
+    only the first num_channels entries are valid.
+
+    Args:
+        data: Response data
+
+    Returns:
+        Dictionary with 'num_channels' and 0-based lists 'in_gains',
+        'out_gains' (cents of dB), 'in_mutes' and 'out_mutes', or None if invalid
+    """
+    if len(data) < 2 or data[0] != ANSWER_OK:
+        _LOGGER.warning("Invalid READGM response: %s", data.hex())
+        return None
+
+    slots = (len(data) - 2) // 10
+    num_channels = min(data[1], slots)
+    if slots == 0:
+        _LOGGER.warning("READGM response has no channel data (%d bytes)", len(data))
+        return None
+
+    gains = struct.unpack_from(f'<{2 * slots}i', data, 2)
+    mutes = data[2 + 8 * slots:2 + 10 * slots]
+
+    return {
+        'num_channels': num_channels,
+        'in_gains': list(gains[:num_channels]),
+        'out_gains': list(gains[slots:slots + num_channels]),
+        'in_mutes': [bool(m) for m in mutes[:num_channels]],
+        'out_mutes': [bool(m) for m in mutes[slots:slots + num_channels]],
+    }
+
+
+# READALARMS answer after answer_ok/channel: validity, detected and level
+# for pilot tone, pilot tone impedance and nominal impedance, then
+# dip-switch, output relay alarms and selected input
+_READALARMS_FORMAT = '<BBBBHBBHBBHBBB'
+
+
+def parse_alarms_response(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse the response from a READALARMS command.
+
+    Args:
+        data: Response data
+
+    Returns:
+        Dictionary with the channel's load and alarm status, or None if invalid
+    """
+    if len(data) < struct.calcsize(_READALARMS_FORMAT) or data[0] != ANSWER_OK:
+        _LOGGER.warning("Invalid READALARMS response: %s", data.hex())
+        return None
+
+    (_, channel,
+     pt_valid, pt_detected, pt_rms,
+     pt_ni_valid, pt_ni_detected, pt_ni_rms,
+     ni_valid, ni_detected, ni_rms,
+     dip_switch, alarms, selected_in) = struct.unpack_from(_READALARMS_FORMAT, data)
+
+    return {
+        'channel': channel,
+        'pilot_tone_detected': bool(pt_detected) if pt_valid else None,
+        'pilot_tone_v': pt_rms / 10.0 if pt_valid else None,
+        'pilot_tone_impedance_ohm': pt_ni_rms / 10.0 if pt_ni_valid else None,
+        'load_detected': bool(ni_detected) if ni_valid else None,
+        'impedance_ohm': ni_rms / 10.0 if ni_valid else None,
+        'dip_switch': dip_switch,
+        'alarms': alarms,
+        'selected_input': selected_in,
+    }
+
+
+def parse_all_alarms2_response(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse the response from a READALLALARMS2 command.
+
+    Layout: answer_ok (u8), gpio_alarms (u8), global_alarms (u32),
+    then one u32 alarm bitfield per output channel.
+
+    Args:
+        data: Response data
+
+    Returns:
+        Dictionary with raw bitfields and decoded alarm names, or None if invalid
+    """
+    if len(data) < 6 or data[0] != ANSWER_OK:
+        _LOGGER.warning("Invalid READALLALARMS2 response: %s", data.hex())
+        return None
+
+    gpio_alarms = data[1]
+    global_alarms = struct.unpack_from('<I', data, 2)[0]
+    count = (len(data) - 6) // 4
+    channel_alarms = list(struct.unpack_from(f'<{count}I', data, 6))
+
+    return {
+        'gpio': gpio_alarms,
+        'global': global_alarms,
+        'global_active': decode_alarm_bits(global_alarms, GLOBAL_ALARMS),
+        'channels': channel_alarms,
+        'channels_active': [decode_alarm_bits(v, CHANNEL_ALARMS) for v in channel_alarms],
+    }
@@ -0,0 +1,241 @@
+"""
+Volume and EQ Ramps for Powersoft Mezzo Amplifiers.
+
+A ramp moves one register from its current value to a target over a given
+duration. All ramps of an amplifier share one fixed-rate tick: on every
+tick each active ramp contributes the write for its current value and the
+writes go out as one multicommand, adjacent registers merged. The request
+size therefore depends on the number of registers moving, not on the
+ramp durations, and the network load is bounded by the tick rate.
+
+Ticks are scheduled on absolute loop times so ramps end on time; a tick
+that overruns its slot makes the next one skip ahead rather than send a
+burst. A lost tick is simply superseded by the next one, but a ramp only
+finishes once its final value has been acknowledged; if that write keeps
+failing for MAX_FINAL_ATTEMPTS ticks the ramp is dropped with the error.
+
+A new ramp on a register that is already ramping starts from the value
+the old one has reached, so retargeting mid-fade does not jump.
+"""
+import asyncio
+import logging
+import math
+from typing import Callable, Dict, List, Optional
+
+from .pbus_protocol import WriteCommand
+from .register_image import merge_writes
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RAMP_RATE = 25.0  # ticks per second
+MIN_RAMP_RATE = 20.0
+MAX_RAMP_RATE = 50.0
+MAX_FINAL_ATTEMPTS = 5  # ticks sending the final value before giving up
+
+
+class _Ramp:
+    """One register moving from start to end over duration."""
+
+    __slots__ = ('address', 'start', 'end', 'begin', 'duration', 'encode', 'future', 'attempts')
+
+    def __init__(self, address, start, end, begin, duration, encode, future):
+        self.address = address
+        self.start = start
+        self.end = end
+        self.begin = begin
+        self.duration = duration
+        self.encode = encode
+        self.future = future
+        self.attempts = 0  # ticks that sent the final value
+
+    def value(self, now: float) -> float:
+        """Interpolated value at loop time now."""
+        if self.duration <= 0 or now >= self.begin + self.duration:
+            return self.end
+        return self.start + (self.end - self.start) * max(0.0, now - self.begin) / self.duration
+
+
+class RampEngine:
+    """Fixed-rate scheduler of register ramps for one amplifier."""
+
+    def __init__(self, client, rate: float = DEFAULT_RAMP_RATE):
+        """
+        Initialize the engine.
+
+        Args:
+            client: MezzoClient to write through
+            rate: Ticks per second (MIN_RAMP_RATE to MAX_RAMP_RATE)
+
+        Raises:
+            ValueError: If the rate is out of range
+        """
+        if not MIN_RAMP_RATE <= rate <= MAX_RAMP_RATE:
+            raise ValueError(f"Ramp rate must be {MIN_RAMP_RATE:g}-{MAX_RAMP_RATE:g} Hz")
+        self._client = client
+        self.rate = rate
+        self._ramps: Dict[int, _Ramp] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.ticks = 0
+        self.missed = 0
+        self.overruns = 0
+
+    @property
+    def running(self) -> bool:
+        """Check if any ramp is in progress."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def active(self) -> int:
+        """Number of registers ramping."""
+        return len(self._ramps)
+
+    def current(self, address: int) -> Optional[float]:
+        """Value a ramp on address has reached, or None if it is not ramping."""
+        ramp = self._ramps.get(address)
+        if ramp is None:
+            return None
+        return ramp.value(asyncio.get_running_loop().time())
+
+    def ramp(
+        self,
+        address: int,
+        start: float,
+        end: float,
+        duration: float,
+        encode: Callable[[float], bytes],
+    ) -> "asyncio.Future[bool]":
+        """
+        Start moving a register to a new value.
+
+        Values are interpolated linearly, so callers pick the domain
+        (e.g. dB for volumes) and encode converts to register bytes. A ramp
+        already running on the address is replaced and the new one starts
+        from the value it had reached.
+
+        Args:
+            address: Register address (the key of the ramp)
+            start: Start value, used when the register is not ramping
+            end: Target value
+            duration: Seconds to reach the target (0 = next tick)
+            encode: Converts a value into the register's bytes
+
+        Returns:
+            Future resolving to True when the target is acknowledged, or
+            False if the ramp was replaced or cancelled. It fails with
+            TimeoutError or ValueError if the target is not acknowledged
+            within MAX_FINAL_ATTEMPTS ticks, or ConnectionError if the
+            client disconnects
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        previous = self._ramps.pop(address, None)
+        if previous is not None:
+            start = previous.value(now)
+            self._finish(previous, False)
+
+        future = loop.create_future()
+        self._ramps[address] = _Ramp(address, start, end, now, max(0.0, duration), encode, future)
+        if not self.running:
+            self._task = loop.create_task(self._run())
+        return future
+
+    def cancel(self, address: Optional[int] = None) -> None:
+        """
+        Stop ramps where they are.
+
+        Args:
+            address: Register to stop, or None for all
+        """
+        addresses = list(self._ramps) if address is None else [address]
+        for addr in addresses:
+            ramp = self._ramps.pop(addr, None)
+            if ramp is not None:
+                self._finish(ramp, False)
+
+    async def stop(self) -> None:
+        """Cancel all ramps and wait for the tick task to end."""
+        self.cancel()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @staticmethod
+    def _finish(ramp: _Ramp, reached: bool) -> None:
+        """Resolve a ramp's future."""
+        if not ramp.future.done():
+            ramp.future.set_result(reached)
+
+    def _give_up(self, final: List[_Ramp], err: Exception) -> None:
+        """Drop final ramps whose target write failed MAX_FINAL_ATTEMPTS times."""
+        for ramp in final:
+            if ramp.attempts < MAX_FINAL_ATTEMPTS or self._ramps.get(ramp.address) is not ramp:
+                continue
+            del self._ramps[ramp.address]
+            _LOGGER.warning(
+                "Ramp of 0x%08x on %s dropped, target not acknowledged after %d attempts: %s",
+                ramp.address, self._client.host, ramp.attempts, err,
+            )
+            if not ramp.future.done():
+                ramp.future.set_exception(err)
+
+    async def _run(self) -> None:
+        """Tick loop; ends when no ramp is left."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.rate
+        next_tick = loop.time()
+
+        while self._ramps:
+            now = loop.time()
+            ramps: List[_Ramp] = list(self._ramps.values())
+            final = [ramp for ramp in ramps if now >= ramp.begin + ramp.duration]
+            commands = merge_writes(
+                WriteCommand(ramp.address, ramp.encode(ramp.value(now))) for ramp in ramps
+            )
+            for ramp in final:
+                ramp.attempts += 1
+            try:
+                responses = await self._client.send_commands(commands, timeout=interval)
+            except (TimeoutError, ValueError) as err:
+                self.missed += 1
+                _LOGGER.debug("Ramp tick to %s failed: %s", self._client.host, err)
+                self._give_up(final, err)
+            except ConnectionError as err:
+                _LOGGER.warning("Ramps to %s stopped: %s", self._client.host, err)
+                for ramp in list(self._ramps.values()):
+                    if not ramp.future.done():
+                        ramp.future.set_exception(err)
+                self._ramps.clear()
+                return
+            else:
+                self.ticks += 1
+                acked = {
+                    command.address: not response.is_nak()
+                    for command, response in zip(commands, responses)
+                }
+                nacked = []
+                for ramp in final:
+                    # Merged writes are acknowledged as one block
+                    block = max((addr for addr in acked if addr <= ramp.address), default=None)
+                    if self._ramps.get(ramp.address) is not ramp:
+                        continue
+                    if block is not None and acked[block]:
+                        del self._ramps[ramp.address]
+                        self._finish(ramp, True)
+                    else:
+                        nacked.append(ramp)
+                if nacked:
+                    self._give_up(nacked, ValueError("Ramp target write NAKed"))
+
+            now = loop.time()
+            next_tick += interval
+            if next_tick < now:
+                # Skip the slots we overran instead of sending back to back
+                skipped = math.ceil((now - next_tick) / interval)
+                self.overruns += skipped
+                next_tick += skipped * interval
+            await asyncio.sleep(next_tick - now)
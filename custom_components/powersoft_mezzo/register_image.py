@@ -0,0 +1,180 @@
+"""
+Register Image for Powersoft Mezzo Amplifiers.
+
+A local copy of the device memory the client has seen: the registers read
+by the last poll, patched with every write the device acknowledged since.
+Each PBus area (register_schema.AREAS) gets a byte image and a mask of
+the bytes that are known.
+
+The differential scene apply compares compiled writes against the image
+and sends only those that would change something. Registers changed by
+another controller since the last poll are not seen until the next one.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .mezzo_memory_map import ADDR_STANDBY_STATE, ADDR_STANDBY_TRIGGER
+from .pbus_protocol import OPCODE_READ, OPCODE_WRITE, PBusCommand, PBusResponse, WriteCommand
+from .register_schema import AREAS
+
+# OPCODE (1) + ADDR32 (4) + SIZE32 (4) ahead of the data of every command
+COMMAND_HEADER_SIZE = 9
+
+# Write-only triggers and the readable register showing their effect
+_TRIGGER_STATE = {ADDR_STANDBY_TRIGGER: ADDR_STANDBY_STATE}
+
+
+@dataclass
+class ApplyReport:
+    """What a scene apply sent compared with a full write."""
+
+    commands: int
+    bytes: int
+    commands_sent: int
+    bytes_sent: int
+
+    @property
+    def commands_saved(self) -> int:
+        """Commands left out of the request."""
+        return self.commands - self.commands_sent
+
+    @property
+    def bytes_saved(self) -> int:
+        """Command bytes (before escaping) left out of the request."""
+        return self.bytes - self.bytes_sent
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return a JSON-serialisable form for diagnostics and events."""
+        return {
+            'commands': self.commands,
+            'bytes': self.bytes,
+            'commands_sent': self.commands_sent,
+            'bytes_sent': self.bytes_sent,
+            'commands_saved': self.commands_saved,
+            'bytes_saved': self.bytes_saved,
+        }
+
+
+def command_bytes(commands: Iterable[WriteCommand]) -> int:
+    """Size of write commands in a request, before escaping."""
+    return sum(COMMAND_HEADER_SIZE + command.size for command in commands)
+
+
+def merge_writes(commands: Iterable[WriteCommand]) -> List[WriteCommand]:
+    """
+    Sort writes by address and merge adjacent ones into block writes.
+
+    Args:
+        commands: Writes to non-overlapping ranges
+
+    Returns:
+        Equivalent writes in address order
+    """
+    result: List[WriteCommand] = []
+    for command in sorted(commands, key=lambda c: c.address):
+        last = result[-1] if result else None
+        if last is not None and last.address + last.size == command.address:
+            result[-1] = WriteCommand(last.address, last.data + command.data)
+        else:
+            result.append(command)
+    return result
+
+
+class RegisterImage:
+    """Known device memory, one byte image and mask per PBus area."""
+
+    def __init__(self, areas: Iterable[Tuple[int, int]] = AREAS):
+        """
+        Initialize an empty image.
+
+        Args:
+            areas: (start, end) address ranges to keep
+        """
+        self._areas = [(start, end, bytearray(end - start), bytearray(end - start))
+                       for start, end in areas]
+
+    def _locate(self, address: int, size: int):
+        """Return (image, mask, offset) of the area holding a range, or None."""
+        for start, end, image, mask in self._areas:
+            if start <= address and address + size <= end:
+                return image, mask, address - start
+        return None
+
+    def store(self, address: int, data: bytes) -> None:
+        """Record bytes read from or acknowledged by the device."""
+        located = self._locate(address, len(data))
+        if located is None:
+            return
+        image, mask, offset = located
+        image[offset:offset + len(data)] = data
+        mask[offset:offset + len(data)] = b'\x01' * len(data)
+
+    def forget(self, address: int, size: int) -> None:
+        """Mark a range unknown, e.g. after a write that was not acknowledged."""
+        located = self._locate(address, size)
+        if located is not None:
+            _, mask, offset = located
+            mask[offset:offset + size] = bytes(size)
+
+    def lookup(self, address: int, size: int) -> Optional[bytes]:
+        """Return the bytes of a range, or None unless all of them are known."""
+        located = self._locate(address, size)
+        if located is None:
+            return None
+        image, mask, offset = located
+        if mask.find(0, offset, offset + size) != -1:
+            return None
+        return bytes(image[offset:offset + size])
+
+    def clear(self) -> None:
+        """Forget everything."""
+        for _, _, _, mask in self._areas:
+            mask[:] = bytes(len(mask))
+
+    def track(self, commands: Iterable[PBusCommand], responses: List[PBusResponse]) -> None:
+        """
+        Update the image from a request and its replies.
+
+        Answered reads are stored. Acknowledged writes are stored (a
+        trigger updates the register showing its effect); the ranges of
+        NAKed or unanswered writes become unknown.
+
+        Args:
+            commands: Commands sent
+            responses: Replies, in command order (may be shorter)
+        """
+        for index, command in enumerate(commands):
+            response = responses[index] if index < len(responses) else None
+            if command.opcode == OPCODE_READ:
+                if response is not None and not response.is_nak():
+                    self.store(command.address, response.data)
+            elif command.opcode == OPCODE_WRITE:
+                address = _TRIGGER_STATE.get(command.address, command.address)
+                if response is not None and not response.is_nak():
+                    self.store(address, command.data)
+                else:
+                    self.forget(address, command.size)
+
+    def changed(self, command: WriteCommand) -> bool:
+        """Check if a write would change the image (unknown counts as changed)."""
+        address = _TRIGGER_STATE.get(command.address, command.address)
+        return self.lookup(address, command.size) != command.data
+
+    def diff(self, commands: Iterable[WriteCommand]) -> List[WriteCommand]:
+        """
+        Reduce writes to those that change something.
+
+        Changed writes are sorted by address and adjacent ones merged into
+        one block write. Write-only triggers are never merged and go last,
+        in their original order.
+
+        Args:
+            commands: Full list of writes, e.g. from compile_scene
+
+        Returns:
+            Writes to send
+        """
+        changed = [command for command in commands if self.changed(command)]
+        result = merge_writes([c for c in changed if c.address not in _TRIGGER_STATE])
+        result.extend(c for c in changed if c.address in _TRIGGER_STATE)
+        return result
@@ -0,0 +1,407 @@
+"""
+Declarative Register Schema for Powersoft Mezzo Amplifiers.
+
+Each register is one table line giving its name, address, element type,
+element count, stride and access rights. From the table this module
+builds:
+
+- ReadPlan: the read commands for any set of registers, with registers
+  that lie close together in the same PBus area merged into one read,
+  and one precompiled struct.Struct per read so decoding a reply is a
+  single unpack_from.
+- write_command(): typed, range-checked WriteCommand for one element.
+- pack_biquad() / unpack_biquad(): the 24-byte BiQuad EQ structure, and
+  pack_biquads() for several consecutive BiQuads in one struct.
+
+The ADDR_* constants in mezzo_memory_map stay the source of the
+addresses; the table only describes how to read and write them.
+"""
+import struct
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .mezzo_memory_map import (
+    ADDR_ANALOG_REF,
+    ADDR_AUTO_POWER_DOWN_ENABLE,
+    ADDR_AUTO_TURN_ON_ENABLE,
+    ADDR_FAULT_CODE,
+    ADDR_MANUAL_SOURCE_SELECTION,
+    ADDR_MUTE_CODE_FLAGS_CH1,
+    ADDR_POWER_CONFIG_END,
+    ADDR_POWER_CONFIG_START,
+    ADDR_PRIORITY_SOURCE_CH1,
+    ADDR_READINGS_END,
+    ADDR_READINGS_START,
+    ADDR_SOURCE_CONFIG_END,
+    ADDR_SOURCE_EQ_START,
+    ADDR_SOURCE_ID_CH1,
+    ADDR_STANDBY_STATE,
+    ADDR_STANDBY_TRIGGER,
+    ADDR_TEMP_CH1,
+    ADDR_TEMP_HEATSINK,
+    ADDR_TEMP_TRANSFORMER,
+    ADDR_USER_DELAY_CH1,
+    ADDR_USER_EQ_CH1_START,
+    ADDR_USER_EQ_END,
+    ADDR_USER_GAIN_CH1,
+    ADDR_USER_MUTE_CH1,
+    ADDR_USER_POLARITY_CH1,
+    ADDR_USER_SETTINGS_START,
+    ADDR_USER_SHADING_CH1,
+    ADDR_ZONE_BLOCK_END,
+    ADDR_ZONE_BLOCK_START,
+    ADDR_ZONE_ENABLE_CH1,
+    ADDR_ZONE_GAIN_CH1,
+    ADDR_ZONE_MUTE_CH1,
+    EQ_BIQUAD_SIZE,
+    NUM_CHANNELS,
+    NUM_EQ_BANDS,
+    NUM_SOURCE_EQ_BANDS,
+)
+from .pbus_protocol import PBusResponse, ReadCommand, WriteCommand
+
+# ============================================================================
+# ELEMENT TYPES
+# ============================================================================
+
+# BiQuad structure: enabled, type, Q, slope, frequency (Hz), gain
+BIQUAD_FIELDS = ("enabled", "type", "q", "slope", "frequency", "gain")
+BIQUAD = struct.Struct('<IIffIf')
+FLAT_BIQUAD = {"enabled": 0, "type": 0, "q": 1.0, "slope": 1.0, "frequency": 1000, "gain": 1.0}
+
+# type name -> (struct format of one element, field names for compound types)
+TYPES: Dict[str, Tuple[str, Optional[Tuple[str, ...]]]] = {
+    "u8": ("B", None),
+    "u32": ("I", None),
+    "i32": ("i", None),
+    "f32": ("f", None),
+    "biquad": (BIQUAD.format.lstrip('<'), BIQUAD_FIELDS),
+}
+
+# Registers further apart than this are read separately
+DEFAULT_MAX_GAP = 32
+
+
+def pack_biquad(band: Dict[str, Any]) -> bytes:
+    """
+    Pack a BiQuad dict into its 24-byte form.
+
+    Missing keys take their flat (pass-through) value.
+
+    Raises:
+        ValueError: If a value does not fit its field
+    """
+    try:
+        return BIQUAD.pack(*(band.get(key, FLAT_BIQUAD[key]) for key in BIQUAD_FIELDS))
+    except struct.error as err:
+        raise ValueError(f"Invalid BiQuad {band}: {err}") from err
+
+
+def unpack_biquad(data: bytes, offset: int = 0) -> Dict[str, Any]:
+    """Unpack a 24-byte BiQuad into a dict."""
+    return dict(zip(BIQUAD_FIELDS, BIQUAD.unpack_from(data, offset)))
+
+
+_BIQUAD_ARRAYS: Dict[int, struct.Struct] = {}
+
+
+def pack_biquads(bands: Sequence[Dict[str, Any]]) -> bytes:
+    """
+    Pack consecutive BiQuads (e.g. a channel's EQ bank) with one struct.
+
+    The struct for each band count is compiled once and reused.
+
+    Raises:
+        ValueError: If a value does not fit its field
+    """
+    packer = _BIQUAD_ARRAYS.get(len(bands))
+    if packer is None:
+        packer = _BIQUAD_ARRAYS[len(bands)] = struct.Struct(
+            '<' + BIQUAD.format.lstrip('<') * len(bands)
+        )
+    try:
+        return packer.pack(*(band.get(key, FLAT_BIQUAD[key]) for band in bands for key in BIQUAD_FIELDS))
+    except struct.error as err:
+        raise ValueError(f"Invalid BiQuad in {list(bands)}: {err}") from err
+
+
+# ============================================================================
+# REGISTER TABLE
+# ============================================================================
+
+@dataclass(frozen=True)
+class Register:
+    """One register, or an array of equally spaced registers."""
+    name: str
+    address: int
+    type: str
+    count: int = 1
+    stride: int = 0  # bytes between elements; 0 = packed
+    access: str = "r"
+
+    @property
+    def format(self) -> str:
+        """struct format of one element (without byte order)."""
+        return TYPES[self.type][0]
+
+    @property
+    def fields(self) -> Optional[Tuple[str, ...]]:
+        """Field names of a compound element, None for scalars."""
+        return TYPES[self.type][1]
+
+    @property
+    def size(self) -> int:
+        """Size of one element in bytes."""
+        return struct.calcsize('<' + self.format)
+
+    @property
+    def step(self) -> int:
+        """Distance between consecutive elements in bytes."""
+        return self.stride or self.size
+
+    @property
+    def end(self) -> int:
+        """Address just past the last element."""
+        return self.address + (self.count - 1) * self.step + self.size
+
+    def address_of(self, index: int = 0) -> int:
+        """
+        Address of one element.
+
+        Raises:
+            ValueError: If index is out of range
+        """
+        if not 0 <= index < self.count:
+            raise ValueError(f"{self.name} index must be 0-{self.count - 1}, got {index}")
+        return self.address + index * self.step
+
+    def select(self, first: int, count: int = 1) -> "Register":
+        """
+        Return a view of `count` elements starting at index `first`.
+
+        Raises:
+            ValueError: If the range is out of bounds
+        """
+        if count < 1 or first + count > self.count:
+            raise ValueError(f"{self.name}[{first}:{first + count}] is out of range")
+        return replace(self, address=self.address_of(first), count=count)
+
+
+REGISTERS: Dict[str, Register] = {reg.name: reg for reg in (
+    # Source selection area
+    Register("source_id", ADDR_SOURCE_ID_CH1, "i32", NUM_CHANNELS, access="rw"),
+    Register("priority_source", ADDR_PRIORITY_SOURCE_CH1, "i32", NUM_CHANNELS, access="rw"),
+    Register("manual_source", ADDR_MANUAL_SOURCE_SELECTION, "i32", access="rw"),
+    # User area
+    Register("user_gain", ADDR_USER_GAIN_CH1, "f32", NUM_CHANNELS, access="rw"),
+    Register("user_delay", ADDR_USER_DELAY_CH1, "f32", NUM_CHANNELS, access="rw"),
+    Register("user_polarity", ADDR_USER_POLARITY_CH1, "u8", NUM_CHANNELS, access="rw"),
+    Register("user_mute", ADDR_USER_MUTE_CH1, "u8", NUM_CHANNELS, access="rw"),
+    Register("user_shading", ADDR_USER_SHADING_CH1, "f32", NUM_CHANNELS, access="rw"),
+    Register("user_eq", ADDR_USER_EQ_CH1_START, "biquad", NUM_CHANNELS * NUM_EQ_BANDS,
+             EQ_BIQUAD_SIZE, "rw"),
+    # Power config area
+    Register("standby_trigger", ADDR_STANDBY_TRIGGER, "u32", access="w"),
+    Register("auto_turn_on", ADDR_AUTO_TURN_ON_ENABLE, "u32", access="rw"),
+    Register("auto_power_down", ADDR_AUTO_POWER_DOWN_ENABLE, "u32", access="rw"),
+    # Readings area
+    Register("temp_transformer", ADDR_TEMP_TRANSFORMER, "f32"),
+    Register("temp_heatsink", ADDR_TEMP_HEATSINK, "f32"),
+    Register("temp_channel", ADDR_TEMP_CH1, "f32", NUM_CHANNELS),
+    Register("standby_state", ADDR_STANDBY_STATE, "u32"),
+    Register("fault_code", ADDR_FAULT_CODE, "u8"),
+    Register("mute_code_flags", ADDR_MUTE_CODE_FLAGS_CH1, "u32", NUM_CHANNELS),
+    # Zone block area
+    Register("zone_enable", ADDR_ZONE_ENABLE_CH1, "u8", NUM_CHANNELS, access="rw"),
+    Register("zone_mute", ADDR_ZONE_MUTE_CH1, "u8", NUM_CHANNELS, access="rw"),
+    Register("zone_gain", ADDR_ZONE_GAIN_CH1, "f32", NUM_CHANNELS, access="rw"),
+    Register("source_eq", ADDR_SOURCE_EQ_START, "biquad", NUM_CHANNELS * NUM_SOURCE_EQ_BANDS,
+             EQ_BIQUAD_SIZE, "rw"),
+)}
+
+# PBus areas; a read may not cross an area boundary
+AREAS = (
+    (ADDR_ANALOG_REF, ADDR_SOURCE_CONFIG_END),
+    (ADDR_USER_SETTINGS_START, ADDR_USER_EQ_END),
+    (ADDR_POWER_CONFIG_START, ADDR_POWER_CONFIG_END),
+    (ADDR_READINGS_START, ADDR_READINGS_END),
+    (ADDR_ZONE_BLOCK_START, ADDR_ZONE_BLOCK_END),
+)
+
+
+def register(name: str) -> Register:
+    """
+    Look up a register by name.
+
+    Raises:
+        ValueError: If there is no such register
+    """
+    try:
+        return REGISTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown register {name!r}") from None
+
+
+def _area_of(reg: Register) -> Optional[int]:
+    """Index of the PBus area holding a register, if known."""
+    for index, (start, end) in enumerate(AREAS):
+        if start <= reg.address and reg.end <= end:
+            return index
+    return None
+
+
+# ============================================================================
+# READ PLANS
+# ============================================================================
+
+class _Read:
+    """One read command of a plan and the precompiled decoder for its reply."""
+
+    __slots__ = ('command', 'struct', 'registers')
+
+    def __init__(self, registers: List[Register]):
+        """Build the read and its struct format (gaps become pad bytes)."""
+        start = registers[0].address
+        end = max(reg.end for reg in registers)
+        self.command = ReadCommand(start, end - start)
+        self.registers = registers
+
+        fmt = ['<']
+        position = start
+        for reg in registers:
+            for index in range(reg.count):
+                address = reg.address + index * reg.step
+                if address > position:
+                    fmt.append(f'{address - position}x')
+                fmt.append(reg.format)
+                position = address + reg.size
+        self.struct = struct.Struct(''.join(fmt))
+
+    def decode(self, data: bytes, values: Dict[str, Any]) -> None:
+        """Unpack a reply into values, keyed by register name."""
+        flat = self.struct.unpack_from(data)
+        position = 0
+        for reg in self.registers:
+            fields = reg.fields
+            if fields is None:
+                items = flat[position:position + reg.count]
+                position += reg.count
+            else:
+                width = len(fields)
+                items = [
+                    dict(zip(fields, flat[offset:offset + width]))
+                    for offset in range(position, position + reg.count * width, width)
+                ]
+                position += reg.count * width
+            values[reg.name] = items[0] if reg.count == 1 else list(items)
+
+
+class ReadPlan:
+    """Precompiled reads and decoders for a fixed set of registers."""
+
+    def __init__(
+        self,
+        registers: Iterable[Union[str, Register]],
+        max_gap: int = DEFAULT_MAX_GAP,
+    ):
+        """
+        Compile a plan.
+
+        Args:
+            registers: Register names, or Register objects (e.g. from
+                       Register.select() for part of an array); names
+                       must be unique within a plan
+            max_gap: Largest number of unused bytes bridged by merging two
+                     registers into one read
+
+        Raises:
+            ValueError: If a name is unknown or repeated
+        """
+        regs = [register(reg) if isinstance(reg, str) else reg for reg in registers]
+        names = [reg.name for reg in regs]
+        if len(set(names)) != len(names):
+            raise ValueError("A read plan cannot contain the same register twice")
+        self.names = names
+
+        reads: List[List[Register]] = []
+        for reg in sorted(regs, key=lambda reg: reg.address):
+            last = reads[-1] if reads else None
+            if (
+                last is not None
+                and 0 <= reg.address - max(r.end for r in last) <= max_gap
+                and _area_of(reg) is not None
+                and _area_of(reg) == _area_of(last[0])
+            ):
+                last.append(reg)
+            else:
+                reads.append([reg])
+        self._reads = [_Read(group) for group in reads]
+
+    @property
+    def commands(self) -> List[ReadCommand]:
+        """Read commands of the plan, in the order decode() expects."""
+        return [read.command for read in self._reads]
+
+    def decode(self, responses: List[PBusResponse]) -> Dict[str, Any]:
+        """
+        Decode the replies to commands.
+
+        Args:
+            responses: One response per command, in order
+
+        Returns:
+            Value per register name: a scalar (or dict for compound types)
+            for single registers, a list for arrays, None where the read
+            was NAKed
+
+        Raises:
+            ValueError: If there are fewer responses than commands, or a
+                        reply is shorter than its read
+        """
+        if len(responses) < len(self._reads):
+            raise ValueError(f"Expected {len(self._reads)} responses, got {len(responses)}")
+        values: Dict[str, Any] = {}
+        for read, response in zip(self._reads, responses):
+            if response.is_nak():
+                for reg in read.registers:
+                    values[reg.name] = None
+                continue
+            try:
+                read.decode(response.data, values)
+            except struct.error as err:
+                raise ValueError(
+                    f"Short reply for 0x{read.command.address:08x}+{read.command.size}: {err}"
+                ) from err
+        return values
+
+
+# ============================================================================
+# TYPED WRITES
+# ============================================================================
+
+def write_command(name: str, value: Any, index: int = 0) -> WriteCommand:
+    """
+    Build a typed write of one register element.
+
+    Args:
+        name: Register name
+        value: Scalar, or dict (missing keys take flat values) for BiQuads
+        index: Element index for arrays (0-based)
+
+    Returns:
+        WriteCommand for the element
+
+    Raises:
+        ValueError: If the register is unknown or read-only, the index is
+                    out of range, or the value does not fit the type
+    """
+    reg = register(name)
+    if "w" not in reg.access:
+        raise ValueError(f"Register {name} is read-only")
+    address = reg.address_of(index)
+    if reg.type == "biquad":
+        return WriteCommand(address, pack_biquad(value))
+    try:
+        return WriteCommand(address, struct.pack('<' + reg.format, value))
+    except struct.error as err:
+        raise ValueError(f"Invalid value {value!r} for {name}: {err}") from err
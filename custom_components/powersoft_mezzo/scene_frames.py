@@ -0,0 +1,178 @@
+"""
+Precompiled scene frames for Powersoft Mezzo amplifiers.
+
+A scene is compiled into the escaped write commands of one PBus request
+when it is created or updated. Applying it only stamps a fresh TAG and
+its CRC around them (see PBusPacket.stamp_request), so each send is
+matched by its own TAG, and then is a single sendto and one
+acknowledgement wait.
+
+Compiled scenes depend on two device registers, the scene context (see
+MezzoClient.read_scene_context): bits 16-31 of the manual source selection
+register, which the source write carries over, and the zone enable bytes,
+which pick the output channels for the Source EQ. The coordinator poll
+reads both; frames are dropped only when one of them changes, and until a
+context is known scenes are applied with MezzoClient.apply_scene.
+"""
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .mezzo_client import MezzoClient, SceneContext
+from .pbus_protocol import PBusPacket, WriteCommand, escape_data
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FRAME_CACHE_SIZE = 64
+
+# A request must fit one datagram (Ethernet MTU minus IP and UDP headers)
+MAX_FRAME_SIZE = 1472
+
+# STX, TAG and CRC (escaped, at most twice their size) and ETX
+_FRAME_OVERHEAD = 1 + 8 + 4 + 1
+
+
+@dataclass(frozen=True)
+class SceneFrame:
+    """A scene encoded as one ready-to-send PBus request."""
+
+    scene_id: int
+    name: str
+    context: SceneContext
+    body: bytes  # encoded write commands
+    escaped_body: bytes
+    commands: Tuple[WriteCommand, ...]  # the writes in the packet, in order
+
+    @property
+    def max_size(self) -> int:
+        """Largest packet size, whatever the TAG and CRC escape to."""
+        return len(self.escaped_body) + _FRAME_OVERHEAD
+
+    def stamp(self, tag: bytes) -> bytes:
+        """Return the request packet with a TAG."""
+        return PBusPacket.stamp_request(tag, self.body, self.escaped_body)
+
+
+class SceneFrameCache:
+    """
+    LRU cache of compiled scene frames for one amplifier.
+
+    Frames are keyed by scene ID and by the scene configuration they were
+    compiled from, so a scene edited elsewhere is never sent stale.
+    """
+
+    def __init__(self, size: int = DEFAULT_FRAME_CACHE_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            size: Number of frames kept
+        """
+        self.size = size
+        self._frames: "OrderedDict[int, Tuple[tuple, SceneFrame]]" = OrderedDict()
+        self._context: Optional[SceneContext] = None
+        self.compiled = 0
+        self.invalidations = 0
+
+    @property
+    def context(self) -> Optional[SceneContext]:
+        """Scene context the cached frames were compiled for."""
+        return self._context
+
+    def set_context(self, context: Optional[SceneContext]) -> None:
+        """
+        Record the scene context last read from the device.
+
+        Frames are dropped only if the context differs from the one they
+        were compiled for. None (registers not read) keeps the frames.
+
+        Args:
+            context: Context from MezzoClient.scene_context, or None
+        """
+        if context is None or context == self._context:
+            return
+        if self._frames:
+            _LOGGER.debug("Scene context changed, dropping %d compiled scene(s)", len(self._frames))
+            self.invalidations += 1
+        self._frames.clear()
+        self._context = context
+
+    def compile(self, scene: Dict[str, Any]) -> Optional[SceneFrame]:
+        """
+        Compile a scene and cache the frame.
+
+        Args:
+            scene: Scene configuration with its 'id'
+
+        Returns:
+            The frame, or None if no context is known yet or the scene does
+            not fit one request
+
+        Raises:
+            ValueError: If the scene configuration is invalid
+        """
+        if self._context is None:
+            return None
+        commands = MezzoClient.compile_scene(scene, self._context)
+        body = b"".join(cmd.to_bytes() for cmd in commands)
+        frame = SceneFrame(
+            scene_id=scene["id"],
+            name=scene.get("name", "Unknown"),
+            context=self._context,
+            body=body,
+            escaped_body=escape_data(body),
+            commands=tuple(commands),
+        )
+        if frame.max_size > MAX_FRAME_SIZE:
+            _LOGGER.debug("Scene %s needs %d bytes, not precompiled", scene["id"], frame.max_size)
+            self._frames.pop(scene["id"], None)
+            return None
+
+        self._frames[scene["id"]] = (self._fingerprint(scene), frame)
+        self._frames.move_to_end(scene["id"])
+        while len(self._frames) > self.size:
+            self._frames.popitem(last=False)
+        self.compiled += 1
+        return frame
+
+    def get(self, scene: Dict[str, Any]) -> Optional[SceneFrame]:
+        """
+        Return the frame for a scene, compiling it on a miss.
+
+        Args:
+            scene: Scene configuration with its 'id'
+
+        Returns:
+            The frame, or None if the scene cannot be precompiled
+        """
+        cached = self._frames.get(scene["id"])
+        if cached is not None and cached[0] == self._fingerprint(scene):
+            self._frames.move_to_end(scene["id"])
+            return cached[1]
+        try:
+            return self.compile(scene)
+        except ValueError as err:
+            _LOGGER.debug("Scene %s not precompiled: %s", scene["id"], err)
+            return None
+
+    def discard(self, scene_id: int) -> None:
+        """Drop the frame of a deleted scene."""
+        self._frames.pop(scene_id, None)
+
+    def __len__(self) -> int:
+        """Number of cached frames."""
+        return len(self._frames)
+
+    @staticmethod
+    def _fingerprint(scene: Dict[str, Any]) -> tuple:
+        """Hashable copy of the scene fields that end up in the frame."""
+        source_eq = tuple(tuple(sorted(band.items())) for band in scene.get("source_eq") or ())
+        return (
+            scene.get("name"),
+            tuple(scene.get("volumes", ())),
+            tuple(scene.get("mutes", ())),
+            tuple(scene.get("sources", ())),
+            source_eq if "source_eq" in scene else None,
+            scene.get("standby"),
+        )
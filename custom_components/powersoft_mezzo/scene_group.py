@@ -0,0 +1,144 @@
+"""
+Synchronized scene apply across several Powersoft Mezzo amplifiers.
+
+Every amplifier's scene is a precompiled frame (see scene_frames), so
+sending it is one sendto with only its TAG and CRC left to encode. The
+group apply first takes the request lock of every amplifier, in a fixed
+order so two group applies cannot deadlock, then waits for the scheduled
+instant and sends all frames back to back from one loop without yielding
+to the event loop. Only then are the acknowledgements gathered, concurrently.
+
+The inter-device skew is therefore the time of a few sendto calls, not of
+a request round trip per amplifier. The report gives the measured send
+skew and the spread of the acknowledgements; amplifiers whose frame or
+acknowledgement was lost are sent it again in a further burst.
+"""
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .scene_frames import SceneFrame
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_GROUP_TIMEOUT = 1.0
+DEFAULT_GROUP_RETRIES = 2
+
+
+@dataclass
+class GroupApplyReport:
+    """Timing of one synchronized apply."""
+
+    amplifiers: int
+    acked: int = 0
+    start_delay_ms: float = 0.0  # first send after the scheduled instant
+    send_skew_ms: float = 0.0  # first to last send
+    ack_spread_ms: float = 0.0  # first to last acknowledgement
+    settle_ms: float = 0.0  # first send to last acknowledgement
+    retried: int = 0  # frames sent again after a timeout
+    failures: Dict[str, str] = field(default_factory=dict)  # host -> error
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable form for notifications and events."""
+        return {
+            'amplifiers': self.amplifiers,
+            'acked': self.acked,
+            'start_delay_ms': round(self.start_delay_ms, 3),
+            'send_skew_ms': round(self.send_skew_ms, 3),
+            'ack_spread_ms': round(self.ack_spread_ms, 3),
+            'settle_ms': round(self.settle_ms, 3),
+            'retried': self.retried,
+            'failures': dict(self.failures),
+        }
+
+
+async def apply_scene_group(
+    targets: Sequence[Tuple[Any, SceneFrame]],
+    at: Optional[float] = None,
+    timeout: float = DEFAULT_GROUP_TIMEOUT,
+    retries: int = DEFAULT_GROUP_RETRIES,
+) -> GroupApplyReport:
+    """
+    Apply precompiled scenes to several amplifiers at one instant.
+
+    Amplifiers that do not acknowledge in time get their frame again in a
+    further burst; a frame only writes registers, so a repeat is harmless.
+
+    Args:
+        targets: (MezzoClient, SceneFrame) pairs, one per amplifier
+        at: Event loop time (loop.time()) to send at, or None to send as
+            soon as every amplifier is free
+        timeout: Seconds to wait for the acknowledgements of a burst
+        retries: Further bursts for amplifiers that timed out
+
+    Returns:
+        Report with the send skew and acknowledgement spread of the first
+        burst; amplifiers that could not be sent to or did not acknowledge
+        are listed in failures
+    """
+    loop = asyncio.get_running_loop()
+    report = GroupApplyReport(amplifiers=len(targets))
+    ordered = sorted(targets, key=lambda target: (target[0].host, target[0].port))
+    sent: List[int] = []
+    answered: List[int] = []
+
+    async with contextlib.AsyncExitStack() as stack:
+        for client, _ in ordered:
+            await stack.enter_async_context(client.exclusive())
+
+        if at is not None:
+            delay = at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            report.start_delay_ms = max(0.0, loop.time() - at) * 1000
+
+        remaining = ordered
+        for attempt in range(retries + 1):
+            # Every send gets a fresh TAG; stamp them all before the burst
+            stamped = [
+                (client, frame, client.stamp_scene_frame(frame)) for client, frame in remaining
+            ]
+            # No await in this loop: the frames leave back to back
+            posted: List[Tuple[Any, SceneFrame, Any]] = []
+            for client, frame, packet in stamped:
+                try:
+                    posted.append((client, frame, client.post_scene_frame(frame, packet)))
+                except (ConnectionError, OSError, ValueError) as err:
+                    report.failures[client.host] = str(err) or type(err).__name__
+
+            results = await asyncio.gather(
+                *(client.finish_scene_frame(frame, pending, timeout=timeout)
+                  for client, frame, pending in posted),
+                return_exceptions=True,
+            )
+
+            remaining = []
+            for (client, frame, pending), result in zip(posted, results):
+                if attempt == 0:
+                    sent.append(pending.sent_ns)
+                if isinstance(result, TimeoutError) and attempt < retries:
+                    remaining.append((client, frame))
+                elif isinstance(result, BaseException):
+                    report.failures[client.host] = str(result) or type(result).__name__
+                else:
+                    answered.append(pending.answered_ns)
+            if not remaining:
+                break
+            report.retried += len(remaining)
+
+    report.acked = len(answered)
+    if sent:
+        report.send_skew_ms = (max(sent) - min(sent)) / 1e6
+    if answered:
+        report.ack_spread_ms = (max(answered) - min(answered)) / 1e6
+        report.settle_ms = (max(answered) - min(sent)) / 1e6
+
+    _LOGGER.info(
+        "Scene group applied to %d/%d amplifiers (send skew %.3f ms, ACK spread %.3f ms, %d resent)",
+        report.acked, report.amplifiers, report.send_skew_ms, report.ack_spread_ms, report.retried,
+    )
+    for host, error in report.failures.items():
+        _LOGGER.warning("Scene group apply to %s failed: %s", host, error)
+    return report
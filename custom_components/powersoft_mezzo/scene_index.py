@@ -0,0 +1,207 @@
+"""
+Scene index for Powersoft Mezzo Integration.
+
+Keeps the custom scenes of one amplifier keyed by ID and by name, so
+lookups do not scan the scene list, and defines the scene library format
+used to export and import scenes between amplifiers and installations.
+
+Scene names are not required to be unique; a name lookup returns the
+scene with that name and the lowest ID.
+"""
+import bisect
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+SCENE_LIBRARY_VERSION = 1
+SCENE_LIBRARY_EXTENSION = ".json"
+
+# Fields that describe a scene; IDs and timestamps belong to one store
+SCENE_FIELDS = ("name", "volumes", "mutes", "sources", "source_eq", "standby", "preset")
+
+
+class SceneIndex:
+    """Custom scenes in creation order, indexed by ID and name."""
+
+    def __init__(self, scenes: Iterable[Dict[str, Any]] = ()):
+        """
+        Initialize the index.
+
+        Args:
+            scenes: Stored scenes, each with an 'id' and 'name'
+        """
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._list: Optional[List[Dict[str, Any]]] = None
+        for scene in scenes:
+            self.add(scene)
+
+    def __len__(self) -> int:
+        """Number of scenes."""
+        return len(self._by_id)
+
+    def __contains__(self, scene_id: int) -> bool:
+        """Check if a scene ID is in use."""
+        return scene_id in self._by_id
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the scenes in creation order."""
+        return iter(self._by_id.values())
+
+    @property
+    def scenes(self) -> List[Dict[str, Any]]:
+        """Scenes in creation order (shared list, do not modify)."""
+        if self._list is None:
+            self._list = list(self._by_id.values())
+        return self._list
+
+    @property
+    def max_id(self) -> Optional[int]:
+        """Highest scene ID, or None if there are no scenes."""
+        return max(self._by_id, default=None)
+
+    def get(self, scene_id: int) -> Optional[Dict[str, Any]]:
+        """Return the scene with an ID, or None."""
+        return self._by_id.get(scene_id)
+
+    def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the scene with a name and the lowest ID, or None."""
+        ids = self._by_name.get(name)
+        return self._by_id[ids[0]] if ids else None
+
+    def add(self, scene: Dict[str, Any]) -> None:
+        """
+        Add a scene.
+
+        Raises:
+            ValueError: If the scene ID is already in use
+        """
+        if scene["id"] in self._by_id:
+            raise ValueError(f"Scene ID {scene['id']} already exists")
+        self._by_id[scene["id"]] = scene
+        bisect.insort(self._by_name.setdefault(scene["name"], []), scene["id"])
+        self._list = None
+
+    def update(
+        self, scene_id: int, fields: Dict[str, Any], remove: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        Update a scene in place, re-indexing it if the name changes.
+
+        Args:
+            scene_id: Scene to update
+            fields: Fields to set
+            remove: Fields to delete from the scene (not 'id' or 'name')
+
+        Returns:
+            The updated scene
+
+        Raises:
+            ValueError: If the scene is not found
+        """
+        scene = self._by_id.get(scene_id)
+        if scene is None:
+            raise ValueError(f"Scene ID {scene_id} not found")
+        old_name = scene["name"]
+        for key in remove:
+            scene.pop(key, None)
+        scene.update(fields)
+        if scene["name"] != old_name:
+            self._unlink_name(old_name, scene_id)
+            bisect.insort(self._by_name.setdefault(scene["name"], []), scene_id)
+        return scene
+
+    def remove(self, scene_id: int) -> Dict[str, Any]:
+        """
+        Remove a scene.
+
+        Returns:
+            The removed scene
+
+        Raises:
+            ValueError: If the scene is not found
+        """
+        scene = self._by_id.pop(scene_id, None)
+        if scene is None:
+            raise ValueError(f"Scene ID {scene_id} not found")
+        self._unlink_name(scene["name"], scene_id)
+        self._list = None
+        return scene
+
+    def _unlink_name(self, name: str, scene_id: int) -> None:
+        """Drop a scene ID from the name index."""
+        ids = self._by_name.get(name)
+        if ids is None:
+            return
+        ids.remove(scene_id)
+        if not ids:
+            del self._by_name[name]
+
+
+def export_library(scenes: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build a scene library from scenes.
+
+    Args:
+        scenes: Scene configurations
+
+    Returns:
+        Library with the scene fields, without IDs
+    """
+    return {
+        "version": SCENE_LIBRARY_VERSION,
+        "scenes": [_scene_fields(scene) for scene in scenes],
+    }
+
+
+def parse_library(library: Any) -> List[Dict[str, Any]]:
+    """
+    Return the scenes of a scene library.
+
+    Args:
+        library: Decoded library from export_library
+
+    Returns:
+        Scene configurations (not yet validated)
+
+    Raises:
+        ValueError: If this is not a scene library of a known version
+    """
+    if not isinstance(library, dict) or not isinstance(library.get("scenes"), list):
+        raise ValueError("Not a scene library")
+    if library.get("version") != SCENE_LIBRARY_VERSION:
+        raise ValueError(f"Unsupported scene library version {library.get('version')}")
+    scenes = []
+    for index, scene in enumerate(library["scenes"]):
+        if not isinstance(scene, dict) or not isinstance(scene.get("name"), str):
+            raise ValueError(f"Scene {index + 1} in library has no name")
+        scenes.append(_scene_fields(scene))
+    return scenes
+
+
+def _scene_fields(scene: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy the scene fields; an empty Source EQ means the scene has none."""
+    fields = {key: scene[key] for key in SCENE_FIELDS if key in scene}
+    if not fields.get("source_eq"):
+        fields.pop("source_eq", None)
+    return fields
+
+
+def save_library(path: str, library: Dict[str, Any]) -> None:
+    """Write a scene library file (blocking)."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(library, file, indent=1)
+
+
+def load_library(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a scene library file (blocking).
+
+    Raises:
+        ValueError: If the file is not a valid scene library
+    """
+    with open(path, encoding="utf-8") as file:
+        try:
+            library = json.load(file)
+        except json.JSONDecodeError as err:
+            raise ValueError(f"Invalid scene library: {err}") from err
+    return parse_library(library)
@@ -2,16 +2,24 @@
 Scene Manager for Powersoft Mezzo Integration.
 
 Manages custom scene storage, loading, and persistence.
+
+Scenes are indexed by ID and name (see scene_index). Changes are written
+with a delayed save, so a burst of edits or an import of a scene library
+is one write of the store; async_flush writes a pending save right away.
+
+For Mezzo amplifiers scenes are also compiled into ready-to-send PBus
+frames when they are created or updated (see scene_frames).
 """
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
 
-from .const import DEFAULT_SCENES
+from .const import DEFAULT_SCENES, PROTOCOL_MEZZO
 from .mezzo_memory_map import NUM_CHANNELS, NUM_SOURCE_EQ_BANDS
+from .scene_index import SceneIndex, export_library
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +29,14 @@ STORAGE_KEY = "powersoft_mezzo_scenes"
 # Custom scene IDs start at 1 (no default scenes anymore)
 CUSTOM_SCENE_ID_START = 1
 
+# Seconds to collect scene changes before writing the store
+SAVE_DELAY = 10
+
+_DEFAULT_SCENES_BY_ID = {scene["id"]: scene for scene in DEFAULT_SCENES}
+
+# Scene fields stored only when the configuration has them
+OPTIONAL_SCENE_FIELDS = ("sources", "source_eq", "preset")
+
 
 class SceneManager:
     """
@@ -30,23 +46,38 @@ class SceneManager:
     Merges default scenes with custom scenes.
     """
 
-    def __init__(self, hass: HomeAssistant, entry_id: str):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        protocol: str = PROTOCOL_MEZZO,
+        precompile: bool = False,
+    ):
         """
         Initialize the scene manager.
 
         Args:
             hass: Home Assistant instance
             entry_id: Config entry ID for unique storage
+            protocol: Amplifier protocol; Mezzo scenes must have sources
+            precompile: Keep scenes compiled to PBus frames (Mezzo only)
         """
         self.hass = hass
         self.entry_id = entry_id
+        self.protocol = protocol
         self._store = Store(
             hass,
             STORAGE_VERSION,
             f"{STORAGE_KEY}_{entry_id}",
         )
-        self._custom_scenes: List[Dict[str, Any]] = []
+        self._scenes = SceneIndex()
         self._next_id = CUSTOM_SCENE_ID_START
+        self._dirty = False
+        self.frames = None
+        if precompile:
+            from .scene_frames import SceneFrameCache
+
+            self.frames = SceneFrameCache()
 
     async def async_load(self) -> None:
         """Load scenes from storage."""
@@ -54,29 +85,42 @@ class SceneManager:
 
         if data is None:
             _LOGGER.info("No custom scenes found, starting fresh")
-            self._custom_scenes = []
+            self._scenes = SceneIndex()
             self._next_id = CUSTOM_SCENE_ID_START
             return
 
-        self._custom_scenes = data.get("scenes", [])
+        self._scenes = SceneIndex(data.get("scenes", []))
 
         # Calculate next available ID
-        if self._custom_scenes:
-            max_id = max(scene["id"] for scene in self._custom_scenes)
-            self._next_id = max(max_id + 1, CUSTOM_SCENE_ID_START)
+        if self._scenes.max_id is not None:
+            self._next_id = max(self._scenes.max_id + 1, CUSTOM_SCENE_ID_START)
         else:
             self._next_id = CUSTOM_SCENE_ID_START
 
-        _LOGGER.info("Loaded %d custom scene(s)", len(self._custom_scenes))
+        _LOGGER.info("Loaded %d custom scene(s)", len(self._scenes))
 
     async def async_save(self) -> None:
-        """Save scenes to storage."""
-        data = {
+        """Save scenes to storage now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_flush(self) -> None:
+        """Write a pending delayed save now, e.g. before the entry reloads."""
+        if self._dirty:
+            await self.async_save()
+
+    def _schedule_save(self) -> None:
+        """Save scenes after SAVE_DELAY, batching further changes."""
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to store."""
+        self._dirty = False
+        _LOGGER.debug("Saving %d custom scene(s)", len(self._scenes))
+        return {
             "version": STORAGE_VERSION,
-            "scenes": self._custom_scenes,
+            "scenes": self._scenes.scenes,
         }
-        await self._store.async_save(data)
-        _LOGGER.debug("Saved %d custom scene(s)", len(self._custom_scenes))
 
     def get_all_scenes(self) -> List[Dict[str, Any]]:
         """
@@ -86,9 +130,7 @@ class SceneManager:
             List of all scene configurations
         """
         # Combine default scenes with custom scenes
-        all_scenes = DEFAULT_SCENES.copy()
-        all_scenes.extend(self._custom_scenes)
-        return all_scenes
+        return [*DEFAULT_SCENES, *self._scenes.scenes]
 
     def get_scene_by_id(self, scene_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -100,11 +142,26 @@ class SceneManager:
         Returns:
             Scene configuration or None if not found
         """
-        all_scenes = self.get_all_scenes()
-        for scene in all_scenes:
-            if scene["id"] == scene_id:
-                return scene
-        return None
+        scene = self._scenes.get(scene_id)
+        if scene is None:
+            scene = _DEFAULT_SCENES_BY_ID.get(scene_id)
+        return scene
+
+    def get_scene_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a scene by name.
+
+        Args:
+            name: Scene name
+
+        Returns:
+            Scene configuration (the one with the lowest ID if several
+            share the name) or None if not found
+        """
+        scene = self._scenes.get_by_name(name)
+        if scene is None:
+            scene = next((s for s in DEFAULT_SCENES if s["name"] == name), None)
+        return scene
 
     def validate_scene_config(self, config: Dict[str, Any]) -> None:
         """
@@ -116,8 +173,10 @@ class SceneManager:
         Raises:
             ValueError: If configuration is invalid
         """
-        # Check required fields
-        required_fields = ["name", "volumes", "mutes", "sources"]
+        # Check required fields (QUATTROCANALI scenes have no sources)
+        required_fields = ["name", "volumes", "mutes"]
+        if self.protocol == PROTOCOL_MEZZO:
+            required_fields.append("sources")
         for field in required_fields:
             if field not in config:
                 raise ValueError(f"Scene missing required field: {field}")
@@ -136,12 +195,19 @@ class SceneManager:
             if not isinstance(mute, bool):
                 raise ValueError(f"Mute {i+1} must be boolean")
 
-        # Validate sources
-        if len(config["sources"]) != NUM_CHANNELS:
-            raise ValueError(f"Scene must have {NUM_CHANNELS} source entries")
-        for i, src in enumerate(config["sources"]):
-            if not isinstance(src, int) or not -1 <= src <= 31:
-                raise ValueError(f"Source {i+1} must be between -1 and 31")
+        # Validate sources if present
+        if "sources" in config:
+            if len(config["sources"]) != NUM_CHANNELS:
+                raise ValueError(f"Scene must have {NUM_CHANNELS} source entries")
+            for i, src in enumerate(config["sources"]):
+                if not isinstance(src, int) or not -1 <= src <= 31:
+                    raise ValueError(f"Source {i+1} must be between -1 and 31")
+
+        # Validate stored preset if present (QUATTROCANALI LOADPRESET2)
+        if config.get("preset") is not None:
+            preset = config["preset"]
+            if not isinstance(preset, int) or not 0 <= preset <= 200:
+                raise ValueError("Preset must be between 0 and 200")
 
         # Validate Source EQ if present
         if "source_eq" in config:
@@ -196,7 +262,7 @@ class SceneManager:
                     "(reserved for default scenes)"
                 )
             # Check if ID already exists
-            if any(s["id"] == scene_id for s in self._custom_scenes):
+            if scene_id in self._scenes:
                 raise ValueError(f"Scene ID {scene_id} already exists")
             use_id = scene_id
         else:
@@ -207,18 +273,14 @@ class SceneManager:
         now = datetime.utcnow().isoformat() + "Z"
         scene = {
             "id": use_id,
-            "name": name,
-            "volumes": scene_config["volumes"],
-            "mutes": scene_config["mutes"],
-            "sources": scene_config["sources"],
-            "source_eq": scene_config.get("source_eq", []),
-            "standby": scene_config.get("standby", False),
+            **self._scene_fields(scene_config),
             "created_at": now,
             "updated_at": now,
         }
 
-        self._custom_scenes.append(scene)
-        await self.async_save()
+        self._scenes.add(scene)
+        self._schedule_save()
+        self._compile(scene)
 
         _LOGGER.info("Created scene '%s' (ID: %d)", name, use_id)
         return use_id
@@ -234,15 +296,7 @@ class SceneManager:
         Raises:
             ValueError: If scene not found
         """
-        # Find the scene
-        scene = None
-        scene_idx = None
-        for idx, s in enumerate(self._custom_scenes):
-            if s["id"] == scene_id:
-                scene = s
-                scene_idx = idx
-                break
-
+        scene = self._scenes.get(scene_id)
         if scene is None:
             raise ValueError(f"Scene ID {scene_id} not found")
 
@@ -255,17 +309,15 @@ class SceneManager:
 
         # Update scene
         now = datetime.utcnow().isoformat() + "Z"
-        self._custom_scenes[scene_idx].update({
-            "name": updated_config["name"],
-            "volumes": updated_config["volumes"],
-            "mutes": updated_config["mutes"],
-            "sources": updated_config["sources"],
-            "source_eq": updated_config.get("source_eq", []),
-            "standby": updated_config.get("standby", False),
-            "updated_at": now,
-        })
+        fields = self._scene_fields(updated_config)
+        self._scenes.update(
+            scene_id,
+            {**fields, "updated_at": now},
+            remove=[key for key in OPTIONAL_SCENE_FIELDS if key not in fields],
+        )
 
-        await self.async_save()
+        self._schedule_save()
+        self._compile(scene)
         _LOGGER.info("Updated scene ID %d", scene_id)
 
     async def async_delete_scene(self, scene_id: int) -> None:
@@ -278,14 +330,10 @@ class SceneManager:
         Raises:
             ValueError: If scene not found
         """
-        # Find and remove the scene
-        initial_count = len(self._custom_scenes)
-        self._custom_scenes = [s for s in self._custom_scenes if s["id"] != scene_id]
-
-        if len(self._custom_scenes) == initial_count:
-            raise ValueError(f"Scene ID {scene_id} not found")
-
-        await self.async_save()
+        self._scenes.remove(scene_id)
+        self._schedule_save()
+        if self.frames is not None:
+            self.frames.discard(scene_id)
         _LOGGER.info("Deleted scene ID %d", scene_id)
 
     async def async_rename_scene(self, scene_id: int, new_name: str) -> None:
@@ -302,30 +350,194 @@ class SceneManager:
         if not new_name or not new_name.strip():
             raise ValueError("Scene name cannot be empty")
 
-        # Find the scene
-        scene = None
-        scene_idx = None
-        for idx, s in enumerate(self._custom_scenes):
-            if s["id"] == scene_id:
-                scene = s
-                scene_idx = idx
-                break
-
+        scene = self._scenes.get(scene_id)
         if scene is None:
             raise ValueError(f"Scene ID {scene_id} not found")
 
         # Update the name
         old_name = scene["name"]
-        self._custom_scenes[scene_idx]["name"] = new_name.strip()
-        self._custom_scenes[scene_idx]["updated_at"] = datetime.utcnow().isoformat() + "Z"
+        self._scenes.update(scene_id, {
+            "name": new_name.strip(),
+            "updated_at": datetime.utcnow().isoformat() + "Z",
+        })
 
-        await self.async_save()
+        self._schedule_save()
         _LOGGER.info("Renamed scene ID %d from '%s' to '%s'", scene_id, old_name, new_name)
 
+    def update_scene_context(self, context) -> None:
+        """
+        Pass the scene context read by the poll to the frame cache.
+
+        When the context changes the most recent scenes are compiled again
+        right away, so the next press does not pay for it.
+
+        Args:
+            context: Scene context from the coordinator data, or None
+        """
+        if self.frames is None or context is None or context == self.frames.context:
+            return
+        self.frames.set_context(context)
+        for scene in self.get_all_scenes()[-self.frames.size:]:
+            self._compile(scene)
+
+    async def async_apply_scene(self, client, scene: Dict[str, Any]) -> None:
+        """
+        Apply a scene, from its precompiled frame when there is one.
+
+        Args:
+            client: Amplifier client
+            scene: Scene configuration
+
+        Raises:
+            ValueError: If configuration is invalid
+            ConnectionError: If not connected
+            TimeoutError: If request times out
+        """
+        # Differential applies and fades depend on the current state, not a frame
+        frame = None
+        if (self.frames is not None and not getattr(client, "scene_diff", False)
+                and not getattr(client, "scene_transition", 0)):
+            frame = self.frames.get(scene)
+        if frame is not None:
+            await client.apply_scene_frame(frame)
+        else:
+            await client.apply_scene(scene)
+
+    async def async_get_frame(self, client, scene: Dict[str, Any]):
+        """
+        Return the precompiled frame of a scene, reading the context if needed.
+
+        Args:
+            client: Amplifier client
+            scene: Scene configuration
+
+        Returns:
+            SceneFrame, or None if the scene cannot be precompiled
+
+        Raises:
+            ConnectionError: If not connected
+            TimeoutError: If reading the context times out
+        """
+        if self.frames is None:
+            return None
+        if self.frames.context is None:
+            self.update_scene_context(await client.read_scene_context())
+        return self.frames.get(scene)
+
+    @staticmethod
+    def _scene_fields(config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the fields to store for a validated scene configuration.
+
+        Sources, Source EQ and a stored preset are kept only if the
+        configuration has them (QUATTROCANALI scenes have no sources).
+        """
+        fields = {
+            "name": config["name"],
+            "volumes": config["volumes"],
+            "mutes": config["mutes"],
+            "standby": config.get("standby", False),
+        }
+        for key in OPTIONAL_SCENE_FIELDS:
+            if config.get(key) is not None:
+                fields[key] = config[key]
+        return fields
+
+    def _compile(self, scene: Dict[str, Any]) -> None:
+        """Compile a saved scene into its frame, if frames are kept."""
+        if self.frames is None:
+            return
+        try:
+            self.frames.compile(scene)
+        except ValueError as err:
+            _LOGGER.debug("Scene '%s' not precompiled: %s", scene["name"], err)
+
+    def export_scenes(self, scene_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Export custom scenes as a scene library.
+
+        Args:
+            scene_ids: Scenes to export (default - all custom scenes)
+
+        Returns:
+            Library for scene_index.save_library
+
+        Raises:
+            ValueError: If a scene ID is not found
+        """
+        if scene_ids is None:
+            return export_library(self._scenes)
+        scenes = []
+        for scene_id in scene_ids:
+            scene = self._scenes.get(scene_id)
+            if scene is None:
+                raise ValueError(f"Scene ID {scene_id} not found")
+            scenes.append(scene)
+        return export_library(scenes)
+
+    async def async_import_scenes(
+        self, scenes: List[Dict[str, Any]], overwrite: bool = False
+    ) -> Tuple[int, int]:
+        """
+        Import scenes from a scene library.
+
+        Every scene is validated before any is added, so a bad library
+        changes nothing. Imported scenes get new IDs; the store is written
+        once for the whole import.
+
+        Args:
+            scenes: Scene configurations from scene_index.parse_library
+            overwrite: Update custom scenes with the same name instead of
+                adding a second scene with that name
+
+        Returns:
+            Number of scenes created and updated
+
+        Raises:
+            ValueError: If a scene configuration is invalid
+        """
+        for index, config in enumerate(scenes):
+            try:
+                self.validate_scene_config(config)
+            except ValueError as err:
+                raise ValueError(f"Scene {index + 1} ('{config.get('name')}'): {err}") from err
+
+        now = datetime.utcnow().isoformat() + "Z"
+        created = updated = 0
+        touched = []
+        for config in scenes:
+            fields = self._scene_fields(config)
+            existing = self._scenes.get_by_name(config["name"]) if overwrite else None
+            if existing is not None:
+                touched.append(self._scenes.update(
+                    existing["id"],
+                    {**fields, "updated_at": now},
+                    remove=[key for key in OPTIONAL_SCENE_FIELDS if key not in fields],
+                ))
+                updated += 1
+            else:
+                scene = {"id": self._next_id, **fields, "created_at": now, "updated_at": now}
+                self._next_id += 1
+                self._scenes.add(scene)
+                touched.append(scene)
+                created += 1
+
+        if touched:
+            self._schedule_save()
+        if self.frames is not None:
+            for scene in touched:
+                self.frames.discard(scene["id"])
+            # Compile only what the frame cache can keep
+            for scene in touched[-self.frames.size:]:
+                self._compile(scene)
+        _LOGGER.info("Imported %d scene(s): %d created, %d updated",
+                     len(scenes), created, updated)
+        return created, updated
+
     def get_custom_scene_count(self) -> int:
         """Get count of custom scenes."""
-        return len(self._custom_scenes)
+        return len(self._scenes)
 
     def get_total_scene_count(self) -> int:
         """Get total count of all scenes (default + custom)."""
-        return len(DEFAULT_SCENES) + len(self._custom_scenes)
+        return len(DEFAULT_SCENES) + len(self._scenes)
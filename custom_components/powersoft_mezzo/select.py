@@ -18,6 +18,8 @@ from .const import (
     UID_SCENE,
     CHANNEL_NUMBERS,
     SOURCE_OPTIONS,
+    CONF_PROTOCOL,
+    PROTOCOL_QUATTRO,
 )
 from .mezzo_client import MezzoClient
 from .scene_manager import SceneManager
@@ -59,6 +61,12 @@ async def async_setup_entry(
     # Add scene selector (dropdown)
     entities.append(MezzoSceneSelect(coordinator, client, scene_manager, entry, hass))
 
+    # QUATTROCANALI amplifiers have no source routing or EQ over this protocol
+    if entry.data.get(CONF_PROTOCOL) == PROTOCOL_QUATTRO:
+        async_add_entities(entities)
+        _LOGGER.info("Added %d select entities (scenes)", len(entities))
+        return
+
     # Add input source selectors for each channel
     for channel in CHANNEL_NUMBERS:
         entities.append(MezzoSourceSelect(coordinator, client, entry, channel))
@@ -106,8 +114,7 @@ class MezzoSceneSelect(CoordinatorEntity, SelectEntity):
         self._attr_name = "Scene"
 
         # Build options list from all scenes
-        self._scenes = scene_manager.get_all_scenes()
-        self._attr_options = [scene["name"] for scene in self._scenes]
+        self._attr_options = [scene["name"] for scene in scene_manager.get_all_scenes()]
 
     @property
     def current_option(self) -> str | None:
@@ -117,23 +124,13 @@ class MezzoSceneSelect(CoordinatorEntity, SelectEntity):
         if active_scene_id is None:
             return None
 
-        # Find the scene with this ID
-        for scene in self._scenes:
-            if scene["id"] == active_scene_id:
-                return scene["name"]
-
-        return None
+        scene = self._scene_manager.get_scene_by_id(active_scene_id)
+        return scene["name"] if scene is not None else None
 
     async def async_select_option(self, option: str) -> None:
         """Select and apply a scene."""
         try:
-            # Find the scene by name
-            scene_to_apply = None
-            for scene in self._scenes:
-                if scene["name"] == option:
-                    scene_to_apply = scene
-                    break
-
+            scene_to_apply = self._scene_manager.get_scene_by_name(option)
             if scene_to_apply is None:
                 _LOGGER.error("Scene not found: %s", option)
                 return
@@ -141,7 +138,7 @@ class MezzoSceneSelect(CoordinatorEntity, SelectEntity):
             _LOGGER.info("Applying scene from selector: %s", scene_to_apply["name"])
 
             # Apply the scene
-            await self._client.apply_scene(scene_to_apply)
+            await self._scene_manager.async_apply_scene(self._client, scene_to_apply)
 
             # Update active scene tracking
             self._hass.data[DOMAIN][self._entry.entry_id][ACTIVE_SCENE_ID] = scene_to_apply["id"]
@@ -208,8 +205,11 @@ class MezzoSourceSelect(CoordinatorEntity, SelectEntity):
                 "Setting channel %d source to %d (%s)",
                 self._channel, source_id, option
             )
-            await self._client.set_source(self._channel, source_id)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_optimistic(
+                ("sources", self._channel),
+                source_id,
+                lambda: self._client.set_source(self._channel, source_id),
+            )
             _LOGGER.warning("Source change completed for channel %d", self._channel)
         except Exception as err:
             _LOGGER.error(
@@ -273,21 +273,7 @@ class MezzoEQTypeSelect(CoordinatorEntity, SelectEntity):
                 _LOGGER.error("Unknown EQ type option: %s", option)
                 return
 
-            # Read current settings
-            current = await self._client.get_eq_band(self._channel, self._band)
-
-            # Write back with new type
-            await self._client.set_eq_band(
-                self._channel,
-                self._band,
-                enabled=current["enabled"],
-                filt_type=type_id,
-                q=current["q"],
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_eq_band(self._channel, self._band, type=type_id)
         except Exception as err:
             _LOGGER.error(
                 "Failed to set EQ type for CH%d Band%d: %s", self._channel, self._band, err
@@ -347,20 +333,7 @@ class MezzoSourceEQTypeSelect(CoordinatorEntity, SelectEntity):
                 _LOGGER.error("Unknown Source EQ type option: %s", option)
                 return
 
-            # Read current settings
-            current = await self._client.get_source_eq_band(self._band)
-
-            # Write back with new type
-            await self._client.set_source_eq_band(
-                self._band,
-                enabled=current["enabled"],
-                filt_type=type_id,
-                q=current["q"],
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_source_eq_band(self._band, type=type_id)
         except Exception as err:
             _LOGGER.error(
                 "Failed to set Source EQ type for Band%d: %s", self._band, err
@@ -7,7 +7,13 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfElectricPotential,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -20,6 +26,15 @@ from .const import (
     UID_TEMP_HEATSINK,
     UID_FAULT_CODE,
     UID_EQ,
+    UID_ALARMS,
+    UID_LOAD,
+    UID_OUTPUT_LEVEL,
+    UID_INPUT_SIGNAL,
+    UID_TRANSPORT,
+    METER_STREAMER,
+    CHANNEL_NUMBERS,
+    CONF_PROTOCOL,
+    PROTOCOL_QUATTRO,
 )
 from .mezzo_memory_map import FAULT_CODES, NUM_CHANNELS, EQ_TYPE_PEAKING, EQ_TYPE_LOW_SHELVING, EQ_TYPE_HIGH_SHELVING
 from .mezzo_client import MezzoClient
@@ -38,6 +53,25 @@ async def async_setup_entry(
 
     entities = []
 
+    # Transport diagnostics (disabled by default)
+    model = "QUATTROCANALI" if entry.data.get(CONF_PROTOCOL) == PROTOCOL_QUATTRO else "Mezzo 602 AD"
+    for description in TRANSPORT_SENSORS:
+        entities.append(TransportMetricSensor(coordinator, client, entry, model, *description))
+
+    # QUATTROCANALI amplifiers report alarm bitfields and load monitoring
+    if entry.data.get(CONF_PROTOCOL) == PROTOCOL_QUATTRO:
+        entities.append(QuattroAlarmSensor(coordinator, entry))
+        for channel in CHANNEL_NUMBERS:
+            entities.append(QuattroLoadSensor(coordinator, entry, channel))
+        streamer = hass.data[DOMAIN][entry.entry_id].get(METER_STREAMER)
+        if streamer is not None and streamer.running:
+            for channel in CHANNEL_NUMBERS:
+                entities.append(QuattroOutputLevelSensor(streamer, entry, channel))
+            for channel in range(1, streamer.meters.inputs + 1):
+                entities.append(QuattroInputSignalSensor(streamer, entry, channel))
+        async_add_entities(entities)
+        return
+
     # Temperature sensors
     entities.append(MezzoTemperatureSensor(
         coordinator, entry, "transformer", UID_TEMP_TRANSFORMER, "Transformer Temperature"
@@ -56,6 +90,77 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
+def _ms(seconds: float | None) -> float | None:
+    """Convert a histogram percentile to milliseconds."""
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+# (key, name, unit, device class, state class, value from TransportMetrics)
+TRANSPORT_SENSORS = (
+    ("rtt_p50", "Round-Trip Time p50", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION,
+     SensorStateClass.MEASUREMENT, lambda m: _ms(m.rtt.percentile(0.50))),
+    ("rtt_p95", "Round-Trip Time p95", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION,
+     SensorStateClass.MEASUREMENT, lambda m: _ms(m.rtt.percentile(0.95))),
+    ("rtt_p99", "Round-Trip Time p99", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION,
+     SensorStateClass.MEASUREMENT, lambda m: _ms(m.rtt.percentile(0.99))),
+    ("poll_p95", "Poll Duration p95", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION,
+     SensorStateClass.MEASUREMENT, lambda m: _ms(m.poll.percentile(0.95))),
+    ("requests", "Requests Sent", None, None,
+     SensorStateClass.TOTAL_INCREASING, lambda m: m.requests),
+    ("timeouts", "Request Timeouts", None, None,
+     SensorStateClass.TOTAL_INCREASING, lambda m: m.timeouts),
+    ("retransmits", "Retransmits", None, None,
+     SensorStateClass.TOTAL_INCREASING, lambda m: m.retransmits),
+    ("naks", "NAKs", None, None,
+     SensorStateClass.TOTAL_INCREASING, lambda m: m.naks),
+    ("unknown_tags", "Unmatched Replies", None, None,
+     SensorStateClass.TOTAL_INCREASING, lambda m: m.unknown_tags),
+    ("parse_errors", "Corrupt Replies", None, None,
+     SensorStateClass.TOTAL_INCREASING, lambda m: m.parse_errors),
+    ("bytes_out", "Bytes Sent", UnitOfInformation.BYTES, SensorDeviceClass.DATA_SIZE,
+     SensorStateClass.TOTAL_INCREASING, lambda m: m.bytes_out),
+    ("bytes_in", "Bytes Received", UnitOfInformation.BYTES, SensorDeviceClass.DATA_SIZE,
+     SensorStateClass.TOTAL_INCREASING, lambda m: m.bytes_in),
+)
+
+
+class TransportMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor for one transport counter or latency percentile."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:lan-connect"
+
+    def __init__(self, coordinator, client, entry: ConfigEntry, model: str,
+                 key, name, unit, device_class, state_class, value_fn):
+        """Initialize the transport sensor."""
+        super().__init__(coordinator)
+        self._client = client
+        self._value_fn = value_fn
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.title,
+            "manufacturer": "Powersoft",
+            "model": model,
+        }
+        self._attr_unique_id = f"{entry.entry_id}_{UID_TRANSPORT}_{key}"
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+
+    @property
+    def available(self) -> bool:
+        """Stay available while polls fail; that is when these matter."""
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the current metric value."""
+        return self._value_fn(self._client.metrics)
+
+
 class MezzoTemperatureSensor(CoordinatorEntity, SensorEntity):
     """Representation of a temperature sensor."""
 
@@ -130,10 +235,205 @@ class MezzoFaultCodeSensor(CoordinatorEntity, SensorEntity):
         return {}
 
 
+class QuattroAlarmSensor(CoordinatorEntity, SensorEntity):
+    """Representation of QUATTROCANALI global and channel alarms."""
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:alert-circle"
+
+    def __init__(self, coordinator, entry: ConfigEntry):
+        """Initialize the alarm sensor."""
+        super().__init__(coordinator)
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.title,
+            "manufacturer": "Powersoft",
+            "model": "QUATTROCANALI",
+        }
+        self._attr_unique_id = f"{entry.entry_id}_{UID_ALARMS}"
+        self._attr_name = "Alarms"
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the active alarms, or 'No Alarm'."""
+        alarms = (self.coordinator.data or {}).get("alarms")
+        if alarms is None:
+            return None
+        active = list(alarms["global_active"])
+        for idx, names in enumerate(alarms["channels_active"]):
+            active.extend(f"CH{idx + 1} {name}" for name in names)
+        return ", ".join(active)[:255] if active else "No Alarm"
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return raw alarm bitfields."""
+        alarms = (self.coordinator.data or {}).get("alarms")
+        if alarms is None:
+            return {}
+        attrs = {"global_alarms": alarms["global"], "gpio_alarms": alarms["gpio"]}
+        for idx, value in enumerate(alarms["channels"]):
+            attrs[f"channel_{idx + 1}_alarms"] = value
+        return attrs
+
+
+class QuattroLoadSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a QUATTROCANALI channel load impedance."""
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:speaker"
+    _attr_native_unit_of_measurement = "Ω"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, entry: ConfigEntry, channel: int):
+        """Initialize the load sensor."""
+        super().__init__(coordinator)
+        self._channel = channel
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.title,
+            "manufacturer": "Powersoft",
+            "model": "QUATTROCANALI",
+        }
+        self._attr_unique_id = f"{entry.entry_id}_{UID_LOAD}{channel}"
+        self._attr_name = f"Load Channel {channel}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the measured nominal impedance."""
+        load = (self.coordinator.data or {}).get("loads", {}).get(self._channel)
+        return load.get("impedance_ohm") if load else None
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return pilot tone and load detection details."""
+        load = (self.coordinator.data or {}).get("loads", {}).get(self._channel)
+        if not load:
+            return {}
+        return {key: value for key, value in load.items() if key != "channel"}
+
+
+class QuattroMeterSensor(SensorEntity):
+    """Base class for sensors fed by the meter streamer's decimated summary."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, streamer, entry: ConfigEntry, channel: int):
+        """Initialize the meter sensor."""
+        self._streamer = streamer
+        self._channel = channel
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.title,
+            "manufacturer": "Powersoft",
+            "model": "QUATTROCANALI",
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to meter summaries."""
+        self.async_on_remove(
+            self._streamer.subscribe_decimated(lambda _: self.async_write_ha_state())
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True while meter frames are arriving."""
+        summary = self._streamer.decimated
+        return self._streamer.running and summary is not None and summary["frames"] > 0
+
+
+class QuattroOutputLevelSensor(QuattroMeterSensor):
+    """Representation of a QUATTROCANALI output RMS voltage (peak per interval)."""
+
+    _attr_icon = "mdi:sine-wave"
+    _attr_device_class = SensorDeviceClass.VOLTAGE
+    _attr_native_unit_of_measurement = UnitOfElectricPotential.VOLT
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, streamer, entry: ConfigEntry, channel: int):
+        """Initialize the output level sensor."""
+        super().__init__(streamer, entry, channel)
+        self._attr_unique_id = f"{entry.entry_id}_{UID_OUTPUT_LEVEL}{channel}"
+        self._attr_name = f"Output Level Channel {channel}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the peak RMS voltage of the last interval."""
+        summary = self._streamer.decimated
+        if summary is None:
+            return None
+        return summary["outputs"][self._channel]["rms_v"]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return headroom and signal presence."""
+        summary = self._streamer.decimated
+        if summary is None:
+            return {}
+        output = summary["outputs"][self._channel]
+        return {"headroom_db": output["headroom_db"], "signal": output["signal"]}
+
+
+class QuattroInputSignalSensor(QuattroMeterSensor):
+    """Representation of QUATTROCANALI input signal presence and clipping."""
+
+    _attr_icon = "mdi:waveform"
+
+    def __init__(self, streamer, entry: ConfigEntry, channel: int):
+        """Initialize the input signal sensor."""
+        super().__init__(streamer, entry, channel)
+        self._attr_unique_id = f"{entry.entry_id}_{UID_INPUT_SIGNAL}{channel}"
+        self._attr_name = f"Input Signal {channel}"
+
+    @property
+    def native_value(self) -> str | None:
+        """Return Clip, Signal or No Signal for the last interval."""
+        summary = self._streamer.decimated
+        if summary is None:
+            return None
+        state = summary["inputs"][self._channel]
+        if state["clip"]:
+            return "Clip"
+        return "Signal" if state["signal"] else "No Signal"
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the source slots with signal or clipping."""
+        summary = self._streamer.decimated
+        if summary is None:
+            return {}
+        state = summary["inputs"][self._channel]
+        return {"signal_slots": state["signal_slots"], "clip_slots": state["clip_slots"]}
+
+
+# Log the missing NumPy once, not on every coordinator update
+_NUMPY_MISSING_LOGGED = False
+
+
+def _user_eq_curves(data: dict):
+    """
+    Compute the User EQ response of every channel.
+
+    Returns:
+        (engine, {channel: curve}), or None if NumPy is not available
+    """
+    global _NUMPY_MISSING_LOGGED
+    try:
+        from .eq_response import get_engine
+    except ImportError as err:
+        if not _NUMPY_MISSING_LOGGED:
+            _NUMPY_MISSING_LOGGED = True
+            _LOGGER.warning("EQ response curves disabled, NumPy is not available: %s", err)
+        return None
+    engine = get_engine()
+    return engine, engine.curves(data['eq'])
+
+
 class MezzoEQSensor(CoordinatorEntity, SensorEntity):
     """Representation of EQ configuration sensor for a channel."""
 
     _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({"response_curve"})
 
     # Map EQ filter types to human-readable names
     EQ_TYPE_NAMES = {
@@ -232,4 +532,13 @@ class MezzoEQSensor(CoordinatorEntity, SensorEntity):
                     f"{type_name}: {freq}Hz, {gain_db:+.1f}dB, Q={q:.1f}"
                 )
 
+        # Combined magnitude response: peak/dip summary and [Hz, dB] points
+        response = _user_eq_curves(self.coordinator.data)
+        if response is not None:
+            engine, curves = response
+            curve = curves[self._channel]
+            for key, value in engine.summary(curve).items():
+                attrs[f"response_{key}"] = value
+            attrs["response_curve"] = engine.export(curve)
+
         return attrs
@@ -0,0 +1,422 @@
+"""
+Configuration Snapshot and Restore for Powersoft Mezzo Amplifiers.
+
+A snapshot holds every writable configuration area of one amplifier
+(source, matrix, user, layout, ways, Dante, GPI, GPO, power, zone and
+Source EQ).
+Areas are read with MTU-sized ReadCommand blocks, keeping up to `window`
+requests in flight.
+
+Snapshot file layout (all integers little-endian):
+
+    header   magic "PSMZSNAP", version u16, area count u16,
+             CRC16 of the index u32, creation time u64 (Unix seconds),
+             8 reserved bytes                                 32 bytes
+    index    one entry per area: name 16s (NUL padded), address u32,
+             size u32, file offset u32, CRC16 u16, flags u16  32 bytes each
+    data     at each entry's offset: length u32 followed by the area
+             bytes, padded to a 16-byte boundary
+
+The index has fixed-size entries and absolute offsets, so a memory-mapped
+file can be searched and sliced without parsing the data blocks.
+
+Restoring asks the device for the CRC16 of every area (the C opcode,
+2 bytes per area), writes only the areas whose CRC differs from the
+snapshot, and checks their CRCs again afterwards.
+"""
+import asyncio
+import logging
+import mmap
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
+
+from .firmware import FIRMWARE_CHUNK_SIZE
+from .mezzo_memory_map import (
+    ADDR_ANALOG_REF,
+    ADDR_DANTE_END,
+    ADDR_DANTE_START,
+    ADDR_GPI_CONFIG_END,
+    ADDR_GPI_CONFIG_START,
+    ADDR_GPO_CONFIG_END,
+    ADDR_GPO_CONFIG_START,
+    ADDR_LAYOUT_END,
+    ADDR_LAYOUT_START,
+    ADDR_MATRIX_END,
+    ADDR_MATRIX_START,
+    ADDR_AUTO_TURN_ON_ENABLE,
+    ADDR_POWER_CONFIG_END,
+    ADDR_SOURCE_CONFIG_END,
+    ADDR_SOURCE_EQ_END,
+    ADDR_SOURCE_EQ_START,
+    ADDR_USER_EQ_END,
+    ADDR_USER_SETTINGS_START,
+    ADDR_WAYS_END,
+    ADDR_WAYS_START,
+    ADDR_ZONE_SETTINGS_END,
+    ADDR_ZONE_SETTINGS_START,
+)
+from .pbus_protocol import CrcCommand, ReadCommand, WriteCommand, calculate_crc16
+
+_LOGGER = logging.getLogger(__name__)
+
+# (name, start, end) of every configuration area in a snapshot; each one
+# lies inside a single PBus area so it can be read, written and CRC-checked
+# whole. The power area leaves out the write-only standby trigger at its
+# start, and the zone block is split around its unallocated gap.
+SNAPSHOT_AREAS = (
+    ("source", ADDR_ANALOG_REF, ADDR_SOURCE_CONFIG_END),
+    ("matrix", ADDR_MATRIX_START, ADDR_MATRIX_END),
+    ("user", ADDR_USER_SETTINGS_START, ADDR_USER_EQ_END),
+    ("layout", ADDR_LAYOUT_START, ADDR_LAYOUT_END),
+    ("ways", ADDR_WAYS_START, ADDR_WAYS_END),
+    ("dante", ADDR_DANTE_START, ADDR_DANTE_END),
+    ("gpi", ADDR_GPI_CONFIG_START, ADDR_GPI_CONFIG_END),
+    ("gpo", ADDR_GPO_CONFIG_START, ADDR_GPO_CONFIG_END),
+    ("power", ADDR_AUTO_TURN_ON_ENABLE, ADDR_POWER_CONFIG_END),
+    ("zone", ADDR_ZONE_SETTINGS_START, ADDR_ZONE_SETTINGS_END),
+    ("source_eq", ADDR_SOURCE_EQ_START, ADDR_SOURCE_EQ_END),
+)
+
+SNAPSHOT_MAGIC = b"PSMZSNAP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EXTENSION = ".mzsnap"
+
+_HEADER = struct.Struct("<8sHHIQ8x")
+_ENTRY = struct.Struct("<16sIIIHH")
+_LENGTH = struct.Struct("<I")
+_ALIGN = 16
+
+# Replies carry the block, so the same escaping bound as writes applies
+SNAPSHOT_BLOCK_SIZE = FIRMWARE_CHUNK_SIZE
+DEFAULT_WINDOW = 8
+DEFAULT_RETRIES = 3
+
+
+@dataclass
+class SnapshotArea:
+    """Contents of one configuration area."""
+    name: str
+    address: int
+    data: bytes
+
+    @property
+    def size(self) -> int:
+        """Area size in bytes."""
+        return len(self.data)
+
+    @property
+    def crc(self) -> int:
+        """CRC16 of the area, as returned by the C opcode."""
+        return calculate_crc16(self.data)
+
+
+@dataclass
+class ConfigSnapshot:
+    """Configuration of one amplifier at a point in time."""
+    areas: List[SnapshotArea]
+    created: int = field(default_factory=lambda: int(time.time()))
+
+    def area(self, name: str) -> Optional[SnapshotArea]:
+        """Return an area by name."""
+        for area in self.areas:
+            if area.name == name:
+                return area
+        return None
+
+    def to_bytes(self) -> bytes:
+        """Serialise the snapshot in the binary file format."""
+        offset = _HEADER.size + _ENTRY.size * len(self.areas)
+        index = bytearray()
+        blocks = bytearray()
+        for area in self.areas:
+            name = area.name.encode("ascii")
+            if len(name) > 16:
+                raise ValueError(f"Area name {area.name!r} is longer than 16 bytes")
+            index += _ENTRY.pack(name, area.address, area.size, offset + len(blocks), area.crc, 0)
+            blocks += _LENGTH.pack(area.size) + area.data
+            blocks += bytes(-len(blocks) % _ALIGN)
+        header = _HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(self.areas), calculate_crc16(index), self.created
+        )
+        return header + bytes(index) + bytes(blocks)
+
+    @classmethod
+    def from_bytes(cls, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]) -> "ConfigSnapshot":
+        """
+        Parse a snapshot file image.
+
+        Args:
+            buffer: File contents; a memory-mapped file works directly
+
+        Returns:
+            Parsed snapshot
+
+        Raises:
+            ValueError: If the magic, version, index CRC, a length prefix
+                        or an area CRC is wrong
+        """
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("Snapshot file is truncated")
+        magic, version, count, index_crc, created = _HEADER.unpack_from(view)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a Mezzo configuration snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        index_end = _HEADER.size + _ENTRY.size * count
+        if len(view) < index_end or calculate_crc16(view[_HEADER.size:index_end]) != index_crc:
+            raise ValueError("Snapshot index is corrupt")
+
+        areas = []
+        for name, address, size, offset, crc, _flags in _ENTRY.iter_unpack(view[_HEADER.size:index_end]):
+            name = name.rstrip(b"\0").decode("ascii")
+            start = offset + _LENGTH.size
+            if start + size > len(view) or _LENGTH.unpack_from(view, offset)[0] != size:
+                raise ValueError(f"Snapshot area {name} is truncated")
+            data = bytes(view[start:start + size])
+            if calculate_crc16(data) != crc:
+                raise ValueError(f"Snapshot area {name} failed its CRC check")
+            areas.append(SnapshotArea(name, address, data))
+        return cls(areas, created)
+
+    def save(self, path: str) -> None:
+        """Write the snapshot to a file (blocking)."""
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "ConfigSnapshot":
+        """
+        Read a snapshot file through a memory map (blocking).
+
+        Raises:
+            ValueError: If the file is not a valid snapshot
+        """
+        with open(path, "rb") as file:
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as err:  # empty file
+                raise ValueError("Snapshot file is truncated") from err
+            with mapped:
+                return cls.from_bytes(mapped)
+
+
+@dataclass
+class SnapshotRestoreResult:
+    """Outcome of a snapshot restore."""
+    checked: int
+    written: List[str]
+    bytes_written: int
+    elapsed: float
+
+
+class SnapshotEngine:
+    """Capture and restore the configuration of one amplifier."""
+
+    def __init__(
+        self,
+        client,
+        areas=SNAPSHOT_AREAS,
+        block_size: int = SNAPSHOT_BLOCK_SIZE,
+        window: int = DEFAULT_WINDOW,
+        retries: int = DEFAULT_RETRIES,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            client: Connected MezzoClient
+            areas: Iterable of (name, start, end) tuples
+            block_size: Data bytes per read or write request
+            window: Maximum requests in flight
+            retries: Extra attempts for a request that times out
+            timeout: Per-request timeout (client default if None)
+
+        Raises:
+            ValueError: If the block size or window is invalid
+        """
+        if not 0 < block_size <= SNAPSHOT_BLOCK_SIZE:
+            raise ValueError(f"Block size must be 1-{SNAPSHOT_BLOCK_SIZE}, got {block_size}")
+        if window < 1:
+            raise ValueError("Window must be at least 1")
+        self._client = client
+        self.areas = tuple(areas)
+        self.block_size = block_size
+        self.window = window
+        self.retries = retries
+        self.timeout = timeout
+
+    async def capture(self) -> ConfigSnapshot:
+        """
+        Read every configuration area.
+
+        Returns:
+            The snapshot
+
+        Raises:
+            ValueError: If the device NAKs a read
+            ConnectionError: If not connected
+            TimeoutError: If a block still times out after all retries
+        """
+        start = time.perf_counter()
+        requests = self._read_requests()
+        images = {name: bytearray(end - begin) for name, begin, end in self.areas}
+        bases = {name: begin for name, begin, _ in self.areas}
+
+        async def read(batch: List[tuple]) -> None:
+            responses = await self._send([ReadCommand(address, size) for _, address, size in batch])
+            for (name, address, size), response in zip(batch, responses):
+                if response.is_nak() or len(response.data) != size:
+                    raise ValueError(f"Read of {name} at 0x{address:08x}+{size} was refused (NAK)")
+                offset = address - bases[name]
+                images[name][offset:offset + size] = response.data
+
+        await self._pipeline(read, requests)
+        snapshot = ConfigSnapshot(
+            [SnapshotArea(name, begin, bytes(images[name])) for name, begin, _ in self.areas]
+        )
+        _LOGGER.debug(
+            "Captured %d configuration bytes from %s in %d requests (%.0f ms)",
+            sum(area.size for area in snapshot.areas), self._client.host,
+            len(requests), (time.perf_counter() - start) * 1000,
+        )
+        return snapshot
+
+    async def diff(self, snapshot: ConfigSnapshot) -> List[SnapshotArea]:
+        """
+        Compare a snapshot with the device without reading it.
+
+        Returns:
+            Snapshot areas whose device CRC differs (or is refused)
+
+        Raises:
+            ConnectionError: If not connected
+            TimeoutError: If the CRC request times out
+        """
+        responses = await self._send(
+            [CrcCommand(area.address, area.size) for area in snapshot.areas]
+        )
+        return [
+            area for area, response in zip(snapshot.areas, responses)
+            if response.crc != area.crc
+        ]
+
+    async def restore(self, snapshot: ConfigSnapshot) -> SnapshotRestoreResult:
+        """
+        Write the areas of a snapshot that differ from the device.
+
+        Args:
+            snapshot: Snapshot to restore
+
+        Returns:
+            Restore statistics
+
+        Raises:
+            ValueError: If a write is NAKed, or an area still differs
+                        after all retries
+            ConnectionError: If not connected
+            TimeoutError: If a request still times out after all retries
+        """
+        start = time.perf_counter()
+        changed = await self.diff(snapshot)
+        written = [area.name for area in changed]
+        bytes_written = 0
+
+        pending = changed
+        for attempt in range(self.retries + 1):
+            if not pending:
+                break
+            requests = [
+                (area, offset)
+                for area in pending
+                for offset in range(0, area.size, self.block_size)
+            ]
+            await self._pipeline(self._write_block, requests)
+            bytes_written += sum(area.size for area in pending)
+            pending = await self.diff(ConfigSnapshot(pending, snapshot.created))
+            if pending:
+                _LOGGER.debug(
+                    "Restore attempt %d left %s different", attempt + 1,
+                    ", ".join(area.name for area in pending),
+                )
+        if pending:
+            raise ValueError(
+                "Areas still differ after restore: " + ", ".join(area.name for area in pending)
+            )
+
+        result = SnapshotRestoreResult(
+            checked=len(snapshot.areas),
+            written=written,
+            bytes_written=bytes_written,
+            elapsed=time.perf_counter() - start,
+        )
+        _LOGGER.info(
+            "Restored %d of %d configuration areas on %s (%d bytes, %.0f ms)",
+            len(written), result.checked, self._client.host, bytes_written, result.elapsed * 1000,
+        )
+        return result
+
+    def _read_requests(self) -> List[List[tuple]]:
+        """
+        Split the areas into blocks and pack them into requests.
+
+        Returns:
+            One list of (area name, address, size) per request, each
+            carrying at most block_size bytes of data
+        """
+        requests: List[List[tuple]] = []
+        batch: List[tuple] = []
+        total = 0
+        for name, begin, end in self.areas:
+            for address in range(begin, end, self.block_size):
+                size = min(self.block_size, end - address)
+                if batch and total + size > self.block_size:
+                    requests.append(batch)
+                    batch, total = [], 0
+                batch.append((name, address, size))
+                total += size
+        if batch:
+            requests.append(batch)
+        return requests
+
+    async def _write_block(self, request: tuple) -> None:
+        """Write one block of an area."""
+        area, offset = request
+        chunk = area.data[offset:offset + self.block_size]
+        response = (await self._send([WriteCommand(area.address + offset, chunk)]))[0]
+        if response.is_nak():
+            raise ValueError(
+                f"Write of {area.name} at 0x{area.address + offset:08x} was refused (NAK)"
+            )
+
+    async def _pipeline(self, worker, requests: list) -> None:
+        """Run worker over requests with up to `window` in flight."""
+        slots = asyncio.Semaphore(self.window)
+
+        async def run(request) -> None:
+            try:
+                await worker(request)
+            finally:
+                slots.release()
+
+        tasks = []
+        try:
+            for request in requests:
+                await slots.acquire()
+                tasks.append(asyncio.ensure_future(run(request)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send(self, commands: list):
+        """Send one request, retrying on timeout (reads, writes and CRCs are idempotent)."""
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._client.send_commands(commands, self.timeout, exclusive=False)
+            except TimeoutError:
+                if attempt == self.retries:
+                    raise
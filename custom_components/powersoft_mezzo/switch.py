@@ -16,6 +16,8 @@ from .const import (
     UID_POWER,
     UID_MUTE,
     CHANNEL_NUMBERS,
+    CONF_PROTOCOL,
+    PROTOCOL_QUATTRO,
 )
 from .mezzo_client import MezzoClient
 from .mezzo_memory_map import NUM_EQ_BANDS, NUM_SOURCE_EQ_BANDS
@@ -41,6 +43,12 @@ async def async_setup_entry(
     for channel in CHANNEL_NUMBERS:
         entities.append(MezzoMuteSwitch(coordinator, client, entry, channel))
 
+    # QUATTROCANALI amplifiers expose power and mutes only
+    if entry.data.get(CONF_PROTOCOL) == PROTOCOL_QUATTRO:
+        async_add_entities(entities)
+        _LOGGER.info("Added %d switch entities (power, mutes)", len(entities))
+        return
+
     # Add User EQ band enable switches for each channel and band
     for channel in CHANNEL_NUMBERS:
         for band in range(1, NUM_EQ_BANDS + 1):
@@ -84,8 +92,9 @@ class MezzoPowerSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the amplifier on (exit standby)."""
         try:
-            await self._client.set_standby(False)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_optimistic(
+                ("standby",), False, lambda: self._client.set_standby(False)
+            )
         except Exception as err:
             _LOGGER.error("Failed to turn on amplifier: %s", err)
             raise
@@ -93,8 +102,9 @@ class MezzoPowerSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the amplifier off (enter standby)."""
         try:
-            await self._client.set_standby(True)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_optimistic(
+                ("standby",), True, lambda: self._client.set_standby(True)
+            )
         except Exception as err:
             _LOGGER.error("Failed to turn off amplifier: %s", err)
             raise
@@ -136,8 +146,11 @@ class MezzoMuteSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Mute the channel."""
         try:
-            await self._client.set_mute(self._channel, True)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_optimistic(
+                ("mutes", self._channel),
+                True,
+                lambda: self._client.set_mute(self._channel, True),
+            )
         except Exception as err:
             _LOGGER.error("Failed to mute channel %d: %s", self._channel, err)
             raise
@@ -145,8 +158,11 @@ class MezzoMuteSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Unmute the channel."""
         try:
-            await self._client.set_mute(self._channel, False)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_optimistic(
+                ("mutes", self._channel),
+                False,
+                lambda: self._client.set_mute(self._channel, False),
+            )
         except Exception as err:
             _LOGGER.error("Failed to unmute channel %d: %s", self._channel, err)
             raise
@@ -194,21 +210,7 @@ class MezzoEQBandSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Enable the EQ band."""
         try:
-            # Read current settings
-            current = await self._client.get_eq_band(self._channel, self._band)
-
-            # Write back with enabled=1
-            await self._client.set_eq_band(
-                self._channel,
-                self._band,
-                enabled=1,
-                filt_type=current["type"],
-                q=current["q"],
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_eq_band(self._channel, self._band, enabled=1)
         except Exception as err:
             _LOGGER.error("Failed to enable EQ CH%d Band%d: %s", self._channel, self._band, err)
             raise
@@ -216,21 +218,7 @@ class MezzoEQBandSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Disable the EQ band."""
         try:
-            # Read current settings
-            current = await self._client.get_eq_band(self._channel, self._band)
-
-            # Write back with enabled=0
-            await self._client.set_eq_band(
-                self._channel,
-                self._band,
-                enabled=0,
-                filt_type=current["type"],
-                q=current["q"],
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_eq_band(self._channel, self._band, enabled=0)
         except Exception as err:
             _LOGGER.error("Failed to disable EQ CH%d Band%d: %s", self._channel, self._band, err)
             raise
@@ -275,20 +263,7 @@ class MezzoSourceEQBandSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Enable the Source EQ band."""
         try:
-            # Read current settings
-            current = await self._client.get_source_eq_band(self._band)
-
-            # Write back with enabled=1
-            await self._client.set_source_eq_band(
-                self._band,
-                enabled=1,
-                filt_type=current["type"],
-                q=current["q"],
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_source_eq_band(self._band, enabled=1)
         except Exception as err:
             _LOGGER.error("Failed to enable Source EQ Band%d: %s", self._band, err)
             raise
@@ -296,20 +271,7 @@ class MezzoSourceEQBandSwitch(CoordinatorEntity, SwitchEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Disable the Source EQ band."""
         try:
-            # Read current settings
-            current = await self._client.get_source_eq_band(self._band)
-
-            # Write back with enabled=0
-            await self._client.set_source_eq_band(
-                self._band,
-                enabled=0,
-                filt_type=current["type"],
-                q=current["q"],
-                slope=current["slope"],
-                frequency=current["frequency"],
-                gain=current["gain"],
-            )
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_write_source_eq_band(self._band, enabled=0)
         except Exception as err:
             _LOGGER.error("Failed to disable Source EQ Band%d: %s", self._band, err)
             raise
@@ -0,0 +1,210 @@
+"""
+Transport Metrics for Powersoft Amplifiers.
+
+Counters and latency histograms kept by the UDP managers for one
+amplifier. Recording is on the request path, so it only increments
+integers: histograms use fixed, precomputed buckets and nothing is
+allocated per request (NAKs per address add a dictionary entry the first
+time an address is NAKed).
+
+Phase histograms split a poll into spans (command building, encoding,
+sendto, waiting, parsing, decoding and entity fan-out), timed with
+time.perf_counter_ns at microsecond resolution.
+"""
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Optional
+
+# Histogram buckets: 0.1 ms to ~100 s, four buckets per octave
+_BUCKETS_PER_OCTAVE = 4
+_FIRST_BOUND = 0.0001
+_NUM_BOUNDS = 80
+BUCKET_BOUNDS = tuple(
+    _FIRST_BOUND * 2 ** (i / _BUCKETS_PER_OCTAVE) for i in range(_NUM_BOUNDS)
+)
+
+# Span buckets: 1 us to ~1 s, same resolution
+SPAN_BUCKET_BOUNDS = tuple(
+    0.000001 * 2 ** (i / _BUCKETS_PER_OCTAVE) for i in range(_NUM_BOUNDS)
+)
+
+# Poll phases, in the order they happen
+PHASE_BUILD = "build"      # building the command list
+PHASE_ENCODE = "encode"    # framing, CRC and escaping
+PHASE_SEND = "send"        # the sendto call
+PHASE_WAIT = "wait"        # from sendto until the reply arrives
+PHASE_PARSE = "parse"      # CRC check, unescaping and parsing the reply
+PHASE_DECODE = "decode"    # turning responses into the state dict
+PHASE_FANOUT = "fanout"    # coordinator listeners (entity state writes)
+PHASES = (
+    PHASE_BUILD, PHASE_ENCODE, PHASE_SEND, PHASE_WAIT,
+    PHASE_PARSE, PHASE_DECODE, PHASE_FANOUT,
+)
+
+_UNIT_SCALE = {'ms': 1000, 'us': 1000000}
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram of durations in seconds.
+
+    Bucket i counts samples in (bounds[i-1], bounds[i]]; the last bucket
+    counts everything above the largest bound. Percentiles are reported as
+    the upper bound of the bucket they fall in, which is within 19% of the
+    true value.
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, bounds: tuple = BUCKET_BOUNDS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            bounds: Ascending bucket upper bounds in seconds
+        """
+        self.bounds = bounds
+        self.counts = array('Q', bytes(8 * (len(bounds) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one sample."""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def record_ns(self, nanoseconds: int) -> None:
+        """Add one sample measured with time.perf_counter_ns."""
+        self.record(nanoseconds * 1e-9)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estimate a percentile.
+
+        Args:
+            fraction: Percentile as a fraction (0.5 for the median)
+
+        Returns:
+            Upper bound of the bucket holding the percentile in seconds,
+            or None if there are no samples
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def reset(self) -> None:
+        """Discard all samples."""
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def as_dict(self, unit: str = 'ms') -> Dict[str, Any]:
+        """
+        Summarise the histogram.
+
+        Args:
+            unit: 'ms' or 'us'; also used as the key suffix
+
+        Returns:
+            Sample count, mean, p50, p95, p99 and max
+        """
+        scale = _UNIT_SCALE[unit]
+
+        def convert(value: Optional[float]) -> Optional[float]:
+            return round(value * scale, 2) if value is not None else None
+
+        return {
+            'count': self.count,
+            f'mean_{unit}': convert(self.total / self.count) if self.count else None,
+            f'p50_{unit}': convert(self.percentile(0.50)),
+            f'p95_{unit}': convert(self.percentile(0.95)),
+            f'p99_{unit}': convert(self.percentile(0.99)),
+            f'max_{unit}': convert(self.max) if self.count else None,
+        }
+
+
+class TransportMetrics:
+    """
+    Per-amplifier transport counters.
+
+    Attributes:
+        requests: Requests sent (not counting retransmits)
+        retransmits: Extra copies of requests sent
+        timeouts: Requests that got no answer in time
+        naks: NAKed PBus commands
+        naks_by_address: NAK count per PBus address
+        unknown_tags: Replies matching no outstanding request (late or duplicate)
+        parse_errors: Packets that failed CRC or parsing
+        bytes_out: Bytes sent, including retransmits
+        bytes_in: Bytes received
+        rtt: Round-trip time histogram (unambiguous samples only)
+        poll: Coordinator poll-cycle duration histogram
+        phases: Span histogram per poll phase (see PHASES)
+    """
+
+    __slots__ = (
+        'requests', 'retransmits', 'timeouts', 'naks', 'naks_by_address',
+        'unknown_tags', 'parse_errors', 'bytes_out', 'bytes_in', 'rtt', 'poll',
+        'phases',
+    )
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self.rtt = LatencyHistogram()
+        self.poll = LatencyHistogram()
+        self.phases = {phase: LatencyHistogram(SPAN_BUCKET_BOUNDS) for phase in PHASES}
+        self.naks_by_address: Dict[int, int] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters and histograms."""
+        self.requests = 0
+        self.retransmits = 0
+        self.timeouts = 0
+        self.naks = 0
+        self.naks_by_address.clear()
+        self.unknown_tags = 0
+        self.parse_errors = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.rtt.reset()
+        self.poll.reset()
+        for histogram in self.phases.values():
+            histogram.reset()
+
+    def record_nak(self, address: int) -> None:
+        """Count a NAK for a PBus address."""
+        self.naks += 1
+        self.naks_by_address[address] = self.naks_by_address.get(address, 0) + 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable snapshot."""
+        return {
+            'requests': self.requests,
+            'retransmits': self.retransmits,
+            'timeouts': self.timeouts,
+            'naks': self.naks,
+            'naks_by_address': {
+                f"0x{address:08x}": count
+                for address, count in sorted(self.naks_by_address.items())
+            },
+            'unknown_tags': self.unknown_tags,
+            'parse_errors': self.parse_errors,
+            'bytes_out': self.bytes_out,
+            'bytes_in': self.bytes_in,
+            'rtt': self.rtt.as_dict(),
+            'poll': self.poll.as_dict(),
+            'phases': {phase: histogram.as_dict('us') for phase, histogram in self.phases.items()},
+        }
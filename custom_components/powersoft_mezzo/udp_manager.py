@@ -5,12 +5,22 @@ This module handles asynchronous UDP socket communication with Mezzo amplifiers,
 including request/response matching, timeout handling, and connection management.
 """
 import asyncio
+import contextlib
 import logging
-from typing import Optional, Dict, Tuple
+import random
+import time
+from typing import Any, AsyncIterator, Callable, Iterable, Optional, Dict, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime
 
 from .pbus_protocol import PBusPacket, PBusCommand, PBusResponse, generate_tag
+from .packet_trace import DIRECTION_IN, DIRECTION_OUT, PacketTrace
+from .transport_metrics import (
+    PHASE_ENCODE,
+    PHASE_PARSE,
+    PHASE_SEND,
+    PHASE_WAIT,
+    TransportMetrics,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,7 +36,9 @@ class PendingRequest:
     """Represents a pending request awaiting response."""
     tag: bytes
     future: asyncio.Future
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=time.monotonic)
+    sent_ns: int = 0  # time.perf_counter_ns() right after sendto
+    answered_ns: int = 0  # time.perf_counter_ns() when the reply arrived
 
 
 class UDPManager:
@@ -60,6 +72,8 @@ class UDPManager:
         self._pending_requests: Dict[bytes, PendingRequest] = {}
         self._is_connected = False
         self._lock = asyncio.Lock()
+        self.metrics = TransportMetrics()
+        self.trace: Optional[PacketTrace] = None  # set to record frames
 
     async def connect(self) -> None:
         """
@@ -117,13 +131,19 @@ class UDPManager:
         self,
         commands: list[PBusCommand],
         timeout: Optional[float] = None,
+        exclusive: bool = True,
     ) -> list[PBusResponse]:
         """
         Send a request and wait for response.
 
+        Requests normally go out one at a time. Bulk transfers pass
+        exclusive=False to keep several requests in flight; replies are
+        still matched by TAG.
+
         Args:
             commands: List of PBus commands to send
             timeout: Timeout in seconds (uses default if None)
+            exclusive: Wait for other exclusive requests to finish first
 
         Returns:
             List of PBus responses
@@ -136,60 +156,127 @@ class UDPManager:
         if not self._is_connected:
             raise ConnectionError("Not connected to amplifier")
 
-        if timeout is None:
-            timeout = self.timeout
+        async with self._lock if exclusive else contextlib.nullcontext():
+            tag = self.new_tag()
+
+            # Build request packet
+            start = time.perf_counter_ns()
+            packet = PBusPacket.build_request(tag, commands)
+            self.metrics.phases[PHASE_ENCODE].record_ns(time.perf_counter_ns() - start)
+
+            pending = self.post_packet(tag, packet)
+            return await self.wait_response(pending, timeout)
+
+    def exclusive(self) -> asyncio.Lock:
+        """
+        Lock held by exclusive requests.
 
-        async with self._lock:
-            # Generate unique TAG
+        Holding it (async with) lets a caller use post_packet and
+        wait_response without other exclusive requests interleaving.
+        """
+        return self._lock
+
+    def new_tag(self) -> bytes:
+        """Generate a TAG not used by any request in flight."""
+        tag = generate_tag()
+        while tag in self._pending_requests:
             tag = generate_tag()
+        return tag
 
-            # Ensure TAG is unique
-            while tag in self._pending_requests:
-                tag = generate_tag()
+    def post_packet(self, tag: bytes, packet: bytes) -> PendingRequest:
+        """
+        Send an encoded packet without waiting for the response.
 
-            # Build request packet
-            packet = PBusPacket.build_request(tag, commands)
+        Used to send to several amplifiers back to back; every posted
+        request must be passed to wait_response. Build every packet with
+        a TAG from new_tag so a late reply to an earlier request cannot
+        complete it.
 
-            # Create future for response
-            future = asyncio.get_event_loop().create_future()
-            self._pending_requests[tag] = PendingRequest(tag, future)
+        Args:
+            tag: TAG the packet was built with
+            packet: Complete request packet
 
-            try:
-                # Send packet
-                _LOGGER.debug(
-                    "Sending request to %s:%d (TAG: %s, size: %d bytes)",
-                    self.host,
-                    self.port,
-                    tag.hex(),
-                    len(packet),
-                )
-                self._transport.sendto(packet)
+        Returns:
+            The pending request (sent_ns is the send time)
 
-                # Wait for response with timeout
-                try:
-                    responses = await asyncio.wait_for(future, timeout=timeout)
-                    _LOGGER.debug(
-                        "Received response from %s:%d (TAG: %s, %d responses)",
-                        self.host,
-                        self.port,
-                        tag.hex(),
-                        len(responses),
-                    )
-                    return responses
+        Raises:
+            ConnectionError: If not connected
+            ValueError: If a request with the same TAG is in flight
+        """
+        if not self._is_connected:
+            raise ConnectionError("Not connected to amplifier")
+        if tag in self._pending_requests:
+            raise ValueError(f"Request with TAG {tag.hex()} already in flight")
 
-                except asyncio.TimeoutError:
-                    _LOGGER.warning(
-                        "Request timeout after %.1fs (TAG: %s)",
-                        timeout,
-                        tag.hex(),
-                    )
-                    raise TimeoutError(
-                        f"No response received within {timeout}s"
-                    ) from None
+        pending = PendingRequest(tag, asyncio.get_event_loop().create_future())
+        self._pending_requests[tag] = pending
+        try:
+            _LOGGER.debug(
+                "Sending request to %s:%d (TAG: %s, size: %d bytes)",
+                self.host,
+                self.port,
+                tag.hex(),
+                len(packet),
+            )
+            start = time.perf_counter_ns()
+            self._transport.sendto(packet)
+            pending.sent_ns = time.perf_counter_ns()
+        except Exception:
+            self._pending_requests.pop(tag, None)
+            raise
+        self.metrics.phases[PHASE_SEND].record_ns(pending.sent_ns - start)
+        self.metrics.requests += 1
+        self.metrics.bytes_out += len(packet)
+        if self.trace is not None:
+            self.trace.record(DIRECTION_OUT, packet, tag)
+        return pending
+
+    async def wait_response(
+        self,
+        pending: PendingRequest,
+        timeout: Optional[float] = None,
+    ) -> list[PBusResponse]:
+        """
+        Wait for the response to a posted request.
+
+        Args:
+            pending: Request returned by post_packet
+            timeout: Timeout in seconds (uses default if None)
+
+        Returns:
+            List of PBus responses
+
+        Raises:
+            TimeoutError: If response not received within timeout
+        """
+        if timeout is None:
+            timeout = self.timeout
+        tag = pending.tag
+        try:
+            responses = await asyncio.wait_for(pending.future, timeout=timeout)
+            _LOGGER.debug(
+                "Received response from %s:%d (TAG: %s, %d responses)",
+                self.host,
+                self.port,
+                tag.hex(),
+                len(responses),
+            )
+            return responses
+
+        except asyncio.TimeoutError:
+            self.metrics.timeouts += 1
+            _LOGGER.warning(
+                "Request timeout after %.1fs (TAG: %s)",
+                timeout,
+                tag.hex(),
+            )
+            raise TimeoutError(
+                f"No response received within {timeout}s"
+            ) from None
 
-            finally:
-                # Clean up pending request
-                self._pending_requests.pop(tag, None)
+        finally:
+            # Clean up pending request
+            self._pending_requests.pop(tag, None)
 
     def _handle_response(self, data: bytes, addr: Tuple[str, int]) -> None:
         """
@@ -199,9 +286,15 @@ class UDPManager:
             data: Raw packet data
             addr: Source address tuple (host, port)
         """
+        arrived = time.perf_counter_ns()
+        metrics = self.metrics
+        metrics.bytes_in += len(data)
         try:
             # Parse response packet
             tag, responses = PBusPacket.parse_response(data)
+            metrics.phases[PHASE_PARSE].record_ns(time.perf_counter_ns() - arrived)
+            if self.trace is not None:
+                self.trace.record(DIRECTION_IN, data, tag)
 
             _LOGGER.debug(
                 "Received packet from %s:%d (TAG: %s, size: %d bytes)",
@@ -216,13 +309,23 @@ class UDPManager:
             if pending:
                 # Set result on future
                 if not pending.future.done():
+                    pending.answered_ns = arrived
+                    metrics.rtt.record(time.monotonic() - pending.timestamp)
+                    metrics.phases[PHASE_WAIT].record_ns(arrived - pending.sent_ns)
+                    for response in responses:
+                        if response.size == 0:
+                            metrics.record_nak(response.address)
                     pending.future.set_result(responses)
             else:
+                metrics.unknown_tags += 1
                 _LOGGER.warning(
                     "Received response with unknown TAG: %s", tag.hex()
                 )
 
         except ValueError as err:
+            metrics.parse_errors += 1
+            if self.trace is not None:
+                self.trace.record(DIRECTION_IN, data)
             _LOGGER.error("Failed to parse response packet: %s", err)
         except Exception as err:
             _LOGGER.exception("Unexpected error handling response: %s", err)
@@ -232,6 +335,287 @@ class UDPManager:
         """Check if connected to amplifier."""
         return self._is_connected
 
+    @property
+    def local_address(self) -> Tuple[str, int]:
+        """Local (host, port) of the socket, or ("0.0.0.0", 0) if closed."""
+        if self._transport is None:
+            return ("0.0.0.0", 0)
+        return self._transport.get_extra_info("sockname")[:2]
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.disconnect()
+
+
+class QuattroUDPManager:
+    """
+    Manages UDP communication with a Powersoft QUATTROCANALI amplifier.
+
+    Unlike PBus, the QUATTROCANALI protocol has no TAG but a 16-bit cookie
+    that the device copies into its answer, and the device serves several
+    requests at once. Requests are therefore not serialised: each gets its
+    own cookie and any number may be in flight. A request that is not
+    answered within the retransmit timeout is sent again with the same
+    cookie, so a late answer to an earlier copy still completes it.
+
+    The retransmit timeout follows the measured round-trip time (smoothed
+    RTT plus four deviations, as in TCP), so a lost packet on a fast LAN
+    costs tens of milliseconds rather than a fixed fraction of the timeout.
+    """
+
+    MIN_RTO = 0.05  # seconds
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 1234,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = 3,
+    ):
+        """
+        Initialize the UDP manager.
+
+        Args:
+            host: IP address of the amplifier
+            port: UDP port (default 1234)
+            timeout: Default total time for a request, including retransmits
+            retries: Number of retransmits within the timeout
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._local_port = 0
+        self._pending_requests: Dict[int, Tuple[int, asyncio.Future]] = {}
+        self._next_cookie = random.randrange(0x10000)
+        self._is_connected = False
+        self._srtt: Optional[float] = None
+        self._rttvar = 0.0
+        self.metrics = TransportMetrics()
+        self.trace: Optional[PacketTrace] = None  # set to record frames
+
+    async def connect(self) -> None:
+        """
+        Create the UDP socket and start listening.
+
+        Raises:
+            OSError: If socket creation fails
+        """
+        if self._is_connected:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: UDPProtocol(self._handle_response),
+                remote_addr=(self.host, self.port),
+            )
+        except OSError as err:
+            _LOGGER.error("Failed to connect to %s:%d: %s", self.host, self.port, err)
+            raise
+
+        # The device answers to answer_port, or to 1234 if it is zero
+        self._local_port = self._transport.get_extra_info('sockname')[1]
+        self._is_connected = True
+        _LOGGER.info("Connected to QUATTROCANALI at %s:%d", self.host, self.port)
+
+    async def disconnect(self) -> None:
+        """Close the UDP socket and cancel outstanding requests."""
+        if not self._is_connected:
+            return
+
+        for _, future in self._pending_requests.values():
+            if not future.done():
+                future.cancel()
+        self._pending_requests.clear()
+
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+
+        self._is_connected = False
+        _LOGGER.info("Disconnected from QUATTROCANALI at %s:%d", self.host, self.port)
+
+    def _allocate_cookie(self) -> int:
+        """Return a cookie not used by any outstanding request."""
+        cookie = self._next_cookie
+        while cookie in self._pending_requests:
+            cookie = (cookie + 1) & 0xFFFF
+        self._next_cookie = (cookie + 1) & 0xFFFF
+        return cookie
+
+    @property
+    def rto(self) -> float:
+        """Current retransmit timeout in seconds."""
+        if self._srtt is None:
+            return self.timeout / max(1, self.retries + 1)
+        return max(self.MIN_RTO, self._srtt + 4 * self._rttvar)
+
+    def _update_rtt(self, sample: float) -> None:
+        """Fold a round-trip sample into the smoothed estimate."""
+        if self._srtt is None:
+            self._srtt = sample
+            self._rttvar = sample / 2
+        else:
+            self._rttvar = 0.75 * self._rttvar + 0.25 * abs(self._srtt - sample)
+            self._srtt = 0.875 * self._srtt + 0.125 * sample
+
+    async def send_request(
+        self,
+        cmd: int,
+        data: bytes = b'',
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+    ) -> Any:
+        """
+        Send a request and wait for the answer with the same cookie.
+
+        Args:
+            cmd: Request command code
+            data: Request payload
+            timeout: Total time in seconds (uses default if None)
+            retries: Retransmits within the timeout (uses default if None)
+
+        Returns:
+            QuattroResponse answering the request
+
+        Raises:
+            ConnectionError: If not connected
+            TimeoutError: If no answer is received within timeout
+        """
+        from .quattro_protocol import QuattroCommand
+
+        if not self._is_connected:
+            raise ConnectionError("Not connected to amplifier")
+
+        if timeout is None:
+            timeout = self.timeout
+        if retries is None:
+            retries = self.retries
+
+        loop = asyncio.get_running_loop()
+        cookie = self._allocate_cookie()
+        future = loop.create_future()
+        self._pending_requests[cookie] = (cmd, future)
+        phases = self.metrics.phases
+        encode_start = time.perf_counter_ns()
+        packet = QuattroCommand(
+            cmd=cmd, data=data, cookie=cookie, answer_port=self._local_port
+        ).build_packet()
+        phases[PHASE_ENCODE].record_ns(time.perf_counter_ns() - encode_start)
+
+        start = loop.time()
+        deadline = start + timeout
+        rto = self.rto
+        metrics = self.metrics
+        metrics.requests += 1
+
+        try:
+            for attempt in range(max(1, retries + 1)):
+                now = loop.time()
+                if now >= deadline:
+                    break
+                if attempt:
+                    metrics.retransmits += 1
+                    _LOGGER.debug(
+                        "Retransmitting cmd 0x%02x to %s (cookie %d, attempt %d)",
+                        cmd, self.host, cookie, attempt + 1,
+                    )
+                send_start = time.perf_counter_ns()
+                self._transport.sendto(packet)
+                phases[PHASE_SEND].record_ns(time.perf_counter_ns() - send_start)
+                metrics.bytes_out += len(packet)
+                if self.trace is not None:
+                    self.trace.record(DIRECTION_OUT, packet, cookie)
+                # The last attempt waits for whatever time is left
+                wait = deadline - now if attempt == retries else min(rto, deadline - now)
+                try:
+                    response = await asyncio.wait_for(asyncio.shield(future), wait)
+                except asyncio.TimeoutError:
+                    rto *= 2
+                    continue
+                # Karn's rule: only unambiguous (first attempt) samples count
+                if not attempt:
+                    sample = loop.time() - start
+                    self._update_rtt(sample)
+                    metrics.rtt.record(sample)
+                    phases[PHASE_WAIT].record(sample)
+                return response
+
+            metrics.timeouts += 1
+            _LOGGER.warning(
+                "QUATTROCANALI request 0x%02x to %s timed out after %.1fs",
+                cmd, self.host, timeout,
+            )
+            raise TimeoutError(f"No response received within {timeout}s")
+
+        finally:
+            self._pending_requests.pop(cookie, None)
+            if not future.done():
+                future.cancel()
+
+    def _handle_response(self, data: bytes, addr: Tuple[str, int]) -> None:
+        """
+        Handle received UDP packet.
+
+        Args:
+            data: Raw packet data
+            addr: Source address tuple (host, port)
+        """
+        from .quattro_protocol import QuattroResponse, is_answer_to
+
+        arrived = time.perf_counter_ns()
+        self.metrics.bytes_in += len(data)
+        response = QuattroResponse.parse_packet(data)
+        self.metrics.phases[PHASE_PARSE].record_ns(time.perf_counter_ns() - arrived)
+        if self.trace is not None:
+            self.trace.record(DIRECTION_IN, data, response.cookie if response is not None else None)
+        if response is None:
+            self.metrics.parse_errors += 1
+            return
+
+        pending = self._pending_requests.get(response.cookie)
+        if pending is None:
+            # Usually the answer to a copy that was already retransmitted
+            self.metrics.unknown_tags += 1
+            _LOGGER.debug("Ignoring answer with unknown cookie %d", response.cookie)
+            return
+
+        cmd, future = pending
+        if not is_answer_to(response, cmd):
+            _LOGGER.debug(
+                "Ignoring answer 0x%02x for cookie %d (expected cmd 0x%02x)",
+                response.cmd, response.cookie, cmd,
+            )
+            return
+
+        if not future.done():
+            future.set_result(response)
+
+    @property
+    def is_connected(self) -> bool:
+        """Check if connected to amplifier."""
+        return self._is_connected
+
+    @property
+    def local_address(self) -> Tuple[str, int]:
+        """Local (host, port) of the socket, or ("0.0.0.0", 0) if closed."""
+        if self._transport is None:
+            return ("0.0.0.0", 0)
+        return self._transport.get_extra_info("sockname")[:2]
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests awaiting an answer."""
+        return len(self._pending_requests)
+
     async def __aenter__(self):
         """Async context manager entry."""
         await self.connect()
@@ -294,62 +678,221 @@ class UDPProtocol(asyncio.DatagramProtocol):
 class UDPBroadcaster:
     """
     Utility for broadcasting UDP packets for device discovery.
+
+    Each scan runs on its own socket and yields devices as they answer, so
+    Mezzo and QUATTROCANALI scans can run concurrently and callers can stop
+    as soon as the expected devices have replied.
     """
 
     @staticmethod
-    async def broadcast(
-        commands: list[PBusCommand],
-        port: int = DEFAULT_PORT,
-        timeout: float = 5.0,
-    ) -> Dict[str, list[PBusResponse]]:
+    async def _iter_replies(
+        packet: Any,
+        port: int,
+        parse: Callable[[bytes], Any],
+        timeout: float,
+        idle_timeout: Optional[float],
+        repeats: int,
+        repeat_interval: float,
+        address: str,
+    ) -> AsyncIterator[Tuple[str, Any]]:
         """
-        Broadcast a request and collect responses from all devices.
+        Broadcast a packet and yield the first valid reply from each host.
 
-        Args:
-            commands: PBus commands to broadcast
-            port: UDP port to broadcast on
-            timeout: Time to wait for responses
+        The packet is sent `repeats` times, `repeat_interval` apart, to
+        survive packet loss. The scan ends at `timeout`, or earlier once
+        nothing has been sent or received for `idle_timeout` seconds.
 
-        Returns:
-            Dictionary mapping IP addresses to response lists
+        Args:
+            packet: Encoded request to broadcast, or a callable building it
+                    from the local port (for protocols with an answer port)
+            port: Destination UDP port
+            parse: Callable returning the decoded reply, or None to ignore it
+            timeout: Maximum scan duration in seconds
+            idle_timeout: Quiet period that ends the scan early (None = never)
+            repeats: Number of times to send the packet
+            repeat_interval: Delay between repeated sends in seconds
+            address: Destination address (broadcast address by default)
+
+        Yields:
+            Tuples of (host, decoded reply)
         """
-        responses_by_host = {}
-        response_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        seen = set()
 
         def handle_response(data: bytes, addr: Tuple[str, int]):
-            """Handle broadcast responses."""
-            try:
-                _, responses = PBusPacket.parse_response(data)
-                responses_by_host[addr[0]] = responses
-                _LOGGER.debug("Broadcast response from %s", addr[0])
-            except ValueError as err:
-                _LOGGER.debug("Invalid broadcast response from %s: %s", addr[0], err)
+            """Queue the first valid reply from each host."""
+            host = addr[0]
+            if host in seen:
+                return
+            result = parse(data)
+            if result is None:
+                _LOGGER.debug("Ignoring invalid discovery reply from %s", host)
+                return
+            seen.add(host)
+            queue.put_nowait((host, result))
 
         try:
-            # Create UDP endpoint for broadcast
-            loop = asyncio.get_event_loop()
-            transport, protocol = await loop.create_datagram_endpoint(
+            transport, _ = await loop.create_datagram_endpoint(
                 lambda: UDPProtocol(handle_response),
                 local_addr=('0.0.0.0', 0),
                 allow_broadcast=True,
             )
+        except OSError as err:
+            _LOGGER.error("Failed to open broadcast socket: %s", err)
+            return
+
+        if callable(packet):
+            packet = packet(transport.get_extra_info('sockname')[1])
 
+        try:
+            start = loop.time()
+            deadline = start + timeout
+            sends_left = max(1, repeats)
+            next_send = start
+            last_activity = start
+
+            while True:
+                now = loop.time()
+                if sends_left and now >= next_send:
+                    transport.sendto(packet, (address, port))
+                    sends_left -= 1
+                    next_send = now + repeat_interval
+                    last_activity = now
+
+                wake = deadline
+                if idle_timeout is not None:
+                    wake = min(wake, last_activity + idle_timeout)
+                if sends_left:
+                    wake = min(wake, next_send)
+
+                if now >= deadline or (
+                    not sends_left and idle_timeout is not None
+                    and now >= last_activity + idle_timeout
+                ):
+                    break
+
+                try:
+                    host, result = await asyncio.wait_for(queue.get(), max(0.0, wake - now))
+                except asyncio.TimeoutError:
+                    continue
+
+                last_activity = loop.time()
+                yield host, result
+
+        finally:
+            transport.close()
+
+    @staticmethod
+    async def iter_broadcast(
+        commands: list[PBusCommand],
+        port: int = DEFAULT_PORT,
+        timeout: float = 5.0,
+        idle_timeout: Optional[float] = None,
+        repeats: int = 1,
+        repeat_interval: float = 0.5,
+        address: str = BROADCAST_ADDRESS,
+    ) -> AsyncIterator[Tuple[str, list[PBusResponse]]]:
+        """
+        Broadcast a PBus request and yield responses as devices answer.
+
+        Args:
+            commands: PBus commands to broadcast
+            port: UDP port to broadcast on
+            timeout: Maximum time to wait for responses
+            idle_timeout: Stop early after this long without replies
+            repeats: Number of times to send the broadcast
+            repeat_interval: Delay between repeated broadcasts
+            address: Destination address
+
+        Yields:
+            Tuples of (IP address, response list)
+        """
+        tag = generate_tag()
+        packet = PBusPacket.build_request(tag, commands)
+
+        def parse(data: bytes) -> Optional[list[PBusResponse]]:
+            """Decode a PBus reply to this broadcast."""
             try:
-                # Build and send broadcast packet
-                tag = generate_tag()
-                packet = PBusPacket.build_request(tag, commands)
+                reply_tag, responses = PBusPacket.parse_response(data)
+            except ValueError:
+                return None
+            return responses if reply_tag == tag else None
+
+        _LOGGER.info("Broadcasting discovery packet on port %d", port)
+        async for host, responses in UDPBroadcaster._iter_replies(
+            packet, port, parse, timeout, idle_timeout, repeats, repeat_interval, address
+        ):
+            _LOGGER.debug("Broadcast response from %s", host)
+            yield host, responses
+
+    @staticmethod
+    async def iter_broadcast_quattro(
+        port: Optional[int] = None,
+        timeout: float = 5.0,
+        idle_timeout: Optional[float] = None,
+        repeats: int = 1,
+        repeat_interval: float = 0.5,
+        address: str = BROADCAST_ADDRESS,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Broadcast a QUATTROCANALI PING and yield responses as devices answer.
 
-                _LOGGER.info("Broadcasting discovery packet on port %d", port)
-                transport.sendto(packet, (BROADCAST_ADDRESS, port))
+        Args:
+            port: UDP port to broadcast on (default 1234)
+            timeout: Maximum time to wait for responses
+            idle_timeout: Stop early after this long without replies
+            repeats: Number of times to send the broadcast
+            repeat_interval: Delay between repeated broadcasts
+            address: Destination address
+
+        Yields:
+            Tuples of (IP address, QuattroResponse)
+        """
+        from .quattro_protocol import build_ping_command, DEFAULT_PORT as QUATTRO_PORT, QuattroResponse
+
+        if port is None:
+            port = QUATTRO_PORT
+
+        def packet(local_port: int) -> bytes:
+            """Build a PING asking for answers on the scan socket."""
+            # PING is the simplest connectivity test with no side effects
+            command = build_ping_command()
+            command.answer_port = local_port
+            return command.build_packet()
+
+        _LOGGER.info("Broadcasting QUATTROCANALI PING on port %d", port)
+        async for host, response in UDPBroadcaster._iter_replies(
+            packet, port, QuattroResponse.parse_packet, timeout, idle_timeout,
+            repeats, repeat_interval, address
+        ):
+            _LOGGER.debug("QUATTROCANALI broadcast response from %s", host)
+            yield host, response
 
-                # Wait for timeout to collect responses
-                await asyncio.sleep(timeout)
+    @staticmethod
+    async def broadcast(
+        commands: list[PBusCommand],
+        port: int = DEFAULT_PORT,
+        timeout: float = 5.0,
+        idle_timeout: Optional[float] = None,
+    ) -> Dict[str, list[PBusResponse]]:
+        """
+        Broadcast a request and collect responses from all devices.
 
-            finally:
-                transport.close()
+        Args:
+            commands: PBus commands to broadcast
+            port: UDP port to broadcast on
+            timeout: Maximum time to wait for responses
+            idle_timeout: Stop early after this long without replies
 
-        except OSError as err:
-            _LOGGER.error("Failed to broadcast: %s", err)
+        Returns:
+            Dictionary mapping IP addresses to response lists
+        """
+        responses_by_host = {}
+        async for host, responses in UDPBroadcaster.iter_broadcast(
+            commands, port, timeout, idle_timeout
+        ):
+            responses_by_host[host] = responses
 
         _LOGGER.info("Broadcast complete, received %d responses", len(responses_by_host))
         return responses_by_host
@@ -357,57 +900,151 @@ class UDPBroadcaster:
     @staticmethod
     async def broadcast_quattro(
         timeout: float = 5.0,
-    ) -> Dict[str, bytes]:
+        idle_timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """
         Broadcast a QUATTROCANALI discovery request and collect responses.
 
         Args:
-            timeout: Time to wait for responses
+            timeout: Maximum time to wait for responses
+            idle_timeout: Stop early after this long without replies
 
         Returns:
-            Dictionary mapping IP addresses to raw response data
+            Dictionary mapping IP addresses to parsed QuattroResponse objects
         """
-        from .quattro_protocol import build_power_command, DEFAULT_PORT as QUATTRO_PORT, QuattroResponse
-
         responses_by_host = {}
+        async for host, response in UDPBroadcaster.iter_broadcast_quattro(
+            timeout=timeout, idle_timeout=idle_timeout
+        ):
+            responses_by_host[host] = response
 
-        def handle_response(data: bytes, addr: Tuple[str, int]):
-            """Handle QUATTROCANALI broadcast responses."""
-            try:
-                # Just store raw response data - we'll check if it's valid QUATTRO protocol
-                if len(data) > 0:
-                    responses_by_host[addr[0]] = data
-                    _LOGGER.debug("QUATTROCANALI broadcast response from %s", addr[0])
-            except Exception as err:
-                _LOGGER.debug("Error handling QUATTROCANALI response from %s: %s", addr[0], err)
+        _LOGGER.info("QUATTROCANALI broadcast complete, received %d responses", len(responses_by_host))
+        return responses_by_host
 
-        try:
-            # Create UDP endpoint for broadcast
-            loop = asyncio.get_event_loop()
-            transport, protocol = await loop.create_datagram_endpoint(
-                lambda: UDPProtocol(handle_response),
-                local_addr=('0.0.0.0', 0),
-                allow_broadcast=True,
-            )
 
-            try:
-                # Build a PING command for discovery
-                # PING is the simplest connectivity test with no side effects
-                from .quattro_protocol import build_ping_command
-                ping_cmd = build_ping_command()
-                packet = ping_cmd.build_packet()
+class UDPSweeper:
+    """
+    Unicast PBus prober for networks that broadcasts cannot reach.
+
+    All probes share one socket. Each target gets its own TAG, sends are
+    paced to a fixed packet rate and at most `concurrency` probes are in
+    flight at once, so large ranges (e.g. a /22 behind a router) are covered
+    in a few seconds without flooding the network.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2000.0,
+        concurrency: int = 1024,
+        timeout: float = 1.0,
+        attempts: int = 2,
+    ):
+        """
+        Initialize the sweeper.
 
-                _LOGGER.info("Broadcasting QUATTROCANALI PING on port %d", QUATTRO_PORT)
-                transport.sendto(packet, (BROADCAST_ADDRESS, QUATTRO_PORT))
+        Args:
+            rate: Maximum packets sent per second
+            concurrency: Maximum number of probes awaiting a reply
+            timeout: Time to wait for each probe's reply in seconds
+            attempts: Number of sends per target before giving up
+        """
+        self.rate = rate
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.attempts = attempts
 
-                # Wait for timeout to collect responses
-                await asyncio.sleep(timeout)
+    async def iter_sweep(
+        self,
+        commands: list[PBusCommand],
+        targets: Iterable[Tuple[str, int]],
+    ) -> AsyncIterator[Tuple[str, int, list[PBusResponse]]]:
+        """
+        Probe every target and yield replies as they arrive.
 
-            finally:
-                transport.close()
+        Args:
+            commands: PBus commands sent to each target
+            targets: Iterable of (host, port) tuples, consumed lazily
 
-        except OSError as err:
-            _LOGGER.error("Failed to broadcast QUATTROCANALI: %s", err)
+        Yields:
+            Tuples of (host, port, response list) for targets that answered
+        """
+        loop = asyncio.get_running_loop()
+        pending: Dict[bytes, asyncio.Future] = {}
+        results: asyncio.Queue = asyncio.Queue()
+        target_iter = iter(targets)
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        next_slot = loop.time()
+        done = object()
 
-        _LOGGER.info("QUATTROCANALI broadcast complete, received %d responses", len(responses_by_host))
-        return responses_by_host
+        def handle_response(data: bytes, addr: Tuple[str, int]):
+            """Resolve the probe matching the reply TAG."""
+            try:
+                tag, responses = PBusPacket.parse_response(data)
+            except ValueError as err:
+                _LOGGER.debug("Invalid sweep reply from %s: %s", addr[0], err)
+                return
+            future = pending.get(tag)
+            if future is not None and not future.done():
+                future.set_result(responses)
+
+        async def send_slot() -> None:
+            """Wait for the next send slot of the rate limiter."""
+            nonlocal next_slot
+            now = loop.time()
+            slot = max(now, next_slot)
+            next_slot = slot + interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+
+        async def worker(transport) -> None:
+            """Probe targets one at a time until the iterator is exhausted."""
+            for host, port in target_iter:
+                for _ in range(self.attempts):
+                    await send_slot()
+                    tag = generate_tag()
+                    while tag in pending:
+                        tag = generate_tag()
+                    future = loop.create_future()
+                    pending[tag] = future
+                    try:
+                        transport.sendto(PBusPacket.build_request(tag, commands), (host, port))
+                        responses = await asyncio.wait_for(future, self.timeout)
+                    except asyncio.TimeoutError:
+                        continue
+                    except OSError as err:
+                        _LOGGER.debug("Sweep send to %s:%d failed: %s", host, port, err)
+                        break
+                    finally:
+                        pending.pop(tag, None)
+                    results.put_nowait((host, port, responses))
+                    break
+
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: UDPProtocol(handle_response),
+            local_addr=('0.0.0.0', 0),
+        )
+
+        workers = [
+            asyncio.create_task(worker(transport))
+            for _ in range(max(1, self.concurrency))
+        ]
+
+        async def watch() -> None:
+            """Signal the consumer once every worker has finished."""
+            await asyncio.gather(*workers, return_exceptions=True)
+            results.put_nowait(done)
+
+        watcher = asyncio.create_task(watch())
+
+        try:
+            while True:
+                item = await results.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            watcher.cancel()
+            await asyncio.gather(*workers, watcher, return_exceptions=True)
+            transport.close()
@@ -2,20 +2,50 @@
 """
 Test script to debug basic PBus write commands.
 
-This tests if we can successfully write to the amplifier at all.
+This tests if we can successfully write to the amplifier at all. Without
+a host argument it runs against an in-process simulated amplifier.
+
+Usage:
+    python test_basic_write.py [HOST] [--port 8002]
 """
+import argparse
 import asyncio
 import sys
-sys.path.insert(0, 'custom_components/powersoft_mezzo')
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "tools"))
+
+from _integration import load_integration  # noqa: E402
+
+load_integration()
+
+from powersoft_mezzo.mezzo_client import MezzoClient  # noqa: E402
+from sim_mezzo import start_simulators  # noqa: E402
 
-from mezzo_client import MezzoClient
 
 async def main():
-    # Replace with your amplifier's IP
-    HOST = input("Enter amplifier IP address: ")
+    parser = argparse.ArgumentParser(description="Debug basic PBus write commands")
+    parser.add_argument("host", nargs="?", help="amplifier IP (default: simulated amplifier)")
+    parser.add_argument("--port", type=int, default=8002)
+    args = parser.parse_args()
+
+    simulators = []
+    HOST, PORT = args.host, args.port
+    if HOST is None:
+        simulators = await start_simulators(1)
+        HOST, PORT = simulators[0].host, simulators[0].port
+        print(f"Using simulated amplifier at {HOST}:{PORT}")
+
+    try:
+        await run_tests(HOST, PORT)
+    finally:
+        for simulator in simulators:
+            simulator.close()
+
 
-    async with MezzoClient(HOST, port=8002, timeout=5.0) as client:
-        print(f"Connected to {HOST}:8002")
+async def run_tests(HOST: str, PORT: int):
+    async with MezzoClient(HOST, port=PORT, timeout=5.0) as client:
+        print(f"Connected to {HOST}:{PORT}")
 
         # Test 1: Read standby state (should work)
         print("\nTest 1: Reading standby state...")
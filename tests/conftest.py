@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the tests.
+
+The tests drive the protocol, transport and client modules against the
+in-process simulated amplifier from tools/sim_mezzo.py. Like the tools,
+they import the integration modules through tools/_integration.py, so
+Home Assistant is not needed.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from _integration import load_integration  # noqa: E402
+
+load_integration()
+
+from powersoft_mezzo.mezzo_client import MezzoClient  # noqa: E402
+from sim_mezzo import start_simulators  # noqa: E402
+
+
+@pytest.fixture
+def amplifier():
+    """
+    Run a scenario against a simulated amplifier and a connected client.
+
+    Call it as amplifier(scenario, **options), where scenario is
+    `async def scenario(client, device)` and options are SimulatedMezzo
+    options (loss, latency, ...) plus the client timeout. Returns what the
+    scenario returns.
+    """
+    def run(scenario, timeout: float = 0.5, **options):
+        async def main():
+            options.setdefault("latency", 0.0)
+            device, = await start_simulators(1, **options)
+            client = MezzoClient(device.host, device.port, timeout=timeout)
+            await client.connect()
+            try:
+                return await scenario(client, device)
+            finally:
+                await client.disconnect()
+                device.close()
+
+        return asyncio.run(main())
+
+    return run
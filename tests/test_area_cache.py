@@ -0,0 +1,46 @@
+"""Tests for CRC-gated polling through the area cache."""
+from powersoft_mezzo import mezzo_memory_map as mm
+from powersoft_mezzo.area_cache import CACHED_AREAS
+from sim_mezzo import MezzoMemory
+
+
+def test_cached_areas_can_be_crc_checked():
+    memory = MezzoMemory()
+    for name, start, end in CACHED_AREAS:
+        area = memory.find(start, end - start)
+        assert area is not None and "c" in area.rights, name
+
+
+def test_cached_poll_matches_direct_poll(amplifier):
+    async def scenario(client, device):
+        direct = await client.get_all_state()
+        client.enable_change_detection()
+        first = await client.get_all_state()
+        reads = client.area_cache.reads
+        second = await client.get_all_state()
+        unchanged_reads = client.area_cache.reads - reads
+
+        device.memory.poke(mm.ADDR_ZONE_ENABLE_CH1, bytes([1, 1, 0, 0]))
+        third = await client.get_all_state()
+        return direct, first, second, unchanged_reads, third, client.area_cache
+
+    direct, first, second, unchanged_reads, third, cache = amplifier(scenario)
+    assert first == direct and second == direct
+    assert unchanged_reads == 0
+    assert cache.reads == len(CACHED_AREAS) + 1  # the zone settings were read again
+    assert third != direct
+
+
+def test_refused_crc_falls_back_to_direct_reads(amplifier):
+    async def scenario(client, device):
+        direct = await client.get_all_state()
+        for area in device.memory.areas:
+            if area.start == mm.ADDR_SOURCE_EQ_START:
+                area.rights = "rw--"
+        client.enable_change_detection()
+        cached = [await client.get_all_state() for _ in range(2)]
+        return direct, cached, client.area_cache.as_dict()
+
+    direct, cached, diagnostics = amplifier(scenario)
+    assert cached == [direct, direct]
+    assert diagnostics["areas"]["source_eq"]["crc"] is None
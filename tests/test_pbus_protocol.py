@@ -0,0 +1,112 @@
+"""Tests for the PBus codec and the Erase and CRC opcodes."""
+import struct
+
+import pytest
+
+from powersoft_mezzo import mezzo_memory_map as mm
+from powersoft_mezzo.pbus_protocol import (
+    OPCODE_CRC,
+    OPCODE_ERASE,
+    OPCODE_READ,
+    OPCODE_WRITE,
+    CrcCommand,
+    EraseCommand,
+    PBusCommand,
+    PBusPacket,
+    PBusResponse,
+    ReadCommand,
+    WriteCommand,
+    calculate_crc16,
+    escape_data,
+)
+from sim_mezzo import ERASED_BYTE, MezzoMemory
+
+# STX, ESC and ETX in the TAG, so it has to be escaped
+TAG = bytes([0x02, 0x1B, 0x03, 0x7F])
+
+
+def test_request_round_trip():
+    commands = [
+        ReadCommand(mm.ADDR_USER_GAIN_CH1, 16),
+        WriteCommand(mm.ADDR_MANUAL_SOURCE_SELECTION, bytes([0x02, 0x03, 0x1B, 0x05])),
+        EraseCommand(mm.ADDR_OEM_SPARE_START, 0x100),
+        CrcCommand(mm.ADDR_USER_EQ_START, 384),
+    ]
+    tag, parsed = PBusPacket.parse_request(PBusPacket.build_request(TAG, commands))
+    assert tag == TAG
+    assert parsed == commands
+
+
+def test_request_with_bad_crc_is_rejected():
+    data = bytes([0x10, 0x20, 0x30, 0x40])
+    packet = PBusPacket.build_request(TAG, [WriteCommand(mm.ADDR_USER_GAIN_CH1, data)])
+    index = packet.index(data) + 1
+    corrupted = packet[:index] + bytes([0x21]) + packet[index + 1:]
+    with pytest.raises(ValueError, match="CRC mismatch"):
+        PBusPacket.parse_request(corrupted)
+
+
+def test_request_with_unknown_opcode_is_rejected():
+    packet = PBusPacket.build_request(TAG, [PBusCommand(ord("X"), 0x4000, 4)])
+    with pytest.raises(ValueError, match="Unknown opcode"):
+        PBusPacket.parse_request(packet)
+
+
+def test_response_round_trip():
+    responses = [
+        PBusResponse(OPCODE_READ, mm.ADDR_USER_GAIN_CH1, 4, bytes([0x02, 0x03, 0x1B, 0x00])),
+        PBusResponse(OPCODE_WRITE, mm.ADDR_MANUAL_SOURCE_SELECTION, 4),
+        PBusResponse(OPCODE_ERASE, mm.ADDR_OEM_SPARE_START, 0x100),
+        PBusResponse(OPCODE_CRC, mm.ADDR_USER_EQ_START, 384, struct.pack("<H", 0xBEEF)),
+        PBusResponse(OPCODE_CRC, 0x00099000, 0),
+    ]
+    tag, parsed = PBusPacket.parse_response(PBusPacket.build_response(TAG, responses))
+    assert tag == TAG
+    assert parsed == responses
+    assert parsed[3].crc == 0xBEEF
+    assert parsed[4].is_nak() and parsed[4].crc is None
+    assert parsed[0].crc is None
+
+
+def test_stamp_request_matches_build_request():
+    commands = [WriteCommand(mm.ADDR_USER_GAIN_CH1, bytes(range(0, 40)))]
+    body = b"".join(command.to_bytes() for command in commands)
+    for tag in (TAG, bytes(4), b"\xff\x1b\x1b\x02"):
+        assert PBusPacket.stamp_request(tag, body, escape_data(body)) == \
+            PBusPacket.build_request(tag, commands)
+
+
+def test_erase_and_crc_follow_area_rights():
+    memory = MezzoMemory()
+    start, size = mm.ADDR_OEM_SPARE_START, 0x40
+    memory.poke(start, bytes(range(size)))
+
+    assert not memory.execute(EraseCommand(start, size)).is_nak()
+    assert memory.peek(start, size) == bytes([ERASED_BYTE]) * size
+    crc = memory.execute(CrcCommand(start, size)).data
+    assert struct.unpack("<H", crc)[0] == calculate_crc16(bytes([ERASED_BYTE]) * size)
+
+    # The User area cannot be erased, and nothing spans the zone block gap
+    assert memory.execute(EraseCommand(mm.ADDR_USER_GAIN_CH1, 4)).is_nak()
+    assert memory.execute(CrcCommand(mm.ADDR_ZONE_SETTINGS_START, 0x200)).is_nak()
+    # The standby trigger is write-only
+    assert memory.execute(ReadCommand(mm.ADDR_STANDBY_TRIGGER, 4)).is_nak()
+
+
+def test_multicommand_runs_left_to_right(amplifier):
+    start, size = mm.ADDR_OEM_SPARE_START, 0x20
+
+    async def scenario(client, device):
+        device.memory.poke(start, bytes(size))
+        return await client.send_commands([
+            EraseCommand(start, size),
+            CrcCommand(start, size),
+            ReadCommand(start, size),
+            EraseCommand(mm.ADDR_USER_GAIN_CH1, 4),
+        ])
+
+    erase, crc, read, refused = amplifier(scenario)
+    assert erase.size == size and erase.data is None
+    assert crc.crc == calculate_crc16(bytes([ERASED_BYTE]) * size)
+    assert read.data == bytes([ERASED_BYTE]) * size
+    assert refused.is_nak()
@@ -0,0 +1,77 @@
+"""Tests for the ramp engine."""
+import asyncio
+
+import pytest
+
+from powersoft_mezzo import mezzo_memory_map as mm
+from powersoft_mezzo.mezzo_memory_map import get_user_gain_address
+from powersoft_mezzo.pbus_protocol import bytes_to_float, float_to_bytes
+from powersoft_mezzo.ramp import MAX_FINAL_ATTEMPTS, RampEngine
+
+ADDR = get_user_gain_address(1)
+
+
+def test_rate_is_checked(amplifier):
+    async def scenario(client, device):
+        with pytest.raises(ValueError):
+            RampEngine(client, rate=5.0)
+
+    amplifier(scenario)
+
+
+def test_ramp_volume_reaches_target(amplifier):
+    async def scenario(client, device):
+        reached = await client.ramp_volume(1, 0.25, 0.1)
+        return reached, bytes_to_float(device.memory.peek(ADDR, 4)), client.ramps
+
+    reached, gain, engine = amplifier(scenario)
+    assert reached is True
+    assert abs(gain - 0.25) < 1e-6
+    assert engine.active == 0 and engine.ticks >= 2
+
+
+def test_retarget_replaces_and_cancel_stops(amplifier):
+    async def scenario(client, device):
+        engine = client.ramps
+        first = engine.ramp(ADDR, 0.0, 1.0, 0.5, float_to_bytes)
+        await asyncio.sleep(0.1)
+        second = engine.ramp(ADDR, 0.0, 0.5, 0.05, float_to_bytes)
+        replaced, reached = await first, await second
+
+        third = engine.ramp(ADDR, 0.5, 1.0, 5.0, float_to_bytes)
+        await asyncio.sleep(0.1)
+        engine.cancel()
+        cancelled = await third
+        await engine.stop()
+        return replaced, reached, cancelled, bytes_to_float(device.memory.peek(ADDR, 4)), engine
+
+    replaced, reached, cancelled, gain, engine = amplifier(scenario)
+    assert replaced is False
+    assert reached is True
+    assert cancelled is False
+    assert 0.5 <= gain < 0.6  # stopped where it was
+    assert engine.active == 0
+
+
+def test_unanswered_target_fails_the_ramp(amplifier):
+    async def scenario(client, device):
+        device.loss = 1.0
+        with pytest.raises(TimeoutError):
+            await client.ramps.ramp(ADDR, 0.0, 1.0, 0.0, float_to_bytes)
+        return client.ramps
+
+    engine = amplifier(scenario)
+    assert engine.active == 0
+    assert engine.missed == MAX_FINAL_ATTEMPTS
+
+
+def test_refused_target_fails_the_ramp(amplifier):
+    async def scenario(client, device):
+        # The readings area is read-only, so every write is NAKed
+        with pytest.raises(ValueError):
+            await client.ramps.ramp(mm.ADDR_TEMP_TRANSFORMER, 0.0, 1.0, 0.0, float_to_bytes)
+        return client.ramps
+
+    engine = amplifier(scenario)
+    assert engine.active == 0
+    assert engine.ticks == MAX_FINAL_ATTEMPTS
@@ -0,0 +1,93 @@
+"""Tests for the register image and the differential scene apply."""
+from powersoft_mezzo import mezzo_memory_map as mm
+from powersoft_mezzo.mezzo_memory_map import get_user_gain_address, get_user_mute_address
+from powersoft_mezzo.pbus_protocol import (
+    OPCODE_READ,
+    OPCODE_WRITE,
+    PBusResponse,
+    ReadCommand,
+    WriteCommand,
+    bytes_to_float,
+    float_to_bytes,
+    uint32_to_bytes,
+)
+from powersoft_mezzo.register_image import RegisterImage, merge_writes
+
+SCENE = {
+    "name": "Test",
+    "volumes": [0.8, 0.6, 0.5, 0.4],
+    "mutes": [False, True, False, False],
+    "sources": [1, 3, 5, 7],
+}
+
+
+def ack(command):
+    """Acknowledgement of a write."""
+    return PBusResponse(OPCODE_WRITE, command.address, command.size)
+
+
+def test_track_stores_reads_and_acknowledged_writes():
+    image = RegisterImage()
+    read = ReadCommand(mm.ADDR_USER_GAIN_CH1, 8)
+    image.track([read], [PBusResponse(OPCODE_READ, read.address, 8, bytes(range(8)))])
+    assert image.lookup(mm.ADDR_USER_GAIN_CH1, 8) == bytes(range(8))
+
+    write = WriteCommand(mm.ADDR_USER_GAIN_CH1, b"\xaa\xbb\xcc\xdd")
+    image.track([write], [ack(write)])
+    assert image.lookup(mm.ADDR_USER_GAIN_CH1, 8) == b"\xaa\xbb\xcc\xdd" + bytes(range(4, 8))
+
+    # A NAKed or unanswered write leaves the range unknown
+    image.track([write], [PBusResponse(OPCODE_WRITE, write.address, 0)])
+    assert image.lookup(mm.ADDR_USER_GAIN_CH1, 4) is None
+    assert image.lookup(mm.ADDR_USER_GAIN_CH1 + 4, 4) == bytes(range(4, 8))
+
+
+def test_trigger_updates_the_state_register():
+    image = RegisterImage()
+    trigger = WriteCommand(mm.ADDR_STANDBY_TRIGGER, uint32_to_bytes(1))
+    image.track([trigger], [ack(trigger)])
+    assert image.lookup(mm.ADDR_STANDBY_STATE, 4) == uint32_to_bytes(1)
+    assert not image.changed(trigger)
+
+
+def test_diff_drops_unchanged_and_merges_adjacent_writes():
+    image = RegisterImage()
+    known = [WriteCommand(get_user_gain_address(ch), float_to_bytes(0.5)) for ch in (1, 2, 3, 4)]
+    image.track(known, [ack(command) for command in known])
+
+    trigger = WriteCommand(mm.ADDR_STANDBY_TRIGGER, uint32_to_bytes(0))
+    commands = [
+        trigger,
+        WriteCommand(get_user_gain_address(2), float_to_bytes(0.5)),  # unchanged
+        WriteCommand(get_user_gain_address(4), float_to_bytes(0.7)),
+        WriteCommand(get_user_gain_address(3), float_to_bytes(0.6)),
+    ]
+    result = image.diff(commands)
+    assert result == [
+        WriteCommand(get_user_gain_address(3), float_to_bytes(0.6) + float_to_bytes(0.7)),
+        trigger,  # triggers go last and are never merged
+    ]
+
+
+def test_merge_writes_keeps_separate_ranges_apart():
+    first = WriteCommand(0x4000, b"\x01")
+    second = WriteCommand(0x4002, b"\x02")
+    assert merge_writes([second, first]) == [first, second]
+
+
+def test_differential_apply_sends_only_changes(amplifier):
+    async def scenario(client, device):
+        await client.get_all_state()
+        full = await client.apply_scene(SCENE, diff=True)
+        again = await client.apply_scene(SCENE, diff=True)
+        changed = await client.apply_scene({**SCENE, "volumes": [0.8, 0.6, 0.5, 0.3]}, diff=True)
+        gain = bytes_to_float(device.memory.peek(get_user_gain_address(4), 4))
+        mute = device.memory.peek(get_user_mute_address(2), 1)
+        return full, again, changed, gain, mute
+
+    full, again, changed, gain, mute = amplifier(scenario)
+    assert 0 < full.commands_sent <= full.commands
+    assert again.commands_sent == 0
+    assert changed.commands_sent == 1
+    assert abs(gain - 0.3) < 1e-6
+    assert mute != b"\x00"
@@ -0,0 +1,34 @@
+"""Tests for precompiled scene frames."""
+from powersoft_mezzo.mezzo_memory_map import get_user_gain_address
+from powersoft_mezzo.packet_trace import DIRECTION_OUT
+from powersoft_mezzo.pbus_protocol import PBusPacket, bytes_to_float
+from powersoft_mezzo.scene_frames import SceneFrameCache
+
+SCENE = {
+    "id": 1,
+    "name": "Test",
+    "volumes": [0.8, 0.6, 0.5, 0.4],
+    "mutes": [False, False, True, False],
+    "sources": [1, 3, 5, 7],
+}
+
+
+def test_frames_are_sent_with_a_fresh_tag(amplifier):
+    async def scenario(client, device):
+        cache = SceneFrameCache()
+        cache.set_context(await client.read_scene_context())
+        frame = cache.get(SCENE)
+
+        tag, commands = PBusPacket.parse_request(frame.stamp(b"\x02\x03\x1b\x00"))
+        assert tag == b"\x02\x03\x1b\x00" and commands == list(frame.commands)
+
+        trace = client.start_trace()
+        for _ in range(3):
+            await client.apply_scene_frame(frame)
+        tags = [record.tag for record in trace.records if record.direction == DIRECTION_OUT]
+        return frame, cache, tags, bytes_to_float(device.memory.peek(get_user_gain_address(1), 4))
+
+    frame, cache, tags, gain = amplifier(scenario)
+    assert len(tags) == 3 and len(set(tags)) == 3
+    assert cache.get(SCENE) is frame  # still cached
+    assert abs(gain - 0.8) < 1e-6
@@ -0,0 +1,97 @@
+"""Tests for configuration snapshots: file format, CRC diff and restore."""
+import random
+
+import pytest
+
+from powersoft_mezzo import mezzo_memory_map as mm
+from powersoft_mezzo.pbus_protocol import uint32_to_bytes
+from powersoft_mezzo.snapshot import (
+    SNAPSHOT_AREAS,
+    ConfigSnapshot,
+    SnapshotArea,
+    SnapshotEngine,
+)
+from sim_mezzo import MezzoMemory
+
+
+def fill_areas(device, seed: int = 1) -> None:
+    """Write random data into every snapshot area of a simulator."""
+    rng = random.Random(seed)
+    for _, start, end in SNAPSHOT_AREAS:
+        device.memory.poke(start, rng.randbytes(end - start))
+
+
+def test_file_round_trip(tmp_path):
+    snapshot = ConfigSnapshot(
+        [SnapshotArea("user", 0x4000, bytes(range(200))), SnapshotArea("power", 0xA004, b"\x01" * 8)],
+        created=1700000000,
+    )
+    path = tmp_path / "amp.mzsnap"
+    snapshot.save(str(path))
+    loaded = ConfigSnapshot.load(str(path))
+    assert loaded == snapshot
+
+    data = bytearray(snapshot.to_bytes())
+    data[data.index(bytes(range(200))) + 10] ^= 0xFF
+    with pytest.raises(ValueError, match="CRC"):
+        ConfigSnapshot.from_bytes(bytes(data))
+
+
+def test_areas_lie_in_one_pbus_area_and_skip_triggers():
+    memory = MezzoMemory()
+    for name, start, end in SNAPSHOT_AREAS:
+        area = memory.find(start, end - start)
+        assert area is not None and "c" in area.rights and "w" in area.rights, name
+        assert not start <= mm.ADDR_STANDBY_TRIGGER < end, name
+
+
+def test_restore_writes_only_changed_areas(amplifier):
+    async def scenario(client, device):
+        fill_areas(device)
+        engine = SnapshotEngine(client)
+        snapshot = await engine.capture()
+        assert await engine.diff(snapshot) == []
+
+        for address in (mm.ADDR_USER_GAIN_CH1, mm.ADDR_SOURCE_EQ_START + 10):
+            device.memory.poke(address, bytes([device.memory.peek(address, 1)[0] ^ 0xFF]))
+        changed = [area.name for area in await engine.diff(snapshot)]
+
+        result = await engine.restore(snapshot)
+        matches = all(
+            device.memory.peek(area.address, area.size) == area.data for area in snapshot.areas
+        )
+        again = await engine.restore(snapshot)
+        return changed, result, matches, again
+
+    changed, result, matches, again = amplifier(scenario)
+    assert sorted(changed) == ["source_eq", "user"]
+    assert sorted(result.written) == ["source_eq", "user"]
+    assert result.checked == len(SNAPSHOT_AREAS)
+    assert matches
+    assert again.written == [] and again.bytes_written == 0
+
+
+def test_restore_does_not_touch_standby(amplifier):
+    async def scenario(client, device):
+        fill_areas(device)
+        engine = SnapshotEngine(client, window=4)
+        snapshot = await engine.capture()
+        device.memory.poke(mm.ADDR_AUTO_TURN_ON_ENABLE, uint32_to_bytes(7))
+        device.memory.poke(mm.ADDR_STANDBY_STATE, uint32_to_bytes(1))
+        result = await engine.restore(snapshot)
+        return result, device.memory.peek(mm.ADDR_STANDBY_STATE, 4)
+
+    result, standby = amplifier(scenario)
+    assert result.written == ["power"]
+    assert standby == uint32_to_bytes(1)
+
+
+def test_capture_retries_lost_requests(amplifier):
+    async def scenario(client, device):
+        fill_areas(device, seed=2)
+        snapshot = await SnapshotEngine(client, retries=10, timeout=0.05).capture()
+        return snapshot, device
+
+    snapshot, device = amplifier(scenario, loss=0.1, seed=3)
+    for area in snapshot.areas:
+        assert device.memory.peek(area.address, area.size) == area.data
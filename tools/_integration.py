@@ -0,0 +1,27 @@
+"""
+Import helper for the development tools.
+
+The integration package's __init__ imports Home Assistant. The protocol,
+transport and client modules do not, so the tools register the integration
+directory as a bare package and import those modules directly.
+"""
+import sys
+import types
+from pathlib import Path
+
+PACKAGE = "powersoft_mezzo"
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / PACKAGE
+
+
+def load_integration() -> str:
+    """
+    Make the integration modules importable as `powersoft_mezzo.<module>`.
+
+    Returns:
+        The package name to import from
+    """
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules[PACKAGE] = package
+    return PACKAGE
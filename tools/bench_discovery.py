@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark amplifier discovery against a simulated subnet.
+
+A set of fake Mezzo and QUATTROCANALI devices is bound to loopback
+addresses (127.0.0.10, 127.0.0.11, ...). Each device answers the discovery
+request after a random latency and may drop packets; QUATTROCANALI devices
+also answer the unicast INFO/STANDBY identification. The benchmark reports
+the time to the first device and the time until discovery completes.
+
+Usage:
+    python tools/bench_discovery.py --mezzo 20 --quattro 5 --loss 0.1
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import struct
+import time
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.pbus_protocol import (  # noqa: E402
+    OPCODE_READ,
+    PBusPacket,
+    PBusResponse,
+    unescape_data,
+)
+from powersoft_mezzo.mezzo_client import iter_discover_amplifiers  # noqa: E402
+from bench_quattro import SimulatedQuattro  # noqa: E402
+
+
+class _Responder(asyncio.DatagramProtocol):
+    """Receives discovery requests on behalf of the simulated subnet."""
+
+    def __init__(self, on_request):
+        self.on_request = on_request
+
+    def datagram_received(self, data, addr):
+        self.on_request(data, addr)
+
+
+class SimulatedSubnet:
+    """Fake devices answering discovery from distinct loopback addresses."""
+
+    def __init__(self, mezzo: int, quattro: int, latency: tuple, loss: float, seed: int):
+        """
+        Initialize the subnet.
+
+        Args:
+            mezzo: Number of Mezzo devices
+            quattro: Number of QUATTROCANALI devices
+            latency: (min, max) reply latency in seconds
+            loss: Probability that a request or reply is dropped
+            seed: Random seed
+        """
+        self.mezzo = mezzo
+        self.quattro = quattro
+        self.latency = latency
+        self.loss = loss
+        self._random = random.Random(seed)
+        self._senders = []
+        self._quattros = []
+        self._listeners = []
+        self._timers = []
+        self.mezzo_port = 0
+        self.quattro_port = 0
+
+    async def start(self) -> None:
+        """Bind the listeners and one reply socket per device."""
+        loop = asyncio.get_running_loop()
+
+        mezzo, _ = await loop.create_datagram_endpoint(
+            lambda: _Responder(self._on_mezzo_request), local_addr=("127.0.0.1", 0)
+        )
+        quattro, _ = await loop.create_datagram_endpoint(
+            lambda: _Responder(self._on_quattro_request), local_addr=("127.0.0.1", 0)
+        )
+        self._listeners = [mezzo, quattro]
+        self.mezzo_port = mezzo.get_extra_info("sockname")[1]
+        self.quattro_port = quattro.get_extra_info("sockname")[1]
+
+        for index in range(self.mezzo):
+            transport, _ = await loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol, local_addr=(f"127.0.0.{10 + index}", 0)
+            )
+            self._senders.append(transport)
+
+        # QUATTROCANALI devices listen on the scan port for unicast identification
+        for index in range(self.quattro):
+            device = SimulatedQuattro(f"SIMQ{index:04d}", self.latency, self.loss,
+                                      self._random.randrange(1 << 30))
+            await loop.create_datagram_endpoint(
+                lambda: device,
+                local_addr=(f"127.0.0.{10 + self.mezzo + index}", self.quattro_port),
+            )
+            self._quattros.append(device)
+
+    def close(self) -> None:
+        """Cancel pending replies and close all sockets."""
+        for timer in self._timers:
+            timer.cancel()
+        for transport in self._senders + self._listeners:
+            transport.close()
+        for device in self._quattros:
+            device.close()
+
+    def _schedule(self, sender, reply: bytes, addr) -> None:
+        """Send a reply after a random delay unless it is lost."""
+        if self._random.random() < self.loss:
+            return
+        delay = self._random.uniform(*self.latency)
+        self._timers.append(
+            asyncio.get_running_loop().call_later(delay, sender.sendto, reply, addr)
+        )
+
+    def _on_mezzo_request(self, data: bytes, addr) -> None:
+        """Answer an identification multicommand from every Mezzo device."""
+        # Requests carry no MZO header: the TAG is the first unescaped field
+        tag = unescape_data(data[1:-1])[:4]
+        for index in range(self.mezzo):
+            responses = [
+                PBusResponse(OPCODE_READ, 0, 4, struct.pack('<I', 0)),
+                PBusResponse(OPCODE_READ, 0, 20, b"Mezzo 602 AD".ljust(20, b"\x00")),
+                PBusResponse(OPCODE_READ, 0, 16, f"SIM{index:05d}".encode().ljust(16, b"\x00")),
+                PBusResponse(OPCODE_READ, 0, 20, b"1.0.0".ljust(20, b"\x00")),
+            ]
+            self._schedule(self._senders[index], PBusPacket.build_response(tag, responses), addr)
+
+    def _on_quattro_request(self, data: bytes, addr) -> None:
+        """Deliver a broadcast PING to every QUATTROCANALI device."""
+        for device in self._quattros:
+            device.datagram_received(data, addr)
+
+
+async def run_once(args, seed: int, expected) -> dict:
+    """Run one discovery against a fresh subnet and time it."""
+    subnet = SimulatedSubnet(args.mezzo, args.quattro, (args.min_latency, args.max_latency),
+                             args.loss, seed)
+    await subnet.start()
+    try:
+        start = time.perf_counter()
+        first = None
+        found = 0
+        async for _ in iter_discover_amplifiers(
+            timeout=args.timeout,
+            idle_timeout=args.idle_timeout,
+            expected=expected,
+            repeats=args.repeats,
+            repeat_interval=args.repeat_interval,
+            broadcast_address="127.0.0.1",
+            mezzo_port=subnet.mezzo_port,
+            quattro_port=subnet.quattro_port,
+        ):
+            if first is None:
+                first = time.perf_counter() - start
+            found += 1
+        return {"first": first, "complete": time.perf_counter() - start, "found": found}
+    finally:
+        subnet.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mezzo", type=int, default=10, help="simulated Mezzo devices")
+    parser.add_argument("--quattro", type=int, default=4, help="simulated QUATTROCANALI devices")
+    parser.add_argument("--min-latency", type=float, default=0.002)
+    parser.add_argument("--max-latency", type=float, default=0.150)
+    parser.add_argument("--loss", type=float, default=0.05, help="packet loss probability")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--idle-timeout", type=float, default=1.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--repeat-interval", type=float, default=0.3)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    total = args.mezzo + args.quattro
+    results = {}
+    for label, expected in (("idle-gap", None), ("expected-count", total)):
+        runs = [await run_once(args, seed, expected) for seed in range(args.runs)]
+        firsts = [r["first"] for r in runs if r["first"] is not None]
+        results[label] = {
+            "time_to_first_s": statistics.median(firsts) if firsts else None,
+            "time_to_complete_s": statistics.median(r["complete"] for r in runs),
+            "found_min": min(r["found"] for r in runs),
+            "devices": total,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Simulated subnet: {args.mezzo} Mezzo + {args.quattro} QUATTROCANALI, "
+          f"loss {args.loss:.0%}, {args.runs} runs (medians)")
+    print(f"Sequential scan before this change: {2 * args.timeout:.1f}s fixed")
+    for label, r in results.items():
+        first = f"{r['time_to_first_s'] * 1000:.1f} ms" if r["time_to_first_s"] is not None else "n/a"
+        print(f"  {label:15s} first device {first:>10s}   complete "
+              f"{r['time_to_complete_s']:.2f} s   found {r['found_min']}/{r['devices']} (worst run)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
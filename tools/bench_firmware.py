@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark firmware transfers to a simulated Mezzo amplifier.
+
+Writes a random image with FirmwareUploader at several window sizes and
+reports the sustained transfer rate, retransmitted chunks and CRC
+mismatches, then checks the simulated flash against the image.
+--corrupt makes the simulator silently store a damaged copy of some
+acknowledged chunks to exercise CRC-driven repair.
+
+Usage:
+    python tools/bench_firmware.py --size 1048576 --windows 1 4 8 16
+    python tools/bench_firmware.py --loss 0.02 --corrupt 0.01
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.firmware import FIRMWARE_CHUNK_SIZE, FirmwareUploader  # noqa: E402
+from powersoft_mezzo.mezzo_client import MezzoClient  # noqa: E402
+from powersoft_mezzo.mezzo_memory_map import ADDR_FIRMWARE_START  # noqa: E402
+from powersoft_mezzo.pbus_protocol import OPCODE_WRITE  # noqa: E402
+from sim_mezzo import start_simulators  # noqa: E402
+
+
+def corrupt_writes(device, probability: float, seed: int) -> None:
+    """Make the simulator flip a byte in some writes while still ACKing them."""
+    rng = random.Random(seed)
+    execute = device.memory.execute
+
+    def flaky_execute(command):
+        response = execute(command)
+        if command.opcode == OPCODE_WRITE and response.size and rng.random() < probability:
+            device.memory.poke(command.address, bytes([command.data[0] ^ 0xFF]))
+        return response
+
+    device.memory.execute = flaky_execute
+
+
+async def run(args, window: int, path: str, image: bytes) -> dict:
+    """Upload the image once and verify the simulated flash."""
+    device = (await start_simulators(1, latency=args.latency, jitter=args.jitter,
+                                     loss=args.loss, seed=window))[0]
+    if args.corrupt:
+        corrupt_writes(device, args.corrupt, window)
+    client = MezzoClient(device.host, device.port, timeout=args.timeout)
+    await client.connect()
+    try:
+        uploader = FirmwareUploader(client, chunk_size=args.chunk, window=window)
+        result = await uploader.upload(path)
+    finally:
+        await client.disconnect()
+        device.close()
+    flashed = device.memory.peek(ADDR_FIRMWARE_START, len(image))
+    return {"result": result, "verified": flashed == image, "requests": client.metrics.requests}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=1 << 20, help="image size in bytes")
+    parser.add_argument("--chunk", type=int, default=FIRMWARE_CHUNK_SIZE)
+    parser.add_argument("--windows", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--latency", type=float, default=0.001, help="simulated device latency")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0, help="packet loss probability")
+    parser.add_argument("--corrupt", type=float, default=0.0,
+                        help="probability that an acknowledged write is stored damaged")
+    parser.add_argument("--timeout", type=float, default=0.2, help="per-request timeout")
+    args = parser.parse_args()
+
+    image = random.Random(0).randbytes(args.size)
+    with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as file:
+        file.write(image)
+        path = file.name
+
+    print(f"{args.size} byte image, {args.chunk} byte chunks, latency {args.latency * 1000:.1f} ms, "
+          f"loss {args.loss:.0%}, corrupt {args.corrupt:.1%}")
+    print(f"  {'window':>6s} {'KiB/s':>9s} {'seconds':>8s} {'requests':>9s} {'resent':>7s} "
+          f"{'crc miss':>8s}  flash")
+    try:
+        for window in args.windows:
+            outcome = await run(args, window, path, image)
+            result = outcome["result"]
+            print(f"  {window:>6d} {result.rate / 1024:>9.1f} {result.elapsed:>8.2f} "
+                  f"{outcome['requests']:>9d} {result.retransmitted:>7d} {result.crc_mismatches:>8d}  "
+                  f"{'ok' if outcome['verified'] else 'MISMATCH'}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark QUATTROCANALI polling against a simulated amplifier.
+
+A fake QUATTROCANALI device on a loopback address answers PING, INFO,
+STANDBY, READGM, READALARMS, READALLALARMS2, SOURCEMETER, OUTPUTMETER,
+LOADPRESET2 and the output gain/mute writes (single and WRITEMULTI), after
+a random latency and with optional packet loss. The benchmark compares a
+full state poll with all requests in flight at once (cookie matched)
+against the same requests sent one at a time, and a scene apply (every
+gain and mute write in flight at once) against the writes sent one at a
+time.
+
+Usage:
+    python tools/bench_quattro.py --loss 0.05 --polls 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import struct
+import time
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.quattro_protocol import (  # noqa: E402
+    ANSWER_FLAG,
+    CMD_PING,
+    CMD_INFO,
+    CMD_STANDBY,
+    CMD_READGM,
+    CMD_READALARMS,
+    CMD_READALLALARMS2,
+    CMD_WRITE_OUT_GAIN,
+    CMD_WRITE_OUT_MUTE,
+    CMD_SOURCEMETER,
+    CMD_OUTPUTMETER,
+    CMD_WRITEMULTI,
+    CMD_LOADPRESET2,
+    STANDBY_READ,
+    STANDBY_OFF,
+    STANDBY_ON,
+    STANDBY_ANSWER_OPERATIVE,
+    STANDBY_ANSWER_STANDBY,
+    QuattroCommand,
+    QuattroResponse,
+)
+from powersoft_mezzo.quattro_client import QuattroClient, NUM_CHANNELS  # noqa: E402
+
+
+class SimulatedQuattro(asyncio.DatagramProtocol):
+    """Fake QUATTROCANALI amplifier answering on one UDP socket."""
+
+    def __init__(self, serial: str = "SIMQ0001", latency: tuple = (0.001, 0.010),
+                 loss: float = 0.0, seed: int = 0):
+        """
+        Initialize the device.
+
+        Args:
+            serial: Serial number reported by INFO
+            latency: (min, max) answer latency in seconds
+            loss: Probability that a request or answer is dropped
+            seed: Random seed
+        """
+        self.serial = serial
+        self.latency = latency
+        self.loss = loss
+        self.standby = False
+        self.out_gains = [0, -600, -1200, -6000]
+        self.out_mutes = [0, 0, 1, 0]
+        self.preset = None
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._timers = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def close(self) -> None:
+        """Cancel pending answers and close the socket."""
+        for timer in self._timers:
+            timer.cancel()
+        if self.transport:
+            self.transport.close()
+
+    def answer(self, cmd: int, data: bytes) -> bytes:
+        """Build the answer payload for a request."""
+        if cmd == CMD_PING:
+            return b""
+        if cmd == CMD_INFO:
+            fields = (b"Powersoft", b"Quattrocanali", b"Quattrocanali 4804 DSP+D", self.serial.encode())
+            return b"".join(f.ljust(32, b"\x00") for f in fields)
+        if cmd == CMD_STANDBY:
+            action = struct.unpack_from("<I", data)[0] if len(data) >= 4 else STANDBY_READ
+            if action in (STANDBY_OFF, STANDBY_ON):
+                self.standby = action == STANDBY_ON
+            return bytes([1, STANDBY_ANSWER_STANDBY if self.standby else STANDBY_ANSWER_OPERATIVE])
+        if cmd == CMD_READGM:
+            return (bytes([1, NUM_CHANNELS])
+                    + struct.pack(f"<{NUM_CHANNELS}i", *[0] * NUM_CHANNELS)
+                    + struct.pack(f"<{NUM_CHANNELS}i", *self.out_gains)
+                    + bytes(NUM_CHANNELS) + bytes(self.out_mutes))
+        if cmd == CMD_READALARMS:
+            channel = data[0]
+            return struct.pack("<BBBBHBBHBBHBBB", 1, channel, 1, 1, 20, 0, 0, 0, 1, 1, 80, 0, 0, 0)
+        if cmd == CMD_READALLALARMS2:
+            return struct.pack(f"<BBI{NUM_CHANNELS}I", 1, 0, 0, *[0] * NUM_CHANNELS)
+        if cmd == CMD_SOURCEMETER:
+            # Signal on slot 1 of every input, clip on input 1 now and then
+            clip = 0x02 if self._random.random() < 0.05 else 0
+            return bytes([1] + [0x01 | (clip if x == 0 else 0) for x in range(NUM_CHANNELS)])
+        if cmd == CMD_OUTPUTMETER:
+            rms = [self._random.randrange(0, 400) for _ in range(NUM_CHANNELS)]
+            headroom = [1500 - r * 3 for r in rms]
+            return struct.pack(f"<B{NUM_CHANNELS}H{NUM_CHANNELS}hB", 1, *rms, *headroom, 0x0F)
+        if cmd == CMD_WRITE_OUT_GAIN:
+            channel, gain = struct.unpack_from("<Bi", data)
+            self.out_gains[channel] = gain
+            return b"\x01" + data
+        if cmd == CMD_WRITE_OUT_MUTE:
+            channel, muted = struct.unpack_from("<BB", data)
+            self.out_mutes[channel] = muted
+            return b"\x01" + data
+        if cmd == CMD_WRITEMULTI:
+            # Same values on every masked channel (input gain/mute not simulated)
+            mask, _, out_gain, _, out_mute = struct.unpack_from("<BiiBB", data)
+            for ch in range(NUM_CHANNELS):
+                if mask & (1 << ch):
+                    self.out_gains[ch] = out_gain
+                    self.out_mutes[ch] = out_mute
+            return b"\x01" + data
+        if cmd == CMD_LOADPRESET2:
+            self.preset = data[0]
+            self.out_gains = [-300 * (self.preset % 4)] * NUM_CHANNELS
+            self.out_mutes = [0] * NUM_CHANNELS
+            return b"\x01" + data
+        return b"\x00"
+
+    def datagram_received(self, data, addr):
+        request = QuattroResponse.parse_packet(data)
+        if request is None or self._random.random() < self.loss:
+            return
+        self.requests += 1
+        # Answer to answer_port, like the real device (0 means port 1234)
+        answer_port = struct.unpack_from("<H", data, 4)[0] or 1234
+        reply = QuattroCommand(
+            cmd=request.cmd | ANSWER_FLAG,
+            data=self.answer(request.cmd, request.data),
+            cookie=request.cookie,
+        ).build_packet()
+        if self._random.random() < self.loss:
+            return
+        delay = self._random.uniform(*self.latency)
+        self._timers.append(asyncio.get_running_loop().call_later(
+            delay, self.transport.sendto, reply, (addr[0], answer_port)
+        ))
+
+
+async def sequential_poll(client: QuattroClient) -> None:
+    """Issue the same requests as get_all_state, one at a time."""
+    await client.get_standby_state()
+    await client.read_gains_mutes()
+    await client.read_all_alarms()
+    for channel in range(1, NUM_CHANNELS + 1):
+        await client.read_alarms(channel)
+
+
+async def sequential_scene(client: QuattroClient, scene: dict) -> None:
+    """Apply a scene with one write per gain and mute, one at a time."""
+    for ch in range(1, NUM_CHANNELS + 1):
+        await client.set_volume(ch, scene["volumes"][ch - 1])
+        await client.set_mute(ch, scene["mutes"][ch - 1])
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--min-latency", type=float, default=0.002)
+    parser.add_argument("--max-latency", type=float, default=0.020)
+    parser.add_argument("--loss", type=float, default=0.02, help="packet loss probability")
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    loop = asyncio.get_running_loop()
+    device = SimulatedQuattro(latency=(args.min_latency, args.max_latency), loss=args.loss)
+    await loop.create_datagram_endpoint(lambda: device, local_addr=("127.0.0.20", 0))
+    port = device.transport.get_extra_info("sockname")[1]
+
+    client = QuattroClient("127.0.0.20", port, timeout=args.timeout)
+    await client.connect()
+    results = {}
+    try:
+        scene = {"volumes": [0.8, 0.5, 0.25, 0.0], "mutes": [False, True, False, True]}
+        runs = (
+            ("pipelined", client.get_all_state),
+            ("sequential", lambda: sequential_poll(client)),
+            ("scene", lambda: client.apply_scene(scene)),
+            ("scene-seq", lambda: sequential_scene(client, scene)),
+        )
+        for label, poll in runs:
+            requests_before = device.requests
+            times, failures = [], 0
+            for _ in range(args.polls):
+                start = time.perf_counter()
+                try:
+                    await poll()
+                except (TimeoutError, ValueError):
+                    failures += 1
+                    continue
+                times.append(time.perf_counter() - start)
+            times.sort()
+            results[label] = {
+                "p50_ms": statistics.median(times) * 1000 if times else None,
+                "p95_ms": times[int(0.95 * (len(times) - 1))] * 1000 if times else None,
+                "failures": failures,
+                "polls": args.polls,
+                "requests_per_poll": (device.requests - requests_before) / args.polls,
+            }
+    finally:
+        await client.disconnect()
+        device.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Simulated QUATTROCANALI: {args.min_latency * 1000:.0f}-{args.max_latency * 1000:.0f} ms "
+          f"latency, loss {args.loss:.0%}, {args.polls} runs each")
+    for label, r in results.items():
+        if r["p50_ms"] is None:
+            print(f"  {label:11s} all polls failed")
+            continue
+        print(f"  {label:11s} p50 {r['p50_ms']:7.1f} ms   p95 {r['p95_ms']:7.1f} ms   "
+              f"failed {r['failures']}/{r['polls']}   {r['requests_per_poll']:.1f} requests/run")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark the QUATTROCANALI packet codec.
+
+Compares the original bit-loop CRC16/ARC with copying parse against the
+table-driven CRC and memoryview parse, for 0, 128 and 1024 byte payloads.
+Both codecs are checked to produce identical packets and payloads first.
+
+Usage:
+    python tools/bench_quattro_codec.py --seconds 0.5
+"""
+import argparse
+import json
+import struct
+import time
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.quattro_protocol import (  # noqa: E402
+    STX,
+    ETX,
+    QuattroCommand,
+    QuattroResponse,
+    crc16_arc,
+)
+
+
+# ----------------------------------------------------------------------------
+# Reference codec (the implementation before the table-driven CRC)
+# ----------------------------------------------------------------------------
+
+def reference_crc16_arc(data: bytes) -> int:
+    """Bit-by-bit CRC16/ARC."""
+    crc = 0x0000
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+    return crc & 0xFFFF
+
+
+def reference_build(cmd: int, data: bytes, cookie: int) -> bytes:
+    """Build a packet with repeated concatenation."""
+    packet = struct.pack('<BBHHH', STX, cmd, cookie, 0, len(data))
+    packet += data
+    packet += struct.pack('<HBB', reference_crc16_arc(data), (255 - cmd) & 0xFF, ETX)
+    return packet
+
+
+def reference_parse(packet: bytes):
+    """Parse a packet, copying the payload."""
+    if len(packet) < 12 or packet[0] != STX or packet[-1] != ETX:
+        return None
+    cmd, cookie, _, count = struct.unpack_from('<BHHH', packet, 1)
+    data_end = 8 + count
+    if data_end + 3 > len(packet):
+        return None
+    data = packet[8:data_end]
+    if struct.unpack_from('<H', packet, data_end)[0] != reference_crc16_arc(data):
+        return None
+    if packet[data_end + 2] != (255 - cmd) & 0xFF:
+        return None
+    return QuattroResponse(cmd=cmd, cookie=cookie, data=data)
+
+
+# ----------------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------------
+
+def rate(func, seconds: float) -> float:
+    """Call func repeatedly for about `seconds` and return calls per second."""
+    calls = 0
+    batch = 16
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            func()
+        calls += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return calls / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=0.5, help="time per measurement")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 128, 1024])
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    assert crc16_arc(b"123456789") == reference_crc16_arc(b"123456789") == 0xBB3D
+
+    results = {}
+    for size in args.sizes:
+        payload = bytes((i * 37 + 11) & 0xFF for i in range(size))
+        command = QuattroCommand(cmd=0x9C, data=payload, cookie=0x1234)
+        packet = command.build_packet()
+
+        # Both codecs must agree before timing them
+        assert packet == reference_build(0x9C, payload, 0x1234)
+        parsed = QuattroResponse.parse_packet(packet)
+        assert parsed is not None and bytes(parsed.data) == reference_parse(packet).data
+
+        results[size] = {
+            "build_before": rate(lambda: reference_build(0x9C, payload, 0x1234), args.seconds),
+            "build_after": rate(command.build_packet, args.seconds),
+            "parse_before": rate(lambda: reference_parse(packet), args.seconds),
+            "parse_after": rate(lambda: QuattroResponse.parse_packet(packet), args.seconds),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("QUATTROCANALI codec throughput (packets/s)")
+    print(f"  {'payload':>8s}  {'build before':>13s}  {'build after':>12s}  "
+          f"{'parse before':>13s}  {'parse after':>12s}  {'speedup':>8s}")
+    for size, r in results.items():
+        speedup = r["parse_after"] / r["parse_before"]
+        print(f"  {size:>7d}B  {r['build_before']:>13,.0f}  {r['build_after']:>12,.0f}  "
+              f"{r['parse_before']:>13,.0f}  {r['parse_after']:>12,.0f}  {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
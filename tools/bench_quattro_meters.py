@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark QUATTROCANALI meter streaming across a rack of simulated devices.
+
+Each simulated amplifier is streamed by its own QuattroMeterStreamer at
+the requested rate while a probe task measures event-loop lag (how late
+a 5 ms sleep wakes up). The benchmark reports achieved frame rates,
+missed frames, overruns and loop lag percentiles.
+
+Usage:
+    python tools/bench_quattro_meters.py --devices 10 --rate 20 --seconds 10
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.quattro_client import QuattroClient  # noqa: E402
+from powersoft_mezzo.quattro_meters import QuattroMeterStreamer  # noqa: E402
+from bench_quattro import SimulatedQuattro  # noqa: E402
+
+
+async def measure_lag(samples: list, stop: asyncio.Event, period: float = 0.005) -> None:
+    """Record how late each short sleep wakes up."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(period)
+        samples.append(loop.time() - start - period)
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Return the given percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=20.0, help="polls per second per device")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--min-latency", type=float, default=0.001)
+    parser.add_argument("--max-latency", type=float, default=0.010)
+    parser.add_argument("--loss", type=float, default=0.0, help="packet loss probability")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    loop = asyncio.get_running_loop()
+    devices, clients, streamers = [], [], []
+    full_rate_frames = [0]
+
+    def on_frame(meters) -> None:
+        full_rate_frames[0] += 1
+
+    for index in range(args.devices):
+        device = SimulatedQuattro(f"SIMQ{index:04d}", (args.min_latency, args.max_latency),
+                                  args.loss, seed=index)
+        host = f"127.0.0.{30 + index}"
+        await loop.create_datagram_endpoint(lambda: device, local_addr=(host, 0))
+        devices.append(device)
+        client = QuattroClient(host, device.transport.get_extra_info("sockname")[1])
+        await client.connect()
+        clients.append(client)
+        streamer = QuattroMeterStreamer(client, rate=args.rate)
+        streamer.subscribe(on_frame)
+        streamers.append(streamer)
+
+    lag = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(measure_lag(lag, stop))
+    # Let the probe settle before streaming to get a baseline
+    await asyncio.sleep(0.5)
+    baseline = list(lag)
+    lag.clear()
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    for streamer in streamers:
+        streamer.start()
+    await asyncio.sleep(args.seconds)
+    for streamer in streamers:
+        await streamer.stop()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    stop.set()
+    await probe
+    for client in clients:
+        await client.disconnect()
+    for device in devices:
+        device.close()
+
+    frames = sum(s.frames for s in streamers)
+    results = {
+        "devices": args.devices,
+        "rate_hz": args.rate,
+        "achieved_hz_per_device": frames / elapsed / args.devices,
+        "frames": frames,
+        "full_rate_callbacks": full_rate_frames[0],
+        "missed": sum(s.missed for s in streamers),
+        "overruns": sum(s.overruns for s in streamers),
+        "cpu_percent": 100.0 * cpu / elapsed,
+        "lag_baseline_p99_ms": percentile(baseline, 0.99) * 1000 if baseline else None,
+        "lag_p50_ms": percentile(lag, 0.50) * 1000,
+        "lag_p99_ms": percentile(lag, 0.99) * 1000,
+        "lag_max_ms": max(lag) * 1000,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.devices} simulated QUATTROCANALI at {args.rate:.0f} Hz for {args.seconds:.0f}s")
+    print(f"  achieved     {results['achieved_hz_per_device']:.1f} Hz per device "
+          f"({frames} frames, {results['missed']} missed, {results['overruns']} overruns)")
+    print(f"  cpu          {results['cpu_percent']:.1f}% of one core (includes simulated devices)")
+    print(f"  loop lag     p50 {results['lag_p50_ms']:.2f} ms   p99 {results['lag_p99_ms']:.2f} ms   "
+          f"max {results['lag_max_ms']:.2f} ms   (idle p99 {results['lag_baseline_p99_ms']:.2f} ms)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark synchronized scene applies across simulated Mezzo amplifiers.
+
+Starts a group of simulators, precompiles one scene per amplifier and
+applies it to the whole group, first one amplifier after the other with
+apply_scene_frame and then with apply_scene_group. Reports the send skew
+(first to last frame leaving) and the acknowledgement spread of each
+mode, then checks every simulator's memory against the scene.
+
+Usage:
+    python tools/bench_scene_group.py
+    python tools/bench_scene_group.py --amplifiers 20 --latency 0.002 --jitter 0.001
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.mezzo_client import MezzoClient  # noqa: E402
+from powersoft_mezzo.scene_frames import SceneFrameCache  # noqa: E402
+from powersoft_mezzo.scene_group import apply_scene_group  # noqa: E402
+from sim_mezzo import start_simulators  # noqa: E402
+
+SCENES = [
+    {"id": 1, "name": "Day", "volumes": [0.8, 0.6, 0.5, 0.4],
+     "mutes": [False, False, True, False], "sources": [1, 3, 5, 7]},
+    {"id": 2, "name": "Night", "volumes": [0.2, 0.3, 0.1, 0.0],
+     "mutes": [False, True, False, True], "sources": [3, 1, 7, 5]},
+]
+
+
+async def sequential(targets) -> dict:
+    """Apply the frames one amplifier after the other."""
+    sends = []
+    start = time.perf_counter_ns()
+    for client, frame in targets:
+        sends.append(time.perf_counter_ns())
+        await client.apply_scene_frame(frame)
+    return {
+        "send_skew_ms": (max(sends) - min(sends)) / 1e6,
+        "settle_ms": (time.perf_counter_ns() - start) / 1e6,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--amplifiers", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--lead", type=float, default=0.01, help="seconds between scheduling and sending")
+    parser.add_argument("--latency", type=float, default=0.001, help="simulated device latency")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0, help="packet loss probability")
+    parser.add_argument("--timeout", type=float, default=0.2, help="acknowledgement timeout")
+    args = parser.parse_args()
+
+    devices = await start_simulators(args.amplifiers, latency=args.latency,
+                                     jitter=args.jitter, loss=args.loss, seed=1)
+    clients = [MezzoClient(device.host, device.port, timeout=args.timeout) for device in devices]
+    try:
+        frames = []
+        for client in clients:
+            await client.connect()
+            cache = SceneFrameCache()
+            for attempt in range(5):
+                try:
+                    cache.set_context(await client.read_scene_context())
+                    break
+                except TimeoutError:
+                    if attempt == 4:
+                        raise
+            frames.append([cache.get(scene) for scene in SCENES])
+
+        results = {"sequential": [], "group": []}
+        failed = 0
+        loop = asyncio.get_running_loop()
+        for index in range(args.rounds):
+            targets = [(client, scene_frames[index % len(SCENES)])
+                       for client, scene_frames in zip(clients, frames)]
+            try:
+                results["sequential"].append(await sequential(targets))
+            except (TimeoutError, ValueError):
+                failed += 1
+            report = await apply_scene_group(targets, at=loop.time() + args.lead,
+                                             timeout=args.timeout)
+            failed += len(report.failures)
+            results["group"].append(report.as_dict())
+    finally:
+        for client in clients:
+            await client.disconnect()
+
+    scene = SCENES[(args.rounds - 1) % len(SCENES)]
+    verified = sum(
+        device.memory.peek(command.address, command.size) == command.data
+        for device, scene_frames in zip(devices, frames)
+        for command in scene_frames[SCENES.index(scene)].commands
+    )
+    total = sum(len(scene_frames[SCENES.index(scene)].commands) for scene_frames in frames)
+    for device in devices:
+        device.close()
+
+    print(f"{args.amplifiers} amplifiers, {args.rounds} rounds, latency {args.latency * 1000:.1f} ms, "
+          f"jitter {args.jitter * 1000:.1f} ms, loss {args.loss:.0%}")
+    print(f"  {'mode':<10s} {'skew p50':>9s} {'skew max':>9s} {'settle p50':>11s}  (ms)")
+    for mode, rows in results.items():
+        if not rows:
+            continue
+        skews = [row["send_skew_ms"] for row in rows]
+        settles = [row["settle_ms"] for row in rows]
+        print(f"  {mode:<10s} {statistics.median(skews):>9.3f} {max(skews):>9.3f} "
+              f"{statistics.median(settles):>11.3f}")
+    spreads = [row["ack_spread_ms"] for row in results["group"]]
+    delays = [row["start_delay_ms"] for row in results["group"]]
+    retried = sum(row["retried"] for row in results["group"])
+    print(f"  group ACK spread p50 {statistics.median(spreads):.3f} ms, max {max(spreads):.3f} ms; "
+          f"start delay p50 {statistics.median(delays):.3f} ms; {retried} frames resent")
+    print(f"  failures: {failed}; memory check {verified}/{total} writes "
+          f"{'ok' if verified == total else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scene store with a large scene library.
+
+Generates a library of scenes and times loading it from the stored JSON,
+lookups by ID and by name, saving after a burst of edits, and exporting
+and importing it as a scene library. The indexed store is compared with
+the list it replaced: lookups scanned the scene list, and every edit
+rewrote the whole store where the delayed save writes it once.
+
+Usage:
+    python tools/bench_scene_store.py
+    python tools/bench_scene_store.py --scenes 5000 --lookups 10000 --edits 100
+"""
+import argparse
+import json
+import random
+import time
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.scene_index import SceneIndex, export_library, parse_library  # noqa: E402
+
+
+def make_scenes(count: int, rng: random.Random) -> list:
+    """Generate stored scenes like SceneManager writes them."""
+    scenes = []
+    for scene_id in range(1, count + 1):
+        scenes.append({
+            "id": scene_id,
+            "name": f"Scene {scene_id:05d}",
+            "volumes": [round(rng.random(), 3) for _ in range(4)],
+            "mutes": [rng.random() < 0.2 for _ in range(4)],
+            "sources": [rng.choice([1, 3, 5, 7]) for _ in range(4)],
+            "source_eq": [
+                {"enabled": True, "type": 1, "q": 0.7, "frequency": 1000.0 * (band + 1),
+                 "gain": round(rng.uniform(-6, 6), 1), "slope": 0}
+                for band in range(8)
+            ],
+            "standby": False,
+            "created_at": "2025-01-01T00:00:00Z",
+            "updated_at": "2025-01-01T00:00:00Z",
+        })
+    return scenes
+
+
+def timed(func, repeat: int = 1) -> float:
+    """Seconds per call of func."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenes", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--edits", type=int, default=100, help="edits batched into one save")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    stored = json.dumps({"version": 1, "scenes": make_scenes(args.scenes, rng)})
+    ids = [rng.randint(1, args.scenes) for _ in range(args.lookups)]
+    names = [f"Scene {scene_id:05d}" for scene_id in ids]
+
+    # Load: decode the store and build the index (the list kept only the max ID)
+    load_list = timed(lambda: max(s["id"] for s in json.loads(stored)["scenes"]), 5)
+    load_index = timed(lambda: SceneIndex(json.loads(stored)["scenes"]), 5)
+    scenes = json.loads(stored)["scenes"]
+    index = SceneIndex(scenes)
+
+    # Lookups: the list was copied and scanned (timed on the first 1000)
+    scanned = ids[:1000]
+    scan_id_time = timed(lambda: [next(s for s in list(scenes) if s["id"] == i) for i in scanned])
+    scan_name_time = timed(lambda: [next(s for s in scenes if s["name"] == f"Scene {i:05d}")
+                                    for i in scanned])
+    index_id_time = timed(lambda: [index.get(i) for i in ids])
+    index_name_time = timed(lambda: [index.get_by_name(n) for n in names])
+
+    # Save: one store write per edit versus one for the burst
+    def save():
+        return json.dumps({"version": 1, "scenes": index.scenes})
+
+    save_time = timed(save, 5)
+    size = len(save())
+
+    # Library round trip
+    export_time = timed(lambda: json.dumps(export_library(index)), 5)
+    library = json.dumps(export_library(index))
+    import_time = timed(lambda: parse_library(json.loads(library)), 5)
+
+    print(f"{args.scenes} scenes, store {size / 1024:.0f} KiB, {args.lookups} lookups, "
+          f"{args.edits} edits per burst")
+    print(f"  {'operation':<22s} {'list':>12s} {'indexed':>12s}")
+    print(f"  {'load (ms)':<22s} {load_list * 1000:>12.2f} {load_index * 1000:>12.2f}")
+    print(f"  {'lookup by id (us)':<22s} {scan_id_time / len(scanned) * 1e6:>12.2f} "
+          f"{index_id_time / len(ids) * 1e6:>12.3f}")
+    print(f"  {'lookup by name (us)':<22s} {scan_name_time / len(scanned) * 1e6:>12.2f} "
+          f"{index_name_time / len(names) * 1e6:>12.3f}")
+    print(f"  {'save burst (ms)':<22s} {save_time * args.edits * 1000:>12.1f} {save_time * 1000:>12.1f}")
+    print(f"  library export {export_time * 1000:.1f} ms, import (parse) {import_time * 1000:.1f} ms, "
+          f"{len(library) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
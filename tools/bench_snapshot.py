@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark configuration snapshots of a simulated Mezzo amplifier.
+
+Fills the configuration areas of a simulator with random data, captures
+a snapshot, round-trips it through a snapshot file, changes a few areas
+on the device and restores the snapshot. Reports capture and restore
+times, request counts and the areas the restore had to write, then checks
+the simulated memory against the snapshot.
+
+Usage:
+    python tools/bench_snapshot.py
+    python tools/bench_snapshot.py --latency 0.002 --loss 0.02 --windows 1 8
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.mezzo_client import MezzoClient  # noqa: E402
+from powersoft_mezzo.snapshot import (  # noqa: E402
+    SNAPSHOT_AREAS,
+    SNAPSHOT_EXTENSION,
+    ConfigSnapshot,
+    SnapshotEngine,
+)
+from sim_mezzo import start_simulators  # noqa: E402
+
+
+async def run(args, window: int) -> dict:
+    """Capture, save, load, disturb and restore one simulated amplifier."""
+    rng = random.Random(window)
+    device = (await start_simulators(1, latency=args.latency, jitter=args.jitter,
+                                     loss=args.loss, seed=window))[0]
+    for _, start, end in SNAPSHOT_AREAS:
+        device.memory.poke(start, rng.randbytes(end - start))
+    client = MezzoClient(device.host, device.port, timeout=args.timeout)
+    await client.connect()
+    try:
+        engine = SnapshotEngine(client, window=window)
+        requests = client.metrics.requests
+        start = asyncio.get_running_loop().time()
+        snapshot = await engine.capture()
+        capture = asyncio.get_running_loop().time() - start
+        capture_requests = client.metrics.requests - requests
+
+        with tempfile.NamedTemporaryFile(suffix=SNAPSHOT_EXTENSION, delete=False) as file:
+            path = file.name
+        try:
+            snapshot.save(path)
+            size = os.path.getsize(path)
+            snapshot = ConfigSnapshot.load(path)
+        finally:
+            os.unlink(path)
+
+        for name, start_address, end in rng.sample(SNAPSHOT_AREAS, args.changed):
+            device.memory.poke(start_address, rng.randbytes(end - start_address))
+        requests = client.metrics.requests
+        result = await engine.restore(snapshot)
+        restore_requests = client.metrics.requests - requests
+    finally:
+        await client.disconnect()
+        device.close()
+
+    verified = all(device.memory.peek(area.address, area.size) == area.data for area in snapshot.areas)
+    return {
+        "bytes": sum(area.size for area in snapshot.areas),
+        "file": size,
+        "capture": capture,
+        "capture_requests": capture_requests,
+        "restore": result,
+        "restore_requests": restore_requests,
+        "verified": verified,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--windows", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--changed", type=int, default=2, help="areas to change before restoring")
+    parser.add_argument("--latency", type=float, default=0.001, help="simulated device latency")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0, help="packet loss probability")
+    parser.add_argument("--timeout", type=float, default=0.2, help="per-request timeout")
+    args = parser.parse_args()
+
+    print(f"{len(SNAPSHOT_AREAS)} areas, latency {args.latency * 1000:.1f} ms, loss {args.loss:.0%}, "
+          f"{args.changed} areas changed before restore")
+    print(f"  {'window':>6s} {'bytes':>6s} {'file':>6s} {'capture ms':>10s} {'reqs':>5s} "
+          f"{'restore ms':>10s} {'reqs':>5s}  written")
+    for window in args.windows:
+        outcome = await run(args, window)
+        result = outcome["restore"]
+        print(f"  {window:>6d} {outcome['bytes']:>6d} {outcome['file']:>6d} "
+              f"{outcome['capture'] * 1000:>10.1f} {outcome['capture_requests']:>5d} "
+              f"{result.elapsed * 1000:>10.1f} {outcome['restore_requests']:>5d}  "
+              f"{', '.join(result.written) or '-'} ({'ok' if outcome['verified'] else 'MISMATCH'})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Mezzo hot paths.
+
+Measures, against simulated amplifiers on loopback:
+  codec.*      calculate_crc16, escape_data and unescape_data throughput,
+               and build_request/parse_response of the real get_all_state
+               frame
+  poll.*       end-to-end get_all_state latency
+  scene.*      apply_scene wall time
+  discovery.*  discovery time for a simulated subnet
+  fleet.*      client CPU per coordinator poll with 1, 10 and 100 amplifiers
+
+Fleet devices run in a separate process so the CPU figures only cover the
+client side. Results can be written as JSON and compared with an earlier
+run; a metric that got worse by more than the threshold is a regression
+and makes the script exit with status 1.
+
+Usage:
+    python tools/bench_suite.py --output baseline.json
+    python tools/bench_suite.py --compare baseline.json --threshold 0.20
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.pbus_protocol import (  # noqa: E402
+    PBusPacket,
+    calculate_crc16,
+    escape_data,
+    unescape_data,
+)
+from powersoft_mezzo.mezzo_client import MezzoClient  # noqa: E402
+from sim_mezzo import start_simulators  # noqa: E402
+
+SCENE = {
+    "name": "Benchmark",
+    "volumes": [0.8, 0.6, 0.4, 0.2],
+    "mutes": [False, False, True, False],
+    "sources": [1, 1, 5, 5],
+    "standby": False,
+}
+
+
+def metric(value: float, unit: str, higher_is_better: bool) -> Dict[str, Any]:
+    """Wrap a measurement with the information needed to compare it."""
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def rate(func: Callable[[], Any], seconds: float, repeat: int = 3) -> float:
+    """
+    Measure calls per second of func.
+
+    Like timeit, the best of `repeat` runs of about `seconds` each is
+    kept, since slower runs measure interference rather than the code.
+    """
+    best = 0.0
+    batch = 16
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            for _ in range(batch):
+                func()
+            calls += batch
+            elapsed = time.perf_counter() - start
+            if elapsed >= seconds:
+                break
+        best = max(best, calls / elapsed)
+    return best
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the given percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# ============================================================================
+# Simulators in a child process
+# ============================================================================
+
+def _serve(count: int, latency: float, conn) -> None:
+    """Child process: run simulators until the parent says stop."""
+    async def serve():
+        devices = await start_simulators(count, latency=latency)
+        conn.send([(device.host, device.port) for device in devices])
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, conn.recv)
+        for device in devices:
+            device.close()
+
+    asyncio.run(serve())
+
+
+class SimulatorProcess:
+    """Simulated amplifiers served from a child process."""
+
+    def __init__(self, count: int, latency: float = 0.001):
+        self.count = count
+        self.latency = latency
+        self.addresses: List[tuple] = []
+        self._conn = None
+        self._process = None
+
+    def __enter__(self):
+        context = multiprocessing.get_context("spawn")
+        self._conn, child = context.Pipe()
+        self._process = context.Process(target=_serve, args=(self.count, self.latency, child))
+        self._process.start()
+        self.addresses = self._conn.recv()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._conn.send("stop")
+        self._process.join(5)
+        if self._process.is_alive():
+            self._process.kill()
+
+
+# ============================================================================
+# Benchmarks
+# ============================================================================
+
+async def capture_get_all_state_frames() -> tuple:
+    """Run get_all_state once against a simulator and keep both packets."""
+    device = (await start_simulators(1))[0]
+    captured = {}
+    handle_request = device.handle_request
+
+    def capture(packet: bytes):
+        reply = handle_request(packet)
+        captured["request"], captured["reply"] = packet, reply
+        return reply
+
+    device.handle_request = capture
+    client = MezzoClient(device.host, device.port)
+    await client.connect()
+    try:
+        await client.get_all_state()
+    finally:
+        await client.disconnect()
+        device.close()
+    return captured["request"], captured["reply"]
+
+
+async def bench_codec(seconds: float) -> Dict[str, Any]:
+    """Codec throughput on the real get_all_state frames."""
+    request, reply = await capture_get_all_state_frames()
+    tag, commands = PBusPacket.parse_request(request)
+    payload = unescape_data(reply[1:-1])
+    escaped = reply[1:-1]
+    mb = len(payload) / 1e6
+
+    return {
+        "codec.crc16": metric(rate(lambda: calculate_crc16(payload), seconds) * mb, "MB/s", True),
+        "codec.escape": metric(rate(lambda: escape_data(payload), seconds) * mb, "MB/s", True),
+        "codec.unescape": metric(rate(lambda: unescape_data(escaped), seconds) * mb, "MB/s", True),
+        "codec.build_request": metric(
+            rate(lambda: PBusPacket.build_request(tag, commands), seconds), "frames/s", True),
+        "codec.parse_response": metric(
+            rate(lambda: PBusPacket.parse_response(reply), seconds), "frames/s", True),
+        "codec.frame_bytes": metric(len(reply), "bytes", False),
+    }
+
+
+async def bench_poll_and_scene(polls: int, latency: float) -> Dict[str, Any]:
+    """End-to-end get_all_state latency and apply_scene wall time."""
+    with SimulatorProcess(1, latency) as sims:
+        host, port = sims.addresses[0]
+        client = MezzoClient(host, port)
+        await client.connect()
+        try:
+            await client.get_all_state()  # warm up
+            poll_times = []
+            for _ in range(polls):
+                start = time.perf_counter()
+                await client.get_all_state()
+                poll_times.append(time.perf_counter() - start)
+            scene_times = []
+            for _ in range(max(5, polls // 5)):
+                start = time.perf_counter()
+                await client.apply_scene(SCENE)
+                scene_times.append(time.perf_counter() - start)
+        finally:
+            await client.disconnect()
+
+    return {
+        "poll.get_all_state.p50": metric(statistics.median(poll_times) * 1000, "ms", False),
+        "poll.get_all_state.p95": metric(percentile(poll_times, 0.95) * 1000, "ms", False),
+        "scene.apply_scene.p50": metric(statistics.median(scene_times) * 1000, "ms", False),
+    }
+
+
+async def bench_discovery(runs: int) -> Dict[str, Any]:
+    """Discovery time for a simulated subnet of 10 Mezzo and 4 QUATTROCANALI."""
+    from types import SimpleNamespace
+    from bench_discovery import run_once
+
+    args = SimpleNamespace(
+        mezzo=10, quattro=4, min_latency=0.002, max_latency=0.050, loss=0.0,
+        timeout=5.0, idle_timeout=0.5, repeats=2, repeat_interval=0.3,
+    )
+    results = [await run_once(args, seed, 14) for seed in range(runs)]
+    return {
+        "discovery.complete": metric(statistics.median(r["complete"] for r in results) * 1000, "ms", False),
+        "discovery.found": metric(min(r["found"] for r in results), "devices", True),
+    }
+
+
+async def bench_fleet(sizes: List[int], cycles: int, latency: float) -> Dict[str, Any]:
+    """Client CPU per amplifier poll, polling the whole fleet concurrently."""
+    results = {}
+    for size in sizes:
+        with SimulatorProcess(size, latency) as sims:
+            clients = [MezzoClient(host, port) for host, port in sims.addresses]
+            for client in clients:
+                await client.connect()
+            try:
+                await asyncio.gather(*(client.get_all_state() for client in clients))
+                cpu_start = time.process_time()
+                wall_start = time.perf_counter()
+                for _ in range(cycles):
+                    await asyncio.gather(*(client.get_all_state() for client in clients))
+                cpu = time.process_time() - cpu_start
+                wall = time.perf_counter() - wall_start
+            finally:
+                for client in clients:
+                    await client.disconnect()
+        results[f"fleet.{size}.cpu_per_poll"] = metric(cpu / (cycles * size) * 1e6, "us", False)
+        results[f"fleet.{size}.cycle"] = metric(wall / cycles * 1000, "ms", False)
+    return results
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Print current results next to a baseline.
+
+    Returns:
+        Names of metrics that regressed by more than the threshold
+    """
+    regressions = []
+    print(f"  {'metric':34s} {'baseline':>12s} {'current':>12s} {'change':>8s}")
+    for name, result in current.items():
+        old = baseline.get(name)
+        if old is None or not old["value"]:
+            print(f"  {name:34s} {'-':>12s} {result['value']:>12.2f} {'new':>8s}  {result['unit']}")
+            continue
+        change = result["value"] / old["value"] - 1.0
+        worse = -change if result["higher_is_better"] else change
+        flag = "  REGRESSION" if worse > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"  {name:34s} {old['value']:>12.2f} {result['value']:>12.2f} "
+              f"{change:>+7.1%}  {result['unit']}{flag}")
+    return regressions
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", nargs="+", choices=["codec", "poll", "discovery", "fleet"],
+                        help="run a subset of the benchmarks")
+    parser.add_argument("--seconds", type=float, default=0.3, help="time per codec run (best of 3)")
+    parser.add_argument("--polls", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.001, help="simulated device latency")
+    parser.add_argument("--fleet", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--cycles", type=int, default=20, help="fleet poll cycles")
+    parser.add_argument("--discovery-runs", type=int, default=3)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare with results from this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    selected = set(args.only or ["codec", "poll", "discovery", "fleet"])
+    results: Dict[str, Any] = {}
+    if "codec" in selected:
+        results.update(await bench_codec(args.seconds))
+    if "poll" in selected:
+        results.update(await bench_poll_and_scene(args.polls, args.latency))
+    if "discovery" in selected:
+        results.update(await bench_discovery(args.discovery_runs))
+    if "fleet" in selected:
+        results.update(await bench_fleet(args.fleet, args.cycles, args.latency))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "simulated_latency_s": args.latency,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        return 0
+
+    for name, result in results.items():
+        print(f"  {name:34s} {result['value']:>12.2f}  {result['unit']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
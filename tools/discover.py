@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Find Powersoft amplifiers from the command line.
+
+Without arguments, broadcasts on the local segment (Mezzo and
+QUATTROCANALI). With --sweep, probes CIDR ranges by unicast, which also
+reaches amplifiers on other VLANs or behind routers.
+
+Usage:
+    python tools/discover.py
+    python tools/discover.py --sweep 10.0.40.0/22 10.0.50.0/24 --ports 8002
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.mezzo_client import (  # noqa: E402
+    iter_discover_amplifiers,
+    iter_sweep_amplifiers,
+)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sweep", nargs="+", metavar="CIDR",
+                        help="unicast sweep of these ranges instead of broadcasting")
+    parser.add_argument("--ports", default="8002", help="comma-separated ports for --sweep")
+    parser.add_argument("--rate", type=float, default=2000.0, help="probes per second")
+    parser.add_argument("--concurrency", type=int, default=1024, help="probes in flight")
+    parser.add_argument("--timeout", type=float, default=1.0,
+                        help="per-probe timeout (sweep) or idle gap (broadcast)")
+    parser.add_argument("--attempts", type=int, default=2, help="sends per target (sweep)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    if args.sweep:
+        ports = [int(p) for p in args.ports.split(",") if p.strip()]
+        devices = iter_sweep_amplifiers(args.sweep, ports, args.rate, args.concurrency,
+                                        args.timeout, args.attempts)
+    else:
+        devices = iter_discover_amplifiers(timeout=5.0, idle_timeout=args.timeout)
+
+    start = time.perf_counter()
+    found = []
+    async for info in devices:
+        found.append(info)
+        if not args.json:
+            print(f"{time.perf_counter() - start:7.3f}s  {info['host']}:{info['port']:<5d} "
+                  f"{info['protocol']:13s} {info['model']}  S/N {info['serial']}  "
+                  f"FW {info['firmware']}")
+
+    if args.json:
+        print(json.dumps(found, indent=2))
+    else:
+        print(f"{len(found)} amplifier(s) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded Mezzo packet trace through the decoders.
+
+Reads a pcap file (from the export_packet_trace service, the diagnostics
+download, or a Wireshark capture), pairs replies with their requests by
+TAG and feeds every reply through PBusPacket.parse_response. Replies to
+the coordinator's get_all_state request also go through
+MezzoClient.decode_all_state, so decode bugs can be reproduced without
+the amplifier.
+
+With --repeat the whole trace is decoded that many times and the decode
+rate is reported, for performance regression runs on real traffic.
+--record writes a trace from a simulated amplifier to start from.
+
+Usage:
+    python tools/replay_trace.py capture.pcap
+    python tools/replay_trace.py capture.pcap --show-state
+    python tools/replay_trace.py capture.pcap --repeat 1000
+    python tools/replay_trace.py --record sample.pcap --polls 20
+"""
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.mezzo_client import MezzoClient  # noqa: E402
+from powersoft_mezzo.packet_trace import DIRECTION_OUT, read_pcap  # noqa: E402
+from powersoft_mezzo.pbus_protocol import PBusPacket  # noqa: E402
+
+ALL_STATE_SIGNATURE = [(c.opcode, c.address, c.size) for c in MezzoClient.all_state_commands()]
+
+
+def load_trace(path: str) -> bytes:
+    """Read a pcap file, or the packet trace inside a diagnostics download."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[:1] == b"{":
+        diagnostics = json.loads(data)
+        trace = diagnostics.get("data", diagnostics).get("packet_trace")
+        if trace is None:
+            raise ValueError("Diagnostics file contains no packet trace")
+        data = base64.b64decode(trace["pcap_base64"])
+    return data
+
+
+def pair_frames(records) -> List[Dict[str, Any]]:
+    """
+    Parse requests and pair each reply with the request it answers.
+
+    Returns:
+        One dict per reply with the raw frame, its TAG, and whether it
+        answers a get_all_state request
+    """
+    requests: Dict[bytes, list] = {}
+    replies = []
+    for record in records:
+        if record.direction == DIRECTION_OUT:
+            try:
+                tag, commands = PBusPacket.parse_request(record.data)
+            except ValueError:
+                continue
+            requests[tag] = [(c.opcode, c.address, c.size) for c in commands]
+            continue
+        tag = None
+        try:
+            tag, _ = PBusPacket.parse_response(record.data)
+        except ValueError:
+            pass
+        replies.append({
+            "timestamp": record.timestamp,
+            "data": record.data,
+            "tag": tag,
+            "all_state": tag is not None and requests.get(tag) == ALL_STATE_SIGNATURE,
+            "matched": tag in requests,
+        })
+    return replies
+
+
+def decode(replies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Decode every reply once, collecting errors and the last state."""
+    counts = {"replies": len(replies), "parsed": 0, "all_state": 0,
+              "unmatched": 0, "errors": []}
+    state: Optional[Dict[str, Any]] = None
+    for index, reply in enumerate(replies):
+        try:
+            _, responses = PBusPacket.parse_response(reply["data"])
+            counts["parsed"] += 1
+            if not reply["matched"]:
+                counts["unmatched"] += 1
+            if reply["all_state"]:
+                state = MezzoClient.decode_all_state(responses)
+                counts["all_state"] += 1
+        except Exception as err:  # report every decode failure, not just ValueError
+            counts["errors"].append(f"reply {index} (TAG {reply['tag'].hex() if reply['tag'] else '?'}): "
+                                    f"{type(err).__name__}: {err}")
+    counts["last_state"] = state
+    return counts
+
+
+def benchmark(replies: List[Dict[str, Any]], repeat: int) -> Dict[str, float]:
+    """Time repeated decoding of the trace."""
+    frames = [(reply["data"], reply["all_state"]) for reply in replies if reply["tag"] is not None]
+    parse = PBusPacket.parse_response
+    decode_all_state = MezzoClient.decode_all_state
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data, all_state in frames:
+            _, responses = parse(data)
+            if all_state:
+                decode_all_state(responses)
+    elapsed = time.perf_counter() - start
+    decoded = repeat * len(frames)
+    return {"frames_per_s": decoded / elapsed, "us_per_frame": elapsed / decoded * 1e6}
+
+
+async def record(path: str, polls: int) -> None:
+    """Record a trace of get_all_state polls and one scene against a simulator."""
+    from sim_mezzo import start_simulators
+
+    device = (await start_simulators(1))[0]
+    client = MezzoClient(device.host, device.port)
+    await client.connect()
+    client.start_trace(max(16, 2 * polls + 32))
+    try:
+        for _ in range(polls):
+            await client.get_all_state()
+        await client.apply_scene({"name": "Replay", "volumes": [0.5, 0.5, 0.5, 0.5],
+                                  "mutes": [False] * 4, "sources": [1, 1, 1, 1], "standby": False})
+        await client.get_all_state()
+        with open(path, "wb") as file:
+            file.write(client.export_pcap())
+        print(f"Recorded {client.trace.recorded} frames to {path}")
+    finally:
+        await client.disconnect()
+        device.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("trace", nargs="?", help="pcap file or diagnostics JSON")
+    parser.add_argument("--port", type=int, default=None,
+                        help="amplifier UDP port (default: destination of the first frame)")
+    parser.add_argument("--show-state", action="store_true", help="print the last decoded state")
+    parser.add_argument("--repeat", type=int, default=0, help="decode the trace this many times and time it")
+    parser.add_argument("--record", metavar="PATH", help="record a trace from a simulated amplifier")
+    parser.add_argument("--polls", type=int, default=20, help="get_all_state polls to record")
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record, args.polls))
+        return 0
+    if not args.trace:
+        parser.error("a trace file is required unless --record is given")
+
+    records = read_pcap(load_trace(args.trace), args.port)
+    replies = pair_frames(records)
+    result = decode(replies)
+    requests = len(records) - len(replies)
+    print(f"{len(records)} frames: {requests} requests, {result['replies']} replies "
+          f"({result['parsed']} parsed, {result['unmatched']} unmatched, "
+          f"{result['all_state']} get_all_state decoded)")
+    for error in result["errors"]:
+        print(f"  ERROR {error}")
+    if args.show_state and result["last_state"] is not None:
+        print(json.dumps(result["last_state"], indent=2, default=str))
+    if args.repeat:
+        timing = benchmark(replies, args.repeat)
+        print(f"  decode: {timing['frames_per_s']:.0f} frames/s ({timing['us_per_frame']:.1f} us/frame)")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
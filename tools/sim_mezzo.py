@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+In-process simulated Mezzo amplifier.
+
+A SimulatedMezzo answers PBus R, W, E and C commands on a UDP socket from
+a sparse memory image laid out like the Mezzo address space. Every area
+carries access rights as in the protocol document, so out-of-area,
+cross-area and forbidden operations are NAKed, and requests that cannot be
+delimited get no reply at all. Replies can be delayed, jittered, dropped,
+duplicated and reordered, and any number of devices can run side by side
+on loopback ports, which makes MezzoClient and UDPManager testable and
+benchmarkable without hardware.
+
+Usage:
+    python tools/sim_mezzo.py --count 3 --latency 0.002 --loss 0.05
+"""
+import argparse
+import asyncio
+import random
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from _integration import load_integration
+
+load_integration()
+
+from powersoft_mezzo.pbus_protocol import (  # noqa: E402
+    OPCODE_READ,
+    OPCODE_WRITE,
+    OPCODE_ERASE,
+    OPCODE_CRC,
+    PBusPacket,
+    PBusResponse,
+    calculate_crc16,
+    float_to_bytes,
+    uint32_to_bytes,
+)
+from powersoft_mezzo import mezzo_memory_map as mm  # noqa: E402
+
+# Access rights letters, as written in the protocol document ("rwec")
+_RIGHTS = {OPCODE_READ: "r", OPCODE_WRITE: "w", OPCODE_ERASE: "e", OPCODE_CRC: "c"}
+
+# Erased flash reads back as 0xFF
+ERASED_BYTE = 0xFF
+
+
+@dataclass
+class MemoryArea:
+    """One PBus area: [start, end) with its access rights."""
+    name: str
+    start: int
+    end: int
+    rights: str
+    data: Optional[bytearray] = None
+
+    def allows(self, opcode: int) -> bool:
+        """Check if the area permits an operation."""
+        return _RIGHTS.get(opcode, "?") in self.rights
+
+    def buffer(self) -> bytearray:
+        """Return the area contents, allocating them on first use."""
+        if self.data is None:
+            self.data = bytearray(self.end - self.start)
+        return self.data
+
+
+# Mezzo address space. Rights follow the block descriptions: read-only
+# info and readings, write-only commands, erasable firmware and OEM areas.
+MEZZO_AREAS = (
+    ("Info (read only)", mm.ADDR_DEVICE_INFO_START, 0x0000007a, "r--c"),
+    ("Info (client)", 0x000000f4, mm.ADDR_DEVICE_INFO_END, "rw-c"),
+    ("Network", mm.ADDR_NETWORK_START, mm.ADDR_NETWORK_END, "rw-c"),
+    ("Source selection", mm.ADDR_ANALOG_REF, mm.ADDR_SOURCE_CONFIG_END, "rw-c"),
+    ("Matrix", mm.ADDR_MATRIX_START, mm.ADDR_MATRIX_END, "rw-c"),
+    ("User", mm.ADDR_USER_SETTINGS_START, mm.ADDR_USER_EQ_END, "rw-c"),
+    ("Speaker layout", mm.ADDR_LAYOUT_START, mm.ADDR_LAYOUT_END, "rw-c"),
+    ("Ways", mm.ADDR_WAYS_START, mm.ADDR_WAYS_END, "rw-c"),
+    ("Dante routing", mm.ADDR_DANTE_START, mm.ADDR_DANTE_END, "rw-c"),
+    ("GPI configuration", mm.ADDR_GPI_CONFIG_START, mm.ADDR_GPI_CONFIG_END, "rw-c"),
+    ("GPO configuration", mm.ADDR_GPO_CONFIG_START, mm.ADDR_GPO_CONFIG_END, "rw-c"),
+    ("Standby trigger", mm.ADDR_STANDBY_TRIGGER, mm.ADDR_AUTO_TURN_ON_ENABLE, "-w--"),
+    ("Power config", mm.ADDR_AUTO_TURN_ON_ENABLE, mm.ADDR_POWER_CONFIG_END, "rw-c"),
+    ("Readings", mm.ADDR_READINGS_START, mm.ADDR_READINGS_END, "r--c"),
+    ("AutoSetup", mm.ADDR_AUTOSETUP_START, mm.ADDR_AUTOSETUP_END, "rw-c"),
+    ("Zone settings", mm.ADDR_ZONE_SETTINGS_START, mm.ADDR_ZONE_SETTINGS_END, "rw-c"),
+    ("Source EQ", mm.ADDR_SOURCE_EQ_START, mm.ADDR_SOURCE_EQ_END, "rw-c"),
+    ("Dante settings", mm.ADDR_UXT_CHIP_START, mm.ADDR_UXT_CHIP_END, "rw-c"),
+    ("OEM spare", mm.ADDR_OEM_SPARE_START, mm.ADDR_OEM_SPARE_END, "rwec"),
+    ("Blink", mm.ADDR_CMD_BLINK, mm.ADDR_CMD_BLINK + 1, "-w--"),
+    ("System reboot", mm.ADDR_CMD_REBOOT, mm.ADDR_CMD_REBOOT + 1, "-w--"),
+    ("Load default", mm.ADDR_CMD_LOAD_DEFAULT, mm.ADDR_CMD_LOAD_DEFAULT + 1, "-w--"),
+    ("Firmware", mm.ADDR_FIRMWARE_START, mm.ADDR_FIRMWARE_END, "rwec"),
+    ("Firmware start", mm.ADDR_UPGRADE_FW_INFO, mm.ADDR_UPGRADE_FW_INFO + 6, "rw-c"),
+    ("Firmware flash erase", mm.ADDR_UPGRADE_FW_FLASH_ERASE, mm.ADDR_UPGRADE_FW_FLASH_ERASE + 1, "-w--"),
+)
+
+
+class MezzoMemory:
+    """Sparse Mezzo memory image; areas are only allocated when touched."""
+
+    def __init__(self, areas=MEZZO_AREAS):
+        """
+        Initialize the memory image.
+
+        Args:
+            areas: Iterable of (name, start, end, rights) tuples
+        """
+        self.areas: List[MemoryArea] = sorted(
+            (MemoryArea(*area) for area in areas), key=lambda area: area.start
+        )
+        self.naks = 0
+
+    def find(self, address: int, size: int) -> Optional[MemoryArea]:
+        """
+        Find the single area holding [address, address + size).
+
+        Returns:
+            The area, or None if the range is unallocated or spans areas
+        """
+        for area in self.areas:
+            if area.start <= address < area.end:
+                return area if size > 0 and address + size <= area.end else None
+        return None
+
+    def peek(self, address: int, size: int) -> bytes:
+        """Read memory directly, ignoring access rights."""
+        area = self.find(address, size)
+        if area is None:
+            raise ValueError(f"0x{address:08x}+{size} is not inside one area")
+        offset = address - area.start
+        return bytes(area.buffer()[offset:offset + size])
+
+    def poke(self, address: int, data: bytes) -> None:
+        """Write memory directly, ignoring access rights."""
+        area = self.find(address, len(data))
+        if area is None:
+            raise ValueError(f"0x{address:08x}+{len(data)} is not inside one area")
+        offset = address - area.start
+        area.buffer()[offset:offset + len(data)] = data
+
+    def execute(self, command) -> PBusResponse:
+        """
+        Execute one PBus command.
+
+        Returns:
+            The reply; SIZE32 0 (NAK) if the operation is not permitted
+        """
+        opcode, address, size = command.opcode, command.address, command.size
+        area = self.find(address, size)
+        if area is None or not area.allows(opcode):
+            self.naks += 1
+            return PBusResponse(opcode, address, 0)
+
+        buffer = area.buffer()
+        offset = address - area.start
+        if opcode == OPCODE_READ:
+            return PBusResponse(opcode, address, size, bytes(buffer[offset:offset + size]))
+        if opcode == OPCODE_WRITE:
+            buffer[offset:offset + size] = command.data
+            return PBusResponse(opcode, address, size)
+        if opcode == OPCODE_ERASE:
+            buffer[offset:offset + size] = bytes([ERASED_BYTE]) * size
+            return PBusResponse(opcode, address, size)
+        # CRC of the area contents, same CRC16 as the frames, little endian
+        crc = calculate_crc16(bytes(buffer[offset:offset + size]))
+        return PBusResponse(opcode, address, size, struct.pack('<H', crc))
+
+
+class SimulatedMezzo(asyncio.DatagramProtocol):
+    """Fake Mezzo amplifier answering PBus requests on one UDP socket."""
+
+    def __init__(
+        self,
+        serial: str = "SIM00001",
+        model: str = "Mezzo 602 AD",
+        firmware: str = "1.0.0",
+        latency: float = 0.001,
+        jitter: float = 0.0,
+        loss: float = 0.0,
+        duplicate: float = 0.0,
+        reorder: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Initialize the device.
+
+        Args:
+            serial: Serial number in the info area
+            model: Model name in the info area
+            firmware: Firmware version in the info area
+            latency: Base reply latency in seconds
+            jitter: Additional uniformly distributed latency in seconds
+            loss: Probability that a request or a reply is dropped
+            duplicate: Probability that a reply is sent twice
+            reorder: Probability that a reply is held back behind later ones
+            seed: Random seed
+        """
+        self.serial = serial
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.duplicate = duplicate
+        self.reorder = reorder
+        self.memory = MezzoMemory()
+        self.stats: Dict[str, int] = {
+            "requests": 0, "replies": 0, "dropped": 0, "duplicated": 0,
+            "reordered": 0, "corrupted": 0, "blinks": 0, "reboots": 0,
+        }
+        self.transport = None
+        self._random = random.Random(seed)
+        self._timers: List[asyncio.TimerHandle] = []
+        self._seed_memory(model, firmware)
+
+    @property
+    def port(self) -> int:
+        """Local UDP port the device listens on."""
+        return self.transport.get_extra_info("sockname")[1]
+
+    @property
+    def host(self) -> str:
+        """Local address the device listens on."""
+        return self.transport.get_extra_info("sockname")[0]
+
+    def _seed_memory(self, model: str, firmware: str) -> None:
+        """Fill the registers the integration reads with plausible values."""
+        poke = self.memory.poke
+        poke(mm.ADDR_MODEL_NAME, model.encode()[:19].ljust(20, b"\x00"))
+        poke(mm.ADDR_SERIAL_NUMBER, self.serial.encode()[:15].ljust(16, b"\x00"))
+        poke(mm.ADDR_FIRMWARE_VERSION, firmware.encode()[:19].ljust(20, b"\x00"))
+        for ch in range(1, mm.NUM_CHANNELS + 1):
+            poke(mm.get_user_gain_address(ch), float_to_bytes(0.5))
+            poke(mm.get_zone_gain_address(ch), float_to_bytes(1.0))
+            poke(mm.get_temp_channel_address(ch), float_to_bytes(40.0 + ch))
+            for band in range(1, mm.NUM_EQ_BANDS + 1):
+                # Disabled peaking filter at 1 kHz, 0 dB
+                poke(mm.get_user_eq_biquad_address(ch, band),
+                     struct.pack('<IIffIf', 0, mm.EQ_TYPE_PEAKING, 0.7, 0.0, 1000, 0.0))
+        poke(mm.ADDR_MANUAL_SOURCE_SELECTION, uint32_to_bytes(0x0D090501))
+        poke(mm.ADDR_TEMP_TRANSFORMER, float_to_bytes(45.0))
+        poke(mm.ADDR_TEMP_HEATSINK, float_to_bytes(50.0))
+        poke(mm.ADDR_STANDBY_STATE, uint32_to_bytes(0))
+
+    def _side_effects(self, command) -> None:
+        """Apply the device behaviour behind writes to command registers."""
+        if command.opcode != OPCODE_WRITE:
+            return
+        if command.address == mm.ADDR_STANDBY_TRIGGER and len(command.data) == 4:
+            self.memory.poke(mm.ADDR_STANDBY_STATE, command.data)
+        elif command.address == mm.ADDR_CMD_BLINK:
+            self.stats["blinks"] += 1
+        elif command.address == mm.ADDR_CMD_REBOOT:
+            self.stats["reboots"] += 1
+
+    def handle_request(self, packet: bytes) -> Optional[bytes]:
+        """
+        Execute a request packet and build the reply.
+
+        Commands run left to right; each failing command gets its own NAK.
+
+        Args:
+            packet: Request packet
+
+        Returns:
+            Reply packet, or None if the request is corrupted
+        """
+        try:
+            tag, commands = PBusPacket.parse_request(packet)
+        except ValueError:
+            self.stats["corrupted"] += 1
+            return None
+
+        responses = []
+        for command in commands:
+            response = self.memory.execute(command)
+            if not response.is_nak():
+                self._side_effects(command)
+            responses.append(response)
+        return PBusPacket.build_response(tag, responses)
+
+    # ------------------------------------------------------------------------
+    # asyncio.DatagramProtocol
+    # ------------------------------------------------------------------------
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.stats["requests"] += 1
+        if self._random.random() < self.loss:
+            self.stats["dropped"] += 1
+            return
+        reply = self.handle_request(data)
+        if reply is None:
+            return
+        if self._random.random() < self.loss:
+            self.stats["dropped"] += 1
+            return
+
+        delay = self.latency + self._random.uniform(0.0, self.jitter)
+        if self._random.random() < self.reorder:
+            # Hold the reply long enough for later replies to overtake it
+            delay += self.latency + self.jitter
+            self.stats["reordered"] += 1
+        self._send_later(delay, reply, addr)
+        if self._random.random() < self.duplicate:
+            self.stats["duplicated"] += 1
+            self._send_later(delay + self._random.uniform(0.0, self.latency + self.jitter), reply, addr)
+
+    def _send_later(self, delay: float, reply: bytes, addr) -> None:
+        """Send a reply after a delay."""
+        loop = asyncio.get_running_loop()
+        self._timers = [timer for timer in self._timers if not timer.cancelled()]
+        self._timers.append(loop.call_later(delay, self._send, reply, addr))
+
+    def _send(self, reply: bytes, addr) -> None:
+        """Send a reply if the socket is still open."""
+        if self.transport is not None and not self.transport.is_closing():
+            self.stats["replies"] += 1
+            self.transport.sendto(reply, addr)
+
+    def close(self) -> None:
+        """Cancel pending replies and close the socket."""
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        if self.transport:
+            self.transport.close()
+
+
+async def start_simulators(count: int, host: str = "127.0.0.1", port: int = 0,
+                           seed: int = 0, **kwargs) -> List[SimulatedMezzo]:
+    """
+    Start simulated Mezzo amplifiers on loopback.
+
+    Args:
+        count: Number of devices
+        host: Address to bind (all devices share it, each gets its own port)
+        port: First port to bind, or 0 for ephemeral ports
+        seed: Base random seed (device i uses seed + i)
+        **kwargs: SimulatedMezzo options (latency, jitter, loss, ...)
+
+    Returns:
+        Running devices; use .host and .port to address them
+    """
+    loop = asyncio.get_running_loop()
+    devices = []
+    for index in range(count):
+        device = SimulatedMezzo(serial=f"SIM{index:05d}", seed=seed + index, **kwargs)
+        await loop.create_datagram_endpoint(
+            lambda device=device: device,
+            local_addr=(host, port + index if port else 0),
+        )
+        devices.append(device)
+    return devices
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002, help="first port (0 for ephemeral)")
+    parser.add_argument("--latency", type=float, default=0.001)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--duplicate", type=float, default=0.0)
+    parser.add_argument("--reorder", type=float, default=0.0)
+    args = parser.parse_args()
+
+    devices = await start_simulators(
+        args.count, args.host, args.port, latency=args.latency, jitter=args.jitter,
+        loss=args.loss, duplicate=args.duplicate, reorder=args.reorder,
+    )
+    for device in devices:
+        print(f"{device.serial} listening on {device.host}:{device.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for device in devices:
+            print(f"{device.serial}: {device.stats}")
+            device.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass